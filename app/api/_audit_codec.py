@@ -0,0 +1,147 @@
+"""Compact blob encoding for an archived match's audit trajectory.
+
+``match_archive`` stores the audit list of a finished match in the
+``match_report_audits`` side table as one compressed blob (see
+:class:`app.db.models.report.MatchReportAudit`). The blob is tagged with
+its codec so rows written by older code, or by the 0008 migration, keep
+decoding after the format moves on:
+
+* ``json-zlib-v0`` — ``zlib(json(records))``. What the migration writes
+  for rows it moves out of the old ``match_reports.audit_log`` column:
+  a migration must not import app code, so it only gets the trivial
+  format.
+* ``columnar-zlib-v1`` — what :func:`encode` writes. The records are
+  split into per-field columns (``ts``, ``action``, ``params``,
+  ``result`` and a catch-all ``extra``), and each ``result`` snapshot is
+  stored as the top-level keys that changed since the previous one.
+  Consecutive snapshots differ by a score or a serve flag, so the delta
+  column is mostly one- or two-key objects, and grouping like values
+  together lets zlib find the rest of the repetition.
+
+Decoding is exact: :func:`decode` returns records equal to the list that
+was encoded (key order inside a rebuilt ``result`` may differ).
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any
+
+CODEC_JSON_ZLIB = "json-zlib-v0"
+CODEC_COLUMNAR_ZLIB = "columnar-zlib-v1"
+
+_COLUMNS = ("ts", "action", "params", "result")
+_MISSING: Any = object()
+
+
+def _delta(prev: Any, cur: Any) -> dict[str, Any]:
+    """One ``result`` cell: ``{"f": full}`` or ``{"d": changed, "x": removed}``."""
+    if not isinstance(prev, dict) or not isinstance(cur, dict):
+        return {"f": cur}
+    changed = {k: v for k, v in cur.items() if k not in prev or prev[k] != v}
+    cell: dict[str, Any] = {"d": changed}
+    removed = [k for k in prev if k not in cur]
+    if removed:
+        cell["x"] = removed
+    return cell
+
+
+def _apply(prev: Any, cell: dict[str, Any]) -> Any:
+    if "f" in cell:
+        return cell["f"]
+    result = dict(prev)
+    for key in cell.get("x", ()):
+        result.pop(key, None)
+    result.update(cell["d"])
+    return result
+
+
+def encode(records: list[dict]) -> tuple[str, bytes]:
+    """Return ``(codec, blob)`` for *records*."""
+    ts: list[Any] = []
+    actions: list[Any] = []
+    params: list[Any] = []
+    results: list[Any] = []
+    extra: list[Any] = []
+    # Which of the four columns each record actually carries, as a bitmask,
+    # so a record without e.g. ``params`` does not come back with a null.
+    present: list[int] = []
+    prev_result: Any = None
+    for record in records:
+        mask = 0
+        for bit, name in enumerate(_COLUMNS):
+            if name in record:
+                mask |= 1 << bit
+        present.append(mask)
+        ts.append(record.get("ts"))
+        actions.append(record.get("action"))
+        params.append(record.get("params"))
+        result = record.get("result", _MISSING)
+        if result is _MISSING:
+            results.append(None)
+        else:
+            results.append(_delta(prev_result, result))
+            prev_result = result
+        rest = {k: v for k, v in record.items() if k not in _COLUMNS}
+        extra.append(rest or None)
+    doc = {
+        "n": len(records),
+        "present": present,
+        "ts": ts,
+        "action": actions,
+        "params": params,
+        "result": results,
+        "extra": extra,
+    }
+    raw = json.dumps(doc, separators=(",", ":"), ensure_ascii=False)
+    return CODEC_COLUMNAR_ZLIB, zlib.compress(raw.encode("utf-8"), 9)
+
+
+def decode(codec: str, blob: bytes) -> list[dict]:
+    """Inverse of :func:`encode` (and of the migration's v0 writer).
+
+    Raises ``ValueError`` for an unknown codec or a corrupt blob; callers
+    decide whether a report without its audit trail is still worth
+    rendering.
+    """
+    try:
+        raw = zlib.decompress(blob).decode("utf-8")
+        doc = json.loads(raw)
+    except (zlib.error, UnicodeDecodeError) as exc:
+        raise ValueError(f"corrupt audit blob: {exc}") from exc
+    if codec == CODEC_JSON_ZLIB:
+        if not isinstance(doc, list):
+            raise ValueError("json-zlib-v0 audit blob is not a list")
+        return [r for r in doc if isinstance(r, dict)]
+    if codec != CODEC_COLUMNAR_ZLIB:
+        raise ValueError(f"unknown audit codec {codec!r}")
+    try:
+        n = int(doc["n"])
+        columns = {name: doc[name] for name in _COLUMNS}
+        present = doc["present"]
+        extra = doc["extra"]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"malformed audit blob: {exc}") from exc
+    records: list[dict] = []
+    prev_result: Any = None
+    # Columns shorter than ``n``, a non-integer mask or a malformed delta
+    # cell surface here; all of them mean the same thing to a caller.
+    try:
+        for i in range(n):
+            record: dict[str, Any] = {}
+            mask = present[i]
+            for bit, name in enumerate(_COLUMNS):
+                if not mask & (1 << bit):
+                    continue
+                if name == "result":
+                    prev_result = _apply(prev_result, columns["result"][i])
+                    record["result"] = prev_result
+                else:
+                    record[name] = columns[name][i]
+            if extra[i]:
+                record.update(extra[i])
+            records.append(record)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as exc:
+        raise ValueError("corrupt audit blob") from exc
+    return records
@@ -0,0 +1,271 @@
+"""Sidecar record index for the per-OID audit log segments.
+
+Every audit segment — the active ``audit_<hash>.jsonl`` and each rotated
+``audit_<hash>.jsonl.N`` — gets a companion ``<segment>.idx`` holding one
+fixed-size binary entry per well-formed JSON line::
+
+    offset  u64   byte offset of the line inside the segment
+    length  u32   byte length of the line (without the newline)
+    ts      f64   record ``ts`` (NaN when absent / non-numeric)
+    ref_ts  f64   tombstone ``ref_ts`` (NaN for non-tombstones)
+    kind    u8    bit flags: undo / pop tombstone / restore tombstone
+    action  u8    small code for the undoable actions, 0 for anything else
+    team    u8    ``params.team`` when it is 1..255, else 0
+
+That is enough to answer "which records are visible" (the tombstone
+bitmap), "which one is the last undoable forward" and "where are the
+newest N records" without parsing a single JSON document. Cold-start
+callers in :mod:`app.api.action_log` seek straight to the lines they need
+instead of re-reading every rotated file.
+
+The index is *derived* data and never authoritative. :func:`load`
+validates it against the segment (size coverage plus a spot check of the
+last indexed line) and re-indexes whatever it cannot vouch for, so a
+missing, torn or misaligned ``.idx`` — crash between the line write and
+the entry write, an interrupted rotation, an upgrade from a tree without
+indexes — costs one scan of that segment and is then repaired on disk.
+
+All helpers expect the caller to hold ``action_log._lock_for(oid)``. I/O
+failures on the sidecar are logged and swallowed: the JSONL stays the
+source of truth and the read paths fall back to parsing it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import struct
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+
+_ENTRY = struct.Struct("<QIddBBB")
+ENTRY_SIZE = _ENTRY.size
+
+KIND_UNDO = 0x01
+KIND_POP = 0x02
+KIND_RESTORE = 0x04
+KIND_TOMBSTONE = KIND_POP | KIND_RESTORE
+
+# Mirrors ``action_log._POP_TOMBSTONE_ACTION`` / ``_RESTORE_TOMBSTONE_ACTION``.
+# Duplicated rather than imported to keep this module free of an import
+# cycle; ``tests/test_action_log.py`` pins the two in sync.
+POP_ACTION = "_pop"
+RESTORE_ACTION = "_restore"
+
+# Codes for the actions the undo paths filter on. Anything else is stored as
+# ``0`` and resolved by parsing the line when a filter needs the name.
+ACTION_CODES: dict[str, int] = {"add_point": 1, "add_set": 2, "add_timeout": 3}
+ACTION_NAMES: dict[int, str] = {code: name for name, code in ACTION_CODES.items()}
+
+
+class IndexEntry(NamedTuple):
+    offset: int
+    length: int
+    ts: float
+    ref_ts: float
+    kind: int
+    action: int
+    team: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+def index_path(segment_path: str) -> str:
+    """Return the sidecar path for *segment_path*."""
+    return segment_path + INDEX_SUFFIX
+
+
+def _as_float(value: object) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def entry_for(record: dict, offset: int, length: int) -> IndexEntry:
+    """Build the index entry describing *record* written at *offset*."""
+    action = record.get("action")
+    params = record.get("params")
+    if not isinstance(params, dict):
+        params = {}
+    kind = 0
+    if action == POP_ACTION:
+        kind |= KIND_POP
+    elif action == RESTORE_ACTION:
+        kind |= KIND_RESTORE
+    if params.get("undo"):
+        kind |= KIND_UNDO
+    team = params.get("team")
+    if isinstance(team, bool) or not isinstance(team, int) or not 1 <= team <= 255:
+        team = 0
+    return IndexEntry(
+        offset,
+        length,
+        _as_float(record.get("ts")),
+        _as_float(record.get("ref_ts")) if kind & KIND_TOMBSTONE else math.nan,
+        kind,
+        ACTION_CODES.get(action, 0) if isinstance(action, str) else 0,
+        team,
+    )
+
+
+def append_entry(segment_path: str, entry: IndexEntry) -> None:
+    """Append *entry* to the segment's sidecar. Best-effort."""
+    try:
+        with open(index_path(segment_path), "ab") as f:
+            f.write(_ENTRY.pack(*entry))
+    except OSError as exc:
+        # The next ``load`` sees the gap and re-indexes the tail.
+        logger.debug("Failed to append audit index entry for '%s': %s", segment_path, exc)
+
+
+def _read_entries(segment_path: str) -> tuple[list[IndexEntry], bool]:
+    """Return the stored entries and whether the sidecar is entry-aligned."""
+    try:
+        with open(index_path(segment_path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], True
+    # A torn trailing entry (crash mid-write) is dropped here and the file is
+    # reported misaligned so ``load`` rewrites it before anything appends.
+    usable = len(data) - len(data) % ENTRY_SIZE
+    entries = [IndexEntry._make(t) for t in _ENTRY.iter_unpack(data[:usable])]
+    return entries, usable == len(data)
+
+
+def _same_ts(a: float, b: object) -> bool:
+    b = _as_float(b)
+    if math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+
+def read_record(segment_path: str, entry: IndexEntry) -> dict | None:
+    """Parse the single line *entry* points at, or ``None`` if unreadable."""
+    try:
+        with open(segment_path, "rb") as f:
+            f.seek(entry.offset)
+            raw = f.read(entry.length)
+        record = json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def read_records(segment_path: str, entries: list[IndexEntry]) -> list[dict] | None:
+    """Parse the lines for *entries* (ascending offsets) with one open.
+
+    Returns ``None`` when any line fails to decode or no longer matches its
+    entry, so the caller can fall back to a full parse rather than serve a
+    view that disagrees with the file.
+    """
+    out: list[dict] = []
+    try:
+        with open(segment_path, "rb") as f:
+            for entry in entries:
+                f.seek(entry.offset)
+                record = json.loads(f.read(entry.length))
+                if not isinstance(record, dict) or not _same_ts(entry.ts, record.get("ts")):
+                    return None
+                out.append(record)
+    except (OSError, ValueError):
+        return None
+    return out
+
+
+def _scan(segment_path: str, start: int) -> list[IndexEntry]:
+    """Index every well-formed JSON line of *segment_path* from *start* on.
+
+    Mirrors ``action_log._read_one_file_locked``: blank and malformed lines
+    are skipped, so a torn tail is simply not indexed.
+    """
+    entries: list[IndexEntry] = []
+    with open(segment_path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            line_start = offset
+            offset += len(raw)
+            stripped = raw.rstrip(b"\r\n")
+            if not stripped.strip():
+                continue
+            try:
+                record = json.loads(stripped)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                entries.append(entry_for(record, line_start, len(stripped)))
+    return entries
+
+
+def _rewrite(segment_path: str, entries: list[IndexEntry]) -> None:
+    try:
+        with open(index_path(segment_path), "wb") as f:
+            f.write(b"".join(_ENTRY.pack(*e) for e in entries))
+    except OSError as exc:
+        logger.debug("Failed to rewrite audit index for '%s': %s", segment_path, exc)
+
+
+def load(segment_path: str) -> list[IndexEntry]:
+    """Return a validated index for *segment_path*, repairing it on disk.
+
+    The stored index is trusted up to its last entry when that entry ends
+    inside the segment and still points at a line carrying the same ``ts``.
+    Anything after it is scanned and appended; an index that fails the check
+    (stale after an interrupted rotation, pointing past EOF) is rebuilt from
+    scratch. Raises ``OSError`` only when the segment itself is unreadable.
+    """
+    size = os.path.getsize(segment_path)
+    entries, aligned = _read_entries(segment_path)
+    if entries:
+        last = entries[-1]
+        record = read_record(segment_path, last) if last.end <= size else None
+        if record is None or not _same_ts(last.ts, record.get("ts")):
+            entries, aligned = [], False
+    covered = entries[-1].end if entries else 0
+    tail = _scan(segment_path, covered) if covered < size else []
+    if not aligned:
+        entries.extend(tail)
+        _rewrite(segment_path, entries)
+    elif tail:
+        try:
+            with open(index_path(segment_path), "ab") as f:
+                f.write(b"".join(_ENTRY.pack(*e) for e in tail))
+        except OSError as exc:
+            logger.debug("Failed to extend audit index for '%s': %s", segment_path, exc)
+        entries.extend(tail)
+    return entries
+
+
+def remove(segment_path: str) -> None:
+    """Delete the sidecar for *segment_path* if present."""
+    try:
+        os.remove(index_path(segment_path))
+    except FileNotFoundError:
+        pass
+    except OSError as exc:
+        logger.warning("Failed to remove audit index for '%s': %s", segment_path, exc)
+
+
+def move(src_segment: str, dst_segment: str) -> None:
+    """Rename the sidecar alongside a segment rename.
+
+    A failure leaves a sidecar that no longer matches its segment; ``load``
+    detects that and rebuilds, so this never raises.
+    """
+    try:
+        os.replace(index_path(src_segment), index_path(dst_segment))
+    except FileNotFoundError:
+        remove(dst_segment)
+    except OSError as exc:
+        logger.warning(
+            "Failed to move audit index '%s' -> '%s': %s",
+            src_segment, dst_segment, exc,
+        )
+        remove(dst_segment)
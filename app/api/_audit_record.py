@@ -0,0 +1,180 @@
+"""Compact in-memory form of one audit-log record.
+
+:mod:`app.api.action_log` keeps every OID's parsed records in its
+``_raw_cache`` so that a scored point costs one append rather than a full
+reparse. As plain dicts, that cache is most of a live court's memory. Each
+record has a top-level dict, a ``params`` dict and a ``result`` snapshot
+that is itself three dicts. With per-object overhead that comes to about a
+kilobyte per point. A long five-set match with scouting tags has thousands
+of records per court, and a 1 GB box serves dozens of courts.
+
+:class:`CompactRecord` holds the same record in a single ``__slots__``
+object:
+
+* ``ts`` and ``action`` are plain attributes. The action string is
+  interned, so every ``add_point`` shares one object.
+* ``params`` is kept as compact JSON bytes and decoded on each access.
+  Inside ``action_log``, only the undo filters look at params.
+* ``result`` is packed into a fixed-layout struct when it has the exact
+  shape that :func:`app.api.game_audit_hooks.audit` writes. Sets, scores
+  and timeouts are stored as signed 16-bit integers and the serve value as
+  trailing UTF-8. Any other shape falls back to compact JSON bytes.
+* Any other top-level key goes into a small ``extra`` dict. That covers
+  ``ref_ts`` on tombstones and fields written by older trees.
+
+:meth:`CompactRecord.to_dict` rebuilds a record equal to the one that was
+compacted. Code outside ``action_log`` (``GET /audit``, the match archive,
+the report export, live stats) therefore keeps seeing the JSON shape.
+Values go through JSON on the way in, just as they do on the way to disk,
+so a warm read and a cold read of the same log return equal records.
+:meth:`CompactRecord.get` mirrors ``dict.get`` for the top-level keys, so
+the tombstone and undo filters work on either form.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from typing import Any
+
+_MISSING: Any = object()
+
+# Leading byte that marks a packed ``result``. A JSON document never starts
+# with a NUL byte, so the two encodings cannot be confused.
+_PACKED_TAG = b"\x00"
+# current_set, score_set, match_finished, then sets / score / timeouts for
+# team 1 and team 2. The serve value follows as UTF-8.
+_RESULT = struct.Struct("<hh?hhhhhh")
+_RESULT_KEYS = frozenset(
+    ("current_set", "score_set", "match_finished", "team_1", "team_2", "serve"),
+)
+_TEAM_KEYS = frozenset(("sets", "score", "timeouts"))
+_INT16_MIN = -(1 << 15)
+_INT16_MAX = (1 << 15) - 1
+
+_EMPTY_PARAMS = b"{}"
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _is_int16(value: Any) -> bool:
+    return type(value) is int and _INT16_MIN <= value <= _INT16_MAX
+
+
+def _team_fields(team: Any) -> tuple[int, int, int] | None:
+    if not isinstance(team, dict) or team.keys() != _TEAM_KEYS:
+        return None
+    sets, score, timeouts = team["sets"], team["score"], team["timeouts"]
+    if not (_is_int16(sets) and _is_int16(score) and _is_int16(timeouts)):
+        return None
+    return sets, score, timeouts
+
+
+def _pack_result(result: Any) -> bytes:
+    """Encode *result* as the fixed struct when possible, else as JSON."""
+    if isinstance(result, dict) and result.keys() == _RESULT_KEYS:
+        team_1 = _team_fields(result["team_1"])
+        team_2 = _team_fields(result["team_2"])
+        current_set = result["current_set"]
+        score_set = result["score_set"]
+        finished = result["match_finished"]
+        serve = result["serve"]
+        if (
+            team_1 is not None
+            and team_2 is not None
+            and _is_int16(current_set)
+            and _is_int16(score_set)
+            and type(finished) is bool
+            and isinstance(serve, str)
+        ):
+            return (
+                _PACKED_TAG
+                + _RESULT.pack(current_set, score_set, finished, *team_1, *team_2)
+                + serve.encode("utf-8")
+            )
+    return _dumps(result)
+
+
+def _unpack_result(data: bytes) -> Any:
+    if not data.startswith(_PACKED_TAG):
+        return json.loads(data)
+    end = 1 + _RESULT.size
+    (current_set, score_set, finished,
+     s1, p1, t1, s2, p2, t2) = _RESULT.unpack(data[1:end])
+    return {
+        "current_set": current_set,
+        "score_set": score_set,
+        "match_finished": finished,
+        "team_1": {"sets": s1, "score": p1, "timeouts": t1},
+        "team_2": {"sets": s2, "score": p2, "timeouts": t2},
+        "serve": data[end:].decode("utf-8"),
+    }
+
+
+class CompactRecord:
+    """One audit record in the cache's compact layout. Treat as immutable."""
+
+    __slots__ = ("_extra", "_params", "_result", "action", "ts")
+
+    def __init__(self, record: dict) -> None:
+        self.ts: Any = record.get("ts", _MISSING)
+        action = record.get("action", _MISSING)
+        self.action: Any = sys.intern(action) if type(action) is str else action
+        params = record.get("params", _MISSING)
+        if params is _MISSING:
+            self._params: bytes | None = None
+        elif isinstance(params, dict) and not params:
+            self._params = _EMPTY_PARAMS
+        else:
+            self._params = _dumps(params)
+        result = record.get("result", _MISSING)
+        self._result: bytes | None = None if result is _MISSING else _pack_result(result)
+        extra = {
+            k: v for k, v in record.items()
+            if k not in ("ts", "action", "params", "result")
+        }
+        self._extra: dict | None = json.loads(_dumps(extra)) if extra else None
+
+    @property
+    def params(self) -> Any:
+        """The decoded ``params``, or ``None`` when the record has none."""
+        return None if self._params is None else json.loads(self._params)
+
+    @property
+    def result(self) -> Any:
+        """The decoded ``result``, or ``None`` when the record has none."""
+        return None if self._result is None else _unpack_result(self._result)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """``dict.get`` over the record's top-level keys."""
+        if key == "ts":
+            value = self.ts
+        elif key == "action":
+            value = self.action
+        elif key == "params":
+            value = _MISSING if self._params is None else self.params
+        elif key == "result":
+            value = _MISSING if self._result is None else self.result
+        elif self._extra is not None:
+            value = self._extra.get(key, _MISSING)
+        else:
+            value = _MISSING
+        return default if value is _MISSING else value
+
+    def to_dict(self) -> dict:
+        """A fresh dict equal to the record this was built from."""
+        record: dict = {}
+        if self.ts is not _MISSING:
+            record["ts"] = self.ts
+        if self.action is not _MISSING:
+            record["action"] = self.action
+        if self._params is not None:
+            record["params"] = self.params
+        if self._result is not None:
+            record["result"] = self.result
+        if self._extra is not None:
+            record.update(json.loads(_dumps(self._extra)))
+        return record
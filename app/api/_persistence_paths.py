@@ -64,13 +64,25 @@ def overlay_hashed_path(
     return os.path.join(directory, hashed_filename(prefix, value, suffix))
 
 
-def atomic_write_json(path: str, payload: Any, *, ensure_ascii: bool = True) -> None:
+def atomic_write_json(
+    path: str,
+    payload: Any,
+    *,
+    ensure_ascii: bool = True,
+    fsync: bool = False,
+) -> None:
     """Atomically write *payload* as JSON to *path*.
 
     Creates the parent directory if needed, writes via ``mkstemp`` in
     the same directory (so ``os.replace`` is atomic across the rename),
     and unlinks the temp file on any exception before re-raising. The
     caller decides how to log/swallow exceptions.
+
+    With ``fsync=True`` the temp file's data is flushed to stable storage
+    before the rename, so a power cut can leave the old document or the new
+    one but never a renamed-but-empty file. Making the rename itself durable
+    is a directory fsync (:func:`fsync_directory`), which batch writers
+    issue once per batch rather than once per file.
     """
     parent = os.path.dirname(path)
     os.makedirs(parent, exist_ok=True)
@@ -78,6 +90,9 @@ def atomic_write_json(path: str, payload: Any, *, ensure_ascii: bool = True) ->
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=ensure_ascii)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
         os.replace(tmp_path, path)
     except BaseException:
         try:
@@ -85,3 +100,19 @@ def atomic_write_json(path: str, payload: Any, *, ensure_ascii: bool = True) ->
         except OSError:
             pass
         raise
+
+
+def fsync_directory(path: str) -> None:
+    """Flush directory *path*'s entries (renames, creates) to stable storage.
+
+    No-op where directories cannot be opened for fsync (Windows). Raises
+    ``OSError`` like the rest of this module's writers.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except (PermissionError, IsADirectoryError):
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -30,6 +30,16 @@ tombstones and the records they reference. The file is truncated by
 ``clear`` at match-end, so tombstone churn does not accumulate
 across matches.
 
+Each segment (the active file and every rotated one) carries a binary
+sidecar index — see :mod:`app.api._audit_index` — with the offset,
+``ts``, tombstone flags and undo-relevant fields of every record. When
+the parsed-record cache is cold (after a restart, or once a retired
+session evicted it), ``read_recent``, ``peek_last_forward``,
+``pop_last_forward`` and ``count_undoable_forwards`` resolve visibility
+from the index alone and seek to the handful of lines they return,
+instead of re-parsing up to ``AUDIT_LOG_MAX_BYTES * AUDIT_LOG_MAX_FILES``
+of JSON.
+
 All I/O is best-effort: failures are logged but never propagate so a
 broken filesystem cannot wedge a live match.
 """
@@ -45,9 +55,12 @@ import time
 from collections.abc import Callable
 from collections.abc import Set as AbstractSet
 
+from app.api import _audit_index
+from app.api._audit_record import CompactRecord
 from app.api._persistence_paths import data_dir as _data_dir
 from app.api._persistence_paths import overlay_hashed_path
 from app.constants import AUDIT_LOG_MAX_BYTES, AUDIT_LOG_MAX_FILES
+from app.spans import STAGE_AUDIT_APPEND, span
 
 logger = logging.getLogger(__name__)
 
@@ -116,9 +129,12 @@ _version_per_oid: dict[str, int] = {}
 # now fold the record they just wrote into this cache, so the steady-state
 # cost of a point is one line appended to a file instead of a full reparse.
 #
-# Records are cached as the parsed dicts themselves, shared with callers, so
-# consumers must treat both the list and its records as read-only.
-_raw_cache: dict[str, tuple[int, list[dict]]] = {}
+# Records are cached as :class:`CompactRecord` objects, not parsed dicts. The
+# dict form of a scored point (top-level dict, params dict and a three-dict
+# ``result`` snapshot) is several times larger, and this cache holds every
+# record of every live court. The public read functions rebuild dicts at the
+# boundary, so callers get fresh records they are free to keep or mutate.
+_raw_cache: dict[str, tuple[int, list[CompactRecord]]] = {}
 
 
 # Optional sink for mutation notifications, installed by
@@ -147,6 +163,28 @@ EVENT_APPEND = "append"
 EVENT_INVALIDATE = "invalidate"
 
 
+# In-process listeners for derived state that must follow every mutation
+# whether or not the WebSocket bridge is installed — :mod:`app.api.live_stats`
+# folds appends into its per-OID accumulators through this. Same contract and
+# the same "outside the lock, never raises" delivery as the observer; kept as
+# a separate tuple so ``set_observer`` stays the single-slot, last-writer-wins
+# hook the bridge and its tests rely on.
+_listeners: tuple[AuditObserver, ...] = ()
+
+
+def add_listener(listener: AuditObserver) -> None:
+    """Register an in-process mutation listener. Idempotent."""
+    global _listeners
+    if listener not in _listeners:
+        _listeners = (*_listeners, listener)
+
+
+def remove_listener(listener: AuditObserver) -> None:
+    """Unregister a listener added with :func:`add_listener`. Idempotent."""
+    global _listeners
+    _listeners = tuple(fn for fn in _listeners if fn != listener)
+
+
 def set_observer(observer: AuditObserver | None) -> None:
     """Install (or with ``None``, remove) the mutation observer.
 
@@ -169,6 +207,11 @@ def _notify(oid: str, event: str, version: int, record: dict | None = None) -> N
     per-OID write lock across it would let one slow client stall the next
     scored point.
     """
+    for listener in _listeners:
+        try:
+            listener(oid, event, version, record)
+        except Exception as exc:
+            logger.warning("Audit listener failed for %r: %s", oid, exc)
     observer = _observer
     if observer is None:
         return
@@ -200,7 +243,7 @@ def _commit_append_locked(oid: str, record: dict) -> None:
     was_fresh = entry is not None and entry[0] == _version_per_oid.get(oid, 0)
     _bump_version(oid)
     if was_fresh and entry is not None:
-        entry[1].append(record)
+        entry[1].append(CompactRecord(record))
         _raw_cache[oid] = (_version_per_oid[oid], entry[1])
     else:
         _raw_cache.pop(oid, None)
@@ -246,6 +289,17 @@ def version(oid: str) -> int:
     return _version_per_oid.get(oid, 0)
 
 
+def last_ts(oid: str) -> float | None:
+    """Timestamp of the newest record this process wrote for *oid*, if any.
+
+    A bound for "the log as it stands now": every record appended later
+    carries a larger ``ts`` (see :func:`_next_ts`). ``None`` when nothing
+    has been written for *oid* since the process started or the log was
+    cleared.
+    """
+    return _last_ts_per_oid.get(oid)
+
+
 def _next_ts(oid: str) -> float:
     """Return a per-OID strictly-monotonic timestamp.
 
@@ -343,6 +397,7 @@ def _rotate_if_needed_locked(path: str) -> bool:
             except OSError as exc:
                 logger.warning("Failed to truncate oversized audit '%s': %s", path, exc)
                 return False
+            _audit_index.remove(path)
             return True
         return False
     try:
@@ -359,6 +414,7 @@ def _rotate_if_needed_locked(path: str) -> bool:
         pass
     except OSError as exc:
         logger.warning("Failed to drop oldest rotated audit '%s': %s", oldest, exc)
+    _audit_index.remove(oldest)
     # Shift .{i} -> .{i+1} from oldest survivor down so renames never
     # overwrite an existing file (.replace would, but the explicit walk
     # makes the intent obvious in the dominator code path).
@@ -368,6 +424,7 @@ def _rotate_if_needed_locked(path: str) -> bool:
         if os.path.exists(src):
             try:
                 os.replace(src, dst)
+                _audit_index.move(src, dst)
             except OSError as exc:
                 logger.warning(
                     "Failed to shift rotated audit '%s' -> '%s': %s",
@@ -379,11 +436,38 @@ def _rotate_if_needed_locked(path: str) -> bool:
     # Active -> .1.
     try:
         os.replace(path, _rotated_path(path, 1))
+        _audit_index.move(path, _rotated_path(path, 1))
     except OSError as exc:
         logger.warning("Failed to rotate active audit '%s': %s", path, exc)
     return True
 
 
+def _write_record_locked(path: str, record: dict) -> None:
+    """Append *record* as one JSON line to the active file and index it.
+
+    Caller holds ``_lock_for(oid)``. The file is opened in binary append
+    mode so the offset handed to the sidecar index is the exact byte
+    position of the line. A log whose last line was torn by a crash (no
+    trailing newline) first gets the newline it is missing, so the torn
+    fragment stays a malformed line of its own instead of swallowing this
+    record — both the full parse and the index then see the record intact.
+    """
+    data = json.dumps(
+        record, separators=(",", ":"), ensure_ascii=False,
+    ).encode("utf-8")
+    with open(path, "a+b") as f:
+        offset = f.seek(0, os.SEEK_END)
+        if offset:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+                offset += 1
+        f.write(data + b"\n")
+    _audit_index.append_entry(
+        path, _audit_index.entry_for(record, offset, len(data)),
+    )
+
+
 def _append_log_line(
     oid: str, body: dict, error_msg: str, event: str = EVENT_INVALIDATE,
 ) -> dict | None:
@@ -422,11 +506,7 @@ def _append_log_line(
                 # cached records no longer match what is on disk.
                 _cache_drop_locked(oid)
             record = {"ts": _next_ts(oid), **body}
-            line = json.dumps(
-                record, separators=(",", ":"), ensure_ascii=False,
-            ) + "\n"
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(line)
+            _write_record_locked(path, record)
             _commit_append_locked(oid, record)
             new_version = _version_per_oid[oid]
     except Exception as exc:
@@ -455,12 +535,15 @@ def append(oid: str, action: str, params: dict, result: dict) -> dict | None:
     bookkeeping (e.g. the rapid-pair cache) read it from the
     returned dict.
     """
-    return _append_log_line(
-        oid,
-        {"action": action, "params": params, "result": result},
-        "Failed to append audit log for %r: %s",
-        event=EVENT_APPEND,
-    )
+    # The span includes the listeners, which fold the record into the
+    # live-stats accumulator.
+    with span(STAGE_AUDIT_APPEND):
+        return _append_log_line(
+            oid,
+            {"action": action, "params": params, "result": result},
+            "Failed to append audit log for %r: %s",
+            event=EVENT_APPEND,
+        )
 
 
 def _read_one_file_locked(path: str, oid: str) -> list[dict]:
@@ -481,7 +564,20 @@ def _read_one_file_locked(path: str, oid: str) -> list[dict]:
     return records
 
 
-def _read_raw_locked(path: str, oid: str) -> list[dict]:
+def _fresh_cache_locked(oid: str) -> list[CompactRecord] | None:
+    """Return the cached raw records when current, else ``None``.
+
+    Caller holds ``_lock_for(oid)``. The index-backed paths below only
+    run when this is ``None``: a warm cache already answers every read
+    without touching disk.
+    """
+    entry = _raw_cache.get(oid)
+    if entry is not None and entry[0] == _version_per_oid.get(oid, 0):
+        return entry[1]
+    return None
+
+
+def _read_raw_locked(path: str, oid: str) -> list[CompactRecord]:
     """Read every JSON line in the OID's full log, oldest first.
 
     Walks ``audit_<hash>.jsonl.{N-1}`` down to ``.1`` and finally the
@@ -494,19 +590,133 @@ def _read_raw_locked(path: str, oid: str) -> list[dict]:
     Served from the parsed-record cache when that cache is current for
     the OID's version, which is the steady state during a live match.
     The returned list is the cached list itself — callers must not
-    mutate it (``read_all`` copies before handing it out).
+    mutate it, and must go through :meth:`CompactRecord.to_dict` before
+    a record leaves the module.
     """
-    entry = _raw_cache.get(oid)
-    if entry is not None and entry[0] == _version_per_oid.get(oid, 0):
-        return entry[1]
-    records: list[dict] = []
+    cached = _fresh_cache_locked(oid)
+    if cached is not None:
+        return cached
+    records: list[CompactRecord] = []
     for p in _iter_log_paths_oldest_first(path):
-        records.extend(_read_one_file_locked(p, oid))
+        records.extend(CompactRecord(r) for r in _read_one_file_locked(p, oid))
     _raw_cache[oid] = (_version_per_oid.get(oid, 0), records)
     return records
 
 
-def _apply_tombstones(raw: list[dict]) -> list[dict]:
+IndexedRecord = tuple[str, _audit_index.IndexEntry]
+
+
+def _visible_index_locked(path: str) -> list[IndexedRecord]:
+    """Tombstone-filtered ``(segment, entry)`` pairs, oldest first.
+
+    The index-only twin of ``_apply_tombstones(_read_raw_locked(...))``:
+    same document-order pop/restore semantics, but computed from the
+    sidecar entries so no JSON is parsed. Caller holds ``_lock_for(oid)``.
+    """
+    entries: list[IndexedRecord] = []
+    for segment in _iter_log_paths_oldest_first(path):
+        entries.extend((segment, e) for e in _audit_index.load(segment))
+    tombstoned_ts: set[float] = set()
+    has_tombstone = False
+    for _, e in entries:
+        if e.kind & _audit_index.KIND_POP:
+            has_tombstone = True
+            if e.ref_ts == e.ref_ts:  # NaN: tombstone without a reference
+                tombstoned_ts.add(e.ref_ts)
+        elif e.kind & _audit_index.KIND_RESTORE:
+            has_tombstone = True
+            tombstoned_ts.discard(e.ref_ts)
+    if not has_tombstone:
+        return entries
+    return [
+        (segment, e) for segment, e in entries
+        if not e.kind & _audit_index.KIND_TOMBSTONE
+        and e.ts not in tombstoned_ts
+    ]
+
+
+def _read_indexed_locked(picked: list[IndexedRecord]) -> list[dict] | None:
+    """Parse just the lines in *picked*, grouped per segment.
+
+    Returns ``None`` when a line no longer matches its index entry; the
+    caller then falls back to the full parse.
+    """
+    records: list[dict] = []
+    start = 0
+    while start < len(picked):
+        segment = picked[start][0]
+        stop = start
+        while stop < len(picked) and picked[stop][0] == segment:
+            stop += 1
+        chunk = _audit_index.read_records(
+            segment, [e for _, e in picked[start:stop]],
+        )
+        if chunk is None:
+            return None
+        records.extend(chunk)
+        start = stop
+    return records
+
+
+def _entry_may_match(
+    entry: _audit_index.IndexEntry,
+    allowed_actions: AbstractSet[str] | None,
+    team: int | None,
+) -> bool | None:
+    """Decide :func:`_find_last_forward`'s filters from an index entry.
+
+    Returns ``True``/``False`` when the entry alone settles it, or
+    ``None`` when the line has to be parsed (an action outside the
+    indexed codes, or a team the index cannot represent).
+    """
+    if entry.kind & _audit_index.KIND_UNDO:
+        return False
+    undecided = False
+    if allowed_actions is not None:
+        name = _audit_index.ACTION_NAMES.get(entry.action)
+        if name is not None:
+            if name not in allowed_actions:
+                return False
+        elif allowed_actions - _audit_index.ACTION_CODES.keys():
+            undecided = True
+        else:
+            return False
+    if team is not None:
+        if isinstance(team, int) and 1 <= team <= 255:
+            if entry.team != team:
+                return False
+        else:
+            undecided = True
+    return None if undecided else True
+
+
+def _find_last_forward_indexed_locked(
+    path: str,
+    allowed_actions: AbstractSet[str] | None,
+    team: int | None,
+) -> dict | None:
+    """Index-backed :func:`_find_last_forward` over the whole log.
+
+    Walks the visible entries newest first and parses only the candidate
+    lines, so undo on a cold cache costs one index read and (usually) a
+    single ``json.loads`` regardless of match length.
+    """
+    for segment, entry in reversed(_visible_index_locked(path)):
+        decision = _entry_may_match(entry, allowed_actions, team)
+        if decision is False:
+            continue
+        record = _audit_index.read_record(segment, entry)
+        if record is None:
+            continue
+        if decision is None and _find_last_forward(
+            [record], allowed_actions, team,
+        ) is None:
+            continue
+        return record
+    return None
+
+
+def _apply_tombstones[R: (dict, CompactRecord)](raw: list[R]) -> list[R]:
     """Return *raw* with pop tombstones (and their targets) removed.
 
     Tombstone records carry ``action == _POP_TOMBSTONE_ACTION`` and
@@ -521,6 +731,9 @@ def _apply_tombstones(raw: list[dict]) -> list[dict]:
     again. Restores are processed in document order so a later
     ``_pop`` for the same ``ref_ts`` (e.g. a fresh undo of the
     same forward) wins over the prior cancellation.
+
+    Works on parsed dicts and on cached :class:`CompactRecord` objects
+    alike; only top-level keys are consulted.
     """
     tombstoned_ts: set = set()
     has_tombstone = False
@@ -574,21 +787,78 @@ def read_all(oid: str) -> list[dict]:
         return []
     try:
         with _lock_for(oid):
-            return _read_visible_locked(path, oid)
+            return [r.to_dict() for r in _read_visible_locked(path, oid)]
+    except Exception as exc:
+        logger.warning("Failed to read audit log for %r: %s", oid, exc)
+        return []
+
+
+def read_all_with_version(oid: str) -> tuple[list[dict], int | None]:
+    """Return :func:`read_all` plus the version it reflects, atomically.
+
+    For derived state that is rebuilt from the log and then kept current
+    from listener notifications (:mod:`app.api.live_stats`): it needs to
+    know exactly which version its rebuild covers so the next ``append``
+    notification can be recognised as contiguous. Same reasoning as the
+    version returned by :func:`read_page`, including ``None`` on a failed
+    read.
+    """
+    path = _path(oid)
+    if path is None:
+        return [], version(oid)
+    try:
+        with _lock_for(oid):
+            log_version = _version_per_oid.get(oid, 0)
+            records = (
+                [r.to_dict() for r in _read_visible_locked(path, oid)]
+                if _has_any_log_file(path)
+                else []
+            )
+    except Exception as exc:
+        logger.warning("Failed to read audit log for %r: %s", oid, exc)
+        return [], None
+    return records, log_version
+
+
+def read_until(oid: str, until_ts: float) -> list[dict]:
+    """Return :func:`read_all` as the log stood when its newest ``ts`` was *until_ts*.
+
+    Records *and tombstones* written after *until_ts* are dropped before
+    tombstones are resolved, so an undo issued after that moment neither
+    hides the record it popped nor shows up itself. Used by the match
+    archive: the job is enqueued with the log's newest ``ts`` at match
+    end, and the worker may run after the operator has already undone the
+    winning point. Filtering :func:`read_all`'s output by ``ts`` could not
+    bring that point back.
+    """
+    path = _path(oid)
+    if path is None or not _has_any_log_file(path):
+        return []
+    try:
+        with _lock_for(oid):
+            raw = [
+                r for r in _read_raw_locked(path, oid)
+                if (r.ts if isinstance(r.ts, (int, float)) else 0) <= until_ts
+            ]
+            return [r.to_dict() for r in _apply_tombstones(raw)]
     except Exception as exc:
         logger.warning("Failed to read audit log for %r: %s", oid, exc)
         return []
 
 
-def _read_visible_locked(path: str, oid: str) -> list[dict]:
-    """Tombstone-filtered records for *oid*. Caller holds ``_lock_for(oid)``."""
+def _read_visible_locked(path: str, oid: str) -> list[CompactRecord]:
+    """Tombstone-filtered records for *oid*. Caller holds ``_lock_for(oid)``.
+
+    Still in the cache's compact form: callers slice first and call
+    :meth:`CompactRecord.to_dict` only on the records they hand out, so a
+    50-record page of a 5000-record log decodes 50 records, not 5000.
+    """
     raw = _read_raw_locked(path, oid)
-    filtered = _apply_tombstones(raw)
+    visible = _apply_tombstones(raw)
     # ``_apply_tombstones`` returns ``raw`` itself when there is nothing to
-    # filter, and ``raw`` may be the cached list — copy so a caller cannot
-    # mutate the cache out from under us. This is a pointer copy, far
-    # cheaper than re-reading the log.
-    return list(filtered)
+    # filter, and ``raw`` may be the cached list — copy it (a pointer copy)
+    # so a later append cannot grow the list a caller is still slicing.
+    return list(raw) if visible is raw else visible
 
 
 def read_page(
@@ -676,15 +946,36 @@ def read_page(
     page = records[-limit:]
     has_more = len(records) > len(page)
     next_cursor = page[0].get("ts") if (page and has_more) else None
-    return page, next_cursor, log_version
+    return [r.to_dict() for r in page], next_cursor, log_version
 
 
 def read_recent(oid: str, limit: int = 100) -> list[dict]:
-    """Return up to *limit* most-recent records (chronological order)."""
+    """Return up to *limit* most-recent records (chronological order).
+
+    With a warm parsed-record cache this slices the tombstone-filtered
+    compact records and rebuilds dicts for just the *limit* it returns.
+    Cold, it resolves the visible tail from the segment indexes and parses
+    only those *limit* lines, falling back to a full read if the index and
+    a log line disagree.
+    """
     if limit <= 0:
         return []
-    records = read_all(oid)
-    return records[-limit:]
+    path = _path(oid)
+    if path is None or not _has_any_log_file(path):
+        return []
+    try:
+        with _lock_for(oid):
+            if _fresh_cache_locked(oid) is None:
+                records = _read_indexed_locked(
+                    _visible_index_locked(path)[-limit:],
+                )
+                if records is not None:
+                    return records
+            tail = _read_visible_locked(path, oid)[-limit:]
+    except Exception as exc:
+        logger.warning("Failed to read audit tail for %r: %s", oid, exc)
+        return read_all(oid)[-limit:]
+    return [r.to_dict() for r in tail]
 
 
 def _remove_all_log_files_locked(path: str) -> bool:
@@ -700,6 +991,7 @@ def _remove_all_log_files_locked(path: str) -> bool:
             removed = True
         except OSError as exc:
             logger.warning("Failed to remove active audit '%s': %s", path, exc)
+    _audit_index.remove(path)
     for i in range(1, AUDIT_LOG_MAX_FILES):
         rp = _rotated_path(path, i)
         if os.path.exists(rp):
@@ -708,6 +1000,7 @@ def _remove_all_log_files_locked(path: str) -> bool:
                 removed = True
             except OSError as exc:
                 logger.warning("Failed to remove rotated audit '%s': %s", rp, exc)
+        _audit_index.remove(rp)
     return removed
 
 
@@ -757,11 +1050,11 @@ def delete(oid: str) -> bool:
     return removed
 
 
-def _find_last_forward(
-    records: list[dict],
+def _find_last_forward[R: (dict, CompactRecord)](
+    records: list[R],
     allowed_actions: AbstractSet[str] | None = None,
     team: int | None = None,
-) -> dict | None:
+) -> R | None:
     """Walk *records* (already tombstone-filtered) in reverse and
     return the most recent non-undo record matching the filters."""
     for record in reversed(records):
@@ -798,7 +1091,8 @@ def pop_last_forward(
     referencing the target's ``ts``. ``read_all`` filters tombstones
     out, so the popped record is invisible to subsequent reads.
     Avoids the O(N) full-file rewrite the previous implementation
-    performed on every undo.
+    performed on every undo. The target is located from the warm cache
+    when there is one, otherwise from the segment indexes.
 
     Returns ``None`` when no matching forward record exists.
     """
@@ -807,9 +1101,16 @@ def pop_last_forward(
         return None
     try:
         with _lock_for(oid):
-            raw = _read_raw_locked(path, oid)
-            filtered = _apply_tombstones(raw)
-            target = _find_last_forward(filtered, allowed_actions, team)
+            raw = _fresh_cache_locked(oid)
+            if raw is not None:
+                cached = _find_last_forward(
+                    _apply_tombstones(raw), allowed_actions, team,
+                )
+                target = None if cached is None else cached.to_dict()
+            else:
+                target = _find_last_forward_indexed_locked(
+                    path, allowed_actions, team,
+                )
             if target is None:
                 return None
             target_ts = target.get("ts")
@@ -824,16 +1125,12 @@ def pop_last_forward(
                 "action": _POP_TOMBSTONE_ACTION,
                 "ref_ts": target_ts,
             }
-            line = json.dumps(
-                tombstone, separators=(",", ":"), ensure_ascii=False,
-            ) + "\n"
             # The tombstone always lands on the active file; even when
             # the target lives in a rotated archive the read paths
             # (``read_all`` / ``_apply_tombstones``) walk the whole
             # set together, so a forward record in ``.3`` can be
             # cancelled by a tombstone in the active file.
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(line)
+            _write_record_locked(path, tombstone)
             _commit_append_locked(oid, tombstone)
             new_version = _version_per_oid[oid]
     except Exception as exc:
@@ -904,12 +1201,16 @@ def peek_last_forward(
         return None
     try:
         with _lock_for(oid):
-            raw = _read_raw_locked(path, oid)
+            raw = _fresh_cache_locked(oid)
+            if raw is None:
+                return _find_last_forward_indexed_locked(
+                    path, allowed_actions, team,
+                )
     except Exception as exc:
         logger.warning("Failed to peek last forward record for %r: %s", oid, exc)
         return None
-    filtered = _apply_tombstones(raw)
-    return _find_last_forward(filtered, allowed_actions, team)
+    found = _find_last_forward(_apply_tombstones(raw), allowed_actions, team)
+    return None if found is None else found.to_dict()
 
 
 def count_undoable_forwards(oid: str) -> int:
@@ -921,8 +1222,32 @@ def count_undoable_forwards(oid: str) -> int:
     in the log right now".
 
     Used by ``GameSession`` to maintain a cached ``can_undo`` flag
-    without re-reading the file on every state response.
+    without re-reading the file on every state response. Session
+    construction calls this on a cold cache, so that case is answered
+    from the segment indexes without parsing any record.
     """
+    path = _path(oid)
+    if path is None or not _has_any_log_file(path):
+        return 0
+    undoable_codes = {
+        _audit_index.ACTION_CODES[a] for a in UNDOABLE_ACTIONS
+    }
+    try:
+        with _lock_for(oid):
+            if _fresh_cache_locked(oid) is None:
+                return sum(
+                    1 for _, e in _visible_index_locked(path)
+                    if e.action in undoable_codes
+                    and not e.kind & _audit_index.KIND_UNDO
+                )
+            records = _apply_tombstones(_read_raw_locked(path, oid))
+            return sum(
+                1 for r in records
+                if r.action in UNDOABLE_ACTIONS
+                and not (r.params or {}).get("undo")
+            )
+    except Exception as exc:
+        logger.warning("Failed to count undoable records for %r: %s", oid, exc)
     return sum(
         1 for r in read_all(oid)
         if r.get("action") in UNDOABLE_ACTIONS
@@ -0,0 +1,412 @@
+"""Durable background queue for archiving finished matches.
+
+The tap that wins a match used to archive it before answering: re-read the
+whole audit log, encode it, compute the stats snapshot and insert the
+``match_reports`` rows — the slowest request of the match, on the one tap
+the broadcast crew is watching. The finish hook
+(:func:`app.api.game_audit_hooks.archive_if_finished`) now only reserves
+the ``match_id`` (:func:`app.api.match_archive.new_match_id`), captures the
+final state and customization, and hands them to :func:`enqueue`; a
+worker thread does the rest.
+
+Durability. :func:`enqueue` first writes the job to
+``data/archive_queue/<match_id>.json`` (fsynced, then the directory), and
+the file is removed only after the archive transaction commits. A crash
+anywhere in between leaves the file for :func:`recover` to pick up on the
+next start; replaying a job whose insert already committed is a no-op
+because :func:`~app.api.match_archive.archive_match` skips an existing
+``match_id``. A failed attempt is retried ``MATCH_ARCHIVE_RETRY_ATTEMPTS``
+times with doubling delays, then left in the journal for the next start.
+
+Consistency. The job records the newest audit timestamp at match end, so
+whatever the operator does afterwards (an undo, the first points of the
+next match) stays out of the report. Readers never observe the gap:
+:mod:`app.api.match_archive` settles the pending jobs in the scope it is
+about to read or delete (one match, overlay or user) on the calling thread
+(:func:`settle`), a match reset settles its overlay's jobs before it
+clears the audit log, and deleting an overlay's archive drops its pending
+jobs (:func:`discard`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any
+
+from app.api import match_archive
+from app.api._persistence_paths import atomic_write_json, fsync_directory
+from app.api._persistence_paths import data_dir as _shared_data_dir
+from app.constants import MATCH_ARCHIVE_RETRY_ATTEMPTS, MATCH_ARCHIVE_RETRY_SECONDS
+from app.metrics import (
+    record_match_archive_failure,
+    record_match_archive_run,
+    set_match_archive_queue_depth,
+)
+from app.overlay_key import is_valid_skey, split_skey
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".json"
+_RETRY_MAX_SECONDS = 60.0
+
+# Tests drive the queue by hand (``settle`` / ``run_pending``): a worker
+# thread writing through the suite's shared in-memory connection would race
+# the test's own transactions.
+_autostart = True
+
+
+def _data_dir() -> str:
+    # Wrapper kept so tests can monkeypatch this attribute.
+    return _shared_data_dir("archive_queue")
+
+
+@dataclass(slots=True)
+class ArchiveJob:
+    """One finished match waiting to be archived; the journal file's content."""
+
+    match_id: str
+    oid: str
+    ended_at: float
+    final_state: dict[str, Any]
+    customization: dict[str, Any]
+    started_at: float | None = None
+    winning_team: int | None = None
+    points_limit: int | None = None
+    points_limit_last_set: int | None = None
+    sets_limit: int | None = None
+    audit_until: float | None = None
+
+    @classmethod
+    def from_json(cls, raw: object) -> ArchiveJob | None:
+        if not isinstance(raw, dict):
+            return None
+        known = {f.name for f in fields(cls)}
+        try:
+            return cls(**{k: v for k, v in raw.items() if k in known})
+        except TypeError:
+            return None
+
+
+@dataclass(slots=True)
+class _Entry:
+    job: ArchiveJob
+    attempts: int = 0
+    not_before: float = field(default=0.0)
+
+
+def _journal_path(match_id: str) -> str:
+    return os.path.join(_data_dir(), match_id + _SUFFIX)
+
+
+def _retry_delay(attempt: int) -> float:
+    return min(MATCH_ARCHIVE_RETRY_SECONDS * 2 ** (attempt - 1), _RETRY_MAX_SECONDS)
+
+
+class _ArchiveQueue:
+    """Pending jobs by ``match_id``, one worker thread, and inline settling.
+
+    A job is either pending, running (on the worker or a settling reader)
+    or gone; ``_cond`` guards both maps and wakes the worker and anyone
+    waiting for a running job to finish.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: dict[str, _Entry] = {}
+        # Running job ids → their overlay's storage key.
+        self._running: dict[str, str] = {}
+        self._generation = 0
+        self._worker: threading.Thread | None = None
+
+    # -- producers ---------------------------------------------------------
+
+    def enqueue(self, job: ArchiveJob) -> None:
+        """Journal *job* to disk and queue it for the worker."""
+        try:
+            atomic_write_json(_journal_path(job.match_id), asdict(job), fsync=True)
+            fsync_directory(_data_dir())
+        except (OSError, TypeError, ValueError) as exc:
+            # Still archived from memory; only crash safety is lost.
+            logger.warning("Could not journal match %s: %s", job.match_id, exc)
+        with self._cond:
+            self._pending[job.match_id] = _Entry(job)
+            self._publish_locked()
+            self._cond.notify_all()
+        self._ensure_worker()
+
+    def recover(self) -> int:
+        """Queue every journaled job not already known. Returns how many."""
+        try:
+            names = sorted(
+                n for n in os.listdir(_data_dir()) if n.endswith(_SUFFIX)
+            )
+        except FileNotFoundError:
+            return 0
+        except OSError as exc:
+            logger.warning("Could not list the match archive journal: %s", exc)
+            return 0
+        jobs = []
+        for name in names:
+            path = os.path.join(_data_dir(), name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    job = ArchiveJob.from_json(json.load(f))
+            except (OSError, ValueError) as exc:
+                logger.warning("Unreadable match archive journal %s: %s", name, exc)
+                continue
+            if job is None or job.match_id + _SUFFIX != name:
+                logger.warning("Ignoring malformed match archive journal %s", name)
+                continue
+            jobs.append(job)
+        with self._cond:
+            added = 0
+            for job in sorted(jobs, key=lambda j: j.ended_at):
+                if job.match_id in self._pending or job.match_id in self._running:
+                    continue
+                self._pending[job.match_id] = _Entry(job)
+                added += 1
+            self._publish_locked()
+            self._cond.notify_all()
+        if added:
+            logger.info("Recovered %d journaled match archive(s)", added)
+            self._ensure_worker()
+        return added
+
+    # -- consumers ---------------------------------------------------------
+
+    def settle(
+        self,
+        *,
+        match_id: str | None = None,
+        oid: str | None = None,
+        user_id: int | None = None,
+    ) -> None:
+        """Archive the matching pending jobs now, on the calling thread.
+
+        With no filter every pending job matches; readers pass the narrowest
+        scope they query so one user's page never archives everyone else's
+        backlog on its request thread. A job the worker is already running
+        is waited for instead. Each job is attempted at most once per call,
+        so a failing one cannot hold a reader hostage; it stays queued for
+        the worker's retries.
+        """
+
+        def wanted(entry_id: str, job_oid: str) -> bool:
+            if match_id is not None and entry_id != match_id:
+                return False
+            if oid is not None and job_oid != oid:
+                return False
+            return user_id is None or (
+                is_valid_skey(job_oid) and split_skey(job_oid)[0] == user_id
+            )
+
+        tried: set[str] = set()
+        while True:
+            with self._cond:
+                entry = next(
+                    (
+                        e for mid, e in self._pending.items()
+                        if mid not in tried and wanted(mid, e.job.oid)
+                    ),
+                    None,
+                )
+                if entry is None:
+                    if not any(wanted(*item) for item in self._running.items()):
+                        return
+                    self._cond.wait()
+                    continue
+                tried.add(entry.job.match_id)
+                self._claim_locked(entry)
+            self._run(entry)
+
+    def discard(self, oid: str) -> int:
+        """Drop *oid*'s pending jobs and their journal files. Returns how many.
+
+        A job already running is waited for, so the caller's delete that
+        follows also removes whatever it wrote.
+        """
+        with self._cond:
+            while oid in self._running.values():
+                self._cond.wait()
+            dropped = [
+                mid for mid, e in self._pending.items() if e.job.oid == oid
+            ]
+            for mid in dropped:
+                del self._pending[mid]
+            self._publish_locked()
+        for mid in dropped:
+            self._remove_journal(mid)
+        return len(dropped)
+
+    def run_pending(self) -> int:
+        """Archive every pending job now, ignoring retry delays (tests, tools)."""
+        with self._cond:
+            before = len(self._pending)
+        self.settle()
+        with self._cond:
+            return before - len(self._pending)
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def shutdown(self, timeout: float | None = 5.0) -> None:
+        """Stop the worker; whatever is still pending stays in the journal.
+
+        Forgets the in-memory queue too, so the next start (or test)
+        begins from :func:`recover` rather than from stale entries.
+        """
+        with self._cond:
+            self._generation += 1
+            worker, self._worker = self._worker, None
+            self._cond.notify_all()
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        with self._cond:
+            self._pending.clear()
+            self._publish_locked()
+
+    # -- internals ---------------------------------------------------------
+
+    def _claim_locked(self, entry: _Entry) -> None:
+        mid = entry.job.match_id
+        del self._pending[mid]
+        self._running[mid] = entry.job.oid
+
+    def _publish_locked(self) -> None:
+        set_match_archive_queue_depth(len(self._pending) + len(self._running))
+
+    def _ensure_worker(self) -> None:
+        if not _autostart:
+            return
+        with self._cond:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._worker_loop,
+                args=(self._generation,),
+                name="match-archive",
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _next_ready_locked(self) -> tuple[_Entry | None, float | None]:
+        """The first job due now, else how long until the earliest one is."""
+        now = time.monotonic()
+        soonest: float | None = None
+        for entry in self._pending.values():
+            if entry.not_before <= now:
+                return entry, None
+            if entry.not_before == float("inf"):
+                continue
+            wait = entry.not_before - now
+            soonest = wait if soonest is None else min(soonest, wait)
+        return None, soonest
+
+    def _worker_loop(self, generation: int) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if generation != self._generation:
+                        return
+                    entry, wait = self._next_ready_locked()
+                    if entry is not None:
+                        break
+                    self._cond.wait(wait)
+                self._claim_locked(entry)
+            try:
+                self._run(entry)
+            except Exception:
+                logger.exception("Match archive worker failed")
+
+    def _run(self, entry: _Entry) -> None:
+        job = entry.job
+        started = time.monotonic()
+        try:
+            archived = match_archive.archive_match(
+                job.oid,
+                job.final_state,
+                job.customization,
+                started_at=job.started_at,
+                winning_team=job.winning_team,
+                points_limit=job.points_limit,
+                points_limit_last_set=job.points_limit_last_set,
+                sets_limit=job.sets_limit,
+                match_id=job.match_id,
+                ended_at=job.ended_at,
+                audit_until=job.audit_until,
+            ) is not None
+        except Exception:
+            logger.exception("Archiving match %s failed", job.match_id)
+            archived = False
+        record_match_archive_run(time.monotonic() - started)
+        if archived:
+            self._remove_journal(job.match_id)
+        else:
+            record_match_archive_failure()
+            entry.attempts += 1
+            if entry.attempts > MATCH_ARCHIVE_RETRY_ATTEMPTS:
+                # Parked, not dropped: ``settle`` still tries it for a
+                # reader, and the journal keeps it for the next start.
+                entry.not_before = float("inf")
+                logger.warning(
+                    "Match %s not archived after %d attempts; it stays in the "
+                    "journal for the next start",
+                    job.match_id, entry.attempts,
+                )
+            else:
+                entry.not_before = time.monotonic() + _retry_delay(entry.attempts)
+        with self._cond:
+            self._running.pop(job.match_id, None)
+            if not archived:
+                self._pending[job.match_id] = entry
+            self._publish_locked()
+            self._cond.notify_all()
+
+    @staticmethod
+    def _remove_journal(match_id: str) -> None:
+        try:
+            os.unlink(_journal_path(match_id))
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            # Replaying it later is harmless: the insert is idempotent.
+            logger.warning("Could not remove match archive journal %s: %s", match_id, exc)
+
+
+archive_queue = _ArchiveQueue()
+
+
+def enqueue(job: ArchiveJob) -> None:
+    """Journal *job* and archive it in the background."""
+    archive_queue.enqueue(job)
+
+
+def settle(
+    *,
+    match_id: str | None = None,
+    oid: str | None = None,
+    user_id: int | None = None,
+) -> None:
+    """Archive pending jobs (all, one *match_id*'s, *oid*'s or *user_id*'s) now."""
+    archive_queue.settle(match_id=match_id, oid=oid, user_id=user_id)
+
+
+def discard(oid: str) -> int:
+    """Drop *oid*'s pending jobs (its archive is being deleted)."""
+    return archive_queue.discard(oid)
+
+
+def recover() -> int:
+    """Queue the jobs a previous process journaled but never finished."""
+    return archive_queue.recover()
+
+
+def shutdown() -> None:
+    """Stop the worker (lifespan shutdown); pending jobs stay journaled."""
+    archive_queue.shutdown()
@@ -82,10 +82,10 @@ def resolve_board_skey(
     bookmark) → cookie user + ``oid`` (owner).
     """
     if token:
-        overlay = overlays_service.get_by_control_token(db, token)
-        if overlay is None:
+        skey = overlays_service.resolve_control_token(db, token)
+        if skey is None:
             raise HTTPException(status_code=403, detail=_INVALID_LINK)
-        return overlays_service.skey_for(overlay)
+        return skey
 
     if public_user:
         overlay = overlays_service.get_public_by_username_and_oid(db, public_user, oid or "")
@@ -6,7 +6,7 @@ import logging
 import time
 from typing import TYPE_CHECKING, Any, cast
 
-from app.api import action_log
+from app.api import action_log, archive_queue
 from app.api import game_audit_hooks as _audit_hooks
 from app.api import game_broadcast as _broadcast
 from app.api import game_rapid_pair as _rapid_pair
@@ -708,6 +708,9 @@ class GameActions:
         # to zero alongside the log so ``can_undo`` is correct. Run
         # before ``get_state`` so the broadcast that follows carries
         # ``can_undo=False`` instead of the stale pre-reset counter.
+        # A match that just ended may still be waiting in the archive
+        # queue, which reads this log; archive it before the log goes.
+        archive_queue.settle(oid=session.oid)
         action_log.clear(session.oid)
         session.undoable_forward_count = 0
         _service(cls)._audit(session, "reset", {})
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
-from app.api import action_log, match_archive
+from app.api import action_log, archive_queue, match_archive
 from app.api.schemas import GameStateResponse
 from app.api.webhooks import webhook_dispatcher
+from app.spans import STAGE_ARCHIVE_ENQUEUE, STAGE_WEBHOOK_DISPATCH, span
 
 if TYPE_CHECKING:
     from app.api.session_manager import GameSession
@@ -21,7 +23,13 @@ def archive_if_finished(
     winning_team: int,
     state_response: GameStateResponse | None = None,
 ) -> str | None:
-    """Archive the match when it transitions to finished."""
+    """Queue the match for archiving when it transitions to finished.
+
+    Only the cheap part runs here: reserve the ``match_id``, snapshot the
+    final state and customization, and journal them to
+    :mod:`app.api.archive_queue`, whose worker reads the audit log and
+    writes the report rows after the response has gone out.
+    """
     if was_finished_before or not session.game_manager.match_finished(session.sets_limit):
         return None
     try:
@@ -36,20 +44,27 @@ def archive_if_finished(
             from app.api.game_service import GameService
 
             state_response = GameService.get_state(session)
-        final_state = state_response.model_dump()
-        customization = session.customization.get_model()
-        match_id = match_archive.archive_match(
-            oid=session.oid,
-            final_state=final_state,
-            customization=customization,
-            started_at=getattr(session, "match_started_at", None),
-            winning_team=winning_team,
-            points_limit=session.points_limit,
-            points_limit_last_set=session.points_limit_last_set,
-            sets_limit=session.sets_limit,
-        )
+        ended_at = time.time()
+        match_id = match_archive.new_match_id(session.oid, ended_at)
+        if match_id is None:
+            return None
+        with span(STAGE_ARCHIVE_ENQUEUE):
+            archive_queue.enqueue(archive_queue.ArchiveJob(
+                match_id=match_id,
+                oid=session.oid,
+                ended_at=ended_at,
+                final_state=state_response.model_dump(),
+                customization=session.customization.get_model(),
+                started_at=getattr(session, "match_started_at", None),
+                winning_team=winning_team,
+                points_limit=session.points_limit,
+                points_limit_last_set=session.points_limit_last_set,
+                sets_limit=session.sets_limit,
+                audit_until=action_log.last_ts(session.oid),
+            ))
         # Remember it so the control board can link straight to the report
-        # at match end without a separate lookup (see GameStateResponse).
+        # at match end without a separate lookup (see GameStateResponse);
+        # opening the link settles the queue first.
         session.last_match_id = match_id
         session.persist_meta()
         return match_id
@@ -120,12 +135,13 @@ def fire_webhook(
 ) -> None:
     """Fire a webhook event for the current session."""
     try:
-        payload = {
-            "state": state_response.model_dump(),
-            "details": details,
-        }
-        # Webhook consumers key on the human-facing overlay id, not the
-        # internal per-user storage key.
-        webhook_dispatcher.dispatch(event, session.raw_oid, payload)
+        with span(STAGE_WEBHOOK_DISPATCH):
+            payload = {
+                "state": state_response.model_dump(),
+                "details": details,
+            }
+            # Webhook consumers key on the human-facing overlay id, not the
+            # internal per-user storage key.
+            webhook_dispatcher.dispatch(event, session.raw_oid, payload)
     except Exception as exc:
         logger.warning("Webhook dispatch for %s failed: %s", event, exc)
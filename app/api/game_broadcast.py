@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 
 from app.api.schemas import GameStateResponse
 from app.api.ws_hub import WSHub
+from app.spans import STAGE_PERSIST_META, STAGE_WS_BROADCAST, span
 
 if TYPE_CHECKING:
     from app.api.session_manager import GameSession
@@ -17,7 +18,8 @@ def save_and_broadcast(
 ) -> None:
     """Persist state to the overlay backend and notify WS clients."""
     session.game_manager.save(session.simple, session.current_set)
-    session.persist_meta()
+    with span(STAGE_PERSIST_META):
+        session.persist_meta()
     broadcast(session, state_response)
 
 
@@ -33,5 +35,6 @@ def broadcast(
         from app.api.game_service import GameService
 
         state_response = GameService.get_state(session)
-    payload_json = state_response.model_dump_json()
-    WSHub.broadcast_payload_json_sync(session.oid, payload_json)
+    with span(STAGE_WS_BROADCAST):
+        payload_json = state_response.model_dump_json()
+        WSHub.broadcast_payload_json_sync(session.oid, payload_json)
@@ -25,6 +25,7 @@ from app.api.schemas import (
 from app.api.ws_hub import WSHub
 from app.customization_cache_ttl import customization_cache_ttl_seconds
 from app.env_vars_manager import EnvVarsManager
+from app.spans import STAGE_GET_STATE, timed
 from app.state import State
 
 if TYPE_CHECKING:
@@ -173,6 +174,7 @@ class GameStatePresenter:
             state.set_current_serve(desired)
 
     @classmethod
+    @timed(STAGE_GET_STATE)
     def get_state(cls, session: GameSession) -> GameStateResponse:
         """Build a ``GameStateResponse`` from the current session state."""
         t0 = time.perf_counter()
@@ -1,24 +1,34 @@
 """Compute live match statistics from the per-OID audit log.
 
-The :func:`compute_live_stats` helper here is a thin wrapper around the
-post-match :func:`app.match_report_stats._compute_stats` analyzer plus a few
-"running" fields (current streak, recent point timeline) that only make
-sense while a match is still in progress. Keeping both flavours backed
-by the same audit log guarantees the live numbers reconcile with the
-final report when the match ends — no second source of truth to drift.
+:func:`compute_live_stats` returns the same Highlights block as the
+post-match :func:`app.match_report.stats._compute_stats` analyzer plus a
+few "running" fields (current streak, recent point timeline) that only
+make sense while a match is still in progress. Both are derived from the
+same audit log, so the live numbers reconcile with the final report when
+the match ends — no second source of truth to drift.
+
+The payload is maintained incrementally: a per-OID accumulator is built
+once from the full log and then folds each appended record as the
+``action_log`` listener reports it, so a scored point costs O(1) here
+instead of a walk over the whole match. Undos, restores and clears
+change the meaning of records already folded, so they drop the
+accumulator and the next read rebuilds it.
 """
 
 from __future__ import annotations
 
 import threading
+from collections import deque
 from typing import Any
 
 from app.api import action_log
+from app.api.schemas import ERROR_TYPES, POINT_TYPES
 from app.match_report.stats import (
-    _compute_stats,
+    _record_point_tags,
     _result_set,
     _running_score_pair,
 )
+from app.spans import STAGE_LIVE_STATS, timed
 
 
 def _is_undo_record(record: dict[str, Any]) -> bool:
@@ -42,116 +52,381 @@ def _is_undo_record(record: dict[str, Any]) -> bool:
     return bool((record.get("params") or {}).get("undo"))
 
 
-def _current_streak(audit: list[dict[str, Any]]) -> dict[str, Any]:
-    """Length of the trailing run of consecutive add_point's by one team.
+_SERVE_TO_TEAM = {"A": 1, "B": 2}
 
-    A ``set_score`` (manual edit) or a record from a different team
-    breaks the streak. Returns ``{"team": None, "n": 0, "set": None}``
-    when the latest action wasn't a point or the audit is empty.
-    """
-    streak_team: int | None = None
-    streak_n = 0
-    streak_set: int | None = None
-    for r in audit:
-        if _is_undo_record(r):
-            continue
-        action = r.get("action")
-        if action == "set_score":
-            streak_team, streak_n, streak_set = None, 0, None
-            continue
-        if action != "add_point":
-            continue
-        team = (r.get("params") or {}).get("team")
-        if team not in (1, 2):
-            continue
-        set_num = _result_set(r)
-        if team == streak_team:
-            streak_n += 1
-        else:
-            streak_team = team
-            streak_n = 1
-        streak_set = set_num
-    if streak_team is None or streak_n == 0:
-        return {"team": None, "n": 0, "set": None}
-    return {"team": streak_team, "n": streak_n, "set": streak_set}
+# Per-set caps on the bucketed event lists. 60 points covers any indoor or
+# beach set including extreme deuce stretches; FIVB caps timeouts at 2 per
+# team per set, so 20 also tolerates legacy logs. Both protect the
+# broadcast payload from runaway sizes.
+_POINTS_PER_SET_LIMIT = 60
+_TIMEOUTS_PER_SET_LIMIT = 20
 
+# Scoring events retained for ``points_history``. Matches the upper bound
+# of ``GET /matches/live/stats?limit=``; a caller asking for more gets a
+# rebuild whose accumulator retains that many instead of a truncated tail.
+_HISTORY_RETAINED = 200
 
-def _last_point(audit: list[dict[str, Any]]) -> dict[str, Any] | None:
-    """Most recent non-undo ``add_point`` with its classification.
 
-    Returns ``{"team", "set", "point_type", "error_type"}`` for the
-    latest scored point, or ``None`` when no point has been scored yet.
-    ``point_type`` / ``error_type`` are ``None`` when the point was
-    recorded untyped. The audit is already tombstone-filtered, so an
-    undone point never wins the walk; explicit undo records are skipped
-    too. Lets the spectator page surface "how the last point was won".
-    """
-    for r in reversed(audit):
-        if _is_undo_record(r):
-            continue
-        if r.get("action") != "add_point":
-            continue
-        params = r.get("params") or {}
-        team = params.get("team")
-        if team not in (1, 2):
-            continue
-        return {
-            "team": team,
-            "set": _result_set(r),
-            "point_type": params.get("point_type"),
-            "error_type": params.get("error_type"),
-        }
-    return None
+def _event_ts(record: dict[str, Any]) -> float | None:
+    ts = record.get("ts")
+    return float(ts) if isinstance(ts, (int, float)) else None
 
 
-def _scoring_events(audit: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Walk the audit once and return all scoring events as flat dicts.
+def _zero_services() -> dict[int, dict[str, int]]:
+    return {1: {"served": 0, "won": 0}, 2: {"served": 0, "won": 0}}
 
-    Each entry has::
 
-        {"team": 1, "set": 2, "ts": 1714508400.5,
-         "score": [12, 9], "action": "add_point"}
+class _SetTally:
+    """Per-set state behind the :func:`_compute_stats` Highlights fields.
 
-    ``set_score`` (manual override) events are included because they
-    still mutate the visible scoreboard; consumers can render them
-    differently (chip-style "edit" markers). Undo records are filtered
-    via :func:`_is_undo_record` — see its docstring for why the filter
-    is still required even after :func:`action_log.read_all`.
+    ``_compute_stats`` groups records by set before walking them, so every
+    one of its per-set walks (streaks, comebacks, scoring gaps, durations)
+    only ever sees that set's records in append order. Keeping one tally
+    per set and folding each record into its own set reproduces that
+    exactly, even when a manual ``set_score`` edits an earlier set
+    mid-match. The match-wide winners are picked at payload time by
+    walking the tallies in first-appearance order — the same order
+    ``_compute_stats`` iterates its groups in, which is what decides ties.
     """
-    out: list[dict[str, Any]] = []
-    for r in audit:
-        if _is_undo_record(r):
-            continue
-        action = r.get("action")
-        if action not in ("add_point", "set_score"):
-            continue
-        team = (r.get("params") or {}).get("team")
-        if team not in (1, 2):
-            continue
-        pair = _running_score_pair(r)
+
+    __slots__ = (
+        "best_streak_n",
+        "best_streak_team",
+        "comeback",
+        "last_pair",
+        "last_point_ts",
+        "max_gap",
+        "streak_n",
+        "streak_team",
+        "ts_count",
+        "ts_max",
+        "ts_min",
+    )
+
+    def __init__(self) -> None:
+        self.streak_team: Any = None
+        self.streak_n = 0
+        self.best_streak_team: Any = None
+        self.best_streak_n = 0
+        # ``_comeback_extremes`` depends on who eventually wins the set,
+        # which is only known once the set's last record is in. Track the
+        # walk under both hypotheses — [winner_peak_deficit,
+        # loser_peak_deficit, loser_min_after_peak, loser_max_recovery] —
+        # and pick one at payload time.
+        self.comeback: dict[int, list[int]] = {1: [0, 0, 0, 0], 2: [0, 0, 0, 0]}
+        self.last_pair: tuple[int, int] | None = None
+        self.last_point_ts: float | None = None
+        self.max_gap = 0.0
+        self.ts_count = 0
+        self.ts_min = 0.0
+        self.ts_max = 0.0
+
+    def fold(self, record: dict[str, Any]) -> None:
+        ts = _event_ts(record)
+        if ts is not None:
+            if self.ts_count == 0:
+                self.ts_min = self.ts_max = ts
+            else:
+                self.ts_min = min(self.ts_min, ts)
+                self.ts_max = max(self.ts_max, ts)
+            self.ts_count += 1
+
+        if record.get("action") == "add_point":
+            team = (record.get("params") or {}).get("team")
+            if team == self.streak_team:
+                self.streak_n += 1
+            else:
+                self.streak_team, self.streak_n = team, 1
+            if self.streak_n > self.best_streak_n:
+                self.best_streak_team, self.best_streak_n = team, self.streak_n
+            if ts is not None:
+                if self.last_point_ts is not None:
+                    self.max_gap = max(self.max_gap, ts - self.last_point_ts)
+                self.last_point_ts = ts
+        else:
+            self.streak_team, self.streak_n = None, 0
+
+        pair = _running_score_pair(record)
+        self.last_pair = pair
         if pair is None:
-            continue
-        ts = r.get("ts")
-        out.append(
-            {
-                "team": team,
-                "set": _result_set(r),
-                "ts": float(ts) if isinstance(ts, (int, float)) else None,
-                "score": [pair[0], pair[1]],
-                "action": action,
+            return
+        t1, t2 = pair
+        for winner, state in self.comeback.items():
+            winner_deficit = (t2 - t1) if winner == 1 else (t1 - t2)
+            loser_deficit = -winner_deficit
+            if winner_deficit > state[0]:
+                state[0] = winner_deficit
+            if loser_deficit > state[1]:
+                state[1] = state[2] = loser_deficit
+            elif state[1] > 0:
+                # Same clamped "recovery while trailing" rule as
+                # ``_comeback_extremes``.
+                clamped = max(0, loser_deficit)
+                if clamped < state[2]:
+                    state[2] = clamped
+                    state[3] = max(state[3], state[1] - clamped)
+
+
+class _LiveStatsAccumulator:
+    """Running live-stats state for one OID, folded one record at a time.
+
+    Built once from the full tombstone-filtered log, then kept current by
+    :func:`_on_audit_mutation` folding each appended record in O(1), so a
+    scored point no longer re-walks the whole match. ``version`` is the
+    :func:`action_log.version` the state reflects; anything other than
+    the next contiguous append (a tombstone, a restore, a clear, rotation,
+    a missed notification) discards the accumulator and the next read
+    rebuilds it.
+
+    :meth:`fold` must stay equivalent to the batch reducers it replaced —
+    the Highlights fields to :func:`_compute_stats`, which still produces
+    the printed report, so the live numbers keep reconciling with it.
+    ``tests/test_live_stats.py`` pins that equivalence on randomized logs.
+    """
+
+    def __init__(
+        self, version: int, *, history_retained: int = _HISTORY_RETAINED,
+    ) -> None:
+        self.version = version
+        self.history_retained = history_retained
+        self.audit_count = 0
+        self._sets: dict[int, _SetTally] = {}
+        self._total_points = 0
+        self._point_types: dict[int, dict[str, int]] = {
+            1: dict.fromkeys(POINT_TYPES, 0),
+            2: dict.fromkeys(POINT_TYPES, 0),
+        }
+        self._error_types: dict[int, dict[str, int]] = {
+            1: dict.fromkeys(ERROR_TYPES, 0),
+            2: dict.fromkeys(ERROR_TYPES, 0),
+        }
+        self._point_types_by_set: dict[int, dict[int, dict[str, int]]] = {}
+        # Trailing run by one team; only ``set_score`` breaks it.
+        self._current: tuple[Any, int, int | None] = (None, 0, None)
+        # Per-set highlight streak; *any* non-point action breaks it.
+        self._set_streak: tuple[Any, int, int | None] = (None, 0, None)
+        self._longest_by_set: dict[int, dict[int, int]] = {}
+        self._last_point: dict[str, Any] | None = None
+        self._history: deque[dict[str, Any]] = deque(maxlen=history_retained)
+        self._points_by_set: dict[int, list[dict[str, Any]]] = {}
+        self._timeouts_by_set: dict[int, list[dict[str, Any]]] = {}
+        self._prev_post_serve: int | None = None
+        self._services = _zero_services()
+        self._services_by_set: dict[int, dict[int, dict[str, int]]] = {}
+
+    def fold(self, record: dict[str, Any]) -> None:
+        """Apply one visible audit record, in append order."""
+        if _is_undo_record(record):
+            return
+        self.audit_count += 1
+        action = record.get("action")
+        params = record.get("params") or {}
+        team = params.get("team")
+        set_num = _result_set(record)
+        scoring_team = team if team in (1, 2) else None
+
+        if set_num is not None:
+            self._sets.setdefault(set_num, _SetTally()).fold(record)
+            if action == "add_point":
+                self._total_points += 1
+                if scoring_team is not None:
+                    _record_point_tags(
+                        scoring_team, params, set_num,
+                        self._point_types, self._error_types,
+                        self._point_types_by_set,
+                    )
+
+        self._fold_streaks(action, scoring_team, set_num)
+
+        if action == "add_point" and scoring_team is not None:
+            self._last_point = {
+                "team": scoring_team,
+                "set": set_num,
+                "point_type": params.get("point_type"),
+                "error_type": params.get("error_type"),
             }
-        )
-    return out
+        bucket_key = set_num if isinstance(set_num, int) and set_num > 0 else 0
+        if action in ("add_point", "set_score") and scoring_team is not None:
+            pair = _running_score_pair(record)
+            if pair is not None:
+                event = {
+                    "team": scoring_team,
+                    "set": set_num,
+                    "ts": _event_ts(record),
+                    "score": [pair[0], pair[1]],
+                    "action": action,
+                }
+                self._history.append(event)
+                if bucket_key:
+                    points = self._points_by_set.setdefault(bucket_key, [])
+                    if len(points) < _POINTS_PER_SET_LIMIT:
+                        points.append(event)
+        if action == "add_timeout" and scoring_team is not None and bucket_key:
+            timeouts = self._timeouts_by_set.setdefault(bucket_key, [])
+            if len(timeouts) < _TIMEOUTS_PER_SET_LIMIT:
+                timeouts.append({
+                    "team": scoring_team,
+                    "set": set_num,
+                    "ts": _event_ts(record),
+                })
+
+        self._fold_services(action, scoring_team, set_num, record)
+
+    def _fold_streaks(
+        self, action: Any, team: int | None, set_num: int | None,
+    ) -> None:
+        if action == "set_score":
+            self._current = (None, 0, None)
+        elif action == "add_point" and team is not None:
+            cur_team, cur_n, _ = self._current
+            self._current = (team, cur_n + 1 if team == cur_team else 1, set_num)
 
+        if action != "add_point":
+            self._set_streak = (None, 0, None)
+            return
+        if team is None:
+            return
+        streak_team, streak_n, streak_set = self._set_streak
+        if set_num != streak_set or team != streak_team:
+            streak_n = 1
+        else:
+            streak_n += 1
+        self._set_streak = (team, streak_n, set_num)
+        if set_num is None:
+            return
+        best = self._longest_by_set.setdefault(set_num, {1: 0, 2: 0})
+        if streak_n > best[team]:
+            best[team] = streak_n
+
+    def _fold_services(
+        self,
+        action: Any,
+        team: int | None,
+        set_num: int | None,
+        record: dict[str, Any],
+    ) -> None:
+        server = self._prev_post_serve
+        if action == "add_point" and server is not None and team is not None:
+            self._services[server]["served"] += 1
+            if server == team:
+                self._services[server]["won"] += 1
+            if set_num is not None:
+                bucket = self._services_by_set.setdefault(
+                    set_num, _zero_services(),
+                )
+                bucket[server]["served"] += 1
+                if server == team:
+                    bucket[server]["won"] += 1
+        serve = (record.get("result") or {}).get("serve")
+        if isinstance(serve, str) and serve in _SERVE_TO_TEAM:
+            self._prev_post_serve = _SERVE_TO_TEAM[serve]
+
+    def _highlights(self) -> dict[str, Any]:
+        """Match-wide Highlights fields, picked across the set tallies."""
+        longest_streak: dict[str, Any] = {"team": None, "n": 0, "set": None}
+        set_win_comeback: dict[int, dict] = {
+            1: {"deficit": 0, "set": None},
+            2: {"deficit": 0, "set": None},
+        }
+        partial_comeback: dict[int, dict] = {
+            1: {"deficit": 0, "set": None},
+            2: {"deficit": 0, "set": None},
+        }
+        longest_rally: dict[str, Any] = {"duration_s": 0.0, "set": None}
+        set_durations: dict[int, float] = {}
+        for set_num, tally in self._sets.items():
+            if tally.ts_count >= 2:
+                set_durations[set_num] = tally.ts_max - tally.ts_min
+            if tally.best_streak_n > longest_streak["n"]:
+                longest_streak = {
+                    "team": tally.best_streak_team,
+                    "n": tally.best_streak_n,
+                    "set": set_num,
+                }
+            if tally.last_pair is None:
+                continue
+            winner = 1 if tally.last_pair[0] > tally.last_pair[1] else 2
+            loser = 2 if winner == 1 else 1
+            winner_peak_deficit, _, _, loser_max_recovery = tally.comeback[winner]
+            if winner_peak_deficit > set_win_comeback[winner]["deficit"]:
+                set_win_comeback[winner] = {
+                    "deficit": winner_peak_deficit, "set": set_num,
+                }
+            if loser_max_recovery > partial_comeback[loser]["deficit"]:
+                partial_comeback[loser] = {
+                    "deficit": loser_max_recovery, "set": set_num,
+                }
+            if tally.max_gap > longest_rally["duration_s"]:
+                longest_rally = {"duration_s": tally.max_gap, "set": set_num}
+        return {
+            "longest_streak": longest_streak,
+            "set_win_comeback": set_win_comeback,
+            "partial_comeback": partial_comeback,
+            "longest_rally": longest_rally,
+            "set_durations": set_durations,
+        }
 
-def _recent_points(
-    events: list[dict[str, Any]],
-    limit: int,
-) -> list[dict[str, Any]]:
-    """Return the last *limit* scoring events in chronological order."""
-    if limit <= 0:
-        return []
-    return events[-limit:]
+    def payload(self, oid: str, history_limit: int) -> dict[str, Any]:
+        """Build the live-stats payload from the current state.
+
+        Every container is copied: payloads are memoized and handed to
+        several consumers, and must not change under them when the next
+        record is folded in. The event dicts themselves are never mutated
+        after creation, so they are shared.
+        """
+        highlights = self._highlights()
+        streak_team, streak_n, streak_set = self._current
+        history = (
+            list(self._history)[-history_limit:] if history_limit > 0 else []
+        )
+        return {
+            "oid": oid,
+            "audit_count": self.audit_count,
+            "current_streak": (
+                {"team": streak_team, "n": streak_n, "set": streak_set}
+                if streak_team is not None and streak_n
+                else {"team": None, "n": 0, "set": None}
+            ),
+            "longest_streak": highlights["longest_streak"],
+            "set_win_comeback": highlights["set_win_comeback"],
+            "partial_comeback": highlights["partial_comeback"],
+            "longest_rally": highlights["longest_rally"],
+            "total_points": self._total_points,
+            "set_durations": highlights["set_durations"],
+            # Optional per-point classification tallies (opt-in). Always
+            # present (zeroed) so consumers don't need a None check; the
+            # error breakdown is a subset of the ``opp_error`` total.
+            "point_types": {t: dict(c) for t, c in self._point_types.items()},
+            "error_types": {t: dict(c) for t, c in self._error_types.items()},
+            # Per-set point-type tallies so the set-summary recap can scope
+            # the breakdown to the displayed set.
+            "point_types_by_set": {
+                n: {t: dict(c) for t, c in by_team.items()}
+                for n, by_team in self._point_types_by_set.items()
+            },
+            # Classification of the most recent scored point (or ``None``),
+            # used by the spectator page to show how the last point was won.
+            "last_point": dict(self._last_point) if self._last_point else None,
+            "points_history": history,
+            # Used by the spectator page to render past sets on demand.
+            "points_by_set": {n: list(v) for n, v in self._points_by_set.items()},
+            # Per-set timeout events with timestamps so the spectator
+            # chart can render them as markers on the same time axis.
+            "timeouts_by_set": {n: list(v) for n, v in self._timeouts_by_set.items()},
+            # Services-won / services-total per team. The chart caption
+            # uses these to label each side's hold rate.
+            "services": {t: dict(c) for t, c in self._services.items()},
+            # Per-set variants of streak/services so the set-summary
+            # recap can show stats that actually belong to the displayed
+            # set instead of match-wide totals.
+            "longest_streak_by_set": {
+                n: dict(v) for n, v in self._longest_by_set.items()
+            },
+            "services_by_set": {
+                n: {t: dict(c) for t, c in by_team.items()}
+                for n, by_team in self._services_by_set.items()
+            },
+        }
 
 
 def resolve_summary_set_num(
@@ -188,189 +463,6 @@ def resolve_summary_set_num(
     return cs if has_real_points else max(cs - 1, 1)
 
 
-def _points_by_set(
-    events: list[dict[str, Any]],
-    per_set_limit: int,
-) -> dict[int, list[dict[str, Any]]]:
-    """Group scoring events by set number, capped at *per_set_limit* per set.
-
-    Used by the spectator (follow) page to render a navigable score-
-    progression chart per set. Events without a ``set`` field (very
-    old audit records) collapse into bucket ``0`` so the renderer can
-    skip them cleanly.
-    """
-    out: dict[int, list[dict[str, Any]]] = {}
-    for ev in events:
-        set_num = ev.get("set")
-        key = set_num if isinstance(set_num, int) and set_num > 0 else 0
-        bucket = out.setdefault(key, [])
-        if len(bucket) < per_set_limit:
-            bucket.append(ev)
-    out.pop(0, None)
-    return out
-
-
-def _timeouts_by_set(
-    audit: list[dict[str, Any]],
-    per_set_limit: int = 20,
-) -> dict[int, list[dict[str, Any]]]:
-    """Group ``add_timeout`` events by set number with their timestamps.
-
-    Used by the spectator chart to render timeout markers on the
-    same time axis as the points line. Each entry is a flat dict::
-
-        {"team": 1, "set": 2, "ts": 1714508400.5}
-
-    Per-set cap (default 20) protects the broadcast from runaway
-    sizes — FIVB caps timeouts at 2 per team per set, so 20 is
-    a comfortable safety margin that also tolerates legacy logs.
-    """
-    out: dict[int, list[dict[str, Any]]] = {}
-    for r in audit:
-        if _is_undo_record(r):
-            continue
-        if r.get("action") != "add_timeout":
-            continue
-        team = (r.get("params") or {}).get("team")
-        if team not in (1, 2):
-            continue
-        ts = r.get("ts")
-        set_num = _result_set(r)
-        key = set_num if isinstance(set_num, int) and set_num > 0 else 0
-        bucket = out.setdefault(key, [])
-        if len(bucket) < per_set_limit:
-            bucket.append({
-                "team": team,
-                "set": set_num,
-                "ts": float(ts) if isinstance(ts, (int, float)) else None,
-            })
-    out.pop(0, None)
-    return out
-
-
-def _services_summary(
-    audit: list[dict[str, Any]],
-) -> dict[int, dict[str, int]]:
-    """For each team, count rallies served and rallies won-while-serving.
-
-    A "service won" is an ``add_point`` whose scoring team was already
-    serving going into the rally. A "service lost" is a sideout — the
-    serving team gives up the serve to the opponent. We don't know
-    who served the very first rally of the match (no record carries
-    a pre-state serve marker), so that single rally is unattributed.
-    Every subsequent point is fully accounted for from the previous
-    record's ``result.serve`` field, which encodes the *post-action*
-    serve (= the team that will serve the next rally).
-    """
-    out: dict[int, dict[str, int]] = {
-        1: {"served": 0, "won": 0},
-        2: {"served": 0, "won": 0},
-    }
-    prev_post_serve: int | None = None
-    for r in audit:
-        if _is_undo_record(r):
-            continue
-        action = r.get("action")
-        result = r.get("result") or {}
-
-        if action == "add_point" and prev_post_serve in (1, 2):
-            scoring = (r.get("params") or {}).get("team")
-            if scoring in (1, 2):
-                out[prev_post_serve]["served"] += 1
-                if prev_post_serve == scoring:
-                    out[prev_post_serve]["won"] += 1
-
-        serve_str = result.get("serve")
-        if serve_str == "A":
-            prev_post_serve = 1
-        elif serve_str == "B":
-            prev_post_serve = 2
-    return out
-
-
-def _longest_streak_by_set(audit: list[dict[str, Any]]) -> dict[int, dict[int, int]]:
-    """Longest consecutive ``add_point`` run per team in each set.
-
-    The set-summary recap shows the *set's* highlight streak per
-    team, so it needs the per-set breakdown rather than the match-
-    wide :func:`_longest_streak`. A manual ``set_score`` edit or an
-    opposite-team point both break the current run; once broken,
-    we start counting again from 1. Output schema::
-
-        { set_num: { 1: <home_longest>, 2: <away_longest> } }
-    """
-    by_set: dict[int, dict[int, int]] = {}
-    streak_team: int | None = None
-    streak_n = 0
-    streak_set: int | None = None
-    for r in audit:
-        if _is_undo_record(r):
-            continue
-        action = r.get("action")
-        set_num = _result_set(r)
-        # Any non-point action resets the run — including set_score
-        # edits, timeouts, and explicit reset events.
-        if action != "add_point":
-            streak_team, streak_n, streak_set = None, 0, None
-            continue
-        team = (r.get("params") or {}).get("team")
-        if team not in (1, 2):
-            continue
-        # If the set rolled over, restart counting in the new set.
-        if set_num != streak_set:
-            streak_team = team
-            streak_n = 1
-            streak_set = set_num
-        elif team == streak_team:
-            streak_n += 1
-        else:
-            streak_team = team
-            streak_n = 1
-        if streak_set is None:
-            continue
-        bucket = by_set.setdefault(streak_set, {1: 0, 2: 0})
-        if streak_n > bucket[team]:
-            bucket[team] = streak_n
-    return by_set
-
-
-def _services_by_set(
-    audit: list[dict[str, Any]],
-) -> dict[int, dict[int, dict[str, int]]]:
-    """Same ``served`` / ``won`` counts as :func:`_services_summary`
-    but bucketed per set so a single-set recap can show each team's
-    service hold rate for that set only. Output schema::
-
-        { set_num: { 1: {"served": n, "won": m},
-                     2: {"served": n, "won": m} } }
-    """
-    by_set: dict[int, dict[int, dict[str, int]]] = {}
-    prev_post_serve: int | None = None
-    for r in audit:
-        if _is_undo_record(r):
-            continue
-        action = r.get("action")
-        result = r.get("result") or {}
-        if action == "add_point" and prev_post_serve in (1, 2):
-            scoring = (r.get("params") or {}).get("team")
-            if scoring in (1, 2):
-                set_num = _result_set(r)
-                if set_num is not None:
-                    bucket = by_set.setdefault(set_num, {
-                        1: {"served": 0, "won": 0},
-                        2: {"served": 0, "won": 0},
-                    })
-                    bucket[prev_post_serve]["served"] += 1
-                    if prev_post_serve == scoring:
-                        bucket[prev_post_serve]["won"] += 1
-        serve_str = result.get("serve")
-        if serve_str == "A":
-            prev_post_serve = 1
-        elif serve_str == "B":
-            prev_post_serve = 2
-    return by_set
-
-
 # Version-keyed memoization. ``compute_live_stats`` is a pure function of
 # the OID's audit log, which only changes on append/tombstone/clear. A
 # single scoring action fans out to a get_state response, an overlay push,
@@ -384,19 +476,57 @@ def _services_by_set(
 _CACHE_LOCK = threading.Lock()
 # oid -> (version, {history_limit: payload})
 _STATS_CACHE: dict[str, tuple[int, dict[int, dict[str, Any]]]] = {}
+# oid -> running accumulator. Guarded by ``_CACHE_LOCK`` too: folding one
+# record is O(1), so sharing the lock costs nothing and keeps "payload at
+# version N" and "accumulator at version N" from ever disagreeing.
+_ACCUMULATORS: dict[str, _LiveStatsAccumulator] = {}
+
+
+def _on_audit_mutation(
+    oid: str,
+    event: str,
+    version: int,
+    record: dict | None,
+) -> None:
+    """Keep the OID's accumulator in step with its audit log.
+
+    Registered as an :func:`action_log.add_listener` listener at import.
+    Only the next contiguous ``append`` is folded in; a notification for
+    a version the accumulator already covers (its rebuild raced ahead of
+    the notification) is ignored, and anything else — an invalidate, or a
+    gap from notifications delivered out of order across threads — drops
+    the accumulator so the next read rebuilds it from the log.
+    """
+    with _CACHE_LOCK:
+        acc = _ACCUMULATORS.get(oid)
+        if acc is None or version <= acc.version:
+            return
+        if (
+            event == action_log.EVENT_APPEND
+            and record is not None
+            and version == acc.version + 1
+        ):
+            acc.fold(record)
+            acc.version = version
+        else:
+            del _ACCUMULATORS[oid]
+
+
+action_log.add_listener(_on_audit_mutation)
 
 
 def clear_cache() -> None:
-    """Drop every memoized live-stats payload.
+    """Drop every memoized live-stats payload and accumulator.
 
     Used by the test harness for per-test isolation.
     """
     with _CACHE_LOCK:
         _STATS_CACHE.clear()
+        _ACCUMULATORS.clear()
 
 
 def evict_cache(oid: str) -> None:
-    """Drop the memoized payloads for a single OID.
+    """Drop the memoized payloads and the accumulator for a single OID.
 
     Entries self-invalidate on the *version* axis, but nothing ever
     removes the key itself, so the payload for every OID the process has
@@ -405,19 +535,24 @@ def evict_cache(oid: str) -> None:
     """
     with _CACHE_LOCK:
         _STATS_CACHE.pop(oid, None)
+        _ACCUMULATORS.pop(oid, None)
 
 
+@timed(STAGE_LIVE_STATS)
 def compute_live_stats(
     oid: str,
     *,
     history_limit: int = 30,
 ) -> dict[str, Any]:
-    """Read the audit log for *oid* and return a live-stats payload.
+    """Return the live-stats payload for *oid*.
 
     Memoized against :func:`action_log.version` — repeated calls between
-    audit mutations return the cached payload without re-reading or
-    re-parsing the log. See :func:`_compute_live_stats` for the payload
-    shape and field semantics.
+    audit mutations return the cached payload. A memo miss is normally
+    served from the OID's accumulator, which the audit listener has
+    already advanced by the record that caused the miss; only when there
+    is no current accumulator (first read, or an undo/clear invalidated
+    it) does :func:`_compute_live_stats` rebuild from the full log. See
+    :meth:`_LiveStatsAccumulator.payload` for the payload shape.
     """
     ver = action_log.version(oid)
     with _CACHE_LOCK:
@@ -426,84 +561,66 @@ def compute_live_stats(
             hit = entry[1].get(history_limit)
             if hit is not None:
                 return hit
-    # Compute outside the lock — the audit read + aggregation passes are
-    # the expensive part and must not serialize unrelated OIDs. A
-    # concurrent miss for the same (oid, version) just recomputes an
-    # identical payload.
+        acc = _ACCUMULATORS.get(oid)
+        if (
+            acc is not None
+            and acc.version == ver
+            and history_limit <= acc.history_retained
+        ):
+            result = acc.payload(oid, history_limit)
+            _memoize_locked(oid, ver, history_limit, result)
+            return result
+    # Rebuild outside the lock — the audit read + fold is the expensive
+    # part and must not serialize unrelated OIDs. A concurrent miss for
+    # the same (oid, version) just rebuilds an identical payload.
     result = _compute_live_stats(oid, history_limit=history_limit)
     with _CACHE_LOCK:
-        entry = _STATS_CACHE.get(oid)
-        if entry is None or entry[0] < ver:
-            # First entry, or ours is newer — install it.
-            _STATS_CACHE[oid] = (ver, {history_limit: result})
-        elif entry[0] == ver:
-            # Same version already cached — add/refresh this history_limit.
-            entry[1][history_limit] = result
-        # entry[0] > ver: a newer version landed while we computed off a
-        # stale snapshot. Drop our result rather than regress the cached
-        # version, which would force a miss on every subsequent read until
-        # the next mutation. The caller still gets ``result`` below.
+        _memoize_locked(oid, ver, history_limit, result)
     return result
 
 
+def _memoize_locked(
+    oid: str, ver: int, history_limit: int, result: dict[str, Any],
+) -> None:
+    """Install *result* for ``(oid, ver)``. Caller holds ``_CACHE_LOCK``."""
+    entry = _STATS_CACHE.get(oid)
+    if entry is None or entry[0] < ver:
+        # First entry, or ours is newer — install it.
+        _STATS_CACHE[oid] = (ver, {history_limit: result})
+    elif entry[0] == ver:
+        # Same version already cached — add/refresh this history_limit.
+        entry[1][history_limit] = result
+    # entry[0] > ver: a newer version landed while we computed off a
+    # stale snapshot. Drop our result rather than regress the cached
+    # version, which would force a miss on every subsequent read until
+    # the next mutation. The caller still gets ``result``.
+
+
 def _compute_live_stats(
     oid: str,
     *,
     history_limit: int = 30,
 ) -> dict[str, Any]:
-    """Read the audit log for *oid* and return a live-stats payload.
-
-    The shape mirrors the post-match Highlights block from
-    :func:`_compute_stats` (so external consumers can use the same
-    renderer) plus three live-only additions:
-
-    * ``current_streak`` — trailing run by one team, mirrors
-      ``longest_streak`` but reset to zero whenever a manual edit or
-      an opposite-team point breaks it.
-    * ``points_history`` — last ``history_limit`` scoring events, each
-      with the running score after the action. Driven by the audit
-      log, so the rendered trajectory survives operator undos.
-    * ``audit_count`` — total non-undo records the stats are computed
-      from, useful for cache-busting on the client.
+    """Rebuild the OID's accumulator from the full log and return a payload.
+
+    Folds every visible record of the tombstone-filtered log, then
+    installs the accumulator (at the exact version the read reflects) so
+    subsequent appends fold incrementally. An accumulator that a racing
+    rebuild or listener has already moved past is kept instead. A failed
+    read (``version is None``) still answers from the records it got, but
+    installs nothing — there is no version to keep it current from.
     """
-    audit = action_log.read_all(oid)
-    base = _compute_stats(audit)
-    events = _scoring_events(audit)
-    return {
-        "oid": oid,
-        "audit_count": sum(1 for r in audit if not _is_undo_record(r)),
-        "current_streak": _current_streak(audit),
-        "longest_streak": base["longest_streak"],
-        "set_win_comeback": base["set_win_comeback"],
-        "partial_comeback": base["partial_comeback"],
-        "longest_rally": base["longest_rally"],
-        "total_points": base["total_points"],
-        "set_durations": base["set_durations"],
-        # Optional per-point classification tallies (opt-in). Always
-        # present (zeroed) so consumers don't need a None check; the
-        # error breakdown is a subset of the ``opp_error`` total.
-        "point_types": base["point_types"],
-        "error_types": base["error_types"],
-        # Per-set point-type tallies so the set-summary recap can scope
-        # the breakdown to the displayed set.
-        "point_types_by_set": base["point_types_by_set"],
-        # Classification of the most recent scored point (or ``None``),
-        # used by the spectator page to show how the last point was won.
-        "last_point": _last_point(audit),
-        "points_history": _recent_points(events, history_limit),
-        # Per-set buckets capped at 60 events (more than enough for
-        # any indoor or beach set, including extreme deuce stretches).
-        # Used by the spectator page to render past sets on demand.
-        "points_by_set": _points_by_set(events, per_set_limit=60),
-        # Per-set timeout events with timestamps so the spectator
-        # chart can render them as markers on the same time axis.
-        "timeouts_by_set": _timeouts_by_set(audit),
-        # Services-won / services-total per team. The chart caption
-        # uses these to label each side's hold rate.
-        "services": _services_summary(audit),
-        # Per-set variants of streak/services so the set-summary
-        # recap can show stats that actually belong to the displayed
-        # set instead of match-wide totals.
-        "longest_streak_by_set": _longest_streak_by_set(audit),
-        "services_by_set": _services_by_set(audit),
-    }
+    audit, log_version = action_log.read_all_with_version(oid)
+    acc = _LiveStatsAccumulator(
+        log_version or 0,
+        history_retained=max(history_limit, _HISTORY_RETAINED),
+    )
+    for record in audit:
+        acc.fold(record)
+    if log_version is not None:
+        with _CACHE_LOCK:
+            current = _ACCUMULATORS.get(oid)
+            if current is None or current.version < log_version:
+                _ACCUMULATORS[oid] = acc
+    return acc.payload(oid, history_limit)
+
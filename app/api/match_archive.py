@@ -9,10 +9,19 @@ The public surface is unchanged so callers (the finish hook, the match
 routes, and the print report) need no changes:
 
 * ``archive_match(skey, …)`` — insert a row, return the ``match_id``.
+* ``new_match_id(skey, ended_at)`` — the id an archive will get, reserved
+  before the row exists (see :mod:`app.api.archive_queue`).
 * ``list_matches(skey | None)`` — newest-first summaries.
 * ``load_match(match_id)`` — full snapshot.
 * ``delete_match(match_id)`` / ``delete_for_oid(skey)``.
 
+Archiving runs off the match-ending request: the finish hook reserves the
+``match_id`` with :func:`new_match_id` and journals the match to
+:mod:`app.api.archive_queue`, whose worker calls :func:`archive_match`.
+Every read and delete here first settles the queue (writes whatever is
+still pending, on the calling thread), so a caller never sees a finished
+match missing from the archive just because the worker has not reached it.
+
 The ``match_id`` keeps the historical ``match_<sha256(skey)[:20]>_<UTC>``
 shape so the HMAC-signed report URLs (:mod:`app.match_report_signing`) and
 the ``/match/{id}/report`` route keep working. Every summary/payload reports
@@ -28,15 +37,15 @@ import re
 from typing import Any
 
 from sqlalchemy import delete as sa_delete
-from sqlalchemy import func, nullslast, select
-from sqlalchemy.orm import load_only
+from sqlalchemy import func, nullslast, select, update
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.sql import Select
 
-from app.api import action_log
+from app.api import _audit_codec, action_log
 from app.api._persistence_paths import DEFAULT_HASH_LEN, hashed_filename
 from app.api._persistence_paths import data_dir as _shared_data_dir
-from app.db.engine import session_scope
-from app.db.models.report import MatchReport
+from app.db.engine import read_session_scope, session_scope
+from app.db.models.report import MatchReport, MatchReportAudit
 from app.overlay_key import is_valid_skey, make_skey, split_skey
 
 logger = logging.getLogger(__name__)
@@ -45,10 +54,10 @@ _FILENAME_HASH_LEN = DEFAULT_HASH_LEN
 # ``match_<20-hex>_<UTC-ISO>`` (no ``.json`` now — it is an id, not a file).
 _MATCH_ID_RE = re.compile(r"^match_[0-9a-f]{20}_\d{8}T\d{6}_\d{6}Z$")
 
-# Listing a report needs these columns and no others. In particular,
-# ``audit_log`` can be several hundred JSON records per match; selecting the
-# whole ORM entity made a 20-row account page deserialize 20 complete match
-# transcripts just to render dates, names and scores.
+# Listing a report needs these columns and no others. The audit transcript
+# is not even on this table any more (see ``MatchReportAudit``), and the
+# summary is read from the denormalized columns, so the listing never
+# deserializes ``final_state`` or ``customization`` either.
 _SUMMARY_COLUMNS = (
     MatchReport.id,
     MatchReport.match_id,
@@ -57,10 +66,20 @@ _SUMMARY_COLUMNS = (
     MatchReport.ended_at,
     MatchReport.duration_s,
     MatchReport.winning_team,
-    MatchReport.final_state,
-    MatchReport.customization,
+    MatchReport.mode,
+    MatchReport.team_1_name,
+    MatchReport.team_2_name,
+    MatchReport.team_1_sets,
+    MatchReport.team_2_sets,
+    MatchReport.current_set,
 )
 
+# Column widths of the summary strings (``MatchReport.team_*_name`` /
+# ``mode``). A longer value is cut for the listing only; the report still
+# renders the full name from ``customization``.
+_NAME_MAX = 120
+_MODE_MAX = 32
+
 
 def _data_dir() -> str:
     # Retained (unused for storage) so the test isolation fixture that
@@ -72,13 +91,67 @@ def _skey_hash(skey: str) -> str:
     return hashed_filename("", skey, "")
 
 
-def _ts_for_now() -> str:
-    now = datetime.datetime.now(datetime.UTC)
-    return now.strftime("%Y%m%dT%H%M%S") + f"_{now.microsecond:06d}Z"
+def _ts_for(timestamp: float) -> str:
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.UTC)
+    return moment.strftime("%Y%m%dT%H%M%S") + f"_{moment.microsecond:06d}Z"
 
 
-def _summary(r: MatchReport) -> dict:
-    fs = r.final_state or {}
+def new_match_id(skey: str, ended_at: float) -> str | None:
+    """The ``match_id`` for *skey*'s match ending at *ended_at*.
+
+    ``None`` for a non-storage-key, which :func:`archive_match` would
+    refuse anyway. Lets the match-end hook hand the id to the control
+    board before the row is written.
+    """
+    if not is_valid_skey(skey):
+        return None
+    return f"match_{_skey_hash(skey)}_{_ts_for(ended_at)}"
+
+
+def _settle_pending(
+    match_id: str | None = None,
+    *,
+    oid: str | None = None,
+    user_id: int | None = None,
+) -> None:
+    """Write queued archives before a read so it sees every finished match.
+
+    Only the jobs inside the read's scope are settled: a user's history
+    page must not archive every other user's backlog on its own request
+    thread. Function-local import: :mod:`app.api.archive_queue` imports
+    this module at load time.
+    """
+    from app.api import archive_queue
+
+    archive_queue.settle(match_id=match_id, oid=oid, user_id=user_id)
+
+
+def _settle_scope(oid: str | None, user_id: int | None) -> None:
+    """:func:`_settle_pending` for the scope :func:`_scope_predicates` applies."""
+    if oid:
+        # An invalid key matches no rows, so there is nothing to settle.
+        if is_valid_skey(oid):
+            _settle_pending(oid=oid)
+    elif user_id is not None:
+        _settle_pending(user_id=user_id)
+    else:
+        _settle_pending()
+
+
+def _as_int(value: Any) -> int | None:
+    # ``bool`` is an ``int`` subclass; a flag is never a count.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _summary_fields(final_state: dict, customization: dict) -> dict[str, Any]:
+    """The denormalized ``MatchReport`` summary columns for one archive.
+
+    Computed once at archive time (and by the 0009 backfill, which mirrors
+    this function) so listing a match never reopens its JSON blobs.
+    """
+    fs = final_state or {}
     t1 = fs.get("team_1", {}) or {}
     t2 = fs.get("team_2", {}) or {}
     # Team names live in the captured customization. Resolve them through the
@@ -97,29 +170,89 @@ def _summary(r: MatchReport) -> dict:
     # render module is imported before the ``app.api`` package finishes
     # initializing. By call time both modules are fully loaded.
     from app.match_report.render import _team_name
-    cust = r.customization or {}
+    cust = customization or {}
     name1 = _team_name(cust, 1)
     name2 = _team_name(cust, 2)
+    # Match mode (indoor / beach / table_tennis) is captured inside the
+    # archived ``final_state.config`` (GameStateResponse.config). ``None``
+    # for matches archived before the mode was recorded.
+    mode = (fs.get("config") or {}).get("mode")
+    return {
+        "mode": mode[:_MODE_MAX] if isinstance(mode, str) else None,
+        "team_1_name": None if name1 == "Team 1" else name1[:_NAME_MAX],
+        "team_2_name": None if name2 == "Team 2" else name2[:_NAME_MAX],
+        "team_1_sets": _as_int(t1.get("sets")),
+        "team_2_sets": _as_int(t2.get("sets")),
+        "current_set": _as_int(fs.get("current_set")),
+    }
+
+
+def _stats_snapshot(audit: list[dict]) -> tuple[dict | None, int | None]:
+    """``(snapshot, version)`` for an audit list; ``(None, None)`` on failure.
+
+    A reducer tripping over a malformed transcript must not cost the
+    archive or the report: with no snapshot stored, the report simply
+    recomputes on read. Function-local import for the same reason as
+    :func:`_summary_fields`.
+    """
+    from app.match_report.stats import STATS_SNAPSHOT_VERSION, compute_stats_snapshot
+
+    try:
+        return compute_stats_snapshot(audit), STATS_SNAPSHOT_VERSION
+    except Exception:
+        logger.warning("Could not compute match stats snapshot", exc_info=True)
+        return None, None
+
+
+def _stored_stats(r: MatchReport, audit: list[dict]) -> dict | None:
+    """The report's stats snapshot, recomputed if stale or missing.
+
+    A stale or missing snapshot is rebuilt from *audit* and written back
+    best-effort in its own transaction, so a read-only or locked database
+    still serves the report. A snapshot from a *newer* version (written by
+    code this process predates, during a rollback or a mixed deploy) is
+    recomputed in memory only: this code cannot read its shape, and
+    writing the older version back would make the newer code recompute
+    it again on every read.
+    """
+    from app.match_report.stats import STATS_SNAPSHOT_VERSION, stats_snapshot_from_json
+
+    if r.stats is not None and r.stats_version == STATS_SNAPSHOT_VERSION:
+        return stats_snapshot_from_json(r.stats)
+    snapshot, version = _stats_snapshot(audit)
+    if snapshot is None:
+        return None
+    if r.stats_version is not None and r.stats_version > STATS_SNAPSHOT_VERSION:
+        return snapshot
+    try:
+        with session_scope() as db:
+            db.execute(
+                update(MatchReport)
+                .where(MatchReport.id == r.id)
+                .values(stats=snapshot, stats_version=version)
+            )
+    except Exception as exc:
+        logger.warning("Could not store recomputed stats for %s: %s", r.match_id, exc)
+    return snapshot
+
+
+def _summary(r: MatchReport) -> dict:
     return {
         "match_id": r.match_id,
         "oid": make_skey(r.user_id, r.oid),
         "ended_at": r.ended_at,
         "duration_s": r.duration_s,
         "winning_team": r.winning_team,
-        "team_1_sets": t1.get("sets"),
-        "team_2_sets": t2.get("sets"),
-        "team_1_name": (None if name1 == "Team 1" else name1),
-        "team_2_name": (None if name2 == "Team 2" else name2),
-        "current_set": fs.get("current_set"),
-        # Match mode (indoor / beach / table_tennis) is captured inside the
-        # archived ``final_state.config`` (GameStateResponse.config). Surface
-        # it so the reports list can filter by match type. ``None`` for
-        # matches archived before the mode was recorded.
-        "mode": (fs.get("config") or {}).get("mode"),
+        "team_1_sets": r.team_1_sets,
+        "team_2_sets": r.team_2_sets,
+        "team_1_name": r.team_1_name,
+        "team_2_name": r.team_2_name,
+        "current_set": r.current_set,
+        "mode": r.mode,
     }
 
 
-def _payload(r: MatchReport) -> dict:
+def _payload(r: MatchReport, audit: list[dict], stats: dict | None) -> dict:
     return {
         "match_id": r.match_id,
         "oid": make_skey(r.user_id, r.oid),
@@ -129,7 +262,10 @@ def _payload(r: MatchReport) -> dict:
         "winning_team": r.winning_team,
         "final_state": r.final_state or {},
         "customization": r.customization or {},
-        "audit_log": r.audit_log or [],
+        "audit_log": audit,
+        # ``compute_stats_snapshot`` output (``None`` if it could not be
+        # computed — the report then derives it from ``audit_log``).
+        "stats": stats,
         "config": {
             "points_limit": r.points_limit,
             "points_limit_last_set": r.points_limit_last_set,
@@ -147,22 +283,49 @@ def archive_match(
     points_limit: int | None = None,
     points_limit_last_set: int | None = None,
     sets_limit: int | None = None,
+    *,
+    match_id: str | None = None,
+    ended_at: float | None = None,
+    audit_until: float | None = None,
 ) -> str | None:
     """Insert a snapshot of *oid*'s (a storage key) match. Returns the match_id.
 
     Returns ``None`` for a non-storage-key (no owning user can be derived)
     or on any DB error — archival never blocks the match-end response.
+
+    The background queue passes the *match_id* and *ended_at* it reserved
+    at match end, and *audit_until*, the newest audit ``ts`` at that
+    moment, so records appended afterwards (an undo, the next match's
+    first points) stay out of the report. That includes the tombstone an
+    undo writes (see :func:`action_log.read_until`), so undoing the
+    winning point before the worker runs cannot remove it from the
+    report. A *match_id* that is already archived is not inserted twice:
+    replaying a journal entry whose insert committed just before a crash
+    is a no-op.
     """
     skey = oid
     if not is_valid_skey(skey):
         return None
     user_id, raw_oid = split_skey(skey)
-    ended_at = datetime.datetime.now(datetime.UTC).timestamp()
-    match_id = f"match_{_skey_hash(skey)}_{_ts_for_now()}"
+    if ended_at is None:
+        ended_at = datetime.datetime.now(datetime.UTC).timestamp()
+    if match_id is None:
+        match_id = f"match_{_skey_hash(skey)}_{_ts_for(ended_at)}"
     duration = None if started_at is None else max(0.0, ended_at - float(started_at))
     try:
+        audit = (
+            action_log.read_all(skey)
+            if audit_until is None
+            else action_log.read_until(skey, audit_until)
+        )
+        codec, blob = _audit_codec.encode(audit)
+        stats, stats_version = _stats_snapshot(audit)
         with session_scope() as db:
-            db.add(MatchReport(
+            if db.scalar(
+                select(MatchReport.id).where(MatchReport.match_id == match_id)
+            ) is not None:
+                return match_id
+            report = MatchReport(
                 match_id=match_id,
                 user_id=user_id,
                 oid=raw_oid,
@@ -172,10 +335,21 @@ def archive_match(
                 winning_team=winning_team,
                 final_state=final_state or {},
                 customization=customization or {},
-                audit_log=action_log.read_all(skey),
                 points_limit=points_limit,
                 points_limit_last_set=points_limit_last_set,
                 sets_limit=sets_limit,
+                stats=stats,
+                stats_version=stats_version,
+                **_summary_fields(final_state, customization or {}),
+            )
+            db.add(report)
+            # Flush for the report id; both rows commit together.
+            db.flush()
+            db.add(MatchReportAudit(
+                report_id=report.id,
+                codec=codec,
+                record_count=len(audit),
+                payload=blob,
             ))
     except Exception as exc:
         logger.warning("Failed to archive match for %r: %s", skey, exc)
@@ -212,16 +386,15 @@ def _summary_filters(
 ) -> Select[Any]:
     """Apply filters shared by summary, count, and calendar-time queries.
 
-    ``JSON.as_string`` compiles to the native JSON scalar extraction for both
-    supported databases (SQLite and PostgreSQL), so old rows can be filtered
-    by the mode captured in ``final_state.config`` without a schema migration.
-    The end bound is exclusive, which makes adjacent local-day ranges meet
-    without double-counting a match exactly at midnight.
+    *mode* compares the denormalized ``MatchReport.mode`` column, which
+    ``ix_match_reports_user_mode_ended`` covers together with the user scope
+    and the ``ended_at`` range, rather than extracting it from
+    ``final_state`` per row. The end bound is exclusive, which makes
+    adjacent local-day ranges meet without double-counting a match
+    exactly at midnight.
     """
     if mode:
-        stmt = stmt.where(
-            MatchReport.final_state["config"]["mode"].as_string() == mode,
-        )
+        stmt = stmt.where(MatchReport.mode == mode)
     if ended_from is not None:
         stmt = stmt.where(MatchReport.ended_at >= ended_from)
     if ended_to is not None:
@@ -251,7 +424,8 @@ def list_matches(
     ``duration``; every order ends in the unique row id so offset pages cannot
     duplicate/drop tied rows.
     """
-    with session_scope() as db:
+    _settle_scope(oid, user_id)
+    with read_session_scope() as db:
         stmt = _scope_predicates(
             select(MatchReport).options(load_only(*_SUMMARY_COLUMNS)),
             oid,
@@ -289,7 +463,8 @@ def count_matches(
     ended_to: float | None = None,
 ) -> int:
     """Total matches in the same scope ``list_matches`` would use."""
-    with session_scope() as db:
+    _settle_scope(oid, user_id)
+    with read_session_scope() as db:
         stmt = _scope_predicates(
             select(func.count()).select_from(MatchReport), oid, user_id,
         )
@@ -315,7 +490,8 @@ def list_match_times(
     This intentionally has its own scalar projection. Calendar dots need the
     complete set of days but not a single state/customization/audit JSON value.
     """
-    with session_scope() as db:
+    _settle_scope(oid, user_id)
+    with read_session_scope() as db:
         stmt = _scope_predicates(select(MatchReport.ended_at), oid, user_id)
         if stmt is None:
             return []
@@ -346,7 +522,8 @@ def latest_match_id(oid: str) -> str | None:
     stmt = _latest_match_stmt(oid)
     if stmt is None:
         return None
-    with session_scope() as db:
+    _settle_pending(oid=oid)
+    with read_session_scope() as db:
         return db.execute(stmt).scalars().first()
 
 
@@ -354,33 +531,70 @@ def owner_user_id(match_id: str) -> int | None:
     """The ``user_id`` that owns *match_id*, or ``None`` if there is no such row.
 
     The cheap half of :func:`load_match`: selects one integer column instead of
-    materialising ``final_state``, ``customization`` and the whole ``audit_log``
-    JSON blob. Use this wherever the payload is only being loaded to answer
+    materialising ``final_state``, ``customization`` and the compressed audit
+    transcript. Use this wherever the payload is only being loaded to answer
     "does the caller own this?".
     """
     if not isinstance(match_id, str) or _MATCH_ID_RE.match(match_id) is None:
         return None
-    with session_scope() as db:
+    _settle_pending(match_id)
+    with read_session_scope() as db:
         return db.execute(
             select(MatchReport.user_id).where(MatchReport.match_id == match_id)
         ).scalars().first()
 
 
+def _load_audit(db: Session, report_id: int, match_id: str) -> list[dict]:
+    """Decode the audit blob of one report; ``[]`` when absent or unreadable.
+
+    A report whose transcript cannot be decoded still renders its scores,
+    so a corrupt blob is logged rather than failing the whole load.
+    """
+    row = db.execute(
+        select(MatchReportAudit.codec, MatchReportAudit.payload)
+        .where(MatchReportAudit.report_id == report_id)
+    ).first()
+    if row is None:
+        return []
+    try:
+        return _audit_codec.decode(row.codec, row.payload)
+    except ValueError as exc:
+        logger.warning("Unreadable audit log for %s: %s", match_id, exc)
+        return []
+
+
 def load_match(match_id: str) -> dict | None:
     """Return the full archived snapshot for *match_id*, or ``None``."""
     if not isinstance(match_id, str) or _MATCH_ID_RE.match(match_id) is None:
         return None
-    with session_scope() as db:
+    _settle_pending(match_id)
+    with read_session_scope() as db:
         row = db.execute(
             select(MatchReport).where(MatchReport.match_id == match_id)
         ).scalar_one_or_none()
-        return _payload(row) if row is not None else None
+        if row is None:
+            return None
+        audit = _load_audit(db, row.id, match_id)
+    return _payload(row, audit, _stored_stats(row, audit))
+
+
+def _forget_rendered(match_ids: list[str]) -> None:
+    """Drop the deleted reports' cached renders (after the commit).
+
+    Only frees space: the report routes check the row exists before using
+    the cache, so a missed call here can never resurrect a report.
+    """
+    from app.match_report import cache as report_cache
+
+    for match_id in match_ids:
+        report_cache.invalidate(match_id)
 
 
 def delete_match(match_id: str) -> bool:
     """Delete the archived match identified by *match_id*."""
     if not isinstance(match_id, str) or _MATCH_ID_RE.match(match_id) is None:
         return False
+    _settle_pending(match_id)
     with session_scope() as db:
         row = db.execute(
             select(MatchReport).where(MatchReport.match_id == match_id)
@@ -388,7 +602,8 @@ def delete_match(match_id: str) -> bool:
         if row is None:
             return False
         db.delete(row)
-        return True
+    _forget_rendered([match_id])
+    return True
 
 
 def delete_matches_for_user(user_id: int, match_ids: list[str]) -> int:
@@ -404,6 +619,7 @@ def delete_matches_for_user(user_id: int, match_ids: list[str]) -> int:
     ))
     if not valid_ids:
         return 0
+    _settle_pending(user_id=user_id)
     with session_scope() as db:
         result = db.execute(
             sa_delete(MatchReport).where(
@@ -411,20 +627,34 @@ def delete_matches_for_user(user_id: int, match_ids: list[str]) -> int:
                 MatchReport.match_id.in_(valid_ids),
             )
         )
-        return int(getattr(result, "rowcount", 0) or 0)
+        deleted = int(getattr(result, "rowcount", 0) or 0)
+    if deleted:
+        # Invalidating an id the caller did not own is harmless.
+        _forget_rendered(valid_ids)
+    return deleted
 
 
 def delete_for_oid(oid: str) -> int:
-    """Delete every archived match for a storage key. Returns the count."""
+    """Delete every archived match for a storage key. Returns the count.
+
+    Matches still waiting in the archive queue are dropped with it (and
+    not counted), so none lands after the overlay is gone.
+    """
     if not is_valid_skey(oid):
         return 0
+    # Function-local import: see ``_settle_pending``.
+    from app.api import archive_queue
+
+    archive_queue.discard(oid)
     user_id, raw_oid = split_skey(oid)
+    scope = (MatchReport.user_id == user_id, MatchReport.oid == raw_oid)
     with session_scope() as db:
-        result = db.execute(
-            sa_delete(MatchReport).where(
-                MatchReport.user_id == user_id, MatchReport.oid == raw_oid,
-            )
+        match_ids = list(
+            db.execute(select(MatchReport.match_id).where(*scope)).scalars()
         )
+        result = db.execute(sa_delete(MatchReport).where(*scope))
         # Result is typed without rowcount; DML returns a CursorResult that
         # has it.
-        return int(getattr(result, "rowcount", 0) or 0)
+        deleted = int(getattr(result, "rowcount", 0) or 0)
+    _forget_rendered(match_ids)
+    return deleted
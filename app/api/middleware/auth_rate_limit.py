@@ -51,26 +51,65 @@ Deliberately **not** watched:
     metrics route. It is not a credential-probing surface for this
     failure-counting limiter.
 
-All state is process-local — clusters with multiple replicas should front
-the app with a layer-7 limiter (Cloudflare, Nginx, etc.) that shares
-state. This is a defence-in-depth backstop for self-hosted single-replica
-deployments. Note also that a per-IP limiter cannot distinguish several
-operators behind one NAT from a single attacker; the split keyspaces bound
-the blast radius, and ``voc_rate_limit_blocks_total`` makes a lockout
-visible, but the tradeoff is inherent to keying on IP.
+Each bucket is a fixed-size *sliding-window counter* rather than a list of
+failure timestamps: the failure counts of the current and the previous
+fixed window, plus the block deadline. The failures "within the last
+window" are estimated as the current count plus the previous count weighted
+by how much of the previous window still overlaps the sliding one. That
+costs four numbers per ``(surface, IP)`` however hard an address hammers,
+and a check never walks a deque.
+
+Where the buckets live is pluggable (``AUTH_RATE_LIMIT_STORE``):
+
+``memory`` (default)
+    A bounded in-process LRU of ``_MAX_CLIENTS`` buckets. With several
+    uvicorn workers each process counts on its own, so the effective limit
+    is multiplied by the worker count.
+
+``sqlite``
+    One row per bucket in a small SQLite database in WAL mode
+    (``AUTH_RATE_LIMIT_STORE_PATH``, default ``data/auth_rate_limit.sqlite3``)
+    shared by every worker on the box, so the limit holds across processes.
+    Buckets are updated in an ``IMMEDIATE`` transaction, idle rows are
+    pruned as failures arrive and the table is capped at ``_MAX_CLIENTS``
+    rows. If the database cannot be opened the process falls back to the
+    memory store; a lookup that fails later lets the request through
+    (logged) rather than turning a disk problem into an outage. Every
+    store call runs on the threadpool: a lookup on each watched request
+    and a ``BEGIN IMMEDIATE`` plus WAL commit on each failure would
+    otherwise stall the event loop, and with it every other request,
+    exactly when a credential-stuffing burst arrives. The memory store
+    answers from a dict and stays inline.
+
+Either way the state is per host — clusters with multiple replicas should
+front the app with a layer-7 limiter (Cloudflare, Nginx, etc.) that shares
+state. This is a defence-in-depth backstop for self-hosted deployments.
+Note also that a per-IP limiter cannot distinguish several operators
+behind one NAT from a single attacker; the split keyspaces bound the blast
+radius, and ``voc_rate_limit_blocks_total`` makes a lockout visible, but
+the tradeoff is inherent to keying on IP.
 """
 
 from __future__ import annotations
 
+import logging
+import math
+import os
+import sqlite3
 import threading
 import time
-from collections import OrderedDict, deque
+from collections import OrderedDict
 from collections.abc import Iterable
+from typing import Protocol
 
+from starlette.concurrency import run_in_threadpool
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.api._persistence_paths import data_dir
 from app.env_vars_manager import EnvVarsManager
 
+logger = logging.getLogger(__name__)
+
 _MAX_CLIENTS = 4096
 
 # Surface name -> (watched path prefixes, statuses that count as a failure).
@@ -116,18 +155,238 @@ def _block_seconds() -> float:
     )
 
 
-class _Bucket:
-    __slots__ = ("blocked_until", "failures")
+# A bucket: (window_start, previous_count, current_count, blocked_until).
+_Counts = tuple[float, int, int, float]
+_EMPTY: _Counts = (0.0, 0, 0, 0.0)
+_Key = tuple[str, str]
+
+
+def _advance(counts: _Counts, now: float, window: float) -> _Counts:
+    """Roll *counts* forward to the fixed window containing *now*."""
+    window_start, previous, current, blocked_until = counts
+    start = math.floor(now / window) * window
+    if start == window_start:
+        return counts
+    # The old current window becomes the previous one only if it is the
+    # window immediately before; anything older has fully slid out.
+    previous = current if start - window_start == window else 0
+    return (start, previous, 0, blocked_until)
+
+
+def _estimate(counts: _Counts, now: float, window: float) -> int:
+    """Failures in the sliding window ending at *now* (see the docstring).
+
+    The weighted share of the previous window is rounded *up*, so the
+    approximation can only err towards blocking earlier, never later.
+    """
+    window_start, previous, current, _ = counts
+    overlap = max(0.0, 1.0 - (now - window_start) / window)
+    return math.ceil(previous * overlap) + current
+
+
+def _with_failure(
+    counts: _Counts, now: float, window: float, max_failures: int, block: float,
+) -> _Counts:
+    window_start, previous, current, blocked_until = _advance(counts, now, window)
+    counts = (window_start, previous, current + 1, blocked_until)
+    if _estimate(counts, now, window) >= max_failures:
+        counts = (window_start, previous, current + 1, now + block)
+    return counts
+
+
+class _Store(Protocol):
+    """Where the per-(surface, IP) buckets live."""
+
+    def is_blocked(self, key: _Key) -> bool: ...
+
+    def record_failure(
+        self, key: _Key, *, window: float, max_failures: int, block: float,
+    ) -> None: ...
+
+    def blocked_counts(self) -> dict[str, int]: ...
+
+    def reset(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _MemoryStore:
+    """Process-local buckets in a bounded LRU (monotonic clock)."""
 
     def __init__(self) -> None:
-        self.failures: deque[float] = deque()
-        self.blocked_until: float = 0.0
+        # Keyed by (surface, ip) — see the module docstring for why the
+        # surface is part of the key.
+        self._buckets: OrderedDict[_Key, _Counts] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_blocked(self, key: _Key) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            counts = self._buckets.get(key)
+            if counts is None:
+                return False
+            self._buckets.move_to_end(key)
+            return counts[3] > now
+
+    def record_failure(
+        self, key: _Key, *, window: float, max_failures: int, block: float,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            counts = self._buckets.get(key, _EMPTY)
+            self._buckets[key] = _with_failure(counts, now, window, max_failures, block)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > _MAX_CLIENTS:
+                self._buckets.popitem(last=False)
+
+    def blocked_counts(self) -> dict[str, int]:
+        now = time.monotonic()
+        counts: dict[str, int] = {}
+        with self._lock:
+            for (surface, _client), bucket in self._buckets.items():
+                if bucket[3] > now:
+                    counts[surface] = counts.get(surface, 0) + 1
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def close(self) -> None:
+        pass
+
 
+class _SQLiteStore:
+    """Buckets shared by every worker through a WAL-mode SQLite file.
 
-# Keyed by (surface, ip) — see the module docstring for why the surface is
-# part of the key.
-_buckets: OrderedDict[tuple[str, str], _Bucket] = OrderedDict()
-_lock = threading.Lock()
+    Uses the wall clock, the only time base the processes share. One
+    connection per process, serialized by a lock: each call is a single
+    indexed read or a read-modify-write of one row.
+    """
+
+    # Prune idle rows every this many recorded failures.
+    _PRUNE_EVERY = 256
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(
+            path, timeout=0.25, isolation_level=None, check_same_thread=False,
+        )
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS auth_rate_limit ("
+                " surface TEXT NOT NULL, ip TEXT NOT NULL,"
+                " window_start REAL NOT NULL, previous INTEGER NOT NULL,"
+                " current INTEGER NOT NULL, blocked_until REAL NOT NULL,"
+                " touched REAL NOT NULL, PRIMARY KEY (surface, ip))"
+            )
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    def is_blocked(self, key: _Key) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blocked_until FROM auth_rate_limit WHERE surface = ? AND ip = ?",
+                key,
+            ).fetchone()
+        return row is not None and float(row[0]) > time.time()
+
+    def record_failure(
+        self, key: _Key, *, window: float, max_failures: int, block: float,
+    ) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT window_start, previous, current, blocked_until"
+                    " FROM auth_rate_limit WHERE surface = ? AND ip = ?",
+                    key,
+                ).fetchone()
+                counts: _Counts = _EMPTY if row is None else (
+                    float(row[0]), int(row[1]), int(row[2]), float(row[3]),
+                )
+                counts = _with_failure(counts, now, window, max_failures, block)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO auth_rate_limit VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, *counts, now),
+                )
+                self._writes += 1
+                if self._writes % self._PRUNE_EVERY == 0:
+                    self._prune(now, window)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _prune(self, now: float, window: float) -> None:
+        # A row whose windows have both slid out and whose block expired
+        # carries no information; past that, drop the least recently failed.
+        self._conn.execute(
+            "DELETE FROM auth_rate_limit WHERE window_start < ? AND blocked_until <= ?",
+            (now - 2 * window, now),
+        )
+        self._conn.execute(
+            "DELETE FROM auth_rate_limit WHERE rowid IN ("
+            " SELECT rowid FROM auth_rate_limit ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+            (_MAX_CLIENTS,),
+        )
+
+    def blocked_counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT surface, COUNT(*) FROM auth_rate_limit"
+                " WHERE blocked_until > ? GROUP BY surface",
+                (time.time(),),
+            ).fetchall()
+        return {str(surface): int(count) for surface, count in rows}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM auth_rate_limit")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store_instance: _Store | None = None
+_store_lock = threading.Lock()
+
+
+def _store_path() -> str:
+    return str(
+        EnvVarsManager.get_env_var("AUTH_RATE_LIMIT_STORE_PATH", None)
+        or data_dir("auth_rate_limit.sqlite3")
+    )
+
+
+def _store() -> _Store:
+    """The configured bucket store, opened on first use."""
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            kind = str(EnvVarsManager.get_env_var("AUTH_RATE_LIMIT_STORE", "memory") or "memory")
+            kind = kind.strip().lower()
+            if kind == "sqlite":
+                path = _store_path()
+                try:
+                    _store_instance = _SQLiteStore(path)
+                except (OSError, sqlite3.Error):
+                    logger.warning(
+                        "Could not open the shared auth rate-limit store at %s; "
+                        "falling back to per-process buckets", path, exc_info=True,
+                    )
+            elif kind != "memory":
+                logger.warning("Unknown AUTH_RATE_LIMIT_STORE %r; using 'memory'", kind)
+            if _store_instance is None:
+                _store_instance = _MemoryStore()
+        return _store_instance
 
 
 def _client_ip(scope: Scope) -> str:
@@ -165,21 +424,16 @@ def _resolve_surface(path: str) -> tuple[str, frozenset[int]] | None:
     return None
 
 
-def _trim_failures_locked(bucket: _Bucket, now: float, window: float) -> None:
-    cutoff = now - window
-    while bucket.failures and bucket.failures[0] < cutoff:
-        bucket.failures.popleft()
-
-
 async def _is_blocked(key: tuple[str, str]) -> bool:
     """Return True if the bucket for *key* is currently blocked."""
-    now = time.monotonic()
-    with _lock:
-        bucket = _buckets.get(key)
-        if bucket is None:
-            return False
-        _buckets.move_to_end(key)
-        return bucket.blocked_until > now
+    try:
+        store = _store()
+        if isinstance(store, _SQLiteStore):
+            return await run_in_threadpool(store.is_blocked, key)
+        return store.is_blocked(key)
+    except sqlite3.Error:
+        logger.warning("Auth rate-limit lookup failed; letting the request through", exc_info=True)
+        return False
 
 
 async def _record_outcome(
@@ -189,35 +443,39 @@ async def _record_outcome(
 ) -> None:
     """Update the bucket for *key* based on the response *status_code*.
 
-    A status in *failure_statuses* appends a failure timestamp (and may flip
-    the bucket into the blocked state). Any other status is ignored: an
+    A status in *failure_statuses* counts a failure (and may flip the
+    bucket into the blocked state). Any other status is ignored: an
     attacker can hit unauthenticated endpoints under the same prefix to draw
     a 200, so "200 clears the bucket" would let them launder failures and
-    bypass the limit. The sliding window already evicts old failures once
-    they fall out of the window, which is the only legitimate reset path.
+    bypass the limit. The sliding window already lets old failures age out,
+    which is the only legitimate reset path.
     """
     if status_code not in failure_statuses:
         return
-    now = time.monotonic()
-    with _lock:
-        bucket = _buckets.get(key)
-        if bucket is None:
-            bucket = _Bucket()
-            _buckets[key] = bucket
-            if len(_buckets) > _MAX_CLIENTS:
-                _buckets.popitem(last=False)
+    try:
+        store = _store()
+        window, max_failures, block = _window_seconds(), _max_failures(), _block_seconds()
+        if isinstance(store, _SQLiteStore):
+            await run_in_threadpool(
+                store.record_failure,
+                key, window=window, max_failures=max_failures, block=block,
+            )
         else:
-            _buckets.move_to_end(key)
-        _trim_failures_locked(bucket, now, _window_seconds())
-        bucket.failures.append(now)
-        if len(bucket.failures) >= _max_failures():
-            bucket.blocked_until = now + _block_seconds()
+            store.record_failure(
+                key, window=window, max_failures=max_failures, block=block,
+            )
+    except sqlite3.Error:
+        logger.warning("Could not record an auth failure in the shared store", exc_info=True)
 
 
 def _reset_for_tests() -> None:
-    """Test hook to clear all buckets between cases."""
-    with _lock:
-        _buckets.clear()
+    """Test hook to clear all buckets between cases and re-read the store kind."""
+    global _store_instance
+    with _store_lock:
+        store, _store_instance = _store_instance, None
+    if store is not None:
+        store.reset()
+        store.close()
 
 
 def blocked_bucket_counts() -> dict[str, int]:
@@ -227,18 +485,17 @@ def blocked_bucket_counts() -> dict[str, int]:
     when another authentication attempt happens, so the gauge returns to
     zero even after traffic stops.
     """
-    now = time.monotonic()
     counts = {
         _API_SURFACE: 0,
         _CAPABILITY_SURFACE: 0,
     }
-    with _lock:
-        for (surface, _client), bucket in _buckets.items():
-            _trim_failures_locked(bucket, now, _window_seconds())
-            if bucket.blocked_until > now:
-                counts[surface] = counts.get(surface, 0) + 1
-            elif bucket.blocked_until:
-                bucket.blocked_until = 0.0
+    try:
+        blocked = _store().blocked_counts()
+    except sqlite3.Error:
+        logger.warning("Could not read the shared auth rate-limit store", exc_info=True)
+        return counts
+    for surface, count in blocked.items():
+        counts[surface] = counts.get(surface, 0) + count
     return counts
 
 
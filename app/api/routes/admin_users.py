@@ -34,7 +34,7 @@ class RegistrationSetting(BaseModel):
 def _cleanup_user_runtime(skeys: list[str], icon_files: list[str]) -> None:
     """Remove a deleted user's non-database state after commit."""
     from app import icons_service
-    from app.api import action_log, session_persistence
+    from app.api import action_log, archive_queue, session_persistence
     from app.api.session_manager import SessionManager
     from app.overlay import overlay_state_store
     from app.overlay_executor import get_overlay_executor
@@ -52,8 +52,10 @@ def _cleanup_user_runtime(skeys: list[str], icon_files: list[str]) -> None:
             # session before queued work drains; this one covers a session
             # admitted by work that was already running. Unlike the overlay
             # path there is no ``match_archive.delete_for_oid`` — reports key
-            # on the user FK, so the cascade already removed them.
+            # on the user FK, so the cascade already removed them; only the
+            # matches still waiting in the archive queue need dropping.
             SessionManager.remove(skey)
+            archive_queue.discard(skey)
             session_persistence.delete_session_meta(skey)
             action_log.delete(skey)
             overlay_state_store.delete_overlay(skey)
@@ -198,32 +200,47 @@ async def replay_dead_letter_webhooks(
         None, description="Only replay records whose ts is >= this Unix-seconds value."),
     max_records: int = Query(
         50, ge=1, le=500, description="Cap the records redelivered in this call."),
+    event: str | None = Query(
+        None, max_length=64, description="Only replay records for this event."),
+    url: str | None = Query(
+        None, max_length=2048, description="Only replay records for this target URL."),
+    oid: str | None = Query(
+        None, max_length=256, description="Only replay records for this overlay id."),
+    after: int | None = Query(
+        None, ge=0,
+        description="Page cursor: only replay records with a seq greater than this "
+                    "(pass the previous response's next_after)."),
 ) -> dict[str, int]:
-    """Replay a slice of the webhook dead-letter file (oldest first).
-
-    Successful redeliveries are removed; unknown-URL and still-failing records
-    are kept. Returns counts only — bodies are never echoed back.
+    """Replay one page of the webhook dead-letter file (oldest first).
+
+    Successful redeliveries are removed. Records whose redelivery fails
+    again stay where they are with their attempt count bumped; unknown-URL
+    records are not attempted and stay unchanged. Walking the file with
+    ``after=<next_after>`` visits every record once. Records that land
+    while the replay runs are untouched. Returns counts only — bodies are
+    never echoed back.
     """
     from app.api import webhook_dead_letter, webhooks
 
-    records = webhook_dead_letter.read_all()
-    if since is not None:
-        eligible = [r for r in records if r.get("ts", 0) >= since]
-        held_back = [r for r in records if r.get("ts", 0) < since]
-    else:
-        eligible = list(records)
-        held_back = []
-    replay_set = eligible[:max_records]
-    deferred = eligible[max_records:]
+    replay_set = webhook_dead_letter.read_page(
+        since=since, event=event, url=url, oid=oid, after=after,
+        limit=max_records,
+    )
     succeeded, still_failing, skipped = await run_in_threadpool(
         webhooks.webhook_dispatcher.replay_records, replay_set,
     )
-    new_dl = held_back + deferred + still_failing
-    webhook_dead_letter.replace_all(new_dl)
+    kept = {r.get("seq") for r in still_failing}
+    delivered = [
+        r["seq"] for r in replay_set
+        if isinstance(r.get("seq"), int) and r["seq"] not in kept
+    ]
+    remaining = webhook_dead_letter.settle(delivered, still_failing)
+    next_after = replay_set[-1].get("seq", after or 0) if replay_set else (after or 0)
     return {
         "considered": len(replay_set),
         "succeeded": succeeded,
         "still_failing": len(still_failing),
         "skipped_unknown_url": skipped,
-        "remaining_in_dl": len(new_dl),
+        "remaining_in_dl": remaining,
+        "next_after": next_after,
     }
@@ -7,8 +7,14 @@ blocks until a slot frees. None of that may run on the event-loop
 thread — see ``app/overlay_executor.py`` and the "Do not block the event
 loop" pitfall in AGENTS.md. ``get_mutation_session`` still holds the
 board's asyncio lock across the hop, so mutations stay serialized.
+
+``_run`` opens the action's timing breakdown (``app/spans.py``) around
+the hop, on the request's own context, so the stage spans recorded in
+the worker thread land in the same breakdown.
 """
 
+from collections.abc import Callable
+
 from fastapi import APIRouter, Depends
 from starlette.concurrency import run_in_threadpool
 
@@ -23,18 +29,29 @@ from app.api.schemas import (
     TeamActionRequest,
 )
 from app.api.session_manager import GameSession
+from app.spans import request_breakdown
 
 router = APIRouter()
 
 
+async def _run[**P](
+    action: str,
+    function: Callable[P, ActionResponse],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> ActionResponse:
+    with request_breakdown(action):
+        return await run_in_threadpool(function, *args, **kwargs)
+
+
 @router.post(
     "/game/add-point",
     response_model=ActionResponse,
 )
 async def add_point(req: AddPointRequest,
                     session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(
-        GameService.add_point,
+    return await _run(
+        "add_point", GameService.add_point,
         session, req.team, req.undo,
         point_type=req.point_type, error_type=req.error_type,
     )
@@ -46,7 +63,7 @@ async def add_point(req: AddPointRequest,
 )
 async def add_set(req: TeamActionRequest,
                   session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(GameService.add_set, session, req.team, req.undo)
+    return await _run("add_set", GameService.add_set, session, req.team, req.undo)
 
 
 @router.post(
@@ -55,7 +72,7 @@ async def add_set(req: TeamActionRequest,
 )
 async def add_timeout(req: TeamActionRequest,
                       session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(GameService.add_timeout, session, req.team, req.undo)
+    return await _run("add_timeout", GameService.add_timeout, session, req.team, req.undo)
 
 
 @router.post(
@@ -64,7 +81,7 @@ async def add_timeout(req: TeamActionRequest,
 )
 async def change_serve(req: ServeRequest,
                        session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(GameService.change_serve, session, req.team)
+    return await _run("change_serve", GameService.change_serve, session, req.team)
 
 
 @router.post(
@@ -73,8 +90,8 @@ async def change_serve(req: ServeRequest,
 )
 async def set_score(req: SetScoreRequest,
                     session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(
-        GameService.set_score, session, req.team, req.set_number, req.value,
+    return await _run(
+        "set_score", GameService.set_score, session, req.team, req.set_number, req.value,
     )
 
 
@@ -84,7 +101,7 @@ async def set_score(req: SetScoreRequest,
 )
 async def set_sets(req: SetSetsRequest,
                    session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(GameService.set_sets_value, session, req.team, req.value)
+    return await _run("set_sets_value", GameService.set_sets_value, session, req.team, req.value)
 
 
 @router.post(
@@ -92,7 +109,7 @@ async def set_sets(req: SetSetsRequest,
     response_model=ActionResponse,
 )
 async def reset_game(session: GameSession = Depends(get_mutation_session)) -> ActionResponse:
-    return await run_in_threadpool(GameService.reset, session)
+    return await _run("reset", GameService.reset, session)
 
 
 @router.post(
@@ -106,7 +123,7 @@ async def start_match(session: GameSession = Depends(get_mutation_session)) -> A
     original anchor in place. The HUD timer / report duration / undo
     flow all read this field downstream.
     """
-    return await run_in_threadpool(GameService.start_match, session)
+    return await _run("start_match", GameService.start_match, session)
 
 
 @router.post(
@@ -120,4 +137,4 @@ async def undo_last(session: GameSession = Depends(get_mutation_session)) -> Act
     ``undo=True``. Returns ``success=false`` with message
     ``"Nothing to undo."`` when the log has no eligible entry.
     """
-    return await run_in_threadpool(GameService.undo_last, session)
+    return await _run("undo_last", GameService.undo_last, session)
@@ -1,4 +1,4 @@
-"""Router lifespan: background session cleanup and per-OID init locks."""
+"""Router lifespan: background session cleanup, startup warm-up and per-OID init locks."""
 
 import asyncio
 import logging
@@ -8,10 +8,11 @@ from weakref import WeakValueDictionary
 
 from fastapi import FastAPI
 
+from app.api import warmup
 from app.api.session_manager import SessionManager
 from app.api.webhooks import webhook_dispatcher
 from app.api.ws_hub import WSHub
-from app.constants import AUTH_SESSION_SWEEP_INTERVAL_SECONDS
+from app.constants import AUTH_SESSION_SWEEP_INTERVAL_SECONDS, WARMUP_OVERLAYS
 from app.overlay_executor import shutdown_overlay_executor
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ _GAME_SESSION_CLEANUP_INTERVAL_SECONDS = 3600
 
 _cleanup_task: asyncio.Task[None] | None = None
 _auth_sweep_task: asyncio.Task[None] | None = None
+_warmup_task: asyncio.Task[int] | None = None
 # WeakValueDictionary auto-evicts entries once all strong refs to the lock are
 # released — i.e. once every caller has exited its ``async with get_init_lock``
 # block. This avoids a race where a manual cleanup could delete a lock between
@@ -92,8 +94,14 @@ async def _auth_session_sweep_loop() -> None:
 
 @asynccontextmanager
 async def router_lifespan(app: FastAPI) -> AsyncIterator[None]:
-    global _cleanup_task, _auth_sweep_task
+    global _cleanup_task, _auth_sweep_task, _warmup_task
     _cleanup_task = asyncio.create_task(_session_cleanup_loop())
+    # Opt-in preload of the busiest overlays. It runs in the background so
+    # the app still comes up at once; ``/health/ready`` holds traffic off
+    # until it is done (see ``app/api/warmup.py``).
+    if WARMUP_OVERLAYS > 0:
+        warmup.mark_pending()
+        _warmup_task = asyncio.create_task(warmup.run_warmup())
     # 0 disables the sweep entirely (operators running an external janitor).
     if AUTH_SESSION_SWEEP_INTERVAL_SECONDS > 0:
         _auth_sweep_task = asyncio.create_task(_auth_session_sweep_loop())
@@ -105,11 +113,19 @@ async def router_lifespan(app: FastAPI) -> AsyncIterator[None]:
     if _auth_sweep_task:
         _auth_sweep_task.cancel()
         _auth_sweep_task = None
+    if _warmup_task:
+        _warmup_task.cancel()
+        _warmup_task = None
     WSHub.stop_heartbeat()
     SessionManager.clear()
     # Backends share one bounded pool. Individual session eviction must not
     # stop workers used by another overlay, so drain it exactly once here.
     shutdown_overlay_executor()
+    # Only after the executor has drained: its last pushes may still have
+    # dirtied overlay state that write-behind mode has not persisted yet.
+    from app.overlay import overlay_state_store
+
+    overlay_state_store.close()
     # Drain in-flight deliveries with cancel_futures=True so a hung
     # outbound webhook can't keep the process alive past shutdown.
     webhook_dispatcher.shutdown()
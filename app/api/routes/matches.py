@@ -52,8 +52,8 @@ def _require_owned(match_id: str, user: User) -> None:
     """404 unless *match_id* exists and belongs to *user*.
 
     Reads only ``match_reports.user_id`` — routes that never touch the snapshot
-    must not drag ``final_state``, ``customization`` and the entire
-    ``audit_log`` JSON column across the wire just to compare an integer.
+    must not drag ``final_state``, ``customization`` and the audit
+    transcript across the wire just to compare an integer.
     """
     if match_archive.owner_user_id(match_id) != user.id:
         raise HTTPException(status_code=404, detail="Match not found.")
@@ -34,18 +34,17 @@ def _resolve_skey(
     storage key, or ``None``."""
     with session_scope() as db:
         if token:
-            overlay = overlays_service.get_by_control_token(db, token)
-            return overlays_service.skey_for(overlay) if overlay is not None else None
+            return overlays_service.resolve_control_token(db, token)
         if public_user:
             overlay = overlays_service.get_public_by_username_and_oid(db, public_user, oid or "")
             return overlays_service.skey_for(overlay) if overlay is not None else None
         raw = ws.cookies.get(sessions.COOKIE_NAME)
         if not raw or not oid:
             return None
-        user = sessions.resolve_session(db, raw)
-        if user is None:
+        user_id = sessions.resolve_session_user_id(db, raw)
+        if user_id is None:
             return None
-        return make_skey(user.id, oid)
+        return make_skey(user_id, oid)
 
 
 @router.websocket("/ws")
@@ -341,11 +341,81 @@ class GameSession:
 
 
 
+class _CreationSlot:
+    """Per-OID construction lock plus the number of callers holding it.
+
+    Lives in ``SessionManager._creating`` only while some caller is
+    building (or waiting to build) that OID's session; the last one out
+    removes it, so the map never outgrows the set of in-flight creations.
+    """
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.users = 0
+
+
 class SessionManager:
-    """Thread-safe singleton managing GameSession instances by OID."""
+    """Thread-safe singleton managing GameSession instances by OID.
+
+    Read-mostly registry. ``_sessions`` is only *mutated* under ``_lock``,
+    and every mutation is a single dict store or pop, so lookups of an
+    existing session (``get``, ``peek`` and the ``get_or_create`` fast
+    path) read it without taking any lock — a dict lookup is atomic, and
+    the hot path of every request should not serialize on the process.
+
+    Creating a session is slow: it builds a ``Backend``, reads
+    ``session_meta`` and the audit log from disk and writes the meta back.
+    That work runs under a per-OID :class:`_CreationSlot` rather than the
+    class lock, so thirty courts opening at once build their sessions in
+    parallel and none of them blocks a hot request for a live court.
+    ``_lock`` is held only for the registry stores themselves.
+    """
 
     _sessions: dict[str, GameSession] = {}
     _lock = threading.Lock()
+    _creating: dict[str, _CreationSlot] = {}
+
+    @classmethod
+    def _lookup(cls, oid: str) -> GameSession | None:
+        """Lock-free lookup that bumps ``last_accessed``.
+
+        ``cleanup_expired`` re-checks ``last_accessed`` after popping and
+        reinstates a session that was touched in between, so re-reading
+        the registry *after* the touch tells us whether this caller won
+        that race. If it did not, fall back to the locked read, which
+        cannot observe the pop/reinstate window.
+        """
+        session = cls._sessions.get(oid)
+        if session is None:
+            return None
+        session.touch()
+        if cls._sessions.get(oid) is session:
+            return session
+        with cls._lock:
+            session = cls._sessions.get(oid)
+            if session is not None:
+                session.touch()
+            return session
+
+    @classmethod
+    def _acquire_slot(cls, oid: str) -> _CreationSlot:
+        with cls._lock:
+            slot = cls._creating.get(oid)
+            if slot is None:
+                slot = cls._creating[oid] = _CreationSlot()
+            slot.users += 1
+        slot.lock.acquire()
+        return slot
+
+    @classmethod
+    def _release_slot(cls, oid: str, slot: _CreationSlot) -> None:
+        slot.lock.release()
+        with cls._lock:
+            slot.users -= 1
+            if slot.users == 0 and cls._creating.get(oid) is slot:
+                del cls._creating[oid]
 
     @classmethod
     def get_or_create(
@@ -362,14 +432,14 @@ class SessionManager:
         If *conf* or *backend* are ``None`` and the session doesn't exist yet,
         sensible defaults are constructed from environment variables.
 
-        Backend and GameSession construction happen inside the global lock
-        only after a session-exists re-check: two racing callers on the
-        same OID cannot both allocate a ``Backend``. Lock contention is
-        bounded because the fast path (existing session) never enters the
-        construction block. Backends share the process-wide overlay executor,
-        so creating a session does not allocate its own worker pool.
+        An existing session is found without locking. Otherwise the caller
+        takes the OID's creation slot and re-checks: two racing callers on
+        the same OID cannot both allocate a ``Backend``, while callers on
+        different OIDs build concurrently. Backends share the process-wide
+        overlay executor, so creating a session does not allocate its own
+        worker pool.
         """
-        def _apply_limits(session: GameSession) -> None:
+        def _apply_limits(session: GameSession) -> GameSession:
             changed = False
             if points_limit is not None and session.points_limit != points_limit:
                 session.points_limit = points_limit
@@ -383,13 +453,18 @@ class SessionManager:
                 changed = True
             if changed:
                 session.persist_meta()
+            return session
 
-        with cls._lock:
-            session = cls._sessions.get(oid)
+        session = cls._lookup(oid)
+        if session is not None:
+            return _apply_limits(session)
+
+        slot = cls._acquire_slot(oid)
+        try:
+            # Whoever held the slot before us may have just built it.
+            session = cls._lookup(oid)
             if session is not None:
-                session.touch()
-                _apply_limits(session)
-                return session
+                return _apply_limits(session)
 
             if conf is None:
                 conf = Conf()
@@ -421,18 +496,17 @@ class SessionManager:
             # Persist the resulting meta so a future restart can
             # rehydrate without requiring any mutation in between.
             new_session.persist_meta()
-            cls._sessions[oid] = new_session
-            set_active_sessions(len(cls._sessions))
+            with cls._lock:
+                cls._sessions[oid] = new_session
+                set_active_sessions(len(cls._sessions))
             return new_session
+        finally:
+            cls._release_slot(oid, slot)
 
     @classmethod
     def get(cls, oid: str) -> GameSession | None:
         """Return an existing session or ``None``."""
-        with cls._lock:
-            session = cls._sessions.get(oid)
-            if session is not None:
-                session.touch()
-            return session
+        return cls._lookup(oid)
 
     @classmethod
     def peek(cls, oid: str) -> GameSession | None:
@@ -441,8 +515,7 @@ class SessionManager:
         Used by inspect-only paths (admin usage endpoint) that need to
         report liveness without resetting the eviction TTL.
         """
-        with cls._lock:
-            return cls._sessions.get(oid)
+        return cls._sessions.get(oid)
 
     @classmethod
     def _release_oid_caches(cls, oid: str) -> None:
@@ -463,12 +536,22 @@ class SessionManager:
 
     @classmethod
     def remove(cls, oid: str) -> None:
-        """Remove a session (e.g. on disconnect)."""
-        with cls._lock:
-            session = cls._sessions.pop(oid, None)
-            if session:
-                session.shutdown()
-            set_active_sessions(len(cls._sessions))
+        """Remove a session (e.g. on disconnect).
+
+        Takes the OID's creation slot first, so a removal that races an
+        in-flight construction lands after it, exactly as it did when
+        both ran under the class lock, instead of being undone by the
+        creator's registry store.
+        """
+        slot = cls._acquire_slot(oid)
+        try:
+            with cls._lock:
+                session = cls._sessions.pop(oid, None)
+                set_active_sessions(len(cls._sessions))
+        finally:
+            cls._release_slot(oid, slot)
+        if session:
+            session.shutdown()
         cls._release_oid_caches(oid)
 
     @classmethod
@@ -484,17 +567,25 @@ class SessionManager:
     def cleanup_expired(cls) -> int:
         """Remove sessions that have not been accessed within the TTL."""
         now = time.monotonic()
+        evicted: list[tuple[str, GameSession]] = []
         with cls._lock:
-            expired = [
+            candidates = [
                 oid for oid, session in cls._sessions.items()
                 if (now - session.last_accessed) > SESSION_TTL_SECONDS
             ]
-            for oid in expired:
+            for oid in candidates:
                 session = cls._sessions.pop(oid)
-                session.shutdown()
-                logger.info("Expired session for OID=%s", oid)
-            if expired:
+                # A lock-free ``get`` may have touched it between the scan
+                # and the pop; that caller now holds it, so put it back
+                # (see ``_lookup``).
+                if (time.monotonic() - session.last_accessed) <= SESSION_TTL_SECONDS:
+                    cls._sessions[oid] = session
+                    continue
+                evicted.append((oid, session))
+            if evicted:
                 set_active_sessions(len(cls._sessions))
-        for oid in expired:
+        for oid, session in evicted:
+            session.shutdown()
+            logger.info("Expired session for OID=%s", oid)
             cls._release_oid_caches(oid)
-        return len(expired)
+        return len(evicted)
@@ -0,0 +1,127 @@
+"""Optional startup warm-up of the busiest overlays' in-process caches.
+
+Everything per-overlay is lazy: the overlay state context
+(``OverlayStateStore.get_overlay_context``) parses ``overlay_state_*.json``
+and the audit-record cache (``action_log``) parses the full audit JSONL the
+first time anything asks for them. After a deploy that first ask is every
+court's first tap, so a rolling restart mid-tournament used to show up as
+a latency spike on each court's first point.
+
+With ``WARMUP_OVERLAYS`` > 0 the router lifespan runs :func:`run_warmup`
+as a background task: it picks the most recently written overlays
+(:meth:`OverlayStateStore.recent_overlay_ids`) and loads both caches for
+them on a bounded thread pool. :func:`readiness` reports whether that has
+finished, and ``/health/ready`` answers 503 until it has (or until the
+timeout gives up on it), so an orchestrator only shifts traffic to the new
+replica once it is warm. With warm-up disabled the replica is ready at once.
+
+``GameSession`` objects themselves are not pre-built: ``init_session``
+validates the overlay and resolves its configuration from the database
+before creating one, and a session created behind its back would skip
+that. Building a session is cheap once the caches it reads are warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.constants import WARMUP_OVERLAYS, WARMUP_TIMEOUT_SECONDS, WARMUP_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# ``None`` while a warm-up is pending or running; the outcome once done.
+_result: dict[str, object] | None = {"state": "disabled"}
+
+
+def readiness() -> tuple[bool, dict[str, object]]:
+    """``(ready, detail)`` for the readiness probe."""
+    with _lock:
+        if _result is None:
+            return False, {"state": "running"}
+        return True, dict(_result)
+
+
+def _set_result(result: dict[str, object] | None) -> None:
+    global _result
+    with _lock:
+        _result = result
+
+
+def mark_pending() -> None:
+    """Flip readiness to "not ready" before :func:`run_warmup` is scheduled.
+
+    Called synchronously in the lifespan so no probe can slip in between
+    startup and the first step of the background task.
+    """
+    _set_result(None)
+
+
+def warm_overlay(oid: str) -> None:
+    """Load *oid*'s overlay state context and audit-record cache."""
+    from app.api import action_log
+    from app.overlay import overlay_state_store
+
+    overlay_state_store.get_overlay_context(oid)
+    action_log.read_all(oid)
+
+
+def _warm_one(oid: str) -> bool:
+    try:
+        warm_overlay(oid)
+    except Exception:
+        logger.exception("Warm-up failed for overlay %s", oid)
+        return False
+    return True
+
+
+async def run_warmup(
+    limit: int = WARMUP_OVERLAYS,
+    workers: int = WARMUP_WORKERS,
+    timeout: float = WARMUP_TIMEOUT_SECONDS,
+) -> int:
+    """Preload the *limit* most recent overlays; return how many succeeded.
+
+    Always ends with readiness set, whether the warm-up finished, failed or
+    ran out of *timeout*: a slow disk may delay traffic, never block it.
+    """
+    from app.overlay import overlay_state_store
+
+    if limit <= 0:
+        _set_result({"state": "disabled"})
+        return 0
+    started = time.monotonic()
+    _set_result(None)
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+    warmed = 0
+    state = "done"
+    try:
+        ids = await loop.run_in_executor(
+            pool, overlay_state_store.recent_overlay_ids, limit,
+        )
+        jobs = [loop.run_in_executor(pool, _warm_one, oid) for oid in ids]
+        if jobs:
+            done, pending = await asyncio.wait(jobs, timeout=timeout)
+            warmed = sum(1 for job in done if job.result())
+            if pending:
+                state = "timed_out"
+                logger.warning(
+                    "Warm-up gave up after %.1fs with %d overlays still loading",
+                    timeout, len(pending),
+                )
+    except Exception:
+        state = "failed"
+        logger.exception("Startup warm-up failed")
+    finally:
+        # Do not wait for stragglers past the timeout; they finish (or not)
+        # in the background and only ever fill a cache.
+        pool.shutdown(wait=False, cancel_futures=True)
+        elapsed = time.monotonic() - started
+        _set_result({"state": state, "overlays": warmed, "seconds": round(elapsed, 3)})
+    logger.info("Warm-up preloaded %d overlays in %.2fs", warmed, elapsed)
+    return warmed
@@ -7,7 +7,8 @@ once the receiving service is healthy again via
 
 Record schema (one JSON object per line)::
 
-    {"ts": 1714508400.123,
+    {"seq": 42,
+     "ts": 1714508400.123,
      "url": "https://hooks.example.com/scoreboard",
      "event": "set_end",
      "oid": "abc",
@@ -15,6 +16,11 @@ Record schema (one JSON object per line)::
      "last_error": "HTTP 503",
      "attempts": 4}
 
+``seq`` is a per-file sequence number assigned on append and never
+reused, so the replay endpoint can page through the file with an
+``after`` cursor and settle exactly the records it replayed even if new
+failures land meanwhile.
+
 The ``body`` is stored as a UTF-8 string (the JSON payload that would
 have been sent), so the file is human-inspectable. The HMAC ``secret``
 is **not** persisted: replay re-resolves the matching ``WebhookTarget``
@@ -22,9 +28,27 @@ from the live config and re-signs with the current secret. That way
 rotating ``WEBHOOKS_SECRET`` does not strand legacy DL entries with
 stale signatures, and a leaked DL file does not leak signing keys.
 
-I/O is protected by a module-level lock so a producer thread (the
-webhook ThreadPoolExecutor) and a consumer (the admin replay
-handler) cannot interleave half-written records.
+Ring layout. The file is append-only between compactions: records live
+in the byte range ``[head, size)`` and eviction of the oldest record
+just advances ``head`` past its line, so a receiver outage that keeps
+the file at ``WEBHOOK_DEAD_LETTER_MAX_RECORDS`` costs one line write
+plus one line read per new failure instead of a scan and a full
+rewrite. The dead prefix is reclaimed by a rewrite only once it
+outweighs the live records, which keeps the rewrite cost amortized
+constant per append. ``head``, the record count, the covered file
+size and the next ``seq`` are persisted in a small ``.idx`` sidecar.
+
+The sidecar is *derived* data. Every call checks it against the file
+size: appends it does not cover (crash between the line write and the
+sidecar write) are counted from its recorded size, a torn final line is
+truncated away, and anything it cannot vouch for — missing, corrupt,
+the file shrank or was replaced — costs one scan of the file to rebuild
+it, re-applying the cap to the evicted prefix it can no longer tell
+apart. A file written before ``seq`` existed is renumbered on that scan.
+
+I/O is protected by a module-level lock so producers (the webhook
+delivery workers) and a consumer (the admin replay handler) cannot
+interleave half-written records.
 """
 from __future__ import annotations
 
@@ -34,7 +58,9 @@ import os
 import tempfile
 import threading
 import time
+from collections.abc import Iterable, Iterator
 
+from app.api._persistence_paths import atomic_write_json
 from app.api._persistence_paths import data_dir as _shared_data_dir
 from app.constants import WEBHOOK_DEAD_LETTER_MAX_RECORDS
 from app.metrics import set_dead_letter_size
@@ -44,6 +70,39 @@ logger = logging.getLogger(__name__)
 _lock = threading.Lock()
 
 _FILENAME = "webhooks_dead_letter.jsonl"
+_INDEX_SUFFIX = ".idx"
+_INDEX_VERSION = 1
+
+# Never compact a dead prefix smaller than this: rewriting a few KiB on
+# every other eviction would be busywork.
+_COMPACT_MIN_BYTES = 64 * 1024
+
+
+class _Index:
+    """Where the live records are inside the dead-letter file."""
+
+    __slots__ = ("count", "head", "next_seq", "size")
+
+    def __init__(self, head: int = 0, size: int = 0, count: int = 0,
+                 next_seq: int = 1) -> None:
+        self.head = head
+        self.size = size
+        self.count = count
+        self.next_seq = next_seq
+
+    def as_json(self) -> dict:
+        return {
+            "version": _INDEX_VERSION,
+            "head": self.head,
+            "size": self.size,
+            "count": self.count,
+            "next_seq": self.next_seq,
+        }
+
+
+# Per-path cache of the sidecar, so steady-state calls do not re-read it.
+# Keyed by path because tests point ``_data_dir`` somewhere new per case.
+_indexes: dict[str, _Index] = {}
 
 
 def _data_dir() -> str:
@@ -55,40 +114,239 @@ def _path() -> str:
     return os.path.join(_data_dir(), _FILENAME)
 
 
-def _count_lines_locked(path: str) -> int:
-    """Return the current record count in *path* (caller holds ``_lock``).
+def _index_path(path: str) -> str:
+    return path + _INDEX_SUFFIX
+
+
+def _file_size(path: str) -> int | None:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
 
-    Counts non-empty lines so partially-written tails (the writer crashed
-    between ``write`` and ``\n``) are forgiven. Used by ``append`` to
-    decide whether to evict and by ``set_dead_letter_size`` callers.
+
+def _read_index_file(path: str) -> _Index | None:
+    try:
+        with open(_index_path(path), encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(raw, dict) or raw.get("version") != _INDEX_VERSION:
+        return None
+    try:
+        index = _Index(
+            head=int(raw["head"]),
+            size=int(raw["size"]),
+            count=int(raw["count"]),
+            next_seq=int(raw["next_seq"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not 0 <= index.head <= index.size or index.count < 0 or index.next_seq < 1:
+        return None
+    return index
+
+
+def _save_index_locked(path: str, index: _Index) -> None:
+    """Persist *index* next to *path*. Best-effort: a stale sidecar is
+    repaired by the next :func:`_load_index_locked`."""
+    _indexes[path] = index
+    try:
+        atomic_write_json(_index_path(path), index.as_json())
+    except OSError as exc:
+        logger.warning("Failed to write webhook DL index: %s", exc)
+
+
+def _iter_lines(path: str, start: int, end: int | None = None) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for complete lines in ``[start, end)``.
+
+    *line* keeps its trailing newline; a final line without one is torn
+    (the writer died mid-line) and is not yielded.
     """
-    if not os.path.exists(path):
-        return 0
-    n = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if end is not None and offset >= end:
+                return
+            if not line.endswith(b"\n"):
+                return
+            yield offset, line
+            offset += len(line)
+
+
+def _seq_of(line: bytes) -> int | None:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    seq = record.get("seq") if isinstance(record, dict) else None
+    return seq if isinstance(seq, int) and not isinstance(seq, bool) else None
+
+
+def _truncate_torn_tail(path: str, good_end: int, actual: int) -> int:
+    """Drop bytes after the last complete line; returns the new size."""
+    if good_end >= actual:
+        return actual
     try:
-        with open(path, encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    n += 1
+        with open(path, "r+b") as f:
+            f.truncate(good_end)
     except OSError as exc:
-        logger.warning("Failed to count webhook DL records: %s", exc)
-    return n
+        logger.warning("Failed to trim torn webhook DL tail: %s", exc)
+        return actual
+    logger.warning(
+        "Webhook DL: dropped %d bytes of a torn final record", actual - good_end,
+    )
+    return good_end
+
+
+def _rebuild_locked(path: str, actual: int) -> _Index:
+    """Re-derive the index with one full scan of *path*.
+
+    Records without a ``seq`` (files written before sequence numbers)
+    are renumbered and the file rewritten once, so every later call can
+    rely on them.
+    """
+    index = _Index()
+    end = 0
+    missing_seq = False
+    max_seq = 0
+    for offset, line in _iter_lines(path, 0):
+        end = offset + len(line)
+        if not line.strip():
+            continue
+        index.count += 1
+        seq = _seq_of(line)
+        if seq is None:
+            missing_seq = True
+        else:
+            max_seq = max(max_seq, seq)
+    index.size = _truncate_torn_tail(path, end, actual)
+    index.next_seq = max_seq + 1
+    if missing_seq:
+        records = list(_parse_lines(path, 0, index.size))
+        for record in records:
+            if not isinstance(record.get("seq"), int):
+                record["seq"] = index.next_seq
+                index.next_seq += 1
+        index = _rewrite_locked(path, records, index.next_seq)
+    # Without a sidecar the evicted prefix looks live again; it is exactly
+    # the oldest records, so re-applying the cap restores the ring.
+    cap = max(1, WEBHOOK_DEAD_LETTER_MAX_RECORDS)
+    if index.count > cap:
+        _evict_oldest_locked(path, index, index.count - cap)
+    _save_index_locked(path, index)
+    return index
+
+
+def _load_index_locked(path: str) -> _Index:
+    """Return an index that matches *path* as it is on disk now.
+
+    The common case — cached sidecar whose ``size`` equals the file
+    size — costs one ``stat``.
+    """
+    actual = _file_size(path)
+    if actual is None:
+        empty = _Index()
+        _indexes[path] = empty
+        return empty
+    index = _indexes.get(path) or _read_index_file(path)
+    if index is not None and index.size == actual:
+        _indexes[path] = index
+        return index
+    if index is None or index.size > actual:
+        return _rebuild_locked(path, actual)
+    # The file grew past what the sidecar covers: count the lines that
+    # landed after it (the sidecar write is the second half of an append).
+    end = index.size
+    for offset, line in _iter_lines(path, index.size):
+        end = offset + len(line)
+        if line.strip():
+            index.count += 1
+            seq = _seq_of(line)
+            if seq is None:
+                return _rebuild_locked(path, actual)
+            index.next_seq = max(index.next_seq, seq + 1)
+    index.size = _truncate_torn_tail(path, end, actual)
+    _save_index_locked(path, index)
+    return index
+
+
+def _parse_lines(path: str, start: int, end: int) -> Iterator[dict]:
+    """Yield the JSON records in ``[start, end)``, skipping malformed lines."""
+    for _offset, line in _iter_lines(path, start, end):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            logger.debug("Skipping malformed DL line: %s", exc)
+            continue
+        if isinstance(record, dict):
+            yield record
+
+
+def _encode(record: dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _rewrite_locked(path: str, records: Iterable[dict], next_seq: int) -> _Index:
+    """Tempfile + ``os.replace`` rewrite with ``head`` back at 0."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix=".tmp",
+    )
+    index = _Index(next_seq=next_seq)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for r in records:
+                line = _encode(r)
+                f.write(line)
+                index.size += len(line)
+                index.count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return index
+
+
+def _evict_oldest_locked(path: str, index: _Index, n: int) -> None:
+    """Advance ``head`` past the *n* oldest records."""
+    evicted = 0
+    for offset, line in _iter_lines(path, index.head, index.size):
+        if evicted >= n:
+            break
+        index.head = offset + len(line)
+        if line.strip():
+            evicted += 1
+            index.count -= 1
+
+
+def _maybe_compact_locked(path: str, index: _Index) -> _Index:
+    """Reclaim the evicted prefix once it outweighs the live records."""
+    dead = index.head
+    if dead < _COMPACT_MIN_BYTES or dead < index.size - index.head:
+        return index
+    records = _parse_lines(path, index.head, index.size)
+    return _rewrite_locked(path, records, index.next_seq)
 
 
 def append(record: dict) -> None:
     """Append a JSON record to the dead-letter file.
 
-    When the resulting record count would exceed
-    ``WEBHOOK_DEAD_LETTER_MAX_RECORDS``, the oldest entries are dropped
-    so the file stays bounded. Eviction is FIFO (preserving the most
-    recent failures, which are most likely to still be relevant for a
-    replay) and runs under the same lock that serialises every other
-    mutation, so a concurrent ``read_all`` or ``replay_records`` can
-    never observe a torn rewrite.
+    Assigns the record its ``seq`` (and ``ts`` when missing). When the
+    record count would exceed ``WEBHOOK_DEAD_LETTER_MAX_RECORDS``, the
+    oldest entries are evicted by advancing the ring head, so the live
+    set stays bounded. Eviction is FIFO (preserving the most recent
+    failures, which are most likely to still be relevant for a replay)
+    and runs under the same lock that serialises every other mutation,
+    so a concurrent read or replay never observes a torn state.
 
     Best-effort: filesystem errors are logged but never raised so a
-    write failure here cannot kill the GameService action that fired
-    the webhook.
+    write failure here cannot kill the caller that fired the webhook.
     """
     record = dict(record)
     record.setdefault("ts", time.time())
@@ -96,80 +354,138 @@ def append(record: dict) -> None:
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with _lock:
-            current = _count_lines_locked(path)
+            index = _load_index_locked(path)
+            record["seq"] = index.next_seq
+            line = _encode(record)
+            with open(path, "ab") as f:
+                f.write(line)
+            index.next_seq += 1
+            index.size += len(line)
+            index.count += 1
             cap = max(1, WEBHOOK_DEAD_LETTER_MAX_RECORDS)
-            if current + 1 > cap:
-                # Need to drop ``overflow`` of the oldest records to make
-                # room for the new one. Read everything, slice the tail,
-                # and rewrite atomically (tempfile + os.replace).
-                overflow = current + 1 - cap
-                kept = _read_records_locked(path)[overflow:]
-                kept.append(record)
-                _write_records_atomic_locked(path, kept)
+            if index.count > cap:
+                overflow = index.count - cap
+                _evict_oldest_locked(path, index, overflow)
                 logger.warning(
                     "Webhook DL evicted %d oldest records (cap=%d)",
                     overflow, cap,
                 )
-                set_dead_letter_size(len(kept))
-                return
-            line = json.dumps(record, ensure_ascii=False) + "\n"
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(line)
-            set_dead_letter_size(current + 1)
+                index = _maybe_compact_locked(path, index)
+            _save_index_locked(path, index)
+            set_dead_letter_size(index.count)
     except OSError as exc:
         logger.warning("Failed to append webhook dead-letter: %s", exc)
 
 
-def _read_records_locked(path: str) -> list[dict]:
-    """Read every JSON record at *path* (caller holds ``_lock``)."""
-    records: list[dict] = []
-    if not os.path.exists(path):
-        return records
-    try:
-        with open(path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    records.append(json.loads(line))
-                except json.JSONDecodeError as exc:
-                    logger.debug("Skipping malformed DL line: %s", exc)
-    except OSError as exc:
-        logger.warning("Failed to read webhook DL: %s", exc)
-    return records
-
-
-def _write_records_atomic_locked(path: str, records: list[dict]) -> None:
-    """Tempfile + ``os.replace`` rewrite (caller holds ``_lock``)."""
-    fd, tmp_path = tempfile.mkstemp(
-        dir=os.path.dirname(path), suffix=".tmp",
-    )
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            for r in records:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
-        os.replace(tmp_path, path)
-    except BaseException:
+def _matches(
+    record: dict,
+    *,
+    since: float | None,
+    event: str | None,
+    url: str | None,
+    oid: str | None,
+    after: int | None,
+) -> bool:
+    if since is not None and record.get("ts", 0) < since:
+        return False
+    if event is not None and record.get("event") != event:
+        return False
+    if url is not None and record.get("url") != url:
+        return False
+    if oid is not None and record.get("oid") != oid:
+        return False
+    if after is not None:
+        seq = record.get("seq")
+        return isinstance(seq, int) and seq > after
+    return True
+
+
+def read_page(
+    *,
+    since: float | None = None,
+    event: str | None = None,
+    url: str | None = None,
+    oid: str | None = None,
+    after: int | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Return up to *limit* live records matching every given filter.
+
+    Oldest first. Streams from the ring head and stops at *limit*, so a
+    page costs the records it skips plus the ones it returns rather than
+    the whole file. *after* is a ``seq`` cursor: only records appended
+    after it are returned.
+    """
+    path = _path()
+    page: list[dict] = []
+    if limit is not None and limit <= 0:
+        return page
+    with _lock:
         try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        raise
+            index = _load_index_locked(path)
+            if index.count == 0:
+                return page
+            for record in _parse_lines(path, index.head, index.size):
+                if _matches(record, since=since, event=event, url=url,
+                            oid=oid, after=after):
+                    page.append(record)
+                    if limit is not None and len(page) >= limit:
+                        break
+        except OSError as exc:
+            logger.warning("Failed to read webhook DL: %s", exc)
+    return page
 
 
 def read_all() -> list[dict]:
     """Return every record in append order. Empty list when the file is missing."""
-    path = _path()
-    with _lock:
-        return _read_records_locked(path)
+    return read_page()
 
 
 def count() -> int:
-    """Return the current record count without parsing every line."""
+    """Return the current record count from the index (no parsing)."""
     path = _path()
     with _lock:
-        return _count_lines_locked(path)
+        try:
+            return _load_index_locked(path).count
+        except OSError as exc:
+            logger.warning("Failed to count webhook DL records: %s", exc)
+            return 0
+
+
+def settle(delivered: Iterable[int], updated: Iterable[dict]) -> int:
+    """Apply a replay's outcome in one rewrite; returns the remaining count.
+
+    Records whose ``seq`` is in *delivered* are removed; each record in
+    *updated* replaces the live record with the same ``seq`` in place
+    (new ``attempts`` / ``last_error``), so a failed replay keeps its
+    position and a paging cursor stays meaningful. Records appended
+    while the replay ran are untouched.
+    """
+    drop = set(delivered)
+    replacements = {
+        r["seq"]: r for r in updated if isinstance(r.get("seq"), int)
+    }
+    path = _path()
+    try:
+        with _lock:
+            index = _load_index_locked(path)
+            if not drop and not replacements:
+                return index.count
+            if index.count == 0:
+                return 0
+            kept = []
+            for record in _parse_lines(path, index.head, index.size):
+                seq = record.get("seq")
+                if seq in drop:
+                    continue
+                kept.append(replacements.get(seq, record))
+            index = _rewrite_locked(path, kept, index.next_seq)
+            _save_index_locked(path, index)
+        set_dead_letter_size(index.count)
+        return index.count
+    except OSError as exc:
+        logger.warning("Failed to settle webhook dead-letter replay: %s", exc)
+        return count()
 
 
 def replace_all(records: list[dict]) -> None:
@@ -177,26 +493,35 @@ def replace_all(records: list[dict]) -> None:
 
     Tempfile + ``os.replace`` so a crash mid-write cannot leave the
     file half-written; either the new content or the old one survives.
-    Used by the admin replay handler after pruning successfully
-    re-delivered entries.
+    Records without a ``seq`` get a fresh one.
     """
     path = _path()
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with _lock:
-            _write_records_atomic_locked(path, records)
+            next_seq = _load_index_locked(path).next_seq
+            stamped = []
+            for r in records:
+                if not isinstance(r.get("seq"), int):
+                    r = {**r, "seq": next_seq}
+                    next_seq += 1
+                stamped.append(r)
+            index = _rewrite_locked(path, stamped, next_seq)
+            _save_index_locked(path, index)
         set_dead_letter_size(len(records))
     except OSError as exc:
         logger.warning("Failed to rewrite webhook dead-letter: %s", exc)
 
 
 def clear() -> None:
-    """Remove the dead-letter file entirely. No-op if missing."""
+    """Remove the dead-letter file and its index. No-op if missing."""
     path = _path()
     try:
         with _lock:
-            if os.path.exists(path):
-                os.remove(path)
+            _indexes.pop(path, None)
+            for target in (path, _index_path(path)):
+                if os.path.exists(target):
+                    os.remove(target)
         set_dead_letter_size(0)
     except OSError as exc:
         logger.warning("Failed to clear webhook dead-letter: %s", exc)
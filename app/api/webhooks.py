@@ -12,7 +12,8 @@ Configured via environment variables:
         {"url": "https://hooks.example.com/scoreboard",
          "secret": "abc123",
          "events": ["set_end", "match_end"],
-         "timeout_s": 5}
+         "timeout_s": 5,
+         "batch_max": 1}
       ]
 
   ``WEBHOOKS_JSON`` takes precedence over ``WEBHOOKS_URL`` when both
@@ -22,37 +23,57 @@ Configured via environment variables:
 - ``WEBHOOKS_TIMEOUT_S`` (float)   — POST timeout for the *single-URL* form,
   in seconds (default 5). The ``WEBHOOKS_JSON`` form carries its own
   per-target ``timeout_s``.
+- ``WEBHOOKS_BATCH_MAX`` (int)    — most events the *single-URL* form
+  folds into one POST when deliveries back up (default 1: no batching).
+  ``WEBHOOKS_JSON`` entries carry their own ``batch_max``.
 - ``WEBHOOKS_ALLOW_PRIVATE_IPS`` (bool) — opt out of the SSRF guard for
   trusted-LAN receivers. See :func:`_allow_private_targets`.
 
 Recognised events: ``set_end``, ``match_end``, ``timeout``,
 ``serve_change``. The signature header is ``X-Webhook-Signature:
 sha256=<hex>`` computed over the raw JSON body. Delivery is
-fire-and-forget on a small thread pool with a per-target timeout —
-failures are logged but never propagate.
+fire-and-forget with a per-target timeout — failures are logged but
+never propagate.
+
+Delivery engine: every target owns an ordered, bounded queue
+(``WEBHOOK_TARGET_QUEUE_MAX``) and a keep-alive ``requests.Session``.
+A small shared pool of workers services whichever targets have work
+due, one worker per target at a time, so events reach each receiver in
+dispatch order and a slow receiver holds at most one worker instead of
+the whole pool. Retry backoff is a timestamp on the target's queue, not
+a ``time.sleep`` in a worker: the thread moves on to other targets and
+comes back when the delay expires. Targets configured with
+``batch_max`` > 1 (``WEBHOOKS_BATCH_MAX`` for the single-URL form) fold
+a backlog of queued events into one POST whose body is a JSON array of
+the individual event objects; the signature covers the whole array and
+``X-Webhook-Batch`` carries the event count.
 """
 
 from __future__ import annotations
 
 import hashlib
+import heapq
 import hmac
+import itertools
 import json
 import logging
 import threading
 import time
+from collections import deque
 from collections.abc import Iterable
-from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from app.api import webhook_dead_letter
 from app.constants import (
     WEBHOOK_RETRY_ATTEMPTS,
     WEBHOOK_RETRY_BASE_SECONDS,
     WEBHOOK_RETRY_MAX_SECONDS,
+    WEBHOOK_TARGET_QUEUE_MAX,
 )
 from app.env_vars_manager import EnvVarsManager
-from app.metrics import record_webhook_outcome
+from app.metrics import record_webhook_outcome, set_webhook_queue_depth
 from app.net_guard import is_target_safe
 from app.trace_context import outbound_trace_headers
 
@@ -64,6 +85,7 @@ KNOWN_EVENTS = frozenset({"set_end", "match_end", "timeout", "serve_change"})
 _DEFAULT_TIMEOUT_S = 5.0
 _MAX_WORKERS = 4
 
+
 def _allow_private_targets() -> bool:
     """Return True iff the operator opted into private-IP webhook targets.
 
@@ -109,11 +131,12 @@ def _normalise_events(value: object) -> set[str] | None:
 class WebhookTarget:
     """A single configured endpoint."""
 
-    __slots__ = ("events", "secret", "timeout_s", "url")
+    __slots__ = ("batch_max", "events", "secret", "timeout_s", "url")
 
     def __init__(self, url: str, secret: str | None = None,
                  events: Iterable[str] | None = None,
-                 timeout_s: float = _DEFAULT_TIMEOUT_S) -> None:
+                 timeout_s: float = _DEFAULT_TIMEOUT_S,
+                 batch_max: int = 1) -> None:
         self.url = url
         self.secret = secret or None
         self.events = _normalise_events(events)
@@ -121,22 +144,106 @@ class WebhookTarget:
             self.timeout_s = float(timeout_s)
         except (TypeError, ValueError):
             self.timeout_s = _DEFAULT_TIMEOUT_S
+        try:
+            self.batch_max = max(int(batch_max), 1)
+        except (TypeError, ValueError):
+            self.batch_max = 1
 
     def accepts(self, event: str) -> bool:
         return self.events is None or event in self.events
 
 
+class _Delivery:
+    """One queued event for one target: the encoded body plus bookkeeping."""
+
+    __slots__ = ("body", "event", "oid", "trace_headers")
+
+    def __init__(self, body: bytes, event: str, oid: str,
+                 trace_headers: dict[str, str]) -> None:
+        self.body = body
+        self.event = event
+        self.oid = oid
+        self.trace_headers = trace_headers
+
+
+class _Lane:
+    """Per-target delivery state, guarded by the dispatcher's condition.
+
+    ``queue`` holds deliveries in dispatch order; the first ``inflight``
+    entries are the batch a worker is currently posting and stay at the
+    head until the outcome is known, so a retry re-sends them before
+    anything queued behind. ``attempt`` counts failed tries of that head
+    batch and ``scheduled`` says whether the lane already sits in the
+    ready heap (a lane is in the heap or being worked, never both).
+    """
+
+    __slots__ = (
+        "attempt", "inflight", "queue", "retired", "scheduled", "session",
+        "target",
+    )
+
+    def __init__(self, target: WebhookTarget) -> None:
+        self.target = target
+        self.queue: deque[_Delivery] = deque()
+        self.session = _new_session()
+        self.inflight = 0
+        self.attempt = 0
+        self.scheduled = False
+        self.retired = False
+
+    @property
+    def idle(self) -> bool:
+        return not self.queue and not self.inflight
+
+
+def _new_session() -> requests.Session:
+    """A keep-alive session sized for one in-flight request.
+
+    A lane is only ever worked by one thread at a time, so a single pooled
+    connection per scheme is all it can use; the default pool of ten would
+    just hold idle sockets open against the receiver.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number *attempt* (1-based)."""
+    return min(
+        WEBHOOK_RETRY_BASE_SECONDS * (2 ** (attempt - 1)),
+        WEBHOOK_RETRY_MAX_SECONDS,
+    )
+
+
 class WebhookDispatcher:
     """Reads env-var config on first use and dispatches events.
 
     The instance caches its target list. Tests can call ``reload`` to
     pick up monkey-patched env vars between cases.
+
+    ``dispatch`` only appends to the per-target queues (see the module
+    docstring); the workers that drain them start with the first
+    configured load and stop on ``shutdown``. ``drain`` blocks until every
+    queue is empty, for tests and orderly teardown.
     """
 
+    # Runtime-tunable copy of the per-target queue bound.
+    _QUEUE_MAX = WEBHOOK_TARGET_QUEUE_MAX
+
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._targets: list[WebhookTarget] | None = None
-        self._executor: ThreadPoolExecutor | None = None
+        # Engine state. ``_cond`` guards the lanes, the ready heap and the
+        # worker generation; ``_lock`` above only guards config loading.
+        self._cond = threading.Condition()
+        self._lanes: dict[WebhookTarget, _Lane] = {}
+        self._ready: list[tuple[float, int, _Lane]] = []
+        self._seq = itertools.count()
+        self._generation = 0
+        self._workers = 0
 
     # -- configuration ---------------------------------------------------
 
@@ -154,6 +261,7 @@ class WebhookDispatcher:
                     secret=item.get("secret"),
                     events=item.get("events"),
                     timeout_s=item.get("timeout_s", _DEFAULT_TIMEOUT_S),
+                    batch_max=item.get("batch_max", 1),
                 ))
             if targets:
                 return targets
@@ -169,6 +277,9 @@ class WebhookDispatcher:
                     _DEFAULT_TIMEOUT_S,
                     exclusive_minimum=0.0,
                 ),
+                batch_max=EnvVarsManager.get_int_env(
+                    "WEBHOOKS_BATCH_MAX", 1, minimum=1,
+                ),
             ))
         return targets
 
@@ -177,26 +288,87 @@ class WebhookDispatcher:
             return self._targets
         with self._lock:
             if self._targets is None:
-                self._targets = self._load_targets_locked()
-                if self._targets and self._executor is None:
-                    self._executor = ThreadPoolExecutor(
-                        max_workers=_MAX_WORKERS,
-                        thread_name_prefix="webhooks",
-                    )
+                targets = self._load_targets_locked()
+                if targets:
+                    self._start_workers(len(targets))
+                self._targets = targets
         return self._targets
 
+    def _start_workers(self, target_count: int) -> None:
+        """Top the worker pool up to ``min(target_count, _MAX_WORKERS)``.
+
+        More workers than targets would only idle: a lane is worked by one
+        thread at a time.
+        """
+        with self._cond:
+            wanted = min(target_count, _MAX_WORKERS)
+            generation = self._generation
+            while self._workers < wanted:
+                self._workers += 1
+                threading.Thread(
+                    target=self._worker_loop,
+                    args=(generation,),
+                    name=f"webhooks-{self._workers}",
+                    daemon=True,
+                ).start()
+
     def reload(self) -> None:
-        """Drop cached config so the next dispatch re-reads env vars."""
+        """Drop cached config so the next dispatch re-reads env vars.
+
+        Deliveries already queued still go out to the target they were
+        queued for; its lane is retired and closed once it drains.
+        """
         with self._lock:
             self._targets = None
+        with self._cond:
+            for target, lane in list(self._lanes.items()):
+                lane.retired = True
+                if lane.idle:
+                    self._close_lane_locked(target, lane)
 
     def shutdown(self) -> None:
+        """Stop the workers and drop whatever is still queued.
+
+        Does not wait for an in-flight POST: its worker notices the new
+        generation when the request returns and exits.
+        """
         with self._lock:
-            executor = self._executor
-            self._executor = None
             self._targets = None
-        if executor is not None:
-            executor.shutdown(wait=False, cancel_futures=True)
+        with self._cond:
+            dropped = sum(
+                len(lane.queue) - lane.inflight for lane in self._lanes.values()
+            )
+            self._generation += 1
+            self._workers = 0
+            for lane in self._lanes.values():
+                lane.session.close()
+            self._lanes.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+        set_webhook_queue_depth(0)
+        if dropped:
+            logger.warning(
+                "Webhook dispatcher shut down with %d queued deliveries dropped",
+                dropped,
+            )
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Block until every queued delivery has been resolved.
+
+        Returns False if *timeout* seconds pass first. Retries count as
+        unresolved, so with the production backoff this can take as long
+        as a full retry cycle.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while any(not lane.idle for lane in self._lanes.values()):
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                self._cond.wait(remaining)
+        return True
 
     # -- dispatch --------------------------------------------------------
 
@@ -204,7 +376,8 @@ class WebhookDispatcher:
         """Send *payload* to every target subscribed to *event*.
 
         Returns the number of targets the event was queued for. Network
-        I/O happens on a thread pool — this call returns immediately.
+        I/O happens on the delivery workers — this call only appends to
+        the per-target queues and returns immediately.
         """
         if event not in KNOWN_EVENTS:
             logger.debug("Ignoring unknown webhook event %r", event)
@@ -222,29 +395,165 @@ class WebhookDispatcher:
         body_bytes = json.dumps(body, separators=(",", ":")).encode("utf-8")
         trace_headers = outbound_trace_headers()
 
-        executor = self._executor
         queued = 0
-        for target in targets:
-            if not target.accepts(event):
-                continue
-            queued += 1
-            if executor is None:
-                # Synchronous fallback (used by tests when the executor
-                # is mocked away). Keeps semantics identical.
-                self._deliver(
-                    target,
-                    body_bytes,
-                    event=event,
-                    oid=oid,
-                    trace_headers=trace_headers,
-                )
-            else:
-                executor.submit(
-                    self._deliver, target, body_bytes,
-                    event=event, oid=oid, trace_headers=trace_headers,
+        evicted: list[tuple[WebhookTarget, _Delivery]] = []
+        with self._cond:
+            for target in targets:
+                if not target.accepts(event):
+                    continue
+                queued += 1
+                lane = self._lanes.get(target)
+                if lane is None:
+                    lane = self._lanes[target] = _Lane(target)
+                if len(lane.queue) >= self._QUEUE_MAX:
+                    # Shed the oldest delivery nobody is posting yet; if the
+                    # whole queue is in flight (tiny bound, big batch) the
+                    # new event is the one that overflows.
+                    if lane.inflight < len(lane.queue):
+                        oldest = lane.queue[lane.inflight]
+                        del lane.queue[lane.inflight]
+                        evicted.append((target, oldest))
+                    else:
+                        evicted.append((target, _Delivery(
+                            body_bytes, event, oid, trace_headers,
+                        )))
+                        continue
+                lane.queue.append(
+                    _Delivery(body_bytes, event, oid, trace_headers),
                 )
+                if not lane.scheduled and not lane.inflight:
+                    self._schedule_locked(lane, 0.0)
+            self._publish_depth_locked()
+        # Rare (a receiver down for a whole queue's worth of events) and an
+        # append is a single small write, so parking the overflow for replay
+        # inline beats losing it.
+        for target, delivery in evicted:
+            logger.warning(
+                "Webhook queue for %s is full; dead-lettering the oldest "
+                "delivery", target.url,
+            )
+            record_webhook_outcome(delivery.event, "overflow")
+            self._dead_letter(target, [delivery], "queue overflow", attempts=0)
         return queued
 
+    # -- delivery engine -------------------------------------------------
+
+    def _schedule_locked(self, lane: _Lane, delay: float) -> None:
+        heapq.heappush(
+            self._ready, (time.monotonic() + delay, next(self._seq), lane),
+        )
+        lane.scheduled = True
+        self._cond.notify()
+
+    def _publish_depth_locked(self) -> None:
+        set_webhook_queue_depth(
+            sum(len(lane.queue) for lane in self._lanes.values()),
+        )
+
+    def _close_lane_locked(self, target: WebhookTarget, lane: _Lane) -> None:
+        if self._lanes.get(target) is lane:
+            del self._lanes[target]
+        lane.session.close()
+
+    def _next_batch(self, generation: int) -> tuple[_Lane, list[_Delivery]] | None:
+        """Wait for a lane whose turn has come and claim its head batch.
+
+        Returns None when *generation* has been superseded by ``shutdown``.
+        """
+        with self._cond:
+            while True:
+                if generation != self._generation:
+                    return None
+                if self._ready:
+                    due, _seq, lane = self._ready[0]
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        heapq.heappop(self._ready)
+                        lane.scheduled = False
+                        if not lane.queue:
+                            continue
+                        size = min(lane.target.batch_max, len(lane.queue))
+                        lane.inflight = size
+                        return lane, [lane.queue[i] for i in range(size)]
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+    def _worker_loop(self, generation: int) -> None:
+        while True:
+            claimed = self._next_batch(generation)
+            if claimed is None:
+                return
+            lane, batch = claimed
+            try:
+                self._deliver(lane, batch, generation)
+            except Exception:
+                # A bug here must not kill the worker or wedge the lane.
+                logger.exception("Webhook delivery to %s crashed", lane.target.url)
+                self._finish(lane, generation, done=len(batch))
+
+    def _deliver(self, lane: _Lane, batch: list[_Delivery],
+                 generation: int) -> None:
+        """Post *batch* once and settle the lane from the outcome.
+
+        Successes and permanent rejections (4xx, SSRF block) pop the batch.
+        A retriable failure leaves it at the head and re-schedules the lane
+        after the backoff delay — no thread waits it out. Once
+        ``WEBHOOK_RETRY_ATTEMPTS`` retries are spent the batch is
+        dead-lettered, one record per event, and the lane moves on.
+        """
+        target = lane.target
+        if len(batch) == 1:
+            body = batch[0].body
+        else:
+            body = b"[" + b",".join(d.body for d in batch) + b"]"
+        status_kind, last_err = self._post_once(
+            target,
+            body,
+            trace_headers=batch[0].trace_headers,
+            session=lane.session,
+            attempt=lane.attempt + 1,
+            batch_size=len(batch),
+        )
+        retriable = status_kind in ("server_error", "exception")
+        if retriable and lane.attempt < WEBHOOK_RETRY_ATTEMPTS:
+            self._finish(lane, generation, retry=True)
+            return
+        for delivery in batch:
+            record_webhook_outcome(delivery.event, status_kind)
+        if retriable:
+            self._dead_letter(
+                target, batch, last_err, attempts=WEBHOOK_RETRY_ATTEMPTS + 1,
+            )
+            for delivery in batch:
+                # Counted in addition to the per-attempt status above so the
+                # operator can alert on "X events landed in the DL" without
+                # subtracting success/4xx/etc. from the total.
+                record_webhook_outcome(delivery.event, "dead_letter")
+        self._finish(lane, generation, done=len(batch))
+
+    def _finish(self, lane: _Lane, generation: int, *, done: int = 0,
+                retry: bool = False) -> None:
+        """Release *lane* after a post: pop *done* items or arm a retry."""
+        with self._cond:
+            lane.inflight = 0
+            if generation != self._generation:
+                return
+            if retry:
+                lane.attempt += 1
+                self._schedule_locked(lane, _backoff_delay(lane.attempt))
+                return
+            lane.attempt = 0
+            for _ in range(min(done, len(lane.queue))):
+                lane.queue.popleft()
+            if lane.queue:
+                self._schedule_locked(lane, 0.0)
+            elif lane.retired:
+                self._close_lane_locked(lane.target, lane)
+            self._publish_depth_locked()
+            # Wake ``drain`` waiters as well as idle workers.
+            self._cond.notify_all()
+
     @staticmethod
     def _sign(secret: str, body: bytes) -> str:
         digest = hmac.new(
@@ -273,126 +582,135 @@ class WebhookDispatcher:
             return False
         return True
 
-    def _attempt_with_retries(
+    def _post_once(
         self,
         target: WebhookTarget,
         body: bytes,
         *,
-        trace_headers: dict[str, str] | None = None,
-    ) -> tuple[bool, str, str]:
-        """Try delivery with up to ``WEBHOOK_RETRY_ATTEMPTS`` retries.
-
-        Retries on 5xx and ``requests.RequestException`` (timeouts,
-        connect errors). 4xx is treated as a permanent client
-        rejection — no retry, no dead-letter, just a warning.
-
-        Backoff: ``WEBHOOK_RETRY_BASE_SECONDS * 2**(attempt-1)``,
-        capped at ``WEBHOOK_RETRY_MAX_SECONDS``. Default is
-        1 / 2 / 4 seconds between attempts (then capped at 8).
-
-        Returns ``(success, last_error_string, status_kind)``.
-        ``status_kind`` is one of ``success`` / ``client_error`` /
-        ``server_error`` / ``exception`` / ``ssrf_blocked`` so the
-        caller can drive the Prometheus counter without re-deriving
-        the bucket from a string match on ``last_error``.
+        trace_headers: dict[str, str] | None,
+        session: requests.Session,
+        attempt: int,
+        batch_size: int = 1,
+    ) -> tuple[str, str]:
+        """Make one delivery attempt and classify it.
+
+        Returns ``(status_kind, last_error)``. ``status_kind`` is one of
+        ``success`` / ``client_error`` / ``server_error`` / ``exception`` /
+        ``ssrf_blocked`` so callers can drive the Prometheus counter
+        without re-deriving the bucket from a string match; only the
+        ``server_error`` and ``exception`` buckets are worth retrying and
+        carry a ``last_error`` for the dead-letter record.
         """
+        total_attempts = WEBHOOK_RETRY_ATTEMPTS + 1
         if not self._ssrf_check(target):
             # SSRF block is permanent: do not retry, do not DL, do not
             # leak the URL in the error string returned to the caller.
-            return False, "", "ssrf_blocked"
+            return "ssrf_blocked", ""
         headers = {
             "Content-Type": "application/json",
             **(trace_headers or {}),
         }
+        if batch_size > 1:
+            headers["X-Webhook-Batch"] = str(batch_size)
         if target.secret:
             headers["X-Webhook-Signature"] = self._sign(target.secret, body)
-        last_err = ""
-        total_attempts = WEBHOOK_RETRY_ATTEMPTS + 1
-        for attempt in range(total_attempts):
-            if attempt > 0:
-                delay = min(
-                    WEBHOOK_RETRY_BASE_SECONDS * (2 ** (attempt - 1)),
-                    WEBHOOK_RETRY_MAX_SECONDS,
-                )
-                time.sleep(delay)
-            try:
-                response = requests.post(
-                    target.url,
-                    data=body,
-                    headers=headers,
-                    timeout=target.timeout_s,
-                    # Never follow redirects: ``_ssrf_check`` only validated the
-                    # configured host, so a 30x to 169.254.169.254/loopback would
-                    # otherwise bypass the guard (cloud-metadata SSRF).
-                    allow_redirects=False,
-                )
-            except requests.RequestException as exc:
-                last_err = f"{type(exc).__name__}: {exc}"
-                logger.warning(
-                    "Webhook %s failed on attempt %d/%d: %s",
-                    target.url, attempt + 1, total_attempts, exc,
-                )
-                continue
-            if response.status_code < 400:
-                return True, "", "success"
-            if 400 <= response.status_code < 500:
-                # Client-side rejection: not retriable, not dead-letter
-                # material — the receiver will keep saying no.
-                logger.warning(
-                    "Webhook %s returned %d (not retried)",
-                    target.url, response.status_code,
-                )
-                return False, "", "client_error"
-            last_err = f"HTTP {response.status_code}"
+        try:
+            response = session.post(
+                target.url,
+                data=body,
+                headers=headers,
+                timeout=target.timeout_s,
+                # Never follow redirects: ``_ssrf_check`` only validated the
+                # configured host, so a 30x to 169.254.169.254/loopback would
+                # otherwise bypass the guard (cloud-metadata SSRF).
+                allow_redirects=False,
+            )
+        except requests.RequestException as exc:
+            logger.warning(
+                "Webhook %s failed on attempt %d/%d: %s",
+                target.url, attempt, total_attempts, exc,
+            )
+            return "exception", f"{type(exc).__name__}: {exc}"
+        if response.status_code < 400:
+            return "success", ""
+        if 400 <= response.status_code < 500:
+            # Client-side rejection: not retriable, not dead-letter
+            # material — the receiver will keep saying no.
             logger.warning(
-                "Webhook %s returned %d on attempt %d/%d",
-                target.url, response.status_code, attempt + 1, total_attempts,
+                "Webhook %s returned %d (not retried)",
+                target.url, response.status_code,
             )
-        # Exhausted retries on a transient failure. ``last_err`` differentiates
-        # exception vs HTTP 5xx via its ``HTTP `` prefix.
-        kind = "server_error" if last_err.startswith("HTTP ") else "exception"
-        return False, last_err, kind
+            return "client_error", ""
+        logger.warning(
+            "Webhook %s returned %d on attempt %d/%d",
+            target.url, response.status_code, attempt, total_attempts,
+        )
+        return "server_error", f"HTTP {response.status_code}"
 
-    def _deliver(
+    def _attempt_with_retries(
         self,
         target: WebhookTarget,
         body: bytes,
-        event: str = "",
-        oid: str = "",
+        *,
         trace_headers: dict[str, str] | None = None,
+        session: requests.Session,
+    ) -> tuple[bool, str, str]:
+        """Try delivery with up to ``WEBHOOK_RETRY_ATTEMPTS`` retries, inline.
+
+        Only the operator-driven replay uses this: the admin request is
+        waiting on the result anyway, so sleeping through the backoff on
+        the request's own thread is the simple, correct choice there.
+        Live events go through the queued engine instead.
+
+        Backoff: ``WEBHOOK_RETRY_BASE_SECONDS * 2**(attempt-1)``,
+        capped at ``WEBHOOK_RETRY_MAX_SECONDS``. Default is
+        1 / 2 / 4 seconds between attempts (then capped at 8).
+
+        Returns ``(success, last_error_string, status_kind)``.
+        """
+        last_err = ""
+        status_kind = "exception"
+        for attempt in range(WEBHOOK_RETRY_ATTEMPTS + 1):
+            if attempt > 0:
+                time.sleep(_backoff_delay(attempt))
+            status_kind, err = self._post_once(
+                target,
+                body,
+                trace_headers=trace_headers,
+                session=session,
+                attempt=attempt + 1,
+            )
+            if status_kind not in ("server_error", "exception"):
+                return status_kind == "success", "", status_kind
+            last_err = err
+        return False, last_err, status_kind
+
+    @staticmethod
+    def _dead_letter(
+        target: WebhookTarget,
+        deliveries: list[_Delivery],
+        last_err: str,
+        *,
+        attempts: int,
     ) -> None:
-        """Deliver *body* with retries; dead-letter on terminal failure.
+        """Park *deliveries* for operator replay, one record per event.
 
-        Called from the dispatch thread pool. Successes return
-        silently; permanent 4xx / SSRF rejections also return silently
-        (their warnings live in the logger). Only retriable failures
-        that exhaust ``WEBHOOK_RETRY_ATTEMPTS`` end up in the
-        dead-letter file for operator-initiated replay.
+        Batched events are recorded individually so a replay re-sends each
+        as the single-event body the receiver would normally get.
         """
-        ok, last_err, status_kind = self._attempt_with_retries(
-            target,
-            body,
-            trace_headers=trace_headers,
-        )
-        record_webhook_outcome(event, status_kind)
-        if ok or not last_err:
-            return
-        try:
-            body_str = body.decode("utf-8")
-        except UnicodeDecodeError:
-            body_str = body.decode("utf-8", errors="replace")
-        webhook_dead_letter.append({
-            "url": target.url,
-            "event": event,
-            "oid": oid,
-            "body": body_str,
-            "last_error": last_err,
-            "attempts": WEBHOOK_RETRY_ATTEMPTS + 1,
-        })
-        # Counted in addition to the per-attempt status above so the
-        # operator can alert on "X events landed in the DL" without
-        # subtracting success/4xx/etc. from the total.
-        record_webhook_outcome(event, "dead_letter")
+        for delivery in deliveries:
+            try:
+                body_str = delivery.body.decode("utf-8")
+            except UnicodeDecodeError:
+                body_str = delivery.body.decode("utf-8", errors="replace")
+            webhook_dead_letter.append({
+                "url": target.url,
+                "event": delivery.event,
+                "oid": delivery.oid,
+                "body": body_str,
+                "last_error": last_err,
+                "attempts": attempts,
+            })
 
     def replay_records(
         self, records: list[dict],
@@ -421,30 +739,34 @@ class WebhookDispatcher:
         still_failing: list[dict] = []
         skipped = 0
         trace_headers = outbound_trace_headers()
-        for r in records:
-            url = r.get("url")
-            target = targets_by_url.get(url) if isinstance(url, str) else None
-            if target is None:
-                skipped += 1
-                still_failing.append(r)
-                continue
-            body_str = r.get("body") or ""
-            body = body_str.encode("utf-8")
-            ok, last_err, status_kind = self._attempt_with_retries(
-                target,
-                body,
-                trace_headers=trace_headers,
-            )
-            record_webhook_outcome(r.get("event", ""), status_kind)
-            if ok:
-                succeeded += 1
-                continue
-            updated = dict(r)
-            updated["last_error"] = last_err or r.get("last_error", "")
-            updated["attempts"] = (
-                int(r.get("attempts", 0)) + WEBHOOK_RETRY_ATTEMPTS + 1
-            )
-            still_failing.append(updated)
+        # One keep-alive session for the whole replay; the live lanes'
+        # sessions belong to their workers.
+        with requests.Session() as session:
+            for r in records:
+                url = r.get("url")
+                target = targets_by_url.get(url) if isinstance(url, str) else None
+                if target is None:
+                    skipped += 1
+                    still_failing.append(r)
+                    continue
+                body_str = r.get("body") or ""
+                body = body_str.encode("utf-8")
+                ok, last_err, status_kind = self._attempt_with_retries(
+                    target,
+                    body,
+                    trace_headers=trace_headers,
+                    session=session,
+                )
+                record_webhook_outcome(r.get("event", ""), status_kind)
+                if ok:
+                    succeeded += 1
+                    continue
+                updated = dict(r)
+                updated["last_error"] = last_err or r.get("last_error", "")
+                updated["attempts"] = (
+                    int(r.get("attempts", 0)) + WEBHOOK_RETRY_ATTEMPTS + 1
+                )
+                still_failing.append(updated)
         return succeeded, still_failing, skipped
 
 
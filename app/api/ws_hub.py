@@ -4,7 +4,7 @@ import logging
 import secrets
 import threading
 import time
-from collections.abc import Callable, Coroutine
+from collections import deque
 from dataclasses import dataclass
 from typing import Any
 
@@ -12,11 +12,12 @@ from fastapi import WebSocket
 
 from app.constants import (
     WS_BROADCAST_SEND_TIMEOUT_SECONDS,
+    WSHUB_CLIENT_QUEUE_MAX,
     WSHUB_CLIENT_TIMEOUT_SECONDS,
     WSHUB_HEARTBEAT_INTERVAL_SECONDS,
     WSHUB_MAX_CLIENTS_PER_OID,
 )
-from app.metrics import set_ws_gauges
+from app.metrics import record_ws_frame_dropped, set_ws_gauges
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,54 @@ class ControllerPresence:
     label: str | None = None
 
 
+# One outbound frame: ``(coalescing key, encoded text)``. A keyed frame is a
+# full snapshot (``state_update``, ``presence_update``) that a newer frame
+# with the same key makes obsolete; ``None`` marks an ordered delta (the
+# audit stream) that is only ever dropped on overflow.
+_Frame = tuple[str | None, str]
+
+_STATE_KEY = "state_update"
+_PRESENCE_KEY = "presence_update"
+
+
+def _push_frame(queue: deque[_Frame], frame: _Frame, limit: int) -> None:
+    """Append *frame* to *queue*, superseding and bounding as it goes.
+
+    A keyed frame removes the queued frame with the same key and goes to the
+    tail, so the client always ends on the newest snapshot and never receives
+    a stale one after a newer delta. Past *limit* the oldest delta is shed
+    first; snapshots are at most one per key and are kept while any delta
+    remains to shed.
+    """
+    key = frame[0]
+    if key is not None:
+        for i, (queued_key, _text) in enumerate(queue):
+            if queued_key == key:
+                del queue[i]
+                record_ws_frame_dropped("superseded")
+                break
+    queue.append(frame)
+    while len(queue) > limit:
+        for i, (queued_key, _text) in enumerate(queue):
+            if queued_key is None:
+                del queue[i]
+                break
+        else:
+            queue.popleft()
+        record_ws_frame_dropped("overflow")
+
+
+class _Outbox:
+    """Bounded outbound queue for one socket and its (optional) writer."""
+
+    __slots__ = ("frames", "oid", "writer")
+
+    def __init__(self, oid: str) -> None:
+        self.oid = oid
+        self.frames: deque[_Frame] = deque()
+        self.writer: asyncio.Future[None] | None = None
+
+
 class WSHubFull(Exception):
     """Raised by :meth:`WSHub.connect` when an OID is at its connection cap.
 
@@ -67,10 +116,14 @@ class WSHub:
     _registry_lock = threading.RLock()
     # {oid: set[WebSocket]}
     _connections: dict[str, set[WebSocket]] = {}
-    # Strong references to in-flight fire-and-forget broadcast tasks. Without
-    # this, the asyncio event loop may garbage-collect a task created via
-    # ``loop.create_task(...)`` before it finishes, dropping the broadcast.
-    _pending_tasks: set[asyncio.Task[None]] = set()
+    # {WebSocket: _Outbox}. Per-client outbound queue plus its writer task;
+    # the dict is also what keeps the writer strongly referenced while it
+    # runs. Event-loop-only state, so it sits outside ``_registry_lock``.
+    _outboxes: dict[WebSocket, _Outbox] = {}
+    # {oid: frames published off-loop and not yet fanned out}. Guarded by
+    # ``_pending_lock`` because worker threads append while the loop drains.
+    _pending: dict[str, deque[_Frame]] = {}
+    _pending_lock = threading.Lock()
     # {WebSocket: monotonic timestamp of last client activity}. Populated
     # by ``connect`` and bumped by the endpoint on every received frame
     # so the heartbeat loop can tell zombies from healthy idle clients.
@@ -202,6 +255,9 @@ class WSHub:
             cls._last_seen.pop(ws, None)
             cls._presence.pop(ws, None)
             cls._refresh_gauges()
+        box = cls._outboxes.pop(ws, None)
+        if box is not None and box.writer is not None:
+            box.writer.cancel()
         logger.debug("WS client disconnected for OID=%s", oid)
 
     # Per-socket send timeout. A slow/hung client must not stall broadcasts
@@ -209,67 +265,194 @@ class WSHub:
     # Configure via ``WS_BROADCAST_SEND_TIMEOUT_SECONDS``.
     _BROADCAST_SEND_TIMEOUT = WS_BROADCAST_SEND_TIMEOUT_SECONDS
 
+    # Runtime-tunable copy of the per-client outbound queue bound.
+    _CLIENT_QUEUE_MAX = WSHUB_CLIENT_QUEUE_MAX
+
     @classmethod
-    async def _broadcast_text(
+    def _publish(cls, oid: str, frame: _Frame) -> None:
+        """Queue *frame* for *oid* from any thread and schedule one flush.
+
+        The hot path for game actions. Frames land in a per-OID pending
+        queue under ``_pending_lock``; only the publish that creates the
+        queue schedules a flush onto the loop, so a burst of rapid taps
+        costs one loop callback and no tasks, and a newer ``state_update``
+        replaces the one still waiting (see :func:`_push_frame`). Skipped
+        outright when nobody is subscribed to *oid*.
+
+        On the loop the flush is deferred with ``call_soon`` so frames
+        published in the same tick coalesce too. Off it (``GameService``
+        under ``run_in_threadpool``) the captured loop is used. Only when no
+        loop can be found at all — genuinely synchronous unit tests — is the
+        frame dropped.
+        """
+        with cls._registry_lock:
+            if not cls._connections.get(oid):
+                return
+        try:
+            loop = asyncio.get_running_loop()
+            threadsafe = False
+        except RuntimeError:
+            captured = cls._loop
+            if captured is None or captured.is_closed():
+                logger.debug(
+                    "No event loop available — skipping broadcast for OID=%s", oid,
+                )
+                return
+            loop = captured
+            threadsafe = True
+        with cls._pending_lock:
+            queue = cls._pending.get(oid)
+            first = queue is None
+            if queue is None:
+                queue = cls._pending[oid] = deque()
+            _push_frame(queue, frame, cls._CLIENT_QUEUE_MAX)
+        if not first:
+            return
+        try:
+            if threadsafe:
+                loop.call_soon_threadsafe(cls._flush_pending, oid)
+            else:
+                loop.call_soon(cls._flush_pending, oid)
+        except RuntimeError:
+            # Loop closed between the check and the hand-off (shutdown).
+            with cls._pending_lock:
+                cls._pending.pop(oid, None)
+
+    @classmethod
+    def _flush_pending(cls, oid: str) -> None:
+        """Move *oid*'s pending frames into its clients' outboxes. Loop only."""
+        with cls._pending_lock:
+            frames = cls._pending.pop(oid, None)
+        for frame in frames or ():
+            cls._fan_out(oid, frame)
+
+    @classmethod
+    def _fan_out(
         cls,
         oid: str,
-        message: str,
+        frame: _Frame,
         *,
         exclude: WebSocket | None = None,
-        notify_presence: bool = True,
-    ) -> None:
-        """Send the pre-serialized *message* to every client for *oid*.
+    ) -> list[_Outbox]:
+        """Push *frame* into every target's outbox and start idle writers.
 
-        Sends run concurrently with a per-socket timeout so a single stuck
-        client cannot delay updates to the rest or leak memory by keeping
-        a dead socket in the registry.
+        The frame text is shared, not copied: it was encoded once by the
+        caller and every outbox holds a reference to the same ``str``.
+        Returns the outboxes touched so an awaiting caller can wait for
+        their writers. Runs on the loop; the outbox map is loop-only state.
         """
-        # Snapshot under the lock — the sends below await, and holding a
-        # threading lock across an await would let another task on this
-        # loop deadlock behind it.
         with cls._registry_lock:
             conns = cls._connections.get(oid)
             if not conns:
-                return
+                return []
             targets = [ws for ws in conns if ws is not exclude]
-        if not targets:
-            return
+        boxes: list[_Outbox] = []
+        for ws in targets:
+            box = cls._outboxes.get(ws)
+            if box is None:
+                box = cls._outboxes[ws] = _Outbox(oid)
+            _push_frame(box.frames, frame, cls._CLIENT_QUEUE_MAX)
+            if box.writer is None:
+                box.writer = asyncio.ensure_future(cls._drain(ws, box))
+            boxes.append(box)
+        return boxes
 
-        async def _send(ws: WebSocket) -> WebSocket | None:
-            try:
-                await asyncio.wait_for(
-                    ws.send_text(message),
-                    timeout=cls._BROADCAST_SEND_TIMEOUT,
-                )
-                return None
-            except Exception:
-                return ws
-
-        results = await asyncio.gather(
-            *(_send(ws) for ws in targets),
-            return_exceptions=False,
-        )
+    @classmethod
+    async def _drain(cls, ws: WebSocket, box: _Outbox) -> None:
+        """Send *box*'s frames to *ws* in order until the outbox is empty.
+
+        One writer per client at a time, alive only while it has something
+        to send — task count tracks busy sockets, not messages × sockets.
+        A send that fails or exceeds the per-socket timeout evicts the
+        client, so one stuck tablet cannot delay the rest or keep a dead
+        socket in the registry.
+        """
+        try:
+            while box.frames:
+                _key, text = box.frames.popleft()
+                try:
+                    await asyncio.wait_for(
+                        ws.send_text(text),
+                        timeout=cls._BROADCAST_SEND_TIMEOUT,
+                    )
+                except Exception:
+                    cls._evict(ws, box.oid)
+                    return
+        finally:
+            box.writer = None
 
-        evicted_any = False
+    @classmethod
+    def _evict(cls, ws: WebSocket, oid: str) -> None:
+        """Drop a client whose send failed and tell the remaining tabs."""
+        cls._outboxes.pop(ws, None)
         with cls._registry_lock:
-            for ws in results:
-                if ws is not None:
-                    conns.discard(ws)
-                    cls._last_seen.pop(ws, None)
-                    cls._presence.pop(ws, None)
-                    evicted_any = True
-            # Only drop the OID entry if the registry still holds *our* set.
-            # A concurrent ``disconnect`` could have removed it and a
-            # concurrent ``connect`` could have installed a new set in the
-            # meantime; popping in that case would silently lose the new
-            # client.
-            if not conns and cls._connections.get(oid) is conns:
-                cls._connections.pop(oid, None)
-                evicted_any = True
-            if evicted_any:
-                cls._refresh_gauges()
-        if evicted_any and notify_presence:
-            await cls.broadcast_presence(oid)
+            conns = cls._connections.get(oid)
+            # A concurrent ``disconnect`` + ``connect`` may have installed a
+            # fresh set under *oid* that never held *ws*; leave it alone.
+            if not conns or ws not in conns:
+                return
+            conns.discard(ws)
+            if not conns:
+                del cls._connections[oid]
+            cls._last_seen.pop(ws, None)
+            cls._presence.pop(ws, None)
+            cls._refresh_gauges()
+        cls._fan_out(oid, cls._presence_frame(oid))
+
+    @classmethod
+    async def _broadcast_text(
+        cls,
+        oid: str,
+        message: str,
+        *,
+        exclude: WebSocket | None = None,
+        key: str | None = None,
+    ) -> None:
+        """Send the pre-serialized *message* to every client for *oid*.
+
+        Goes through the same per-client outboxes as the sync publishers and
+        returns once the writers it touched have drained, so awaiting callers
+        (the endpoint's presence updates, tests) still observe delivery and
+        eviction. *key* marks the frame as a snapshot that a newer frame with
+        the same key may supersede while still queued.
+        """
+        boxes = cls._fan_out(oid, (key, message), exclude=exclude)
+        writers = {box.writer for box in boxes if box.writer is not None}
+        if writers:
+            await asyncio.wait(writers)
+
+    @staticmethod
+    def _state_message(payload_json: str) -> str:
+        return '{"type":"state_update","data":' + payload_json + '}'
+
+    @staticmethod
+    def _audit_message(
+        event: str,
+        version: int,
+        record: dict[str, Any] | None,
+    ) -> str:
+        return json.dumps({
+            "type": f"audit_{event}",
+            "data": {"version": version, "record": record},
+        })
+
+    @classmethod
+    def _presence_frame(cls, oid: str) -> _Frame:
+        clients = cls.presence(oid)
+        message = json.dumps(
+            {
+                "type": "presence_update",
+                "data": {
+                    "controller_count": len(clients),
+                    "clients": [
+                        {"client_id": item.client_id, "label": item.label}
+                        for item in clients
+                    ],
+                },
+            },
+            separators=(",", ":"),
+        )
+        return (_PRESENCE_KEY, message)
 
     @classmethod
     async def broadcast(
@@ -279,7 +462,7 @@ class WSHub:
     ) -> None:
         """Send a JSON ``state_update`` message to every client for *oid*."""
         message = json.dumps({"type": "state_update", "data": data})
-        await cls._broadcast_text(oid, message)
+        await cls._broadcast_text(oid, message, key=_STATE_KEY)
 
     @classmethod
     async def broadcast_payload_json(cls, oid: str, payload_json: str) -> None:
@@ -292,8 +475,9 @@ class WSHub:
         round-trip ``model_dump`` → dict → ``json.dumps`` that
         :meth:`broadcast` would otherwise perform.
         """
-        message = '{"type":"state_update","data":' + payload_json + '}'
-        await cls._broadcast_text(oid, message)
+        await cls._broadcast_text(
+            oid, cls._state_message(payload_json), key=_STATE_KEY,
+        )
 
     @classmethod
     async def broadcast_presence(
@@ -303,26 +487,8 @@ class WSHub:
         exclude: WebSocket | None = None,
     ) -> None:
         """Broadcast aggregate controller presence without account identity."""
-        clients = cls.presence(oid)
-        message = json.dumps(
-            {
-                "type": "presence_update",
-                "data": {
-                    "controller_count": len(clients),
-                    "clients": [
-                        {"client_id": item.client_id, "label": item.label}
-                        for item in clients
-                    ],
-                },
-            },
-            separators=(",", ":"),
-        )
-        await cls._broadcast_text(
-            oid,
-            message,
-            exclude=exclude,
-            notify_presence=False,
-        )
+        key, message = cls._presence_frame(oid)
+        await cls._broadcast_text(oid, message, exclude=exclude, key=key)
 
     @classmethod
     async def broadcast_audit(
@@ -341,11 +507,9 @@ class WSHub:
         its copy contiguously, and treats any other value as a missed
         message and re-reads.
         """
-        message = json.dumps({
-            "type": f"audit_{event}",
-            "data": {"version": version, "record": record},
-        })
-        await cls._broadcast_text(oid, message)
+        await cls._broadcast_text(
+            oid, cls._audit_message(event, version, record),
+        )
 
     @classmethod
     def broadcast_audit_sync(
@@ -355,15 +519,15 @@ class WSHub:
         version: int,
         record: dict[str, Any] | None = None,
     ) -> None:
-        """Sync wrapper around :meth:`broadcast_audit`.
+        """Sync counterpart of :meth:`broadcast_audit`.
 
         Audit writes happen on the synchronous game-action path, often under
-        ``run_in_threadpool``, so this goes through the same ``_schedule``
-        hand-off the state broadcast uses.
+        ``run_in_threadpool``, so this goes through the same ``_publish``
+        hand-off the state broadcast uses. Audit frames are deltas and are
+        never coalesced; one dropped on overflow shows up to the client as a
+        version gap, which already triggers a re-read.
         """
-        cls._schedule(
-            oid, lambda: cls.broadcast_audit(oid, event, version, record),
-        )
+        cls._publish(oid, (None, cls._audit_message(event, version, record)))
 
     @classmethod
     def capture_event_loop(cls) -> None:
@@ -374,47 +538,20 @@ class WSHub:
         """
         cls._loop = asyncio.get_running_loop()
 
-    @classmethod
-    def _schedule(
-        cls,
-        oid: str,
-        coro_factory: Callable[[], Coroutine[Any, Any, None]],
-    ) -> None:
-        """Schedule a broadcast coroutine, on- or off-loop.
-
-        On the loop, create the task directly. Off it (``GameService``
-        running under ``run_in_threadpool``), hand it to the captured loop
-        via ``call_soon_threadsafe``. Only when no loop can be found at all
-        — genuinely synchronous unit tests — is the broadcast skipped.
-        """
-        def _create() -> None:
-            task = asyncio.ensure_future(coro_factory())
-            cls._pending_tasks.add(task)
-            task.add_done_callback(cls._pending_tasks.discard)
-
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            loop = cls._loop
-            if loop is None or loop.is_closed():
-                logger.debug(
-                    "No event loop available — skipping broadcast for OID=%s", oid,
-                )
-                return
-            loop.call_soon_threadsafe(_create)
-            return
-        _create()
-
     @classmethod
     def broadcast_sync(cls, oid: str, data: dict[str, Any]) -> None:
         """Fire-and-forget broadcast usable from synchronous code."""
-        cls._schedule(oid, lambda: cls.broadcast(oid, data))
+        message = json.dumps({"type": "state_update", "data": data})
+        cls._publish(oid, (_STATE_KEY, message))
 
     @classmethod
     def broadcast_payload_json_sync(cls, oid: str, payload_json: str) -> None:
-        """Sync wrapper around :meth:`broadcast_payload_json` for use from
-        synchronous code paths (the ``GameService`` action methods)."""
-        cls._schedule(oid, lambda: cls.broadcast_payload_json(oid, payload_json))
+        """Sync counterpart of :meth:`broadcast_payload_json` for use from
+        synchronous code paths (the ``GameService`` action methods).
+
+        The envelope is built here, in the calling worker thread, so the
+        loop only ever moves an already-encoded frame around."""
+        cls._publish(oid, (_STATE_KEY, cls._state_message(payload_json)))
 
     @classmethod
     def clear(cls) -> None:
@@ -424,6 +561,9 @@ class WSHub:
             cls._last_seen.clear()
             cls._presence.clear()
             cls._refresh_gauges()
+        cls._outboxes.clear()
+        with cls._pending_lock:
+            cls._pending.clear()
 
     # ----- Heartbeat (opt-in via WSHUB_HEARTBEAT_INTERVAL_SECONDS > 0) ---
 
@@ -6,6 +6,7 @@ model backed by the database:
 * ``passwords``     — scrypt hashing (re-exported from ``app.password_hash``)
                       plus temporary-password generation.
 * ``sessions``      — opaque-token cookie sessions (stored hashed in the DB).
+* ``resolution_cache`` — short-TTL cache of resolved sessions/control tokens.
 * ``service``       — user CRUD + authentication operations.
 * ``dependencies``  — FastAPI deps: current user / require_user / require_admin.
 * ``routes``        — the ``/api/v1/auth`` router.
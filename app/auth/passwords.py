@@ -3,19 +3,48 @@
 Thin layer over :mod:`app.password_hash` (scrypt, stdlib-only) so the auth
 package has a single import surface, plus a temporary-password generator for
 the admin "reset to a temp password" flow.
+
+Each scrypt call costs ~50 ms of CPU and ~16 MiB of memory, and login used
+to run it on the request thread. A room of volunteers signing in at once
+then held most of the threadpool that also serves live scoring, and the
+concurrent working sets added up. :func:`hash_password` and
+:func:`verify_password` here therefore run scrypt on a dedicated pool of
+``PASSWORD_HASH_WORKERS`` threads (``hashlib.scrypt`` releases the GIL), so
+at most that many working sets are ever live. At most
+``PASSWORD_HASH_QUEUE_LIMIT`` more calls may wait for a thread; a call
+beyond that raises :class:`PasswordHashBusy` (503 with ``Retry-After``) at
+once, instead of parking one more request thread behind the queue. The
+caller still waits for its own result, so the threads tied up by password
+work are bounded by workers + queue limit rather than by the burst.
 """
 
 from __future__ import annotations
 
 import secrets
 import string
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
 
-from app.password_hash import hash_password, is_hashed, verify_password
+from app import password_hash
+from app.constants import PASSWORD_HASH_QUEUE_LIMIT, PASSWORD_HASH_WORKERS
+from app.metrics import (
+    record_password_hash_rejected,
+    record_password_hash_run,
+    record_password_hash_wait,
+    set_password_hash_queue_depth,
+)
+from app.password_hash import is_hashed
+from app.service_errors import UnavailableServiceError
 
 __all__ = [
+    "PasswordHashBusy",
     "generate_temp_password",
     "hash_password",
     "is_hashed",
+    "shutdown_hash_pool",
     "verify_password",
 ]
 
@@ -25,7 +54,101 @@ _TEMP_ALPHABET = "".join(
     c for c in (string.ascii_letters + string.digits) if c not in "0O1lI"
 )
 
+_pool: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+# Calls submitted and not yet finished, and how many of them are running;
+# the difference is the queue the limit applies to.
+_in_flight = 0
+_running = 0
+
+
+class PasswordHashBusy(UnavailableServiceError):
+    """Every hashing thread is busy and the queue behind them is full."""
+
 
 def generate_temp_password(length: int = 14) -> str:
     """Return a random, human-transcribable temporary password."""
     return "".join(secrets.choice(_TEMP_ALPHABET) for _ in range(length))
+
+
+def hash_password(password: str) -> str:
+    """:func:`app.password_hash.hash_password` on the hashing pool."""
+    return _run(password_hash.hash_password, password)
+
+
+def verify_password(provided: str, stored: str) -> bool:
+    """:func:`app.password_hash.verify_password` on the hashing pool."""
+    return _run(password_hash.verify_password, provided, stored)
+
+
+def _hash_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+        return _pool
+
+
+def _publish_locked() -> None:
+    set_password_hash_queue_depth(_in_flight - _running)
+
+
+def _run[T](fn: Callable[..., T], *args: str) -> T:
+    global _in_flight
+    if PASSWORD_HASH_WORKERS <= 0:
+        started = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            record_password_hash_run(time.monotonic() - started)
+    with _lock:
+        if _in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+            record_password_hash_rejected()
+            raise PasswordHashBusy(
+                "Too many sign-ins at once — please try again in a moment."
+            )
+        _in_flight += 1
+        _publish_locked()
+    submitted = time.monotonic()
+
+    def task() -> T:
+        global _running
+        started = time.monotonic()
+        record_password_hash_wait(started - submitted)
+        with _lock:
+            _running += 1
+            _publish_locked()
+        try:
+            return fn(*args)
+        finally:
+            record_password_hash_run(time.monotonic() - started)
+            with _lock:
+                _running -= 1
+
+    try:
+        future = _hash_pool().submit(task)
+    except BaseException:
+        _release(None)
+        raise
+    # Released on completion *or* cancellation (a pool shut down under it).
+    future.add_done_callback(_release)
+    return future.result()
+
+
+def _release(_future: Future[Any] | None) -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+        _publish_locked()
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing threads (lifespan shutdown); the next call restarts them."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,152 @@
+"""Short-lived cache of resolved credentials (cookie sessions, control tokens).
+
+Every authenticated request and every WebSocket connect turns a credential
+into an identity: a ``vsession`` cookie into its user, a ``?c=`` control
+token into the board's storage key. Each of those was a database round-trip,
+and a venue's tablets reconnecting together after a Wi-Fi blip issue the
+very same lookups in a burst — on SQLite, a queue of identical reads.
+
+Successful resolutions are remembered here for ``AUTH_CACHE_TTL_SECONDS``,
+in two LRUs of at most ``AUTH_CACHE_ENTRIES`` entries each, keyed by the
+SHA-256 of the credential (the raw value is never kept). Only successes are
+cached: a wrong or revoked token always goes to the database, so guessing
+cannot fill the cache and a freshly minted credential is never shadowed.
+
+Revocation is explicit. :mod:`app.auth.sessions`, :mod:`app.auth.service`
+and :mod:`app.overlays_service` drop the affected entries on logout,
+password change or reset, deactivation, token rotation and deletes, both
+when the change is made and again once it commits (see :func:`invalidate`),
+so a lookup racing the revoking transaction cannot re-cache what it just
+removed. The cache is per process: another worker keeps serving a revoked
+credential for at most the TTL, which is why the TTL is seconds, not
+minutes. Setting either knob to 0 disables the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.constants import AUTH_CACHE_ENTRIES, AUTH_CACHE_TTL_SECONDS
+from app.db.engine import after_commit
+from app.metrics import record_auth_cache
+
+
+def credential_key(raw: str) -> str:
+    """Cache key for a raw credential (its SHA-256, as stored in the DB)."""
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _ResolutionCache[V]:
+    """A TTL + LRU map of credential hash → ``(user_id, value)``.
+
+    ``user_id`` is kept next to each value so every credential of one
+    account can be dropped at once. A monotonically increasing generation
+    is bumped by every invalidation; :meth:`put` is given the generation
+    read *before* the database lookup and refuses to store a result that an
+    invalidation may have overtaken.
+    """
+
+    def __init__(self, kind: str) -> None:
+        self._kind = kind
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, int, V]] = OrderedDict()
+        self._generation = 0
+
+    @staticmethod
+    def enabled() -> bool:
+        return AUTH_CACHE_TTL_SECONDS > 0 and AUTH_CACHE_ENTRIES > 0
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key: str) -> tuple[int, V] | None:
+        if not self.enabled():
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        record_auth_cache(self._kind, "miss" if entry is None else "hit")
+        return None if entry is None else (entry[1], entry[2])
+
+    def put(self, key: str, user_id: int, value: V, generation: int) -> None:
+        if not self.enabled():
+            return
+        deadline = time.monotonic() + AUTH_CACHE_TTL_SECONDS
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (deadline, user_id, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > AUTH_CACHE_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def discard(
+        self,
+        *,
+        keys: tuple[str, ...] = (),
+        user_id: int | None = None,
+        keep: str | None = None,
+    ) -> None:
+        """Drop *keys* and, with *user_id*, every entry of that account but *keep*."""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+            if user_id is not None:
+                for key in [
+                    key for key, (_, owner, _) in self._entries.items()
+                    if owner == user_id and key != keep
+                ]:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Session-token hash → the session's expiry (the user id rides alongside).
+sessions: _ResolutionCache[datetime] = _ResolutionCache("session")
+# Control-token hash → the board's storage key.
+control_tokens: _ResolutionCache[str] = _ResolutionCache("control")
+
+
+def invalidate(db: Session | None, drop: Callable[[], None]) -> None:
+    """Run *drop* now and, when *db* is given, again after it commits.
+
+    The first call stops this process from answering with the revoked
+    credential straight away; the second removes anything a concurrent
+    lookup re-cached from the still-uncommitted old row in between.
+    """
+    drop()
+    if db is not None:
+        after_commit(db, drop)
+
+
+def forget_user(db: Session | None, user_id: int) -> None:
+    """Drop every cached session and control token of *user_id*."""
+
+    def drop() -> None:
+        sessions.discard(user_id=user_id)
+        control_tokens.discard(user_id=user_id)
+
+    invalidate(db, drop)
+
+
+def clear() -> None:
+    """Drop both caches (tests)."""
+    sessions.clear()
+    control_tokens.clear()
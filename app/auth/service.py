@@ -15,6 +15,7 @@ from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.auth import resolution_cache
 from app.auth.passwords import generate_temp_password, hash_password, verify_password
 from app.db.models.user import ROLE_ADMIN, ROLE_USER, User
 from app.id_validation import OVERLAY_ID_PATTERN
@@ -179,8 +180,10 @@ def update_profile(
 
 def delete_user(db: Session, user: User) -> None:
     """Delete a user; FK cascades remove their overlays/teams/presets/reports."""
+    user_id = user.id
     db.delete(user)
     db.flush()
+    resolution_cache.forget_user(db, user_id)
 
 
 def list_users(
@@ -239,3 +242,4 @@ def set_active(db: Session, user: User, active: bool) -> None:
         raise UserError("Cannot deactivate the last administrator.")
     user.is_active = active
     db.flush()
+    resolution_cache.forget_user(db, user.id)
@@ -19,6 +19,7 @@ from fastapi import Response
 from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.auth import resolution_cache
 from app.db.models.user import AuthSession, User
 from app.env_vars_manager import EnvVarsManager, is_truthy
 
@@ -77,11 +78,56 @@ def resolve_session(db: Session, raw: str | None) -> User | None:
 
     Validates expiry and that the account is still active, and bumps
     ``last_seen_at``. Expired rows are dropped lazily.
+
+    A session resolved within the last ``AUTH_CACHE_TTL_SECONDS`` skips the
+    ``auth_sessions`` lookup (and the ``last_seen_at`` bump, which is
+    throttled far more coarsely anyway); the user row is still loaded, so
+    the caller gets a live ORM object with the current role and flags.
+    """
+    if not raw:
+        return None
+    key = hash_token(raw)
+    user_id = _cached_user_id(key)
+    if user_id is not None:
+        user = db.get(User, user_id)
+        if user is not None and user.is_active:
+            return user
+        resolution_cache.sessions.discard(keys=(key,))
+        return None
+    return _resolve_uncached(db, key)
+
+
+def resolve_session_user_id(db: Session, raw: str | None) -> int | None:
+    """Like :func:`resolve_session`, for callers that only need the user id.
+
+    A cache hit answers without touching the database at all, which is what
+    makes a burst of WebSocket reconnects cheap.
     """
     if not raw:
         return None
+    key = hash_token(raw)
+    user_id = _cached_user_id(key)
+    if user_id is not None:
+        return user_id
+    user = _resolve_uncached(db, key)
+    return None if user is None else user.id
+
+
+def _cached_user_id(key: str) -> int | None:
+    cached = resolution_cache.sessions.get(key)
+    if cached is None:
+        return None
+    user_id, expires_at = cached
+    if expires_at <= _now():
+        resolution_cache.sessions.discard(keys=(key,))
+        return None
+    return user_id
+
+
+def _resolve_uncached(db: Session, key: str) -> User | None:
+    generation = resolution_cache.sessions.generation()
     row = db.execute(
-        select(AuthSession).where(AuthSession.token_hash == hash_token(raw))
+        select(AuthSession).where(AuthSession.token_hash == key)
     ).scalar_one_or_none()
     if row is None:
         return None
@@ -93,19 +139,23 @@ def resolve_session(db: Session, raw: str | None) -> User | None:
     user = db.get(User, row.user_id)
     if user is None or not user.is_active:
         return None
+    expires_at = row.expires_at
     now = _now()
     last_seen = row.last_seen_at
     if last_seen is None or (now - last_seen) > _LAST_SEEN_THROTTLE:
         row.last_seen_at = now
         db.commit()
+    resolution_cache.sessions.put(key, user.id, expires_at, generation)
     return user
 
 
 def revoke_session(db: Session, raw: str | None) -> None:
     if not raw:
         return
-    db.execute(delete(AuthSession).where(AuthSession.token_hash == hash_token(raw)))
+    key = hash_token(raw)
+    db.execute(delete(AuthSession).where(AuthSession.token_hash == key))
     db.commit()
+    resolution_cache.sessions.discard(keys=(key,))
 
 
 def purge_expired(db: Session) -> int:
@@ -133,6 +183,7 @@ def revoke_all_for_user(
         stmt = stmt.where(AuthSession.token_hash != except_token_hash)
     db.execute(stmt)
     db.commit()
+    resolution_cache.sessions.discard(user_id=user_id, keep=except_token_hash)
 
 
 def cookie_secure(scheme: str | None = None) -> bool:
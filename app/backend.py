@@ -19,6 +19,7 @@ from app.overlay_backends import (
 )
 from app.overlay_executor import OverlayTaskExecutor, get_overlay_executor
 from app.overlay_payload import build_overlay_payload
+from app.spans import STAGE_OVERLAY_PUSH, STAGE_OVERLAY_SAVE, span
 from app.state import State
 
 _CUSTOMIZATION_CACHE_TTL_SECONDS = customization_cache_ttl_seconds(
@@ -195,7 +196,7 @@ class Backend:
                 return
             Backend.logger.debug("saving model...")
             self._ensure_overlay_backend()
-            with _timed("save_model.model", Backend.logger):
+            with _timed("save_model.model", Backend.logger), span(STAGE_OVERLAY_SAVE):
                 self._overlay.save_model(current_model)
 
             to_save = copy.copy(current_model)
@@ -203,7 +204,7 @@ class Backend:
                 to_save = State.simplify_model(to_save)
 
             def _push() -> None:
-                with _timed("save_model.push", Backend.logger):
+                with _timed("save_model.push", Backend.logger), span(STAGE_OVERLAY_PUSH):
                     self._overlay.push_model_update(
                         current_model,
                         to_save,
@@ -211,7 +212,12 @@ class Backend:
                     )
 
             if self.conf.multithread:
-                self.executor.submit(self._executor_key(), _push)
+                # The push renders the whole overlay from this model, so a
+                # newer one makes a still-queued older one redundant; score
+                # pushes also jump queued customization re-renders.
+                self.executor.submit_latest(
+                    self._executor_key(), "model", _push, priority=True,
+                )
             else:
                 _push()
 
@@ -237,8 +243,11 @@ class Backend:
                 return self.get_current_model(self.conf.oid)
 
             if self.conf.multithread:
-                self.executor.submit(
+                # Re-renders from the newest model at run time, so only the
+                # latest queued customization push needs to run.
+                self.executor.submit_latest(
                     self._executor_key(),
+                    "customization",
                     self._overlay.on_customization_saved,
                     get_model,
                     to_save,
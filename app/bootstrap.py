@@ -37,7 +37,7 @@ from app.pwa_manifest import _render_index_html as _render_index_html
 from app.pwa_manifest import _render_manifest as _render_manifest
 from app.security_bootstrap import run_security_bootstrap
 from app.service_errors import ServiceError
-from app.static_files import CachedStaticFiles, SPAStaticFiles
+from app.static_files import CachedStaticFiles, SPAStaticFiles, VersionedStaticFiles
 from app.system_routes import register_system_routes
 
 logger = logging.getLogger(__name__)
@@ -73,6 +73,19 @@ async def _lifespan(application: FastAPI) -> AsyncIterator[None]:
         audit_broadcast.install()
     except Exception:
         logger.exception("Failed to bridge the audit log onto the control WS hub")
+    try:
+        from app.db import maintenance as db_maintenance
+
+        db_maintenance.start()
+    except Exception:
+        logger.exception("Failed to start SQLite maintenance")
+    try:
+        # Matches a previous process journaled but did not get to archive.
+        from app.api import archive_queue
+
+        archive_queue.recover()
+    except Exception:
+        logger.exception("Failed to recover the match archive journal")
     yield
     try:
         from app.api import audit_broadcast
@@ -80,6 +93,30 @@ async def _lifespan(application: FastAPI) -> AsyncIterator[None]:
         audit_broadcast.uninstall()
     except Exception:
         logger.exception("Failed to detach the audit-log WS bridge")
+    try:
+        from app.api import archive_queue
+
+        archive_queue.shutdown()
+    except Exception:
+        logger.exception("Failed to stop the match archive worker")
+    try:
+        from app.db import maintenance as db_maintenance
+
+        db_maintenance.stop()
+    except Exception:
+        logger.exception("Failed to stop SQLite maintenance")
+    try:
+        from app import icons_service
+
+        icons_service.shutdown_transcode_pool()
+    except Exception:
+        logger.exception("Failed to stop the icon transcoding pool")
+    try:
+        from app.auth import passwords
+
+        passwords.shutdown_hash_pool()
+    except Exception:
+        logger.exception("Failed to stop the password hashing pool")
 
 
 def _register_auth(application: FastAPI) -> None:
@@ -92,9 +129,13 @@ async def _service_error_response(
 ) -> JSONResponse:
     """Translate caller-safe service errors at the application boundary."""
     assert isinstance(exc, ServiceError)
+    headers = None
+    if exc.retry_after is not None:
+        headers = {"Retry-After": str(exc.retry_after)}
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": str(exc)},
+        headers=headers,
     )
 
 
@@ -149,9 +190,11 @@ def _register_static_mounts(application: FastAPI) -> None:
         name="fonts",
     )
     if OVERLAY_STATIC_DIR.is_dir():
+        from app.overlay.assets import static_assets
+
         application.mount(
             "/static",
-            StaticFiles(directory=str(OVERLAY_STATIC_DIR)),
+            VersionedStaticFiles(directory=str(OVERLAY_STATIC_DIR), assets=static_assets),
             name="overlay-static",
         )
     application.mount("/pwa", StaticFiles(directory="app/pwa"), name="pwa")
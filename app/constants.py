@@ -79,6 +79,25 @@ AUTH_SESSION_SWEEP_INTERVAL_SECONDS = _env_int_nonneg(
     "AUTH_SESSION_SWEEP_INTERVAL_SECONDS", 6 * 60 * 60,
 )
 
+# Credential resolution cache (see ``app/auth/resolution_cache.py``). A
+# resolved cookie session or control token is remembered for
+# ``AUTH_CACHE_TTL_SECONDS``, up to ``AUTH_CACHE_ENTRIES`` of each kind, so
+# a burst of reconnecting tablets does not repeat the same lookup. Logout,
+# password changes, token rotation and deletes invalidate the entries of
+# this process at once; other workers see a revocation within the TTL.
+# Either set to 0 disables the cache.
+AUTH_CACHE_TTL_SECONDS = _env_float_nonneg("AUTH_CACHE_TTL_SECONDS", 5.0)
+AUTH_CACHE_ENTRIES = _env_int_nonneg("AUTH_CACHE_ENTRIES", 4096)
+
+# Password hashing and verification (scrypt, ~16 MiB and ~50 ms each) run
+# on ``PASSWORD_HASH_WORKERS`` dedicated threads (see
+# ``app/auth/passwords.py``), with at most ``PASSWORD_HASH_QUEUE_LIMIT``
+# more waiting; anything beyond that is refused with a 503 instead of
+# parking another request thread. ``PASSWORD_HASH_WORKERS=0`` hashes on the
+# calling thread with no limit, as before.
+PASSWORD_HASH_WORKERS = _env_int_nonneg("PASSWORD_HASH_WORKERS", 2)
+PASSWORD_HASH_QUEUE_LIMIT = _env_int_nonneg("PASSWORD_HASH_QUEUE_LIMIT", 16)
+
 # Per-socket WebSocket broadcast timeout used by ``WSHub``. A slow
 # subscriber must not stall delivery to the rest. Override with
 # ``WS_BROADCAST_SEND_TIMEOUT_SECONDS``.
@@ -102,6 +121,13 @@ AUDIT_LOG_MAX_FILES = _env_int("AUDIT_LOG_MAX_FILES", 5)
 # ``WSHUB_MAX_CLIENTS_PER_OID``.
 WSHUB_MAX_CLIENTS_PER_OID = _env_int("WSHUB_MAX_CLIENTS_PER_OID", 200)
 
+# Per-client outbound frame queue in ``WSHub``. State and presence frames
+# supersede their queued predecessor, so this only fills with audit deltas
+# for a client that cannot keep up; past the bound the oldest delta is shed
+# and the client re-reads on the version gap. Override with
+# ``WSHUB_CLIENT_QUEUE_MAX``.
+WSHUB_CLIENT_QUEUE_MAX = max(_env_int("WSHUB_CLIENT_QUEUE_MAX", 32), 4)
+
 # Same idea for the OBS browser-source hub (``/ws/<public_token>``): the
 # public token is shareable, so cap fan-out per overlay to keep a leaked
 # link from exhausting sockets or slowing every broadcast. Override with
@@ -124,6 +150,73 @@ WSHUB_CLIENT_TIMEOUT_SECONDS = _env_float(
     "WSHUB_CLIENT_TIMEOUT_SECONDS", 60.0,
 )
 
+# Overlay state write-behind window. 0 (the default) keeps the historical
+# behaviour: every overlay mutation rewrites ``overlay_state_<hash>.json``
+# before returning. A positive value keeps the in-memory state
+# authoritative and lets a background writer persist each overlay at most
+# once per window (fsynced, oldest-dirty first), flushed on shutdown —
+# meant for SD-card hosts where the per-tap rewrite dominates latency. A
+# crash loses at most this much overlay state. Override with
+# ``OVERLAY_STATE_WRITE_BEHIND_SECONDS``.
+OVERLAY_STATE_WRITE_BEHIND_SECONDS = _env_float_nonneg(
+    "OVERLAY_STATE_WRITE_BEHIND_SECONDS", 0.0,
+)
+
+# Rendered match reports (see ``app/match_report/cache.py``): the HTML and
+# CSV bodies kept in memory, and how many evicted bodies may be spilled to
+# ``data/report_cache/`` (0 = no spill). ``MATCH_REPORT_CACHE_ENTRIES=0``
+# renders every request afresh.
+MATCH_REPORT_CACHE_ENTRIES = _env_int_nonneg("MATCH_REPORT_CACHE_ENTRIES", 256)
+MATCH_REPORT_CACHE_DISK_ENTRIES = _env_int_nonneg(
+    "MATCH_REPORT_CACHE_DISK_ENTRIES", 0,
+)
+
+# SQLite connection profile (see ``app/db/engine.py``). ``performance`` (the
+# default) runs a SQLite file in WAL mode with ``synchronous=NORMAL``, waits
+# up to ``SQLITE_BUSY_TIMEOUT_MS`` for a lock instead of failing, gives each
+# connection ``SQLITE_CACHE_KIB`` of page cache and ``SQLITE_MMAP_BYTES`` of
+# memory-mapped I/O (0 keeps SQLite's default for either), and serves
+# listing/report reads from a separate pool of ``SQLITE_READ_POOL_SIZE``
+# query-only connections (0 = reads share the main pool). Every
+# ``SQLITE_MAINTENANCE_SECONDS`` (0 = never) a background job checkpoints
+# the WAL and runs ``PRAGMA optimize``. ``compat`` keeps the historical
+# rollback-journal setup, for databases on network filesystems. PostgreSQL
+# ignores all of these.
+SQLITE_PROFILE = str(
+    EnvVarsManager.get_env_var("SQLITE_PROFILE", "performance") or "performance"
+).strip().lower()
+SQLITE_BUSY_TIMEOUT_MS = _env_int_nonneg("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_CACHE_KIB = _env_int_nonneg("SQLITE_CACHE_KIB", 16 * 1024)
+SQLITE_MMAP_BYTES = _env_int_nonneg("SQLITE_MMAP_BYTES", 64 * 1024 * 1024)
+SQLITE_READ_POOL_SIZE = _env_int_nonneg("SQLITE_READ_POOL_SIZE", 4)
+SQLITE_MAINTENANCE_SECONDS = _env_float_nonneg("SQLITE_MAINTENANCE_SECONDS", 300.0)
+
+# Background match archival (see ``app/api/archive_queue.py``). A match that
+# fails to archive is retried up to ``MATCH_ARCHIVE_RETRY_ATTEMPTS`` times,
+# ``MATCH_ARCHIVE_RETRY_SECONDS * 2**attempt`` apart (capped at a minute);
+# after that it stays in the on-disk journal and is retried on the next
+# start, so a database outage delays a report but never loses the match.
+MATCH_ARCHIVE_RETRY_ATTEMPTS = _env_int_nonneg("MATCH_ARCHIVE_RETRY_ATTEMPTS", 5)
+MATCH_ARCHIVE_RETRY_SECONDS = _env_float_nonneg("MATCH_ARCHIVE_RETRY_SECONDS", 2.0)
+
+# Fraction of game actions (0-1) whose per-stage timing breakdown is logged
+# at INFO, tagged with the request's trace id (see ``app/spans.py``). The
+# ``voc_stage_duration_seconds`` histograms cover every action regardless;
+# the sampled line is for pinning one slow tap to its trace. 0 (the
+# default) logs none.
+SPAN_LOG_SAMPLE_RATE = _env_float_nonneg("SPAN_LOG_SAMPLE_RATE", 0.0)
+
+# Startup warm-up (see ``app/api/warmup.py``). ``WARMUP_OVERLAYS`` is how
+# many of the most recently written overlays get their state context and
+# audit cache preloaded when the app starts; ``0`` (the default) keeps
+# everything lazy. The preload runs on ``WARMUP_WORKERS`` threads and
+# ``/health/ready`` answers 503 until it finishes or
+# ``WARMUP_TIMEOUT_SECONDS`` passes, so a rolling restart only routes
+# traffic to a replica whose busiest courts are already in memory.
+WARMUP_OVERLAYS = _env_int_nonneg("WARMUP_OVERLAYS", 0)
+WARMUP_WORKERS = _env_int("WARMUP_WORKERS", 4)
+WARMUP_TIMEOUT_SECONDS = _env_float("WARMUP_TIMEOUT_SECONDS", 60.0)
+
 # Outbound webhook retry policy. Exponential backoff between attempts:
 # ``RETRY_BASE * 2**attempt`` capped at ``RETRY_MAX``. Only 5xx
 # responses and ``requests.RequestException`` (timeouts, connect
@@ -136,6 +229,13 @@ WEBHOOK_RETRY_ATTEMPTS = _env_int("WEBHOOK_RETRY_ATTEMPTS", 3)
 WEBHOOK_RETRY_BASE_SECONDS = _env_float("WEBHOOK_RETRY_BASE_SECONDS", 1.0)
 WEBHOOK_RETRY_MAX_SECONDS = _env_float("WEBHOOK_RETRY_MAX_SECONDS", 8.0)
 
+# Deliveries held in memory per webhook target. Each target drains its
+# own ordered queue; once a dead receiver lets it fill up, the oldest
+# waiting delivery is moved to the dead-letter file to make room, so a
+# long outage costs bounded memory and nothing is lost for replay.
+# Override with ``WEBHOOK_TARGET_QUEUE_MAX``.
+WEBHOOK_TARGET_QUEUE_MAX = _env_int("WEBHOOK_TARGET_QUEUE_MAX", 256)
+
 # Hard cap on the dead-letter file. ``append`` evicts the oldest
 # records once the file would exceed this many entries, so a
 # misbehaving target / runaway producer cannot grow ``data/
@@ -176,3 +276,14 @@ ICONS_MAX_PIXELS = _env_int("ICONS_MAX_PIXELS", 24_000_000)
 # cap on how many teams one request may convert.
 ICONS_IMPORT_TIMEOUT_SECONDS = _env_float("ICONS_IMPORT_TIMEOUT_SECONDS", 10.0)
 ICONS_IMPORT_MAX_BATCH = _env_int("ICONS_IMPORT_MAX_BATCH", 100)
+# How many of a batch import's downloads (and their transcodes) run at once.
+ICONS_IMPORT_CONCURRENCY = _env_int("ICONS_IMPORT_CONCURRENCY", 4)
+# Worker processes for the Pillow decode/resize/encode, so icon work never
+# holds the GIL the request threads need (0 transcodes on the calling
+# thread instead). Transcodes are memoized by source-content hash in a
+# cache of at most ``ICONS_TRANSCODE_CACHE_BYTES`` of WebP output (0
+# disables it).
+ICONS_TRANSCODE_WORKERS = _env_int_nonneg("ICONS_TRANSCODE_WORKERS", 2)
+ICONS_TRANSCODE_CACHE_BYTES = _env_int_nonneg(
+    "ICONS_TRANSCODE_CACHE_BYTES", 16 * 1024 * 1024,
+)
@@ -19,6 +19,7 @@ from app.db.engine import (
     get_db,
     get_engine,
     get_sessionmaker,
+    read_session_scope,
     session_scope,
 )
 
@@ -31,5 +32,6 @@ __all__ = [
     "get_db",
     "get_engine",
     "get_sessionmaker",
+    "read_session_scope",
     "session_scope",
 ]
@@ -8,6 +8,23 @@ by setting ``DATABASE_URL=postgresql+psycopg://...`` — no code change.
 The engine and ``sessionmaker`` are process-global singletons created
 lazily on first use. ``configure_engine`` lets tests swap in an in-memory
 SQLite engine (``StaticPool``) before the app touches the DB.
+
+SQLite profile (``SQLITE_PROFILE``). Venue boxes run the default SQLite
+file, where the rollback journal makes every writer (a match archive, a
+session ``last_seen_at`` bump) lock out every reader (the history list, a
+report) and vice versa — "database is locked" right at match end. The
+``performance`` profile (the default) opens each connection in WAL mode
+with ``synchronous=NORMAL``, a ``busy_timeout``, a larger page cache,
+memory-mapped reads and in-memory temp tables, so readers and the one
+writer no longer block each other and a short write burst waits instead
+of failing. It also builds a second, ``query_only`` connection pool that
+:func:`read_session_scope` hands to the listing and report queries, so
+they never queue behind the writer's connections. ``compat`` keeps the
+historical connection setup (foreign keys only), for a database on a
+filesystem where WAL's shared memory does not work (NFS/SMB). Periodic
+WAL checkpoints and ``PRAGMA optimize`` are run by
+:mod:`app.db.maintenance`. None of this applies to PostgreSQL or to an
+in-memory or caller-built engine.
 """
 
 from __future__ import annotations
@@ -26,6 +43,8 @@ logger = logging.getLogger(__name__)
 
 _engine: Engine | None = None
 _SessionLocal: sessionmaker[Session] | None = None
+_read_engine: Engine | None = None
+_ReadSessionLocal: sessionmaker[Session] | None = None
 _AFTER_COMMIT = "volley_after_commit"
 _AFTER_ROLLBACK = "volley_after_rollback"
 
@@ -61,6 +80,54 @@ def _engine_kwargs(url: str) -> dict[str, Any]:
     return {"pool_pre_ping": True}
 
 
+def sqlite_profile() -> str:
+    """The configured ``SQLITE_PROFILE`` (``performance`` or ``compat``)."""
+    # Lazy import, like ``database_url``: app.constants pulls in the env
+    # manager, which must not load with the db package.
+    from app.constants import SQLITE_PROFILE
+
+    if SQLITE_PROFILE not in ("performance", "compat"):
+        logger.warning("Unknown SQLITE_PROFILE %r; using 'performance'", SQLITE_PROFILE)
+        return "performance"
+    return SQLITE_PROFILE
+
+
+def is_sqlite_file(engine: Engine) -> bool:
+    """True for an engine on a SQLite *file* (not ``:memory:``)."""
+    if engine.dialect.name != "sqlite":
+        return False
+    database = engine.url.database or ""
+    return database not in ("", ":memory:") and "mode=memory" not in str(engine.url)
+
+
+def _tuned_sqlite(engine: Engine) -> bool:
+    return is_sqlite_file(engine) and sqlite_profile() == "performance"
+
+
+def _sqlite_pragmas(*, read_only: bool) -> list[str]:
+    """The ``performance`` profile's per-connection pragmas."""
+    from app.constants import SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_KIB, SQLITE_MMAP_BYTES
+
+    pragmas = [
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        # Persistent in the file, but cheap to re-assert; a reader needs the
+        # database in WAL mode before it can read alongside the writer.
+        "PRAGMA journal_mode=WAL",
+        # WAL + NORMAL is durable across application crashes; only an OS
+        # crash or power cut can lose the last commits, never corrupt.
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if SQLITE_CACHE_KIB:
+        # Negative means KiB rather than pages.
+        pragmas.append(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+    if SQLITE_MMAP_BYTES:
+        pragmas.append(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
 def configure_engine(
     url: str | None = None,
     *,
@@ -72,33 +139,67 @@ def configure_engine(
     Pass ``engine`` to bind a caller-built engine directly (tests use this
     to inject an in-memory ``StaticPool`` engine). Otherwise an engine is
     built from ``url`` (defaulting to :func:`database_url`).
+
+    With the SQLite ``performance`` profile, an engine built here from a
+    file URL is tuned and gets a read-only companion pool (see the module
+    docstring); a caller-built engine is bound as given, with foreign keys
+    on, and reads share it.
     """
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _read_engine, _ReadSessionLocal
+    if _read_engine is not None:
+        _read_engine.dispose()
+    _read_engine = _ReadSessionLocal = None
+    tuned = False
     if engine is None:
         resolved = url or database_url()
         kwargs = {**_engine_kwargs(resolved), **engine_kwargs}
         engine = create_engine(resolved, future=True, **kwargs)
+        tuned = _tuned_sqlite(engine)
     if engine.dialect.name == "sqlite":
-        _enable_sqlite_fk(engine)
+        _enable_sqlite_fk(engine, _sqlite_pragmas(read_only=False) if tuned else [])
     _engine = engine
     _SessionLocal = sessionmaker(
         bind=engine, autoflush=False, expire_on_commit=False, future=True,
     )
+    if tuned:
+        _configure_read_engine(engine)
     return engine
 
 
-def _enable_sqlite_fk(engine: Engine) -> None:
-    """Turn on ``PRAGMA foreign_keys`` for every SQLite connection.
+def _configure_read_engine(engine: Engine) -> None:
+    """Build the ``query_only`` pool next to a tuned SQLite *engine*."""
+    global _read_engine, _ReadSessionLocal
+    from app.constants import SQLITE_READ_POOL_SIZE
+
+    if SQLITE_READ_POOL_SIZE <= 0:
+        return
+    _read_engine = create_engine(
+        engine.url,
+        future=True,
+        connect_args={"check_same_thread": False},
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=SQLITE_READ_POOL_SIZE,
+    )
+    _enable_sqlite_fk(_read_engine, _sqlite_pragmas(read_only=True))
+    _ReadSessionLocal = sessionmaker(
+        bind=_read_engine, autoflush=False, expire_on_commit=False, future=True,
+    )
+
+
+def _enable_sqlite_fk(engine: Engine, pragmas: list[str] | None = None) -> None:
+    """Turn on ``PRAGMA foreign_keys`` (plus *pragmas*) for every connection.
 
     SQLite ships with FK enforcement OFF; without this the ``ON DELETE
     CASCADE`` rules (user-account deletion wiping overlays/teams/presets/
     reports/sessions) silently no-op. Registered once per engine.
     """
+    statements = ["PRAGMA foreign_keys=ON", *(pragmas or [])]
 
     @event.listens_for(engine, "connect")
     def _set_pragma(dbapi_conn: Any, _record: Any) -> None:
         cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for statement in statements:
+            cursor.execute(statement)
         cursor.close()
 
 
@@ -135,6 +236,24 @@ def session_scope() -> Iterator[Session]:
         session.close()
 
 
+@contextmanager
+def read_session_scope() -> Iterator[Session]:
+    """Session for read-only queries (history listings, report loads).
+
+    Served from the ``query_only`` pool when the SQLite ``performance``
+    profile built one, else from the regular engine. Never commits: closing
+    the session ends its transaction (without expiring the loaded rows,
+    which callers read after the block), and a write through it fails on
+    the read pool, so only pure reads belong here.
+    """
+    factory = _ReadSessionLocal or get_sessionmaker()
+    session = factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def after_commit(session: Session, callback: Callable[[], None]) -> None:
     """Run *callback* after the request transaction commits successfully."""
     session.info.setdefault(_AFTER_COMMIT, []).append(callback)
@@ -0,0 +1,85 @@
+"""Periodic WAL checkpoint and ``PRAGMA optimize`` for a SQLite database.
+
+In WAL mode SQLite checkpoints on its own once the log reaches 1000 pages,
+but only from the connection that happens to commit past the threshold —
+so the match-end write pays for it — and never while a reader holds an old
+snapshot, which lets the ``-wal`` file keep growing on a busy evening.
+:func:`start` runs a small daemon thread that, every
+``SQLITE_MAINTENANCE_SECONDS``, issues a ``PASSIVE`` checkpoint (copies
+what it can without waiting on anyone) and ``PRAGMA optimize`` (refreshes
+the planner statistics the listing queries rely on, only where they went
+stale). :func:`stop` wakes it for a final ``TRUNCATE`` checkpoint so a
+clean shutdown leaves no ``-wal`` behind.
+
+Only a tuned SQLite file (see :mod:`app.db.engine`) is maintained; for
+PostgreSQL, an in-memory database or the ``compat`` profile both calls are
+no-ops. Failures are logged and retried on the next round.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from app.db.engine import get_engine, is_sqlite_file, sqlite_profile
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stop: threading.Event | None = None
+_thread: threading.Thread | None = None
+
+
+def _enabled() -> bool:
+    return is_sqlite_file(get_engine()) and sqlite_profile() == "performance"
+
+
+def run_once(checkpoint: str = "PASSIVE") -> bool:
+    """Checkpoint the WAL with *checkpoint* mode and optimize. True on success."""
+    try:
+        with get_engine().connect() as conn:
+            conn.exec_driver_sql(f"PRAGMA wal_checkpoint({checkpoint})")
+            conn.exec_driver_sql("PRAGMA optimize")
+            conn.commit()
+    except Exception as exc:
+        logger.warning("SQLite maintenance (%s) failed: %s", checkpoint, exc)
+        return False
+    return True
+
+
+def _loop(stop: threading.Event, interval: float) -> None:
+    while not stop.wait(interval):
+        run_once()
+
+
+def start() -> None:
+    """Start the maintenance thread (lifespan startup); idempotent."""
+    global _stop, _thread
+    from app.constants import SQLITE_MAINTENANCE_SECONDS
+
+    if SQLITE_MAINTENANCE_SECONDS <= 0 or not _enabled():
+        return
+    with _lock:
+        if _thread is not None:
+            return
+        _stop = threading.Event()
+        _thread = threading.Thread(
+            target=_loop,
+            args=(_stop, SQLITE_MAINTENANCE_SECONDS),
+            name="sqlite-maintenance",
+            daemon=True,
+        )
+        _thread.start()
+
+
+def stop() -> None:
+    """Stop the thread and truncate the WAL (lifespan shutdown)."""
+    global _stop, _thread
+    with _lock:
+        stop_event, thread = _stop, _thread
+        _stop = _thread = None
+    if thread is None or stop_event is None:
+        return
+    stop_event.set()
+    thread.join(timeout=5.0)
+    run_once("TRUNCATE")
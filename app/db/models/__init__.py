@@ -9,7 +9,7 @@ from __future__ import annotations
 from app.db.models.icon import Icon
 from app.db.models.overlay import UserOverlay
 from app.db.models.preset import Preset
-from app.db.models.report import MatchReport
+from app.db.models.report import MatchReport, MatchReportAudit
 from app.db.models.setting import Setting
 from app.db.models.team import Team, TeamGroup, TeamGroupMember, UserGroupTeam
 from app.db.models.user import AuthSession, User
@@ -18,6 +18,7 @@ __all__ = [
     "AuthSession",
     "Icon",
     "MatchReport",
+    "MatchReportAudit",
     "Preset",
     "Setting",
     "Team",
@@ -3,16 +3,32 @@
 Mirrors the ``archive_match`` payload shape, plus ``user_id`` for ownership
 and account-screen listing. ``match_id`` keeps the historical
 ``match_<20hex>_<UTC>`` format so ``/match/{id}/report`` parsing and the
-HMAC report-signing keep working. Per-set summary numbers are computed from
-``final_state`` on read rather than stored (they were the ``index.jsonl``
-columns).
+HMAC report-signing keep working.
+
+The listing summary (mode, team names, set counts, current set) is
+denormalized into plain columns when the match is archived, so the history
+page, its count and the calendar are index scans over this table instead of
+a JSON extraction plus a customization lookup per row. ``final_state`` and
+``customization`` stay the source of truth for the full report; the summary
+columns are written once from them and never edited independently.
+
+The report's audit-derived statistics (highlights, set durations, serve
+split, timeouts per set) are computed once at archive time and stored in
+``stats`` with the ``stats_version`` that produced them; a row whose
+version is older than the running code's is recomputed from its audit on
+the next full read and written back.
+
+The audit trajectory — by far the largest part of a match — lives in the
+``match_report_audits`` side table as one compressed blob per report, so
+listing queries, the summary pages and backups of ``match_reports`` never
+touch it. Only the full-snapshot read (``load_match``) joins it back in.
 """
 
 from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy import Float, ForeignKey, Index, Integer, LargeBinary, String
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import JSON
 
@@ -23,6 +39,9 @@ class MatchReport(Base, TimestampMixin):
     __tablename__ = "match_reports"
     __table_args__ = (
         Index("ix_match_reports_user_oid_ended", "user_id", "oid", "ended_at"),
+        # The account-wide history (no oid) and its mode filter.
+        Index("ix_match_reports_user_ended", "user_id", "ended_at"),
+        Index("ix_match_reports_user_mode_ended", "user_id", "mode", "ended_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -37,7 +56,36 @@ class MatchReport(Base, TimestampMixin):
     winning_team: Mapped[int | None] = mapped_column(Integer)
     final_state: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict, nullable=False)
     customization: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict, nullable=False)
-    audit_log: Mapped[list[Any]] = mapped_column(JSON, default=list, nullable=False)
     points_limit: Mapped[int | None] = mapped_column(Integer)
     points_limit_last_set: Mapped[int | None] = mapped_column(Integer)
     sets_limit: Mapped[int | None] = mapped_column(Integer)
+    # Summary columns — see the module docstring.
+    mode: Mapped[str | None] = mapped_column(String(32))
+    team_1_name: Mapped[str | None] = mapped_column(String(120))
+    team_2_name: Mapped[str | None] = mapped_column(String(120))
+    team_1_sets: Mapped[int | None] = mapped_column(Integer)
+    team_2_sets: Mapped[int | None] = mapped_column(Integer)
+    current_set: Mapped[int | None] = mapped_column(Integer)
+    # Stats snapshot — see the module docstring.
+    stats: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    stats_version: Mapped[int | None] = mapped_column(Integer)
+
+
+class MatchReportAudit(Base):
+    """The archived audit list of one :class:`MatchReport`, compressed.
+
+    One row per report, keyed by the report's id and removed with it by the
+    FK cascade. ``codec`` names the encoding of ``payload`` (see
+    :mod:`app.api._audit_codec`) so rows written by older code keep
+    decoding; ``record_count`` answers "how long was the transcript?"
+    without inflating the blob.
+    """
+
+    __tablename__ = "match_report_audits"
+
+    report_id: Mapped[int] = mapped_column(
+        ForeignKey("match_reports.id", ondelete="CASCADE"), primary_key=True,
+    )
+    codec: Mapped[str] = mapped_column(String(32), nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
@@ -25,31 +25,37 @@ from __future__ import annotations
 
 import errno
 import hashlib
-import io
 import logging
+import multiprocessing
 import os
 import secrets
 import tempfile
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from PIL import Image, ImageOps, UnidentifiedImageError
+from PIL import Image
 from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.api._persistence_paths import data_dir
 from app.constants import (
+    ICONS_IMPORT_CONCURRENCY,
     ICONS_IMPORT_TIMEOUT_SECONDS,
     ICONS_MAX_DIM,
     ICONS_MAX_PER_USER,
     ICONS_MAX_PIXELS,
     ICONS_MAX_STORED_BYTES,
     ICONS_MAX_UPLOAD_BYTES,
+    ICONS_TRANSCODE_CACHE_BYTES,
+    ICONS_TRANSCODE_WORKERS,
     ICONS_WEBP_QUALITY,
 )
 from app.db.models.icon import Icon
 from app.db.models.team import Team
+from app.icons_transcode import IconError, ProcessedIcon, init_worker, transcode
 from app.net_guard import GuardedFetchError, fetch_guarded
-from app.service_errors import ServiceError
 
 logger = logging.getLogger(__name__)
 
@@ -63,25 +69,21 @@ ICONS_URL_PREFIX = "/media/icons/"
 # future non-icon image handling.
 Image.MAX_IMAGE_PIXELS = ICONS_MAX_PIXELS
 
-# Formats we accept after sniffing the actual bytes (never the client
-# Content-Type). SVG is deliberately absent in v1: Pillow cannot decode
-# it and passing XML through unrasterized would open a script-injection
-# surface.
-_ACCEPTED_FORMATS = {"PNG", "JPEG", "WEBP", "GIF"}
-
-# Quality ladder: retry the WebP encode at decreasing quality until the
-# output fits ICONS_MAX_STORED_BYTES. A 512x512 WebP virtually never
-# exceeds 512 KiB even at q82 — the ladder is belt-and-braces.
-_QUALITY_LADDER_FLOOR = (70, 55, 40)
+# Transcoding runs in a small process pool started on first use, so a
+# Pillow encode never holds the GIL the request threads need. Results are
+# memoized in a byte-bounded LRU keyed by the SHA-256 of the source bytes
+# plus the encoder settings; a re-upload of the same image (or a league's
+# shared sponsor logo, imported once per team) is served from it.
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_cache: OrderedDict[tuple[object, ...], ProcessedIcon] = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
 
 # Must match the ``icons.name`` column width (String(120)).
 _MAX_NAME_LEN = 120
 
 
-class IconError(ServiceError):
-    """A caller-fixable icon error (bad image, duplicate, quota, missing)."""
-
-
 def icons_dir() -> str:
     """Directory the icon files live in (monkeypatchable in tests)."""
     return data_dir("media", "icons")
@@ -91,11 +93,63 @@ def icon_public_url(filename: str) -> str:
     return f"{ICONS_URL_PREFIX}{filename}"
 
 
-@dataclass(frozen=True)
-class ProcessedIcon:
-    content: bytes
-    width: int
-    height: int
+def _transcode_pool() -> ProcessPoolExecutor | None:
+    """The shared transcoding pool, started on first use (``None``: inline)."""
+    global _pool
+    if ICONS_TRANSCODE_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # ``spawn`` rather than ``fork``: the server is multi-threaded,
+            # and a forked child can inherit a lock some other thread held.
+            _pool = ProcessPoolExecutor(
+                max_workers=ICONS_TRANSCODE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(ICONS_MAX_PIXELS,),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_transcode_pool() -> None:
+    """Stop the worker processes (lifespan shutdown); the next use restarts them."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _cache_get(key: tuple[object, ...]) -> ProcessedIcon | None:
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+        return hit
+
+
+def _cache_put(key: tuple[object, ...], processed: ProcessedIcon) -> None:
+    global _cache_bytes
+    size = len(processed.content)
+    if size > ICONS_TRANSCODE_CACHE_BYTES:
+        return
+    with _cache_lock:
+        previous = _cache.pop(key, None)
+        if previous is not None:
+            _cache_bytes -= len(previous.content)
+        _cache[key] = processed
+        _cache_bytes += size
+        while _cache_bytes > ICONS_TRANSCODE_CACHE_BYTES:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted.content)
 
 
 def process_icon_upload(raw: bytes) -> ProcessedIcon:
@@ -104,50 +158,42 @@ def process_icon_upload(raw: bytes) -> ProcessedIcon:
     Raises :class:`IconError` for anything the uploader can fix: not an
     image, an unsupported format, a decompression bomb, or an image
     that will not compress under the stored-size cap.
+
+    The Pillow work runs in the transcoding process pool (see
+    ``ICONS_TRANSCODE_WORKERS``), so it holds neither the GIL nor a
+    request thread's CPU; this thread only waits for the result. Results
+    are cached by a hash of the source bytes and the encoder settings, so
+    re-uploading or re-importing the same image skips the encode.
     """
     if len(raw) > ICONS_MAX_UPLOAD_BYTES:
         raise IconError(
             f"Image is too large (max {ICONS_MAX_UPLOAD_BYTES // (1024 * 1024)} MB)."
         )
-    head = raw[:512].lstrip().lower()
-    if head.startswith(b"<?xml") or b"<svg" in head:
-        raise IconError("SVG images are not supported — upload PNG, JPEG, WebP or GIF.")
-    try:
-        with Image.open(io.BytesIO(raw)) as img:
-            fmt = (img.format or "").upper()
-            if fmt not in _ACCEPTED_FORMATS:
-                raise IconError(
-                    f"Unsupported image format {fmt or 'unknown'!r} — "
-                    "upload PNG, JPEG, WebP or GIF."
-                )
-            # Explicit pixel budget from the header, BEFORE any decode:
-            # Pillow's own bomb guard only hard-fails at 2× MAX_IMAGE_PIXELS
-            # (below that it merely warns), which would let a ~5 MB upload
-            # materialize a ~48M-pixel RGBA (~190 MB) during convert().
-            if img.width * img.height > ICONS_MAX_PIXELS:
-                raise IconError("Image has too many pixels.")
-            # Animated inputs are flattened to their first frame (v1).
-            img.seek(0)
-            # Bake EXIF rotation in, then normalize palette/CMYK/L modes;
-            # RGBA keeps transparency and WebP encodes it natively.
-            # (New name: exif_transpose/convert return plain Image objects,
-            # not the ImageFile that ``open`` produced — mypy distinguishes.)
-            normalized = ImageOps.exif_transpose(img).convert("RGBA")
-            # thumbnail() preserves aspect ratio and never upscales.
-            normalized.thumbnail(
-                (ICONS_MAX_DIM, ICONS_MAX_DIM), Image.Resampling.LANCZOS,
-            )
-            for quality in (ICONS_WEBP_QUALITY, *_QUALITY_LADDER_FLOOR):
-                buf = io.BytesIO()
-                normalized.save(buf, format="WEBP", quality=quality, method=6)
-                content = buf.getvalue()
-                if len(content) <= ICONS_MAX_STORED_BYTES:
-                    return ProcessedIcon(content, normalized.width, normalized.height)
-            raise IconError("Image does not compress under the stored-size limit.")
-    except Image.DecompressionBombError as exc:
-        raise IconError("Image has too many pixels.") from exc
-    except UnidentifiedImageError as exc:
-        raise IconError("File is not a recognizable image.") from exc
+    settings = {
+        "max_dim": ICONS_MAX_DIM,
+        "quality": ICONS_WEBP_QUALITY,
+        "max_stored_bytes": ICONS_MAX_STORED_BYTES,
+        "max_pixels": ICONS_MAX_PIXELS,
+    }
+    key = (hashlib.sha256(raw).digest(), *settings.values())
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    pool = _transcode_pool()
+    if pool is None:
+        processed = transcode(raw, **settings)
+    else:
+        try:
+            processed = pool.submit(transcode, raw, **settings).result()
+        except BrokenProcessPool as exc:
+            # A worker died mid-encode (OOM-killed on a hostile image, most
+            # likely). Start a fresh pool for the next upload and fail this
+            # one rather than retrying the same input inline.
+            logger.warning("Icon transcoding worker died; restarting the pool")
+            _discard_pool(pool)
+            raise IconError("Image could not be processed.") from exc
+    _cache_put(key, processed)
+    return processed
 
 
 def _store_file(content: bytes) -> str:
@@ -326,6 +372,27 @@ def create_icon(
     Request callers register rollback cleanup for ``icon.filename``; the
     batch importer owns its per-team commits and cleanup directly.
     """
+    name = _checked_name(db, name, user_id=user_id, dedupe=dedupe)
+    return _persist_icon(
+        db, name=name, processed=process_icon_upload(raw), user_id=user_id,
+    )
+
+
+def _create_processed_icon(
+    db: Session,
+    *,
+    name: str,
+    processed: ProcessedIcon,
+    user_id: int | None,
+    dedupe: bool = False,
+) -> Icon:
+    """:func:`create_icon` for an image the caller already transcoded."""
+    name = _checked_name(db, name, user_id=user_id, dedupe=dedupe)
+    return _persist_icon(db, name=name, processed=processed, user_id=user_id)
+
+
+def _checked_name(db: Session, name: str, *, user_id: int | None, dedupe: bool) -> str:
+    """Validate *name* and the quota for a new icon; returns the final name."""
     name = (name or "").strip()
     if not name:
         raise IconError("Icon name is required.")
@@ -337,8 +404,13 @@ def create_icon(
         name = dedupe_name(db, name, user_id=user_id)
     elif _name_taken(db, name, user_id=user_id):
         raise IconError(f"An icon named {name!r} already exists.")
+    return name
 
-    processed = process_icon_upload(raw)
+
+def _persist_icon(
+    db: Session, *, name: str, processed: ProcessedIcon, user_id: int | None,
+) -> Icon:
+    """Write *processed* to disk and add its row; unlinks the file on a failed flush."""
     filename = _store_file(processed.content)
     icon = Icon(
         name=name,
@@ -405,6 +477,33 @@ def delete_icon(db: Session, icon: Icon) -> tuple[int, str]:
     return int(cleared), filename
 
 
+def _import_skip_reason(source: str) -> str | None:
+    """Why the batch import leaves a team with this ``icon_url`` alone."""
+    if not source:
+        return "no icon URL"
+    if source.startswith(ICONS_URL_PREFIX):
+        # Already hosted — makes re-running the import idempotent.
+        return "already hosted"
+    if not source.lower().startswith(("http://", "https://")):
+        return "not an external http(s) URL"
+    return None
+
+
+def _download_and_transcode(source: str) -> ProcessedIcon:
+    """Fetch one import source and transcode it.
+
+    Only the transcoded icon is returned: the raw download (up to
+    ``ICONS_MAX_UPLOAD_BYTES``) is dropped as soon as it is encoded rather
+    than held until the team's write step.
+    """
+    raw = fetch_guarded(
+        source,
+        max_bytes=ICONS_MAX_UPLOAD_BYTES,
+        timeout=ICONS_IMPORT_TIMEOUT_SECONDS,
+    )
+    return process_icon_upload(raw)
+
+
 def import_icons_from_teams(
     db: Session,
     teams: list[Team],
@@ -419,34 +518,45 @@ def import_icons_from_teams(
     the team at the hosted URL. Committed **per team**, so one failure
     never rolls back earlier conversions.
 
+    The downloads and transcodes run ``ICONS_IMPORT_CONCURRENCY`` at a
+    time before the per-team writes, which stay serial on *db* and store
+    the already-transcoded icon. Nothing is encoded twice, however many
+    entries a large import evicts from the transcode cache.
+
     Returns one result dict per team, in input order:
     ``{team_id, team_name, status: ok|skipped|error, icon_id?, icon_url?, error?}``.
     """
+    # One download per distinct URL: teams sharing a logo share the fetch.
+    sources = list(dict.fromkeys(
+        source for team in teams
+        if _import_skip_reason(source := (team.icon_url or "").strip()) is None
+    ))
+    prepared: dict[str, Future[ProcessedIcon]] = {}
+    if sources:
+        with ThreadPoolExecutor(
+            max_workers=min(ICONS_IMPORT_CONCURRENCY, len(sources)),
+            thread_name_prefix="icon-import",
+        ) as pool:
+            prepared = {
+                source: pool.submit(_download_and_transcode, source)
+                for source in sources
+            }
     results: list[dict] = []
     for team in teams:
         base = {"team_id": team.id, "team_name": team.name}
         source = (team.icon_url or "").strip()
-        if not source:
-            results.append({**base, "status": "skipped", "error": "no icon URL"})
-            continue
-        if source.startswith(ICONS_URL_PREFIX):
-            # Already hosted — makes re-running the import idempotent.
-            results.append({**base, "status": "skipped", "error": "already hosted"})
-            continue
-        if not source.lower().startswith(("http://", "https://")):
-            results.append(
-                {**base, "status": "skipped", "error": "not an external http(s) URL"}
-            )
+        skip_reason = _import_skip_reason(source)
+        if skip_reason is not None:
+            results.append({**base, "status": "skipped", "error": skip_reason})
             continue
         created_filename: str | None = None
         try:
-            raw = fetch_guarded(
-                source,
-                max_bytes=ICONS_MAX_UPLOAD_BYTES,
-                timeout=ICONS_IMPORT_TIMEOUT_SECONDS,
-            )
-            icon = create_icon(
-                db, name=team.name, raw=raw, user_id=user_id, dedupe=True,
+            icon = _create_processed_icon(
+                db,
+                name=team.name,
+                processed=prepared[source].result(),
+                user_id=user_id,
+                dedupe=True,
             )
             created_filename = icon.filename
             url = icon_public_url(icon.filename)
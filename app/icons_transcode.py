@@ -0,0 +1,97 @@
+"""Pillow side of the icon pipeline: decode, shrink and re-encode to WebP.
+
+Kept apart from :mod:`app.icons_service` so it can run in the transcoding
+worker processes. Everything it needs arrives as arguments and it imports
+nothing heavier than Pillow, so a worker starts quickly and never pulls in
+SQLAlchemy, the models or the app settings. Nothing here touches disk or
+the database.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.service_errors import ServiceError
+
+# Formats we accept after sniffing the actual bytes (never the client
+# Content-Type). SVG is deliberately absent in v1: Pillow cannot decode
+# it and passing XML through unrasterized would open a script-injection
+# surface.
+_ACCEPTED_FORMATS = {"PNG", "JPEG", "WEBP", "GIF"}
+
+# Quality ladder: retry the WebP encode at decreasing quality until the
+# output fits the stored-size cap. A 512x512 WebP virtually never exceeds
+# 512 KiB even at q82 — the ladder is belt-and-braces.
+_QUALITY_LADDER_FLOOR = (70, 55, 40)
+
+
+class IconError(ServiceError):
+    """A caller-fixable icon error (bad image, duplicate, quota, missing)."""
+
+
+@dataclass(frozen=True)
+class ProcessedIcon:
+    content: bytes
+    width: int
+    height: int
+
+
+def init_worker(max_pixels: int) -> None:
+    """Process-pool initializer: arm Pillow's decompression-bomb guard."""
+    Image.MAX_IMAGE_PIXELS = max_pixels
+
+
+def transcode(
+    raw: bytes,
+    *,
+    max_dim: int,
+    quality: int,
+    max_stored_bytes: int,
+    max_pixels: int,
+) -> ProcessedIcon:
+    """Decode, shrink, and re-encode *raw* image bytes to bounded WebP.
+
+    Raises :class:`IconError` for anything the uploader can fix: not an
+    image, an unsupported format, a decompression bomb, or an image that
+    will not compress under *max_stored_bytes*.
+    """
+    head = raw[:512].lstrip().lower()
+    if head.startswith(b"<?xml") or b"<svg" in head:
+        raise IconError("SVG images are not supported — upload PNG, JPEG, WebP or GIF.")
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            fmt = (img.format or "").upper()
+            if fmt not in _ACCEPTED_FORMATS:
+                raise IconError(
+                    f"Unsupported image format {fmt or 'unknown'!r} — "
+                    "upload PNG, JPEG, WebP or GIF."
+                )
+            # Explicit pixel budget from the header, BEFORE any decode:
+            # Pillow's own bomb guard only hard-fails at 2× MAX_IMAGE_PIXELS
+            # (below that it merely warns), which would let a ~5 MB upload
+            # materialize a ~48M-pixel RGBA (~190 MB) during convert().
+            if img.width * img.height > max_pixels:
+                raise IconError("Image has too many pixels.")
+            # Animated inputs are flattened to their first frame (v1).
+            img.seek(0)
+            # Bake EXIF rotation in, then normalize palette/CMYK/L modes;
+            # RGBA keeps transparency and WebP encodes it natively.
+            # (New name: exif_transpose/convert return plain Image objects,
+            # not the ImageFile that ``open`` produced — mypy distinguishes.)
+            normalized = ImageOps.exif_transpose(img).convert("RGBA")
+            # thumbnail() preserves aspect ratio and never upscales.
+            normalized.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+            for step in (quality, *_QUALITY_LADDER_FLOOR):
+                buf = io.BytesIO()
+                normalized.save(buf, format="WEBP", quality=step, method=6)
+                content = buf.getvalue()
+                if len(content) <= max_stored_bytes:
+                    return ProcessedIcon(content, normalized.width, normalized.height)
+            raise IconError("Image does not compress under the stored-size limit.")
+    except Image.DecompressionBombError as exc:
+        raise IconError("Image has too many pixels.") from exc
+    except UnidentifiedImageError as exc:
+        raise IconError("File is not a recognizable image.") from exc
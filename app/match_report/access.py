@@ -15,7 +15,6 @@ from __future__ import annotations
 from fastapi import HTTPException, Request
 
 from app.env_vars_manager import EnvVarsManager
-from app.overlay_key import is_valid_skey, split_skey
 
 _WWW_AUTH = {"WWW-Authenticate": "Cookie"}
 
@@ -40,14 +39,10 @@ def cookie_user_owns(request: Request, match_id: str | None) -> bool:
             return False
         from app.api import match_archive
 
-        payload = match_archive.load_match(match_id)
-        if payload is None:
-            return False
-        skey = payload.get("oid")
-        if not isinstance(skey, str) or not is_valid_skey(skey):
-            return False
-        owner_id, _ = split_skey(skey)
-        return owner_id == user.id
+        # One integer column: the full payload would decode the audit blob
+        # (and maybe refresh the stats) on every owner hit, 304s included.
+        owner_id = match_archive.owner_user_id(match_id)
+        return owner_id is not None and owner_id == user.id
 
 
 def check_read_access(
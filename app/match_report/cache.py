@@ -0,0 +1,223 @@
+"""Rendered-report cache for ``/match/{id}/report`` and its CSV export.
+
+An archived match never changes, yet every GET of its report used to load
+the full row, decode the audit transcript and re-run the trim/collapse/stats
+passes, the colour-contrast resolution and the SVG chart generation. A
+shared report link is opened by a crowd all at once right after the final
+point, so each of them paid that full render.
+
+Rendered bodies are kept here per ``(match_id, locale, kind)``:
+
+* an in-process LRU of ``MATCH_REPORT_CACHE_ENTRIES`` bodies (0 disables the
+  cache and every request renders, as before);
+* optionally, bodies evicted from it are spilled to
+  ``data/report_cache/`` (``MATCH_REPORT_CACHE_DISK_ENTRIES`` bounds the
+  file count; 0, the default, disables the spill) and promoted back on the
+  next request, so a long tail of old reports survives both eviction and a
+  restart;
+* concurrent misses on one key render once — the rest wait for that render
+  rather than each starting their own.
+
+:data:`RENDER_VERSION` is a digest of this package's source, so any change
+to the template, the strings or the renderers orphans every older body
+(including spilled ones) without a manual bump. Nothing here checks access
+or existence: the routes do both before asking, so a report deleted by
+another worker is never served from a stale entry. :func:`invalidate` just
+frees the space when this process deletes one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.api._persistence_paths import data_dir
+from app.constants import MATCH_REPORT_CACHE_DISK_ENTRIES, MATCH_REPORT_CACHE_ENTRIES
+from app.metrics import record_match_report_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _source_digest() -> str:
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+RENDER_VERSION = _source_digest()
+
+_CacheKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedReport:
+    content: str
+    # Download filename (CSV only); part of what the route replays.
+    filename: str | None = None
+
+    @property
+    def digest(self) -> str:
+        """Content digest the routes build their ``ETag`` from."""
+        return hashlib.sha256(self.content.encode()).hexdigest()[:32]
+
+
+_lock = threading.Lock()
+_memory: OrderedDict[_CacheKey, tuple[RenderedReport, str]] = OrderedDict()
+# One lock per key with a render in flight; see :func:`get_or_render`.
+_rendering: dict[_CacheKey, threading.Lock] = {}
+
+
+def cache_dir() -> str:
+    """Spill directory (monkeypatchable in tests)."""
+    return data_dir("report_cache")
+
+
+def _match_dir(match_id: str) -> str:
+    return os.path.join(cache_dir(), hashlib.sha256(match_id.encode()).hexdigest()[:32])
+
+
+def _spill_path(key: _CacheKey) -> str:
+    match_id, locale, kind = key
+    return os.path.join(_match_dir(match_id), f"{RENDER_VERSION}-{locale or '_'}.{kind}.json")
+
+
+def _spill(key: _CacheKey, report: RenderedReport) -> None:
+    """Best-effort write of an evicted body to disk, then trim the spill."""
+    path = _spill_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"content": report.content, "filename": report.filename}, f)
+        os.replace(tmp, path)
+    except OSError:
+        logger.warning("Could not spill a rendered match report to disk", exc_info=True)
+        return
+    _trim_spill()
+
+
+def _trim_spill() -> None:
+    """Drop the oldest spilled bodies beyond ``MATCH_REPORT_CACHE_DISK_ENTRIES``."""
+    try:
+        files = [
+            entry for match in os.scandir(cache_dir()) if match.is_dir()
+            for entry in os.scandir(match.path) if entry.name.endswith(".json")
+        ]
+        excess = len(files) - MATCH_REPORT_CACHE_DISK_ENTRIES
+        if excess <= 0:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:excess]:
+            os.unlink(entry.path)
+    except OSError:
+        logger.warning("Could not trim the match report spill", exc_info=True)
+
+
+def _load_spilled(key: _CacheKey) -> RenderedReport | None:
+    path = _spill_path(key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        report = RenderedReport(content=raw["content"], filename=raw.get("filename"))
+        # Refresh the mtime so the trim treats a re-read body as recent.
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning("Discarding an unreadable spilled match report", exc_info=True)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return None
+    return report
+
+
+def _remember(key: _CacheKey, report: RenderedReport) -> tuple[RenderedReport, str]:
+    entry = (report, report.digest)
+    evicted: list[tuple[_CacheKey, RenderedReport]] = []
+    with _lock:
+        _memory[key] = entry
+        _memory.move_to_end(key)
+        while len(_memory) > MATCH_REPORT_CACHE_ENTRIES:
+            old_key, (old_report, _) = _memory.popitem(last=False)
+            evicted.append((old_key, old_report))
+    if MATCH_REPORT_CACHE_DISK_ENTRIES > 0:
+        for old_key, old_report in evicted:
+            _spill(old_key, old_report)
+    return entry
+
+
+def _lookup(key: _CacheKey) -> tuple[RenderedReport, str] | None:
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            _memory.move_to_end(key)
+            record_match_report_cache("memory")
+            return entry
+    if MATCH_REPORT_CACHE_DISK_ENTRIES > 0:
+        report = _load_spilled(key)
+        if report is not None:
+            record_match_report_cache("disk")
+            return _remember(key, report)
+    return None
+
+
+def get_or_render(
+    match_id: str,
+    locale: str,
+    kind: str,
+    render: Callable[[], RenderedReport | None],
+) -> tuple[RenderedReport, str] | None:
+    """The cached ``(report, digest)`` for this key, rendering it on a miss.
+
+    *render* returning ``None`` (the match vanished mid-request) is passed
+    through and not cached.
+    """
+    if MATCH_REPORT_CACHE_ENTRIES <= 0:
+        report = render()
+        return None if report is None else (report, report.digest)
+    key = (match_id, locale, kind)
+    entry = _lookup(key)
+    if entry is not None:
+        return entry
+    with _lock:
+        render_lock = _rendering.setdefault(key, threading.Lock())
+    with render_lock:
+        # Whoever held the lock before us may have filled the entry.
+        entry = _lookup(key)
+        if entry is not None:
+            return entry
+        record_match_report_cache("miss")
+        try:
+            report = render()
+            if report is None:
+                return None
+            return _remember(key, report)
+        finally:
+            with _lock:
+                _rendering.pop(key, None)
+
+
+def invalidate(match_id: str) -> None:
+    """Forget every cached body of *match_id*, in memory and on disk."""
+    with _lock:
+        for key in [key for key in _memory if key[0] == match_id]:
+            del _memory[key]
+    shutil.rmtree(_match_dir(match_id), ignore_errors=True)
+
+
+def clear() -> None:
+    """Drop the in-memory cache (tests; the spill is left alone)."""
+    with _lock:
+        _memory.clear()
@@ -28,6 +28,7 @@ lives on the account API (``DELETE /api/v1/matches/{match_id}``).
 
 from __future__ import annotations
 
+import hashlib
 import html
 import logging
 import time
@@ -37,6 +38,7 @@ from fastapi import APIRouter, Header, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, Response
 
 from app.api import match_archive
+from app.match_report import cache as report_cache
 from app.match_report.access import check_read_access
 from app.match_report.cards import _render_highlights
 from app.match_report.charts import _render_charts
@@ -61,12 +63,10 @@ from app.match_report.render import (
 )
 from app.match_report.stats import (
     _collapse_undos,
-    _compute_stats,
-    _initial_serve_from_pregame,
     _played_set_count,
     _safe_int,
-    _timeouts_per_set,
     _trim_pregame,
+    compute_stats_snapshot,
 )
 from app.match_report.template import REPORT_TEMPLATE as _REPORT_TEMPLATE
 
@@ -89,6 +89,47 @@ logger = logging.getLogger(__name__)
 
 match_report_router = APIRouter()
 
+# Stand-in for the Download-CSV href in a cached report body. The href
+# carries the reader's own ``exp``/``sig``, so it is the one part of the
+# page that cannot be shared between readers. The template itself never
+# contains NUL; one smuggled in through a team name would only receive the
+# same escaped href.
+_CSV_HREF_SLOT = "\x00csv-href\x00"
+
+
+def _require_match(match_id: str) -> None:
+    """404 unless *match_id* is archived — checked before any cache lookup.
+
+    One indexed integer read, so a report deleted by another worker is
+    never served from this worker's cache.
+    """
+    if match_archive.owner_user_id(match_id) is None:
+        raise HTTPException(status_code=404, detail="Match not found.")
+
+
+def _etag(digest: str, csv_params: str) -> str:
+    # The page embeds the reader's CSV query, so readers of one cached
+    # body holding different signed links get different validators.
+    if csv_params:
+        digest += "-" + hashlib.sha256(csv_params.encode()).hexdigest()[:8]
+    return f'"{report_cache.RENDER_VERSION}-{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` already names *etag* (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    # ``no-cache`` (revalidate every time) rather than a max-age: access
+    # is re-checked per request and a deleted report must stop rendering.
+    # ``private`` because the gated report must not sit in shared caches.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
 
 def _effective_started_at(payload: dict, audit: list[dict]) -> float | None:
     """The match anchor both report surfaces measure time from.
@@ -135,11 +176,9 @@ def match_report(
         ),
     ),
     accept_language: str | None = Header(default=None),
-) -> HTMLResponse:
+) -> Response:
     check_read_access(request, match_id, exp=exp, sig=sig)
-    payload = match_archive.load_match(match_id)
-    if payload is None:
-        raise HTTPException(status_code=404, detail="Match not found.")
+    _require_match(match_id)
 
     # Explicit ``?lang=`` wins over the browser's ``Accept-Language``.
     # Without this, a report shared from a Spanish-set control UI to
@@ -152,6 +191,42 @@ def match_report(
         locale = resolve_locale(lang)
     else:
         locale = resolve_locale(accept_language)
+
+    def _render() -> report_cache.RenderedReport | None:
+        payload = match_archive.load_match(match_id)
+        if payload is None:
+            return None
+        return report_cache.RenderedReport(_render_report_html(match_id, payload, locale))
+
+    cached = report_cache.get_or_render(match_id, locale, "html", _render)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Match not found.")
+    report, digest = cached
+    # The Download-CSV anchor must keep working for signed-URL
+    # readers: carry the capability params through so the CSV route's
+    # identical access ladder admits them. Built server-side so the
+    # link works without JS, and spliced in per request because the
+    # cached body is shared by every reader of the report.
+    csv_params = urlencode(
+        [(k, v) for k, v in (("exp", exp), ("sig", sig)) if v],
+    )
+    csv_href = f"/match/{match_id}/report.csv" + (
+        f"?{csv_params}" if csv_params else ""
+    )
+    etag = _etag(digest, csv_params)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return HTMLResponse(
+        content=report.content.replace(
+            _CSV_HREF_SLOT, html.escape(csv_href, quote=True),
+        ),
+        headers=_cache_headers(etag),
+    )
+
+
+def _render_report_html(match_id: str, payload: dict, locale: str) -> str:
+    """The report page for one archived snapshot, with the CSV link left
+    as :data:`_CSV_HREF_SLOT` for the route to fill in."""
     customization = payload.get("customization", {}) or {}
     final = payload.get("final_state", {}) or {}
     config = payload.get("config", {}) or {}
@@ -167,11 +242,11 @@ def match_report(
     # the post-undo view, and at least one (``_timeouts_per_set``)
     # was leaking undone forward-counts into the per-set row.
     audit = _collapse_undos(_trim_pregame(raw_audit))
-    # The serve/receive walk needs to know who served the *first*
-    # rally, and that fact lives in the pregame slice the trim just
-    # dropped (the operator's pre-match serve assignment). Seed it
-    # from the raw log before the slice is forgotten.
-    initial_serve = _initial_serve_from_pregame(raw_audit)
+    # Highlights, set durations, serve split and the timeouts row come
+    # from the snapshot stored at archive time (the same pipeline, run
+    # once — see ``compute_stats_snapshot``). Only a report whose
+    # snapshot could not be computed re-derives it here.
+    snapshot = payload.get("stats") or compute_stats_snapshot(raw_audit)
 
     team1_name = _team_name(customization, 1)
     team2_name = _team_name(customization, 2)
@@ -219,7 +294,7 @@ def match_report(
         for i in range(1, played_sets + 1)
     )
 
-    timeouts_by_set = _timeouts_per_set(audit)
+    timeouts_by_set = snapshot["timeouts_per_set"]
 
     def _set_winner(i: int) -> int | None:
         """Which team took set *i*, from the archived per-set scores.
@@ -249,7 +324,7 @@ def match_report(
             cells.append(f"{td_open}{html.escape(text)}</td>")
         return "".join(cells)
 
-    stats = _compute_stats(audit, initial_serve=initial_serve)
+    stats = snapshot["stats"]
     set_durations = stats.get("set_durations", {}) or {}
 
     effective_started_at = _effective_started_at(payload, audit)
@@ -302,18 +377,7 @@ def match_report(
            sets=set_scores, date=_fmt_ts(payload.get("ended_at")))
         if set_scores else match_label
     )
-    # The Download-CSV anchor must keep working for signed-URL
-    # readers: carry the capability params through so the CSV route's
-    # identical access ladder admits them. Built server-side so the
-    # link works without JS.
-    csv_params = urlencode(
-        [(k, v) for k, v in (("exp", exp), ("sig", sig)) if v],
-    )
-    csv_href = f"/match/{match_id}/report.csv" + (
-        f"?{csv_params}" if csv_params else ""
-    )
-
-    rendered = _REPORT_TEMPLATE.format(
+    return _REPORT_TEMPLATE.format(
         # ``locale`` derives from the ``?lang=`` param / ``Accept-Language``
         # header and lands in the ``<html lang="…">`` attribute — escape it
         # like every other request-derived kwarg (and like the matches-index
@@ -408,10 +472,9 @@ def match_report(
         btn_copy=html.escape(_t(locale, "copyLink")),
         btn_copy_ok=html.escape(_t(locale, "copyLinkOk")),
         btn_csv=html.escape(_t(locale, "downloadCsv")),
-        csv_href=html.escape(csv_href, quote=True),
+        csv_href=_CSV_HREF_SLOT,
         permalink=html.escape(permalink, quote=True),
     )
-    return HTMLResponse(content=rendered)
 
 
 @match_report_router.get(
@@ -436,10 +499,32 @@ def match_report_csv(
     renders, just in rows.
     """
     check_read_access(request, match_id, exp=exp, sig=sig)
-    payload = match_archive.load_match(match_id)
-    if payload is None:
+    _require_match(match_id)
+
+    def _render() -> report_cache.RenderedReport | None:
+        payload = match_archive.load_match(match_id)
+        if payload is None:
+            return None
+        return _render_point_log(match_id, payload)
+
+    cached = report_cache.get_or_render(match_id, "", "csv", _render)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Match not found.")
+    report, digest = cached
+    etag = _etag(digest, "")
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return Response(
+        content=report.content,
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="{report.filename}"',
+            **_cache_headers(etag),
+        },
+    )
+
 
+def _render_point_log(match_id: str, payload: dict) -> report_cache.RenderedReport:
     raw_audit = payload.get("audit_log", []) or []
     # Same slice as the HTML report: pregame noise trimmed, undo pairs
     # collapsed — the CSV and the rendered timeline must agree.
@@ -458,10 +543,4 @@ def match_report_csv(
         audit, base_ts=_effective_started_at(payload, audit),
     )
     filename = csv_filename(match_label, payload.get("match_id", match_id))
-    return Response(
-        content=body,
-        media_type="text/csv; charset=utf-8",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-        },
-    )
+    return report_cache.RenderedReport(body, filename=filename)
@@ -593,3 +593,51 @@ def _compute_stats(audit: list[dict], *, initial_serve: int | None = None) -> di
         "point_types_by_set": point_types_by_set,
         "serve_receive": _serve_receive_summary(audit, initial_serve),
     }
+
+
+# ---------------------------------------------------------------------------
+# Archived stats snapshot
+# ---------------------------------------------------------------------------
+
+# Bump whenever the snapshot's shape or any reducer above changes what it
+# produces for the same audit: archived reports carrying an older version
+# are recomputed from their audit log on next read and the result stored
+# (see ``match_archive._stored_stats``). Newer ones are recomputed in
+# memory but never overwritten, so a rollback does not downgrade them.
+STATS_SNAPSHOT_VERSION = 1
+
+
+def compute_stats_snapshot(raw_audit: list[dict]) -> dict:
+    """Everything the report derives from the whole audit, computed once.
+
+    Runs the report's own pipeline — pregame trim, undo collapse, the
+    serve seed from the raw log — then :func:`_compute_stats` and
+    :func:`_timeouts_per_set`. Stored with the archived match so the
+    report (and any cross-match query) reads the result instead of
+    re-walking the transcript. Goes through JSON on the way to the
+    database; :func:`stats_snapshot_from_json` restores the int keys.
+    """
+    audit = _collapse_undos(_trim_pregame(raw_audit))
+    return {
+        "stats": _compute_stats(
+            audit, initial_serve=_initial_serve_from_pregame(raw_audit),
+        ),
+        "timeouts_per_set": _timeouts_per_set(audit),
+    }
+
+
+def stats_snapshot_from_json(value: Any) -> Any:
+    """Undo JSON's stringification of the snapshot's int keys (set, team).
+
+    Every int-keyed mapping in the snapshot is keyed by a set number or a
+    team id, and no string key in it is all digits, so the rule is exact.
+    """
+    if isinstance(value, dict):
+        return {
+            int(key) if isinstance(key, str) and key.isdigit() else key:
+            stats_snapshot_from_json(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [stats_snapshot_from_json(item) for item in value]
+    return value
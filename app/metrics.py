@@ -19,13 +19,28 @@ Cardinality budget:
   so the label set stays bounded by the OpenAPI surface.
 * ``webhook_delivery_total`` — labels ``event`` (4 known values)
   and ``status`` (``success`` / ``client_error`` / ``server_error`` /
-  ``exception`` / ``dead_letter`` / ``ssrf_blocked``).
+  ``exception`` / ``dead_letter`` / ``ssrf_blocked`` / ``overflow``).
+* ``webhook_queue_depth`` — unlabelled gauge of deliveries waiting in
+  the per-target queues (summed, so target URLs never become labels).
 * ``ws_clients_total`` and ``ws_oids_active`` — unlabelled gauges so
   a tournament with thousands of OIDs cannot blow up the metric set.
+* ``ws_frames_dropped_total`` — label ``reason`` (``superseded`` /
+  ``overflow``).
 * ``active_sessions`` — unlabelled gauge.
-* overlay-executor depth and latency — unlabelled, process-wide metrics.
+* overlay-executor depth, latency and coalesced pushes — unlabelled,
+  process-wide metrics.
 * ``rate_limit_blocked_buckets`` — labels one of two bounded limiter surfaces.
+* ``match_report_cache_total`` — label ``result`` (``memory`` / ``disk`` /
+  ``miss``).
+* ``auth_cache_total`` — labels ``kind`` (``session`` / ``control``) and
+  ``result`` (``hit`` / ``miss``).
+* password-hash queue depth, wait and run latency, and rejections —
+  unlabelled, process-wide metrics.
 * ``webhook_dead_letter_size`` — unlabelled persistent queue-depth gauge.
+* match-archive queue depth, run latency and failed attempts — unlabelled,
+  process-wide metrics.
+* ``stage_duration_seconds`` — label ``stage``, one of the ``STAGE_*``
+  constants in ``app/spans.py`` (about a dozen hot-path stages).
 
 The plan called for ``ws_clients_per_oid``; that label would be
 unbounded in OID space and is the textbook anti-pattern. Two
@@ -136,6 +151,13 @@ ws_oids_active = Gauge(
     "Number of distinct OIDs with at least one open WebSocket subscriber.",
 )
 
+ws_frames_dropped_total = Counter(
+    "voc_ws_frames_dropped_total",
+    "Outbound WebSocket frames discarded before send: superseded by a newer "
+    "snapshot of the same kind, or shed from a full per-client queue.",
+    labelnames=("reason",),
+)
+
 active_sessions = Gauge(
     "voc_active_sessions",
     "Number of live GameSession instances tracked by SessionManager.",
@@ -158,6 +180,82 @@ overlay_executor_run_seconds = Histogram(
     buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
 )
 
+overlay_executor_coalesced_total = Counter(
+    "voc_overlay_executor_coalesced_total",
+    "Queued idempotent overlay pushes replaced by a newer push for the same "
+    "overlay before they ran.",
+)
+
+match_report_cache_total = Counter(
+    "voc_match_report_cache_total",
+    "Match report and CSV requests by where the rendered body came from: "
+    "the in-memory cache, the on-disk spill, or a fresh render.",
+    labelnames=("result",),
+)
+
+auth_cache_total = Counter(
+    "voc_auth_cache_total",
+    "Cookie-session and control-token resolutions by whether the credential "
+    "resolution cache answered them.",
+    labelnames=("kind", "result"),
+)
+
+password_hash_queue_depth = Gauge(
+    "voc_password_hash_queue_depth",
+    "Password hash/verify calls waiting for a hashing thread.",
+)
+
+password_hash_wait_seconds = Histogram(
+    "voc_password_hash_wait_seconds",
+    "Time a password hash/verify call waits for a hashing thread.",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+password_hash_run_seconds = Histogram(
+    "voc_password_hash_run_seconds",
+    "Execution time of one scrypt password hash or verification.",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+password_hash_rejected_total = Counter(
+    "voc_password_hash_rejected_total",
+    "Password hash/verify calls refused with a 503 because the hashing "
+    "queue was full.",
+)
+
+match_archive_queue_depth = Gauge(
+    "voc_match_archive_queue_depth",
+    "Finished matches journaled and waiting to be written to the archive.",
+)
+
+match_archive_run_seconds = Histogram(
+    "voc_match_archive_run_seconds",
+    "Time to write one finished match to the archive in the background.",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+match_archive_failures_total = Counter(
+    "voc_match_archive_failures_total",
+    "Background match-archive attempts that failed and were retried or "
+    "left in the journal for the next start.",
+)
+
+stage_duration_seconds = Histogram(
+    "voc_stage_duration_seconds",
+    "Time spent in one stage of a game action (audit append, get_state, "
+    "overlay save, broadcasts, ...); see app/spans.py for the stages.",
+    labelnames=("stage",),
+    buckets=(
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+        0.1, 0.25, 0.5, 1.0,
+    ),
+)
+
+webhook_queue_depth = Gauge(
+    "voc_webhook_queue_depth",
+    "Webhook deliveries queued in memory across all targets.",
+)
+
 webhook_dead_letter_size = Gauge(
     "voc_webhook_dead_letter_size",
     "Records currently parked in data/webhooks_dead_letter.jsonl.",
@@ -190,7 +288,7 @@ def record_webhook_outcome(event: str, status: str) -> None:
     """Increment ``webhook_delivery_total{event, status}`` by 1.
 
     *status* is one of: ``success``, ``client_error``, ``server_error``,
-    ``exception``, ``dead_letter``, ``ssrf_blocked``. Unknown values
+    ``exception``, ``dead_letter``, ``ssrf_blocked``, ``overflow``. Unknown values
     flow through unchanged so a future refinement does not need a
     coordinated metrics change.
     """
@@ -203,6 +301,11 @@ def set_ws_gauges(total_clients: int, oid_count: int) -> None:
     ws_oids_active.set(oid_count)
 
 
+def record_ws_frame_dropped(reason: str) -> None:
+    """Count one frame dropped by ``WSHub`` (``superseded`` or ``overflow``)."""
+    ws_frames_dropped_total.labels(reason=reason).inc()
+
+
 def set_active_sessions(count: int) -> None:
     active_sessions.set(count)
 
@@ -219,6 +322,56 @@ def record_overlay_executor_run(seconds: float) -> None:
     overlay_executor_run_seconds.observe(seconds)
 
 
+def record_overlay_executor_coalesced() -> None:
+    overlay_executor_coalesced_total.inc()
+
+
+def record_match_report_cache(result: str) -> None:
+    """Count one report lookup (``memory``, ``disk`` or ``miss``)."""
+    match_report_cache_total.labels(result=result).inc()
+
+
+def record_auth_cache(kind: str, result: str) -> None:
+    """Count one credential resolution (``session``/``control``, ``hit``/``miss``)."""
+    auth_cache_total.labels(kind=kind, result=result).inc()
+
+
+def set_password_hash_queue_depth(count: int) -> None:
+    password_hash_queue_depth.set(count)
+
+
+def record_password_hash_wait(seconds: float) -> None:
+    password_hash_wait_seconds.observe(seconds)
+
+
+def record_password_hash_run(seconds: float) -> None:
+    password_hash_run_seconds.observe(seconds)
+
+
+def record_password_hash_rejected() -> None:
+    password_hash_rejected_total.inc()
+
+
+def set_match_archive_queue_depth(count: int) -> None:
+    match_archive_queue_depth.set(count)
+
+
+def record_match_archive_run(seconds: float) -> None:
+    match_archive_run_seconds.observe(seconds)
+
+
+def record_match_archive_failure() -> None:
+    match_archive_failures_total.inc()
+
+
+def record_stage_duration(stage: str, seconds: float) -> None:
+    stage_duration_seconds.labels(stage=stage).observe(seconds)
+
+
+def set_webhook_queue_depth(count: int) -> None:
+    webhook_queue_depth.set(count)
+
+
 def set_dead_letter_size(count: int) -> None:
     """Refresh the webhook dead-letter gauge after a write/clear."""
     webhook_dead_letter_size.set(count)
@@ -0,0 +1,67 @@
+"""Content-hash versioning for the overlay pages' ``/static`` assets.
+
+The overlay templates used to stamp every CSS/JS URL with ``?v=<now>``, so
+each page load named a brand-new URL and nothing under ``/static`` was ever
+served from cache — an OBS scene with a dozen browser sources refetched
+every stylesheet and script on every scene switch.
+
+Templates now write ``{{ static_url('css/style.css') }}``, which renders
+``/static/css/style.css?v=<digest>`` with a digest of the file's bytes. The
+URL therefore changes exactly when the file does, and
+:class:`app.static_files.VersionedStaticFiles` can mark a request carrying
+the current digest ``immutable``; anything else under ``/static`` (images a
+stylesheet pulls in, stale or hand-written URLs) keeps revalidating.
+
+Digests are computed on first use and kept for the life of the process; a
+deploy restarts the process, which is the only way the files change in
+production.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path
+
+OVERLAY_STATIC_DIR = Path(__file__).resolve().parents[2] / "overlay_static"
+
+_DIGEST_CHARS = 12
+
+
+class StaticAssets:
+    """Digest lookup for the files under one static directory."""
+
+    def __init__(self, directory: Path, prefix: str = "/static") -> None:
+        self._directory = directory.resolve()
+        self._prefix = prefix.rstrip("/")
+        self._digests: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def version(self, path: str) -> str | None:
+        """Digest of ``<directory>/<path>``, or ``None`` if there is no such file."""
+        target = (self._directory / path.lstrip("/")).resolve()
+        if not target.is_relative_to(self._directory):
+            return None
+        # Keyed by the resolved file, so other spellings of one path share
+        # an entry and made-up paths (never remembered) cannot grow the map.
+        key = target.relative_to(self._directory).as_posix()
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached is not None:
+            return cached
+        if not target.is_file():
+            return None
+        digest = hashlib.sha256(target.read_bytes()).hexdigest()[:_DIGEST_CHARS]
+        with self._lock:
+            self._digests[key] = digest
+        return digest
+
+    def url(self, path: str) -> str:
+        """The versioned public URL templates embed for *path*."""
+        path = path.lstrip("/")
+        digest = self.version(path)
+        base = f"{self._prefix}/{path}"
+        return base if digest is None else f"{base}?v={digest}"
+
+
+static_assets = StaticAssets(OVERLAY_STATIC_DIR)
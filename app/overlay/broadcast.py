@@ -2,6 +2,22 @@
 
 Manages WebSocket connections from OBS browser sources and broadcasts
 overlay state updates with 50ms debouncing to coalesce rapid changes.
+
+Two wire protocols share one hub:
+
+* **Full state** (default, what older pages speak): every update is the
+  whole overlay state as one JSON object.
+* **Patch** (opt-in with ``/ws/<token>?protocol=patch``): the client gets a
+  ``{"type": "snapshot", "rev": N, "state": {...}}`` frame on connect and
+  then ``{"type": "patch", "rev": N, "base": N - 1, "ops": [...]}`` frames
+  carrying RFC 6902-style ``add`` / ``remove`` / ``replace`` operations
+  against the previous revision. A client whose last delivered revision is
+  not the patch's ``base`` is sent a fresh snapshot instead, and a client
+  that notices a gap itself can send ``resync`` to get one.
+
+The hub keeps one baseline state per overlay (only while patch clients
+are connected) and encodes each frame kind once per broadcast, however
+many browser sources are listening.
 """
 
 import asyncio
@@ -17,9 +33,53 @@ from app.constants import (
     OBS_MAX_CLIENTS_PER_OVERLAY,
     WS_BROADCAST_SEND_TIMEOUT_SECONDS,
 )
+from app.spans import STAGE_OBS_BROADCAST, span
 
 logger = logging.getLogger(__name__)
 
+PATCH_PROTOCOL = "patch"
+
+
+def _escape_pointer(key: str) -> str:
+    """Escape one JSON Pointer reference token (RFC 6901)."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(
+    old: Any,
+    new: Any,
+    path: str = "",
+) -> list[dict[str, Any]]:
+    """Return the patch operations that turn *old* into *new*.
+
+    Objects are compared key by key so a single score change is a single
+    ``replace``; lists and scalars are replaced whole when they differ
+    (overlay lists are short, and positional list ops would make the
+    client-side apply far more fragile than the bytes they save).
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key, old_value in old.items():
+            child = f"{path}/{_escape_pointer(str(key))}"
+            if key not in new:
+                ops.append({"op": "remove", "path": child})
+            else:
+                ops.extend(json_diff(old_value, new[key], child))
+        for key, new_value in new.items():
+            if key not in old:
+                ops.append({
+                    "op": "add",
+                    "path": f"{path}/{_escape_pointer(str(key))}",
+                    "value": new_value,
+                })
+        return ops
+    if old == new and (
+        type(old) is type(new)
+        or (isinstance(old, list) and isinstance(new, list))
+    ):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
 
 class ObsHubFull(Exception):
     """Raised by :meth:`ObsBroadcastHub.add_client` at the per-overlay cap.
@@ -48,17 +108,31 @@ class ObsBroadcastHub:
         self._clients: dict[str, list[WebSocket]] = {}
         self._broadcast_tasks: dict[str, asyncio.Task[None]] = {}
         self._loop: asyncio.AbstractEventLoop | None = None
+        # Patch-protocol bookkeeping. ``_revisions`` maps each opted-in
+        # socket to the last revision it was sent (``0`` before its first
+        # snapshot); ``_baselines`` holds ``(rev, state)`` per overlay — the
+        # state every patch is diffed against. Both are loop-only.
+        self._revisions: dict[WebSocket, int] = {}
+        self._baselines: dict[str, tuple[int, dict[str, Any]]] = {}
 
     def capture_event_loop(self) -> None:
         """Capture the running event loop for use from background threads."""
         self._loop = asyncio.get_running_loop()
 
-    def add_client(self, overlay_id: str, ws: WebSocket) -> None:
+    def add_client(
+        self,
+        overlay_id: str,
+        ws: WebSocket,
+        *,
+        protocol: str | None = None,
+    ) -> None:
         """Register an OBS browser source connection.
 
         Raises :class:`ObsHubFull` when the overlay already has
         ``_MAX_CLIENTS_PER_OVERLAY`` connections — call before
-        ``accept``-ing so the refusal is a clean 1013 close.
+        ``accept``-ing so the refusal is a clean 1013 close. Pass
+        ``protocol=PATCH_PROTOCOL`` for a client that speaks the patch
+        protocol; it must then be sent :meth:`snapshot_message` first.
         """
         clients = self._clients.setdefault(overlay_id, [])
         if len(clients) >= self._MAX_CLIENTS_PER_OVERLAY:
@@ -68,12 +142,38 @@ class ObsBroadcastHub:
             )
             raise ObsHubFull(overlay_id, self._MAX_CLIENTS_PER_OVERLAY)
         clients.append(ws)
+        if protocol == PATCH_PROTOCOL:
+            self._revisions[ws] = 0
 
     def remove_client(self, overlay_id: str, ws: WebSocket) -> None:
         """Unregister an OBS browser source connection."""
+        self._revisions.pop(ws, None)
         clients = self._clients.get(overlay_id)
         if clients and ws in clients:
             clients.remove(ws)
+        if not any(c in self._revisions for c in clients or ()):
+            self._baselines.pop(overlay_id, None)
+
+    def snapshot_message(
+        self,
+        overlay_id: str,
+        ws: WebSocket,
+        state: dict[str, Any],
+    ) -> str:
+        """Return the snapshot frame for patch client *ws* and mark it current.
+
+        Serves the overlay's baseline when one exists, so the snapshot and
+        the next patch agree on what ``base`` means even if *state* (read by
+        the caller just now) is already ahead of a pending debounced
+        broadcast — that broadcast will patch the client forward. Without a
+        baseline *state* becomes one.
+        """
+        baseline = self._baselines.get(overlay_id)
+        if baseline is None:
+            baseline = self._baselines[overlay_id] = (1, state)
+        rev, snapshot = baseline
+        self._revisions[ws] = rev
+        return json.dumps({"type": "snapshot", "rev": rev, "state": snapshot})
 
     def get_client_count(self, overlay_id: str) -> int:
         """Return the number of connected OBS sources for *overlay_id*."""
@@ -124,13 +224,95 @@ class ObsBroadcastHub:
             return
         loop.call_soon_threadsafe(self.schedule_broadcast, overlay_id, get_state)
 
-    async def _send_to_clients(self, overlay_id: str, message: str) -> None:
-        """Send *message* to all clients in parallel, cleaning up stale ones."""
+    def _frames_for(
+        self,
+        overlay_id: str,
+        state: dict[str, Any],
+    ) -> tuple[dict[WebSocket, str], int | None]:
+        """Pick each client's frame for *state*, encoding each kind once.
+
+        Returns the per-client messages plus the revision the patch clients
+        are moved to (``None`` when there are none). A patch client at the
+        baseline revision gets the shared patch frame (nothing at all when
+        the state did not change); any other patch client gets a snapshot.
+        """
         clients = self._clients.get(overlay_id, [])
-        if not clients:
+        patch_clients = [c for c in clients if c in self._revisions]
+        messages: dict[WebSocket, str] = {}
+        if len(patch_clients) < len(clients):
+            full = json.dumps(state)
+            for client in clients:
+                if client not in self._revisions:
+                    messages[client] = full
+        if not patch_clients:
+            self._baselines.pop(overlay_id, None)
+            return messages, None
+
+        baseline = self._baselines.get(overlay_id)
+        if baseline is None:
+            rev, ops = 1, None
+        else:
+            base, previous = baseline
+            ops = json_diff(previous, state)
+            if not ops:
+                # Nothing changed: patch clients already at the baseline need
+                # no frame; stragglers still get their catch-up snapshot.
+                rev = base
+            else:
+                rev = base + 1
+        self._baselines[overlay_id] = (rev, state)
+
+        patch_frame: str | None = None
+        snapshot_frame: str | None = None
+        for client in patch_clients:
+            client_rev = self._revisions[client]
+            if client_rev == rev:
+                continue
+            if baseline is not None and ops and client_rev == baseline[0]:
+                if patch_frame is None:
+                    patch_frame = json.dumps({
+                        "type": "patch", "rev": rev, "base": baseline[0],
+                        "ops": ops,
+                    })
+                messages[client] = patch_frame
+            else:
+                if snapshot_frame is None:
+                    snapshot_frame = json.dumps(
+                        {"type": "snapshot", "rev": rev, "state": state},
+                    )
+                messages[client] = snapshot_frame
+        return messages, rev
+
+    async def _broadcast_state(
+        self,
+        overlay_id: str,
+        state: dict[str, Any],
+    ) -> None:
+        """Send *state* to every client in the protocol it speaks.
+
+        The hub keeps a reference to *state* as the next patch baseline, so
+        callers hand over a dict they will not mutate afterwards (the store's
+        ``get_state`` returns a frozen snapshot).
+        """
+        with span(STAGE_OBS_BROADCAST):
+            messages, rev = self._frames_for(overlay_id, state)
+            await self._send_messages(overlay_id, messages, rev)
+
+    async def _send_messages(
+        self,
+        overlay_id: str,
+        messages: dict[WebSocket, str],
+        rev: int | None,
+    ) -> None:
+        """Send each client its message in parallel, cleaning up stale ones.
+
+        Patch clients that took their frame are recorded at *rev*.
+        """
+        if not messages:
             return
+        clients = self._clients.get(overlay_id, [])
 
-        async def _send(client: WebSocket) -> WebSocket | None:
+        async def _send(client: WebSocket, message: str) -> WebSocket | None:
             try:
                 # A slow or wedged client (TCP backpressure from a stuck
                 # OBS source) must not stall delivery to the rest — treat
@@ -139,6 +321,8 @@ class ObsBroadcastHub:
                     client.send_text(message),
                     timeout=self._BROADCAST_SEND_TIMEOUT,
                 )
+                if rev is not None and client in self._revisions:
+                    self._revisions[client] = rev
                 return None
             except Exception as exc:
                 # WebSocket frameworks raise a range of exceptions on a
@@ -152,9 +336,12 @@ class ObsBroadcastHub:
                 )
                 return client
 
-        results = await asyncio.gather(*(_send(c) for c in clients))
+        results = await asyncio.gather(
+            *(_send(c, m) for c, m in messages.items()),
+        )
         disconnected = [c for c in results if c is not None]
         for c in disconnected:
+            self._revisions.pop(c, None)
             if c in clients:
                 clients.remove(c)
         if disconnected:
@@ -173,8 +360,7 @@ class ObsBroadcastHub:
         try:
             await asyncio.sleep(delay)
             state = get_state()
-            message = json.dumps(state)
-            await self._send_to_clients(overlay_id, message)
+            await self._broadcast_state(overlay_id, state)
         except asyncio.CancelledError:
             pass  # Superseded by a newer update
         except Exception:
@@ -190,8 +376,7 @@ class ObsBroadcastHub:
         state: dict[str, Any],
     ) -> None:
         """Immediately broadcast *state* to all clients (no debounce)."""
-        message = json.dumps(state)
-        await self._send_to_clients(overlay_id, message)
+        await self._broadcast_state(overlay_id, state)
 
     # -- Cleanup -----------------------------------------------------------
 
@@ -200,8 +385,10 @@ class ObsBroadcastHub:
         task = self._broadcast_tasks.pop(overlay_id, None)
         if task and not task.done():
             task.cancel()
+        self._baselines.pop(overlay_id, None)
         clients = self._clients.pop(overlay_id, [])
         for client in clients:
+            self._revisions.pop(client, None)
             # Best-effort: a client that already disconnected raises here.
             try:
                 await client.close()
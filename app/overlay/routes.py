@@ -5,18 +5,22 @@ inside a factory function so the ``OverlayStateStore`` and
 ``ObsBroadcastHub`` singletons can be injected.
 """
 
+import hashlib
 import json
 import logging
 import re
-import time
+import threading
+from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse, Response
 from fastapi.routing import APIRoute
 from fastapi.templating import Jinja2Templates
+from markupsafe import escape
 from starlette.concurrency import run_in_threadpool
 
-from app.overlay.broadcast import ObsBroadcastHub, ObsHubFull
+from app.overlay.assets import static_assets
+from app.overlay.broadcast import PATCH_PROTOCOL, ObsBroadcastHub, ObsHubFull
 from app.overlay.locale import _resolve_overlay_locale
 from app.overlay.state_store import OverlayStateStore
 from app.overlay.themes import get_theme_names
@@ -24,13 +28,60 @@ from app.overlay.themes import get_theme_names
 logger = logging.getLogger(__name__)
 
 
-# Overlay pages embed a per-render ``?v=`` cache-buster on their JS/CSS so a
-# new deploy is picked up on the next load. That only holds if the HTML page
-# itself is never cached — otherwise a proxy/CDN can freeze the ``?v`` and keep
-# serving the stale assets it points at (the page looks "stuck" on old code
-# even though the bare ``/static`` URLs are fresh). Mark these dynamic pages
-# no-store so intermediaries always re-fetch them.
-_NO_CACHE_HEADERS = {"Cache-Control": "no-cache, no-store, must-revalidate"}
+# Overlay pages are cheap to revalidate and must never be served stale: the
+# overlay's style and locale are chosen per request from its persisted
+# customization, and a deploy changes the digests in the asset URLs (see
+# ``app/overlay/assets.py``). ``no-cache`` lets a browser or proxy keep the
+# page but makes it ask every time; the ``ETag`` turns an unchanged answer
+# into a bodiless 304.
+_PAGE_CACHE_CONTROL = "no-cache"
+
+# Rendered pages are kept per template context *minus* the public token,
+# which is the only per-overlay value in it; the token is spliced into the
+# cached body for each request, so one render serves every overlay that
+# uses that (style, locale). The key space is bounded by the styles on disk
+# times the supported locales; the cap only guards against a template
+# directory that keeps growing at runtime.
+_TOKEN_SLOT = "\x00output-key\x00"
+_MAX_COMPILED_PAGES = 512
+
+
+class _CompiledPages:
+    """Token-free renders of the overlay templates, one per context."""
+
+    def __init__(self, templates: Jinja2Templates) -> None:
+        self._templates = templates
+        self._pages: dict[tuple[object, ...], str] = {}
+        self._lock = threading.Lock()
+
+    def render(self, name: str, token: str, **context: Any) -> str:
+        key = (name, *(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in sorted(context.items())
+        ))
+        with self._lock:
+            page = self._pages.get(key)
+        if page is None:
+            page = self._templates.get_template(name).render(
+                target_id=_TOKEN_SLOT, output_key=_TOKEN_SLOT, **context,
+            )
+            with self._lock:
+                if len(self._pages) >= _MAX_COMPILED_PAGES:
+                    self._pages.clear()
+                self._pages[key] = page
+        # Escaped as the template's autoescape would have done it.
+        return page.replace(_TOKEN_SLOT, str(escape(token)))
+
+
+def _page_response(request: Request, body: str) -> Response:
+    etag = f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": _PAGE_CACHE_CONTROL}
+    header = request.headers.get("if-none-match")
+    if header:
+        candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
 
 
 def _resolve_public_token(token: str) -> str | None:
@@ -52,6 +103,29 @@ def _resolve_public_token(token: str) -> str | None:
         return overlays_service.skey_for(overlay)
 
 
+def _overlay_page_inputs(
+    store: OverlayStateStore, public_token: str,
+) -> tuple[list[str], list[str], dict[str, Any]] | None:
+    """Styles and persisted customization for ``/overlay/{token}``.
+
+    One threadpool hop for the token lookup and the (usually in-memory)
+    style catalog and state reads; ``None`` when the token is unknown.
+    """
+    skey = _resolve_public_token(public_token)
+    if skey is None:
+        return None
+    # Read the in-memory snapshot (lazy-loaded from disk on first touch).
+    # ``preferredStyle`` and the operator-chosen ``locale`` both live on
+    # ``raw_remote_customization`` so the page boots in the right language
+    # and style before any WS update arrives.
+    state = store.get_state(skey)
+    return (
+        store.get_available_styles_list(),
+        store.get_renderable_styles(),
+        state.get("raw_remote_customization") or {},
+    )
+
+
 
 # ---------------------------------------------------------------------------
 # Router factory
@@ -93,6 +167,8 @@ def _register_page_routes(
     templates: Jinja2Templates,
 ) -> None:
     """HTML pages + the OBS browser-source WebSocket."""
+    templates.env.globals.setdefault("static_url", static_assets.url)
+    pages = _CompiledPages(templates)
 
     # -- Favicon -----------------------------------------------------------
 
@@ -109,20 +185,10 @@ def _register_page_routes(
         style: str | None = None,
         lang: str | None = None,
     ) -> Response:
-        skey = await run_in_threadpool(_resolve_public_token, public_token)
-        if skey is None:
+        inputs = await run_in_threadpool(_overlay_page_inputs, store, public_token)
+        if inputs is None:
             raise HTTPException(status_code=404, detail="Overlay ID not found.")
-        overlay_id = skey
-
-        available = await run_in_threadpool(store.get_available_styles_list)
-        renderable = await run_in_threadpool(store.get_renderable_styles)
-
-        # Read the in-memory snapshot (lazy-loaded from disk on first
-        # touch). ``preferredStyle`` and the operator-chosen ``locale``
-        # both live on ``raw_remote_customization`` so the page boots in
-        # the right language and style before any WS update arrives.
-        state = await run_in_threadpool(store.get_state, overlay_id)
-        customization = state.get("raw_remote_customization") or {}
+        available, renderable, customization = inputs
 
         if not style:
             preferred = customization.get("preferredStyle")
@@ -144,24 +210,17 @@ def _register_page_routes(
 
         persisted_locale = customization.get("locale")
 
-        return templates.TemplateResponse(
-            request=request,
-            name=template_name,
-            context={
-                # The page connects to /ws/{output_key}; both the OBS URL
-                # token and the WS subscription use the public token, which
-                # the WS route resolves back to the storage key.
-                "target_id": public_token,
-                "output_key": public_token,
-                "style": style,
-                "available_styles": available,
-                "v": int(time.time()),
-                "locale": _resolve_overlay_locale(
-                    lang, request, persisted_locale,
-                ),
-            },
-            headers=_NO_CACHE_HEADERS,
+        # The page connects to /ws/{output_key}; both the OBS URL token and
+        # the WS subscription use the public token, which the WS route
+        # resolves back to the storage key.
+        body = pages.render(
+            template_name,
+            public_token,
+            style=style,
+            available_styles=available,
+            locale=_resolve_overlay_locale(lang, request, persisted_locale),
         )
+        return _page_response(request, body)
 
     # -- Public spectator (follow) page ------------------------------------
 
@@ -182,21 +241,23 @@ def _register_page_routes(
         if skey is None:
             raise HTTPException(status_code=404, detail="Overlay ID not found.")
 
-        return templates.TemplateResponse(
-            request=request,
-            name="_spectator.html",
-            context={
-                "target_id": public_token,
-                "output_key": public_token,
-                "v": int(time.time()),
-            },
-            headers=_NO_CACHE_HEADERS,
-        )
+        return _page_response(request, pages.render("_spectator.html", public_token))
 
     # -- OBS browser source WebSocket --------------------------------------
 
     @router.websocket("/ws/{public_token}")
-    async def obs_websocket(websocket: WebSocket, public_token: str) -> None:
+    async def obs_websocket(
+        websocket: WebSocket,
+        public_token: str,
+        protocol: str | None = None,
+    ) -> None:
+        """Stream overlay state to an OBS browser source.
+
+        ``?protocol=patch`` opts into snapshot + diff frames (see
+        :mod:`app.overlay.broadcast`); anything else gets the full state on
+        every change, which is what older pages expect.
+        """
+        patch = protocol == PATCH_PROTOCOL
         skey = await run_in_threadpool(_resolve_public_token, public_token)
         if skey is None:
             await websocket.close(code=4004, reason="Overlay not found")
@@ -205,7 +266,10 @@ def _register_page_routes(
         try:
             # Register before accepting so a capped overlay is refused with
             # a clean 1013 close (same shape as the control WS endpoint).
-            broadcast.add_client(overlay_id, websocket)
+            broadcast.add_client(
+                overlay_id, websocket,
+                protocol=PATCH_PROTOCOL if patch else None,
+            )
         except ObsHubFull as exc:
             logger.warning(
                 "Refused OBS WS connect for overlay '%s' — at cap %d",
@@ -216,11 +280,22 @@ def _register_page_routes(
         try:
             await websocket.accept()
             state = await run_in_threadpool(store.get_state, overlay_id)
-            await websocket.send_text(json.dumps(state))
+            if patch:
+                await websocket.send_text(
+                    broadcast.snapshot_message(overlay_id, websocket, state),
+                )
+            else:
+                await websocket.send_text(json.dumps(state))
             while True:
                 data = await websocket.receive_text()
                 if data == "ping":
                     await websocket.send_text("pong")
+                elif data == "resync" and patch:
+                    # The client saw a ``base`` it does not hold.
+                    state = await run_in_threadpool(store.get_state, overlay_id)
+                    await websocket.send_text(
+                        broadcast.snapshot_message(overlay_id, websocket, state),
+                    )
         except WebSocketDisconnect:
             pass
         finally:
@@ -6,6 +6,7 @@ overlay server.
 """
 
 import asyncio
+import atexit
 import copy
 import hashlib
 import json
@@ -13,13 +14,22 @@ import logging
 import os
 import re
 import threading
+import time
 from collections.abc import Callable, Iterator
+from typing import Any, NoReturn
 
-from app.api._persistence_paths import DEFAULT_HASH_LEN, atomic_write_json, hashed_filename
+from app.api._persistence_paths import (
+    DEFAULT_HASH_LEN,
+    atomic_write_json,
+    fsync_directory,
+    hashed_filename,
+)
+from app.constants import OVERLAY_STATE_WRITE_BEHIND_SECONDS
 from app.env_vars_manager import EnvVarsManager
 from app.id_validation import is_valid_overlay_id, validate_overlay_id
 from app.overlay.style_catalog import StyleCatalog
 from app.overlay_key import is_valid_skey
+from app.spans import STAGE_STATE_STORE_WRITE, span
 
 logger = logging.getLogger(__name__)
 
@@ -165,6 +175,109 @@ def get_default_state(best_of_sets: int = 5) -> dict:
     }
 
 
+# ---------------------------------------------------------------------------
+# Frozen state snapshots
+# ---------------------------------------------------------------------------
+
+
+def _read_only(self: object, *_args: object, **_kwargs: object) -> NoReturn:
+    raise TypeError(
+        "overlay state snapshots are read-only; copy.deepcopy() one to edit it",
+    )
+
+
+class FrozenDict(dict):
+    """Read-only ``dict`` used for published overlay state snapshots.
+
+    Still a real ``dict`` so ``json.dumps``, Jinja and ``isinstance``
+    checks behave exactly as before. ``copy.copy`` / ``copy.deepcopy``
+    return plain mutable containers, which is how a caller that needs to
+    edit a snapshot gets its own copy.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return _thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return (dict, (_thaw(self),))
+
+
+class FrozenList(list):
+    """Read-only ``list`` counterpart of :class:`FrozenDict`."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return _thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return (list, (_thaw(self),))
+
+
+def _thaw(value: Any) -> Any:
+    """Return a plain, fully mutable deep copy of a (frozen) JSON value."""
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_thaw(v) for v in value]
+    return value
+
+
+_MISSING = object()
+
+
+def _freeze(value: Any, previous: Any = _MISSING) -> Any:
+    """Return a frozen copy of *value* that shares what it can with *previous*.
+
+    *previous* is the last published snapshot of the same subtree. Any
+    subtree that compares equal is returned as the very same frozen object,
+    so a score change re-allocates only the containers on the path to the
+    score and ``snapshot_a[k] is snapshot_b[k]`` holds for everything else.
+    Equality also requires the same type, so ``1`` never stands in for
+    ``True`` or ``1.0``.
+    """
+    if isinstance(value, dict):
+        prev = previous if isinstance(previous, FrozenDict) else None
+        changed = prev is None or len(prev) != len(value)
+        items = {}
+        for key, child in value.items():
+            old = prev.get(key, _MISSING) if prev is not None else _MISSING
+            frozen = _freeze(child, old)
+            changed = changed or frozen is not old
+            items[key] = frozen
+        return FrozenDict(items) if changed else prev
+    if isinstance(value, list):
+        prev_list = previous if isinstance(previous, FrozenList) else None
+        changed = prev_list is None or len(prev_list) != len(value)
+        frozen_items = []
+        for i, child in enumerate(value):
+            old = (
+                prev_list[i]
+                if prev_list is not None and i < len(prev_list) else _MISSING
+            )
+            frozen = _freeze(child, old)
+            changed = changed or frozen is not old
+            frozen_items.append(frozen)
+        return FrozenList(frozen_items) if changed else prev_list
+    if previous is not _MISSING and type(previous) is type(value) and previous == value:
+        return previous
+    return value
+
+
 # ---------------------------------------------------------------------------
 # OverlayStateStore
 # ---------------------------------------------------------------------------
@@ -189,9 +302,21 @@ class OverlayStateStore:
     breaks the taint flow from user input to filesystem paths that CodeQL
     tracks. The original overlay id is stored inside the JSON payload under
     ``_meta.overlay_id`` so listings and cache lookups can recover it.
+
+    By default every mutation rewrites that file before returning. With a
+    positive *write_behind_seconds* (``OVERLAY_STATE_WRITE_BEHIND_SECONDS``)
+    mutations only mark the overlay dirty; a background writer persists
+    each dirty overlay once its window elapses, and :meth:`close` flushes
+    whatever is pending at shutdown.
     """
 
-    def __init__(self, data_dir: str, templates_dir: str) -> None:
+    def __init__(
+        self,
+        data_dir: str,
+        templates_dir: str,
+        *,
+        write_behind_seconds: float | None = None,
+    ) -> None:
         self._data_dir = data_dir
         self._overlays: dict[str, dict] = {}
         self._lock = threading.RLock()
@@ -206,6 +331,20 @@ class OverlayStateStore:
         # in sync by create/copy/delete.
         self._output_key_cache: dict[str, str] = {}
         self._all_overlays_scanned = False
+        # Write-behind state, all guarded by ``_dirty_cond``: overlay id ->
+        # monotonic deadline by which its in-memory state must be on disk.
+        # The first mutation in a window sets the deadline; later ones ride
+        # along, which is the coalescing.
+        self._write_behind_seconds = (
+            OVERLAY_STATE_WRITE_BEHIND_SECONDS
+            if write_behind_seconds is None else max(write_behind_seconds, 0.0)
+        )
+        self._dirty: dict[str, float] = {}
+        self._dirty_cond = threading.Condition()
+        # The current background writer. A writer exits as soon as it is no
+        # longer the one recorded here, which is how ``close`` stops it.
+        self._writer: threading.Thread | None = None
+        self._atexit_registered = False
         os.makedirs(data_dir, exist_ok=True)
 
     def set_broadcast_callback(
@@ -265,13 +404,23 @@ class OverlayStateStore:
         """Write state to disk atomically via temp file + rename."""
         atomic_write_json(path, state)
 
+    @staticmethod
+    def _write_state_durable(path: str, state: dict) -> None:
+        """Like :meth:`_write_state_sync` but fsyncs the data before the rename."""
+        atomic_write_json(path, state, fsync=True)
+
     @staticmethod
     def _stamp_meta(state: dict, overlay_id: str) -> dict:
         """Inject ``_meta.overlay_id`` so the id can be recovered from the file.
 
         Needed because filenames no longer carry the id (they're hashes).
-        Returns *state* for call-site convenience.
+        Returns *state* for call-site convenience — or, for a frozen
+        snapshot, a shallow copy carrying the stamp.
         """
+        if isinstance(state, FrozenDict):
+            stamped = dict(state)
+            stamped["_meta"] = {**state.get("_meta", {}), "overlay_id": overlay_id}
+            return stamped
         meta = state.setdefault("_meta", {})
         meta["overlay_id"] = overlay_id
         return state
@@ -287,9 +436,10 @@ class OverlayStateStore:
     def _save_persisted_state_unlocked(self, overlay_id: str, state: dict) -> None:
         """Persist *state* while the caller holds the overlay's write lock."""
         path = self.get_state_file_path(overlay_id)
-        self._stamp_meta(state, overlay_id)
+        state = self._stamp_meta(state, overlay_id)
         try:
-            self._write_state_sync(path, state)
+            with span(STAGE_STATE_STORE_WRITE):
+                self._write_state_sync(path, state)
         except OSError as exc:
             # _write_state_sync uses tempfile + os.replace; failure modes
             # are filesystem-level (no space, permissions, missing dir).
@@ -310,11 +460,19 @@ class OverlayStateStore:
     # -- In-memory context -------------------------------------------------
 
     def get_overlay_context(self, overlay_id: str) -> dict:
-        """Return the in-memory context for *overlay_id*, lazy-loading from disk."""
+        """Return the in-memory context for *overlay_id*, lazy-loading from disk.
+
+        ``state`` is the private working copy mutations are applied to
+        (under the overlay's persistence lock); ``published`` is the
+        ``(revision, FrozenDict)`` pair readers get, swapped in as a single
+        reference after every mutation.
+        """
         with self._lock:
             if overlay_id not in self._overlays:
+                state = self.load_persisted_state(overlay_id)
                 self._overlays[overlay_id] = {
-                    "state": self.load_persisted_state(overlay_id),
+                    "state": state,
+                    "published": (0, _freeze(state)),
                     "clients": [],
                     "controllers": [],
                 }
@@ -323,10 +481,31 @@ class OverlayStateStore:
                 ctx["controllers"] = []
             return ctx
 
+    def _published(self, overlay_id: str) -> tuple[int, FrozenDict]:
+        ctx = self._overlays.get(overlay_id)
+        if ctx is None:
+            ctx = self.get_overlay_context(overlay_id)
+        published: tuple[int, FrozenDict] = ctx["published"]
+        return published
+
     def get_state(self, overlay_id: str) -> dict:
-        """Return a snapshot of the current state for *overlay_id*."""
-        with self._lock:
-            return copy.deepcopy(self.get_overlay_context(overlay_id)["state"])
+        """Return a read-only snapshot of the current state for *overlay_id*.
+
+        The snapshot is a :class:`FrozenDict` that later mutations never
+        touch — they publish a new one that shares every unchanged subtree —
+        so this neither copies nor takes ``self._lock`` once the overlay is
+        loaded. ``copy.deepcopy`` it for an editable copy.
+        """
+        return self._published(overlay_id)[1]
+
+    def get_state_revision(self, overlay_id: str) -> int:
+        """Return the in-process revision of *overlay_id*'s state.
+
+        Bumped by every mutation that changes the state; ``0`` for state as
+        loaded from disk. Not persisted, so only comparable within one
+        process — suitable for cache keys and change detection.
+        """
+        return self._published(overlay_id)[0]
 
     def overlay_exists(self, overlay_id: str) -> bool:
         """Check whether a state file exists on disk for *overlay_id*.
@@ -397,6 +576,41 @@ class OverlayStateStore:
                 continue
             yield oid, filename
 
+    def recent_overlay_ids(self, limit: int) -> list[str]:
+        """Ids of the *limit* most recently written overlays, newest first.
+
+        Ranks the state files by mtime — every state change rewrites the
+        file, so that is "last activity" — and only parses as many of them
+        as it takes to collect *limit* valid ids, so a warm-up of a few
+        courts on a host with thousands of overlays reads a few files.
+        """
+        if limit <= 0 or not os.path.isdir(self._data_dir):
+            return []
+        ranked: list[tuple[float, str]] = []
+        for filename in os.listdir(self._data_dir):
+            if not _HASHED_FILENAME_PATTERN.fullmatch(filename):
+                continue
+            try:
+                mtime = os.stat(os.path.join(self._data_dir, filename)).st_mtime
+            except OSError:
+                continue
+            ranked.append((mtime, filename))
+        ranked.sort(reverse=True)
+        ids: list[str] = []
+        for _mtime, filename in ranked:
+            try:
+                with open(os.path.join(self._data_dir, filename), encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Skipping unreadable state file '%s': %s", filename, exc)
+                continue
+            oid = (payload or {}).get("_meta", {}).get("overlay_id")
+            if is_valid_overlay_id(oid) or is_valid_skey(oid):
+                ids.append(oid)
+                if len(ids) >= limit:
+                    break
+        return ids
+
     def _populate_cache_locked(self) -> None:
         """Walk the data directory once and index every overlay by both
         its raw id and its output key. Caller must hold ``self._lock``.
@@ -486,6 +700,9 @@ class OverlayStateStore:
             return False
         existed = False
         with self._get_persistence_lock(overlay_id):
+            # A queued write-behind flush must not resurrect the file.
+            with self._dirty_cond:
+                self._dirty.pop(overlay_id, None)
             if os.path.exists(path):
                 os.remove(path)
                 existed = True
@@ -518,6 +735,9 @@ class OverlayStateStore:
         """
         if not self.overlay_exists(source_id):
             return False
+        # The clone is read from disk, so pending write-behind changes to
+        # the source must land first.
+        self.flush(source_id)
         source_state = self.load_persisted_state(source_id)
         with self._get_persistence_lock(target_id):
             if self.overlay_exists(target_id):
@@ -535,12 +755,11 @@ class OverlayStateStore:
 
     def get_raw_config(self, overlay_id: str) -> dict:
         """Return ``{model, customization}`` from the overlay state."""
-        with self._lock:
-            state = self.get_overlay_context(overlay_id)["state"]
-            return {
-                "model": copy.deepcopy(state.get("raw_remote_model", {})),
-                "customization": copy.deepcopy(state.get("raw_remote_customization", {})),
-            }
+        state = self.get_state(overlay_id)
+        return {
+            "model": copy.deepcopy(state.get("raw_remote_model", {})),
+            "customization": copy.deepcopy(state.get("raw_remote_customization", {})),
+        }
 
     def set_raw_config(
         self, overlay_id: str,
@@ -566,13 +785,141 @@ class OverlayStateStore:
     def _mutate_and_persist(
         self, overlay_id: str, mutation: Callable[[dict], None],
     ) -> None:
-        """Apply *mutation* and persist its snapshot in per-overlay order."""
+        """Apply *mutation* and persist its snapshot in per-overlay order.
+
+        Only the overlay's own persistence lock is held: the working copy
+        belongs to this overlay alone and readers go through the published
+        snapshot, so courts never wait on each other here. The new snapshot
+        is published before the disk write, which serializes it directly —
+        no deep copy. In write-behind mode the write is deferred to the
+        background writer.
+        """
         with self._get_persistence_lock(overlay_id):
-            with self._lock:
-                state = self.get_overlay_context(overlay_id)["state"]
-                mutation(state)
-                snapshot = copy.deepcopy(state)
-            self._save_persisted_state_unlocked(overlay_id, snapshot)
+            ctx = self.get_overlay_context(overlay_id)
+            mutation(ctx["state"])
+            revision, previous = ctx["published"]
+            snapshot = _freeze(ctx["state"], previous)
+            if snapshot is not previous:
+                ctx["published"] = (revision + 1, snapshot)
+            if self._write_behind_seconds <= 0:
+                self._save_persisted_state_unlocked(overlay_id, snapshot)
+                return
+        self._mark_dirty(overlay_id)
+
+    # -- Write-behind ------------------------------------------------------
+
+    def _mark_dirty(self, overlay_id: str) -> None:
+        """Schedule *overlay_id* for the background writer."""
+        with self._dirty_cond:
+            if overlay_id not in self._dirty:
+                self._dirty[overlay_id] = (
+                    time.monotonic() + self._write_behind_seconds
+                )
+                self._dirty_cond.notify()
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    name="overlay-state-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+                if not self._atexit_registered:
+                    # Backstop for processes that exit without running the
+                    # app lifespan (scripts, a bare uvicorn crash handler).
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def _writer_loop(self) -> None:
+        """Persist dirty overlays as their windows elapse, oldest first."""
+        while True:
+            with self._dirty_cond:
+                while True:
+                    if self._writer is not threading.current_thread():
+                        return
+                    if not self._dirty:
+                        self._dirty_cond.wait()
+                        continue
+                    now = time.monotonic()
+                    earliest = min(self._dirty.values())
+                    if earliest <= now:
+                        break
+                    self._dirty_cond.wait(earliest - now)
+                due = sorted(
+                    (oid for oid, deadline in self._dirty.items() if deadline <= now),
+                    key=self._dirty.__getitem__,
+                )
+                for oid in due:
+                    del self._dirty[oid]
+            try:
+                self._flush_batch(due)
+            except Exception:
+                # Never let one bad overlay kill the writer for the rest.
+                logger.exception("Overlay state write-behind batch failed")
+
+    def _flush_batch(self, overlay_ids: list[str]) -> None:
+        """Write the current in-memory state of each overlay durably.
+
+        Each file is fsynced before its rename, so a crash leaves either
+        the previous or the new document; the directory is fsynced once
+        after the batch so the renames themselves survive. Overlays
+        deleted since they were marked are skipped.
+        """
+        wrote = False
+        for overlay_id in overlay_ids:
+            with self._get_persistence_lock(overlay_id):
+                ctx = self._overlays.get(overlay_id)
+                if ctx is None:
+                    continue
+                snapshot = self._stamp_meta(ctx["published"][1], overlay_id)
+                try:
+                    with span(STAGE_STATE_STORE_WRITE):
+                        self._write_state_durable(
+                            self.get_state_file_path(overlay_id), snapshot,
+                        )
+                    wrote = True
+                except OSError as exc:
+                    logger.warning(
+                        "Failed to save state for '%s': %s", overlay_id, exc,
+                    )
+        if wrote:
+            try:
+                fsync_directory(self._data_dir)
+            except OSError as exc:
+                logger.warning(
+                    "Failed to fsync overlay state directory '%s': %s",
+                    self._data_dir, exc,
+                )
+
+    def flush(self, overlay_id: str | None = None) -> None:
+        """Write pending write-behind changes now (one overlay or all).
+
+        No-op when nothing is pending, including in synchronous mode.
+        """
+        with self._dirty_cond:
+            if overlay_id is None:
+                due = sorted(self._dirty, key=self._dirty.__getitem__)
+                self._dirty.clear()
+            elif self._dirty.pop(overlay_id, None) is not None:
+                due = [overlay_id]
+            else:
+                due = []
+        if due:
+            self._flush_batch(due)
+
+    def close(self) -> None:
+        """Stop the background writer and flush everything still pending.
+
+        Called from the application lifespan on shutdown. Idempotent, and
+        not final: a later mutation starts a fresh writer, which keeps a
+        store shared across several app lifespans (the test suite) working.
+        """
+        with self._dirty_cond:
+            writer = self._writer
+            self._writer = None
+            self._dirty_cond.notify_all()
+        if writer is not None and writer is not threading.current_thread():
+            writer.join(timeout=5)
+        self.flush()
 
     def _update_state_and_persist(self, overlay_id: str, payload: dict) -> None:
         """Shared implementation for synchronous and asynchronous updates."""
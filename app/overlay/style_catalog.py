@@ -28,8 +28,9 @@ class StyleCatalog:
     _META_STYLES = {"mosaic"}
     _NEVER_RENDERED = {"base"}
 
-    # Pull linked stylesheet names from templates and one-level CSS imports.
-    _CSS_HREF_RE = re.compile(r"/static/css/([\w-]+)\.css")
+    # Pull linked stylesheet names from templates (literal ``/static/css/``
+    # hrefs or ``static_url('css/...')`` calls) and one-level CSS imports.
+    _CSS_HREF_RE = re.compile(r"(?:/static/|static_url\(['\"])css/([\w-]+)\.css")
     _CSS_IMPORT_RE = re.compile(r"@import\s+url\(['\"]?([\w-]+)\.css")
 
     def __init__(
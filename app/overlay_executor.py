@@ -10,6 +10,18 @@ properties the overlay path needs:
 * FIFO execution for work targeting the same per-user storage key, while work
   for different overlays can still run concurrently.
 
+On top of that, :meth:`OverlayTaskExecutor.submit_latest` queues
+*idempotent* pushes — work that renders the overlay's whole state from the
+newest inputs, so only the last one queued matters. Such a push replaces a
+queued push of the same kind for the same key instead of queueing behind it
+(five taps during a slow disk write become one write, not five), and may
+ask for the priority lane: it overtakes queued idempotent work for its key,
+and its key is dispatched ahead of keys whose next task is ordinary.
+Plain :meth:`~OverlayTaskExecutor.submit` work is a barrier for both: nothing
+is coalesced or reordered across it, so non-idempotent work (the delete
+barrier of :meth:`~OverlayTaskExecutor.run_after_pending`) keeps exactly the
+ordering it had.
+
 The singleton is lazy and restartable so importing application modules does
 not create worker threads and independent application lifespans in tests do
 not inherit a shut-down pool.
@@ -24,11 +36,12 @@ import time
 from collections import deque
 from collections.abc import Callable
 from concurrent.futures import Future, ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from app.env_vars_manager import EnvVarsManager
 from app.metrics import (
+    record_overlay_executor_coalesced,
     record_overlay_executor_run,
     record_overlay_executor_wait,
     set_overlay_executor_queue_depth,
@@ -68,10 +81,19 @@ class _WorkItem:
     args: tuple[Any, ...]
     kwargs: dict[str, Any]
     queued_at: float
+    # Coalescing kind for ``submit_latest`` work; ``None`` marks plain work,
+    # which nothing is merged or reordered across.
+    slot: str | None = None
+    priority: bool = False
+    # Futures of the pushes this item replaced; they settle with its result.
+    followers: list[Future[Any]] = field(default_factory=list)
 
 
 class OverlayTaskExecutor:
-    """Bounded worker pool that preserves FIFO order within each key."""
+    """Bounded worker pool that preserves FIFO order within each key.
+
+    Except where :meth:`submit_latest` says otherwise, for idempotent pushes.
+    """
 
     def __init__(self, max_workers: int, max_queue: int) -> None:
         if max_workers < 1:
@@ -91,6 +113,9 @@ class OverlayTaskExecutor:
         self._capacity = threading.BoundedSemaphore(max_workers + max_queue)
         self._condition = threading.Condition()
         self._queues: dict[str, deque[_WorkItem]] = {}
+        # Keys with work ready to dispatch: those whose next task asked for
+        # the priority lane, then the rest. ``_ready_key_set`` spans both.
+        self._priority_keys: deque[str] = deque()
         self._ready_keys: deque[str] = deque()
         self._ready_key_set: set[str] = set()
         self._running_keys: set[str] = set()
@@ -138,12 +163,110 @@ class OverlayTaskExecutor:
             self._queues.setdefault(key, deque()).append(item)
             self._queued_count += 1
             set_overlay_executor_queue_depth(self._queued_count)
-            if key not in self._running_keys and key not in self._ready_key_set:
-                self._ready_keys.append(key)
-                self._ready_key_set.add(key)
+            self._mark_ready_locked(key)
+            self._dispatch_ready_locked()
+        return item.future
+
+    def submit_latest(
+        self,
+        key: str,
+        slot: str,
+        function: Callable[..., Any],
+        /,
+        *args: Any,
+        priority: bool = False,
+        **kwargs: Any,
+    ) -> Future[Any]:
+        """Queue an idempotent push, replacing a queued one of the same *slot*.
+
+        Only for work whose effect depends on nothing but its own arguments
+        and the newest state, so running the latest of several queued calls
+        is the same as running them all. A queued (not yet running) item for
+        *key* with the same *slot* is dropped in favour of this one, provided
+        no plain :meth:`submit` work sits between them; the dropped call's
+        future settles with this one's result. With *priority* the push is
+        placed ahead of queued idempotent work for *key* (never ahead of
+        plain work) and its key is dispatched before ordinary keys.
+
+        Blocks or raises on a full executor exactly like :meth:`submit`.
+        """
+        queued_at = time.perf_counter()
+        self._acquire_capacity()
+        item = _WorkItem(
+            future=Future(),
+            function=function,
+            args=args,
+            kwargs=kwargs,
+            queued_at=queued_at,
+            slot=slot,
+            priority=priority,
+        )
+        with self._condition:
+            if self._shutdown:
+                self._capacity.release()
+                raise RuntimeError("cannot schedule work after executor shutdown")
+            queue = self._queues.setdefault(key, deque())
+            replaced = self._find_replaceable_locked(queue, slot)
+            if replaced is not None:
+                queue.remove(replaced)
+                item.followers = [*replaced.followers, replaced.future]
+                item.queued_at = replaced.queued_at
+                # The replaced item's slot carries over to this one.
+                self._capacity.release()
+                record_overlay_executor_coalesced()
+            else:
+                self._unfinished_count += 1
+                self._queued_count += 1
+                set_overlay_executor_queue_depth(self._queued_count)
+            if priority:
+                queue.insert(self._priority_index_locked(queue), item)
+            else:
+                queue.append(item)
+            self._mark_ready_locked(key)
             self._dispatch_ready_locked()
         return item.future
 
+    @staticmethod
+    def _find_replaceable_locked(
+        queue: deque[_WorkItem], slot: str,
+    ) -> _WorkItem | None:
+        """Newest queued *slot* item not separated from the tail by plain work."""
+        for queued in reversed(queue):
+            if queued.slot is None:
+                return None
+            if queued.slot == slot:
+                return queued
+        return None
+
+    @staticmethod
+    def _priority_index_locked(queue: deque[_WorkItem]) -> int:
+        """Where a priority push goes: behind plain and priority work only."""
+        index = len(queue)
+        while index > 0:
+            queued = queue[index - 1]
+            if queued.slot is None or queued.priority:
+                break
+            index -= 1
+        return index
+
+    def _mark_ready_locked(self, key: str) -> None:
+        """Put *key* in the right ready lane for its next queued task."""
+        if key in self._running_keys:
+            return
+        queue = self._queues.get(key)
+        if not queue:
+            return
+        urgent = queue[0].priority
+        if key in self._ready_key_set:
+            # A priority push may have just become the head of a key that
+            # was waiting in the ordinary lane.
+            if urgent and key in self._ready_keys:
+                self._ready_keys.remove(key)
+                self._priority_keys.append(key)
+            return
+        (self._priority_keys if urgent else self._ready_keys).append(key)
+        self._ready_key_set.add(key)
+
     def _acquire_capacity(self) -> None:
         """Reserve one slot, never parking a thread that drives the loop.
 
@@ -164,8 +287,11 @@ class OverlayTaskExecutor:
 
     def _dispatch_ready_locked(self) -> None:
         """Assign ready keys to free workers while the condition is held."""
-        while self._running_count < self.max_workers and self._ready_keys:
-            key = self._ready_keys.popleft()
+        while self._running_count < self.max_workers and (
+            self._priority_keys or self._ready_keys
+        ):
+            lane = self._priority_keys or self._ready_keys
+            key = lane.popleft()
             self._ready_key_set.discard(key)
             queue = self._queues[key]
             item = queue.popleft()
@@ -180,16 +306,24 @@ class OverlayTaskExecutor:
     def _run_item(self, key: str, item: _WorkItem) -> None:
         started_at = time.perf_counter()
         record_overlay_executor_wait(started_at - item.queued_at)
-        if item.future.set_running_or_notify_cancel():
+        # A coalesced push runs once for every caller it absorbed; it is
+        # skipped only when all of them were cancelled.
+        live = [
+            future for future in (item.future, *item.followers)
+            if future.set_running_or_notify_cancel()
+        ]
+        if live:
             try:
                 result = item.function(*item.args, **item.kwargs)
             except BaseException as exc:
-                item.future.set_exception(exc)
+                for future in live:
+                    future.set_exception(exc)
                 # The ordering key contains the account id and raw OID; keep
                 # it out of logs even when LOG_REDACT is disabled.
                 logger.exception("Overlay background task failed")
             else:
-                item.future.set_result(result)
+                for future in live:
+                    future.set_result(result)
             finally:
                 record_overlay_executor_run(time.perf_counter() - started_at)
         self._capacity.release()
@@ -198,10 +332,7 @@ class OverlayTaskExecutor:
             self._unfinished_count -= 1
             self._running_count -= 1
             self._running_keys.discard(key)
-            queue = self._queues.get(key)
-            if queue:
-                self._ready_keys.append(key)
-                self._ready_key_set.add(key)
+            self._mark_ready_locked(key)
             self._dispatch_ready_locked()
             if self._unfinished_count == 0:
                 self._condition.notify_all()
@@ -244,6 +375,7 @@ class OverlayTaskExecutor:
                 for queue in self._queues.values():
                     cancelled.extend(queue)
                 self._queues.clear()
+                self._priority_keys.clear()
                 self._ready_keys.clear()
                 self._ready_key_set.clear()
                 self._queued_count = 0
@@ -251,6 +383,8 @@ class OverlayTaskExecutor:
                 set_overlay_executor_queue_depth(0)
                 for item in cancelled:
                     item.future.cancel()
+                    for follower in item.followers:
+                        follower.cancel()
                     self._capacity.release()
                 if self._unfinished_count == 0:
                     self._condition.notify_all()
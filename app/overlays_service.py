@@ -14,6 +14,7 @@ from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import InstrumentedAttribute, Session
 
+from app.auth import resolution_cache
 from app.db.models.overlay import UserOverlay
 from app.id_validation import validate_overlay_id
 from app.overlay_key import make_skey
@@ -141,6 +142,36 @@ def get_by_control_token(db: Session, token: str) -> UserOverlay | None:
     return db.execute(select(UserOverlay).where(UserOverlay.control_token == token)).scalar_one_or_none()
 
 
+def resolve_control_token(db: Session, token: str) -> str | None:
+    """Storage key of the board a control link points at, or ``None``.
+
+    What the control surface and the WebSocket upgrade actually need from a
+    ``?c=`` token; answered from :mod:`app.auth.resolution_cache` while a
+    recent resolution is still fresh.
+    """
+    if not token:
+        return None
+    key = resolution_cache.credential_key(token)
+    cached = resolution_cache.control_tokens.get(key)
+    if cached is not None:
+        return cached[1]
+    generation = resolution_cache.control_tokens.generation()
+    overlay = get_by_control_token(db, token)
+    if overlay is None:
+        return None
+    skey = skey_for(overlay)
+    resolution_cache.control_tokens.put(key, overlay.user_id, skey, generation)
+    return skey
+
+
+def _forget_control_token(db: Session, token: str | None) -> None:
+    if token:
+        key = resolution_cache.credential_key(token)
+        resolution_cache.invalidate(
+            db, lambda: resolution_cache.control_tokens.discard(keys=(key,)),
+        )
+
+
 def get_public_by_username_and_oid(
     db: Session,
     username: str,
@@ -179,8 +210,10 @@ def regenerate_control_token(db: Session, user_id: int, oid: str) -> UserOverlay
     overlay = get_overlay(db, user_id, oid)
     if overlay is None:
         raise OverlayNotFoundError("Overlay not found.")
+    previous = overlay.control_token
     overlay.control_token = _generate_control_token(db)
     db.flush()
+    _forget_control_token(db, previous)
     return overlay
 
 
@@ -207,8 +240,10 @@ def delete_overlay(db: Session, user_id: int, oid: str) -> bool:
     overlay = get_overlay(db, user_id, oid)
     if overlay is None:
         return False
+    token = overlay.control_token
     db.delete(overlay)
     db.flush()
+    _forget_control_token(db, token)
     return True
 
 
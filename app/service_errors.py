@@ -12,6 +12,8 @@ class ServiceError(ValueError):
     """Base class for errors that are safe to expose to API callers."""
 
     status_code = 400
+    # Seconds a client should wait before retrying; sent as ``Retry-After``.
+    retry_after: int | None = None
 
 
 class NotFoundServiceError(ServiceError):
@@ -30,3 +32,10 @@ class UnprocessableServiceError(ServiceError):
     """The request shape is valid but a semantic identifier is invalid."""
 
     status_code = 422
+
+
+class UnavailableServiceError(ServiceError):
+    """The service is temporarily saturated; the same request may succeed later."""
+
+    status_code = 503
+    retry_after = 1
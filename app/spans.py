@@ -0,0 +1,142 @@
+"""Per-stage timing spans for the game-action hot path.
+
+``voc_http_request_duration_seconds`` says that ``/game/add-point`` got
+slower, not where the time went. The stages an action passes through —
+the audit append (which also folds the live-stats accumulator), the
+state response, persisting the overlay state and session meta, the
+WebSocket and OBS fan-out, webhook dispatch and the archive hand-off —
+are wrapped in :func:`span` (or decorated with :func:`timed`), and each
+one lands in ``voc_stage_duration_seconds{stage}``. Stage names are the
+``STAGE_*`` constants below, never built from request data, so the label
+set stays as bounded as the code.
+
+Per-request breakdown. The game routes wrap each action in
+:func:`request_breakdown`; with ``SPAN_LOG_SAMPLE_RATE`` above 0 that
+fraction of actions also collects its spans in a context variable and
+logs one INFO line with the per-stage milliseconds. The line is emitted
+inside the request, so the logging filter stamps it with the request's
+W3C ``trace_id`` like every other record. Work handed to another thread
+without the request's context (the overlay executor's push, the OBS
+debounce task) still feeds the histograms but not the sampled line.
+
+Cost when not sampled: two ``perf_counter`` calls, one histogram observe
+and one context-variable read per span.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from app.constants import SPAN_LOG_SAMPLE_RATE
+from app.metrics import record_stage_duration
+
+logger = logging.getLogger(__name__)
+
+STAGE_ACTION = "action"
+STAGE_AUDIT_APPEND = "audit_append"
+STAGE_LIVE_STATS = "live_stats"
+STAGE_GET_STATE = "get_state"
+STAGE_OVERLAY_SAVE = "overlay_save"
+STAGE_OVERLAY_PUSH = "overlay_push"
+STAGE_STATE_STORE_WRITE = "state_store_write"
+STAGE_PERSIST_META = "persist_meta"
+STAGE_WS_BROADCAST = "ws_broadcast"
+STAGE_OBS_BROADCAST = "obs_broadcast"
+STAGE_WEBHOOK_DISPATCH = "webhook_dispatch"
+STAGE_ARCHIVE_ENQUEUE = "archive_enqueue"
+
+
+class _Breakdown:
+    """Stage totals (seconds) and call counts for one sampled action."""
+
+    __slots__ = ("action", "counts", "totals")
+
+    def __init__(self, action: str) -> None:
+        self.action = action
+        self.totals: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def format(self) -> str:
+        parts = []
+        for stage, seconds in self.totals.items():
+            if stage == STAGE_ACTION:
+                continue
+            count = self.counts[stage]
+            suffix = f" x{count}" if count > 1 else ""
+            parts.append(f"{stage}={seconds * 1000:.2f}ms{suffix}")
+        return " ".join(parts)
+
+
+_breakdown_var: contextvars.ContextVar[_Breakdown | None] = contextvars.ContextVar(
+    "span_breakdown", default=None,
+)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as *stage* (one of the ``STAGE_*`` names)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        record_stage_duration(stage, elapsed)
+        breakdown = _breakdown_var.get()
+        if breakdown is not None:
+            breakdown.add(stage, elapsed)
+
+
+def timed[**P, R](stage: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator form of :func:`span` for a function that is one whole stage."""
+
+    def decorate(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _sampled() -> bool:
+    rate = SPAN_LOG_SAMPLE_RATE
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+@contextmanager
+def request_breakdown(action: str) -> Iterator[None]:
+    """Time one game action and, when sampled, log its per-stage breakdown.
+
+    Must wrap the ``run_in_threadpool`` hop rather than run inside it:
+    the worker thread gets a copy of this context, and the spans it
+    records reach the log line through the shared breakdown object.
+    """
+    if not _sampled():
+        with span(STAGE_ACTION):
+            yield
+        return
+    breakdown = _Breakdown(action)
+    token = _breakdown_var.set(breakdown)
+    try:
+        with span(STAGE_ACTION):
+            yield
+    finally:
+        _breakdown_var.reset(token)
+        logger.info(
+            "game action %s took %.2fms: %s",
+            action,
+            breakdown.totals.get(STAGE_ACTION, 0.0) * 1000,
+            breakdown.format() or "no stages recorded",
+        )
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs
 
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -14,6 +15,11 @@ from starlette.types import Scope
 from app.app_config import get_app_title
 from app.pwa_manifest import _render_index_html
 
+if TYPE_CHECKING:
+    from app.overlay.assets import StaticAssets
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 class SPAStaticFiles(StaticFiles):
     """Serve the SPA shell for unknown paths and rewrite its runtime title."""
@@ -63,3 +69,29 @@ class CachedStaticFiles(StaticFiles):
         if response.status_code in (200, 206, 304):
             response.headers.setdefault("Cache-Control", self._cache_control)
         return response
+
+
+class VersionedStaticFiles(StaticFiles):
+    """Cache content-hash-versioned URLs forever, revalidate everything else.
+
+    A request whose ``?v=`` equals the file's current digest (see
+    :mod:`app.overlay.assets`) names bytes that can never change, so it is
+    served ``immutable``. Any other request — no ``v``, or a digest from
+    before a deploy — gets ``no-cache`` and revalidates against the
+    ``ETag``/``Last-Modified`` ``StaticFiles`` already sends.
+    """
+
+    def __init__(self, *args: Any, assets: StaticAssets, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._assets = assets
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 206, 304):
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            requested = query.get("v", [None])[0]
+            versioned = requested is not None and requested == self._assets.version(path)
+            response.headers.setdefault(
+                "Cache-Control", IMMUTABLE_CACHE_CONTROL if versioned else "no-cache",
+            )
+        return response
@@ -117,7 +117,7 @@ def register_system_routes(
 
     @application.get("/health/ready")
     def readiness_check() -> JSONResponse:
-        """Readiness probe for writable local persistence."""
+        """Readiness probe: writable local persistence and a finished warm-up."""
         from app.api import action_log
 
         checks: dict[str, bool] = {}
@@ -138,12 +138,23 @@ def register_system_routes(
             checks["data_dir_writable"] = False
             reasons["data_dir_writable"] = "write_failed"
 
+        # Not ready while the opt-in startup warm-up is still preloading
+        # overlays (always ready when it is disabled); the detail says how
+        # it ended so a slow or timed-out warm-up is visible to operators.
+        from app.api import warmup
+
+        warm, warmup_detail = warmup.readiness()
+        checks["warmup_complete"] = warm
+        if not warm:
+            reasons["warmup_complete"] = "warming_up"
+
         all_ok = all(checks.values())
         payload: dict[str, object] = {
             "status": "ok" if all_ok else "degraded",
             "timestamp": int(time.time()),
             "service": "volley-overlay-control",
             "checks": checks,
+            "warmup": warmup_detail,
         }
         if reasons:
             payload["reasons"] = reasons
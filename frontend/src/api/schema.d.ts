@@ -421,10 +421,13 @@ export interface paths {
         put?: never;
         /**
          * Re-deliver dead-lettered webhook records
-         * @description Replay a slice of the webhook dead-letter file (oldest first).
+         * @description Replay one page of the webhook dead-letter file (oldest first).
          *
          *     Successful redeliveries are removed; unknown-URL and still-failing records
-         *     are kept. Returns counts only — bodies are never echoed back.
+         *     stay where they are with their attempt count bumped, so walking the file
+         *     with ``after=<next_after>`` visits every record once. Records that land
+         *     while the replay runs are untouched. Returns counts only — bodies are
+         *     never echoed back.
          */
         post: operations["replay_dead_letter_webhooks_api_v1_admin_webhooks_replay_post"];
         delete?: never;
@@ -1702,7 +1705,7 @@ export interface paths {
         };
         /**
          * Readiness Check
-         * @description Readiness probe for writable local persistence.
+         * @description Readiness probe: writable local persistence and a finished warm-up.
          */
         get: operations["readiness_check_health_ready_get"];
         put?: never;
@@ -3856,6 +3859,14 @@ export interface operations {
                 since?: number | null;
                 /** @description Cap the records redelivered in this call. */
                 max_records?: number;
+                /** @description Only replay records for this event. */
+                event?: string | null;
+                /** @description Only replay records for this target URL. */
+                url?: string | null;
+                /** @description Only replay records for this overlay id. */
+                oid?: string | null;
+                /** @description Page cursor: only replay records with a seq greater than this (pass the previous response's next_after). */
+                after?: number | null;
             };
             header?: never;
             path?: never;
@@ -0,0 +1,90 @@
+/*
+ * Tests for the OBS overlay's patch-protocol consumer in
+ * overlay_static/js/app.js (server side: app/overlay/broadcast.py).
+ *
+ * Loaded the same way as overlaySideSwap.test.ts: the plain script is
+ * evaluated inside a ``new Function`` shell whose epilogue hands back the
+ * pieces under test, with ``processStateUpdate`` rebound to a recorder and
+ * ``socket`` to a fake so resync requests can be observed.
+ */
+import { describe, expect, it } from 'vitest';
+import APP_SRC from '../../../overlay_static/js/app.js?raw';
+
+interface PatchApp {
+  applyPatchOps: (state: unknown, ops: unknown[]) => unknown;
+  handleStreamMessage: (message: unknown) => void;
+  rendered: unknown[];
+  sent: string[];
+}
+
+function loadApp(): PatchApp {
+  const epilogue = `
+    ;const rendered = [];
+    const sent = [];
+    processStateUpdate = function (state) {
+      rendered.push(structuredClone(state));
+    };
+    socket = { readyState: WebSocket.OPEN, send: function (m) { sent.push(m); } };
+    return {
+      applyPatchOps: applyPatchOps,
+      handleStreamMessage: handleStreamMessage,
+      rendered: rendered,
+      sent: sent,
+    };`;
+  const factory = new Function('gsap', APP_SRC + epilogue);
+  return factory({}) as PatchApp;
+}
+
+describe('overlay patch protocol', () => {
+  it('applies add/remove/replace ops, including escaped keys', () => {
+    const app = loadApp();
+    const state = { team_home: { score: 3, 'a/b': 1 }, gone: true };
+
+    const next = app.applyPatchOps(state, [
+      { op: 'replace', path: '/team_home/score', value: 4 },
+      { op: 'remove', path: '/gone' },
+      { op: 'add', path: '/team_home/a~1b', value: 2 },
+      { op: 'add', path: '/serve', value: 'home' },
+    ]);
+
+    expect(next).toEqual({ team_home: { score: 4, 'a/b': 2 }, serve: 'home' });
+  });
+
+  it('renders a snapshot and then patches against its revision', () => {
+    const app = loadApp();
+
+    app.handleStreamMessage({ type: 'snapshot', rev: 3, state: { score: 1 } });
+    app.handleStreamMessage({
+      type: 'patch',
+      rev: 4,
+      base: 3,
+      ops: [{ op: 'replace', path: '/score', value: 2 }],
+    });
+
+    expect(app.rendered).toEqual([{ score: 1 }, { score: 2 }]);
+    expect(app.sent).toEqual([]);
+  });
+
+  it('asks for a resync on a revision gap instead of rendering', () => {
+    const app = loadApp();
+
+    app.handleStreamMessage({ type: 'snapshot', rev: 3, state: { score: 1 } });
+    app.handleStreamMessage({
+      type: 'patch',
+      rev: 6,
+      base: 5,
+      ops: [{ op: 'replace', path: '/score', value: 9 }],
+    });
+
+    expect(app.rendered).toEqual([{ score: 1 }]);
+    expect(app.sent).toEqual(['resync']);
+  });
+
+  it('still renders full-state frames from an older server', () => {
+    const app = loadApp();
+
+    app.handleStreamMessage({ overlay_control: { show_main_scoreboard: true } });
+
+    expect(app.rendered).toEqual([{ overlay_control: { show_main_scoreboard: true } }]);
+  });
+});
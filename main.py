@@ -17,9 +17,12 @@ from app.bootstrap import create_app
 from app.env_vars_manager import EnvVarsManager
 from app.logging_config import get_uvicorn_log_config, setup_logging
 
-setup_logging()
+# The icon transcoding pool's spawned workers re-import this script as
+# ``__mp_main__``; they must not run migrations or build a second app.
+if __name__ != "__mp_main__":
+    setup_logging()
 
-app = create_app()
+    app = create_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+"""move match-report audit logs into a compressed side table
+
+``match_reports.audit_log`` held every archived match's full action
+transcript as JSON on the same row as the summary columns, so on SQLite
+the listing queries, the calendar and every backup paged through
+megabytes of audit JSON to read a handful of dates and scores. This
+revision moves each transcript into ``match_report_audits`` — one row
+per report, keyed and cascade-deleted by the report id — as a
+zlib-compressed blob, then drops the old column.
+
+Rows are moved as codec ``json-zlib-v0`` (``zlib(json(list))``). The
+app's own writer uses a denser columnar codec, but a migration must not
+import app code, and the app decodes both (see
+``app/api/_audit_codec.py``; ``tests/test_db_migrations.py`` pins the
+codec names in sync). The backfill walks the table in id-ordered batches
+so memory stays bounded on a large archive.
+
+Downgrade restores the column from the blobs, decoding both codecs.
+
+Revision ID: 0008_match_report_audit_blobs
+Revises: 0007_user_storage_namespace
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_match_report_audit_blobs"
+down_revision: str | None = "0007_user_storage_namespace"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Mirrors ``app.api._audit_codec`` — duplicated, not imported (see above).
+CODEC_JSON_ZLIB = "json-zlib-v0"
+CODEC_COLUMNAR_ZLIB = "columnar-zlib-v1"
+
+_BATCH = 200
+
+_reports = sa.table(
+    "match_reports",
+    sa.column("id", sa.Integer()),
+    sa.column("audit_log", sa.JSON()),
+)
+_audits = sa.table(
+    "match_report_audits",
+    sa.column("report_id", sa.Integer()),
+    sa.column("codec", sa.String(length=32)),
+    sa.column("record_count", sa.Integer()),
+    sa.column("payload", sa.LargeBinary()),
+)
+
+
+def _set_sqlite_fk(connection: sa.engine.Connection, enabled: bool) -> None:
+    # The ``match_reports`` rebuild below copies the table and drops the
+    # original; with FK actions on, that drop would cascade-delete every
+    # ``match_report_audits`` row just written. Same approach as 0007.
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"PRAGMA foreign_keys={'ON' if enabled else 'OFF'}",
+        )
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    _set_sqlite_fk(connection, False)
+    op.create_table(
+        "match_report_audits",
+        sa.Column("report_id", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(length=32), nullable=False),
+        sa.Column("record_count", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["report_id"], ["match_reports.id"],
+            name=op.f("fk_match_report_audits_report_id_match_reports"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("report_id", name=op.f("pk_match_report_audits")),
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(_reports.c.id, _reports.c.audit_log)
+            .where(_reports.c.id > last_id)
+            .order_by(_reports.c.id)
+            .limit(_BATCH)
+        ).all()
+        if not rows:
+            break
+        batch = []
+        for report_id, audit in rows:
+            if isinstance(audit, str):
+                # Some drivers hand back the raw JSON text.
+                audit = json.loads(audit)
+            records = audit if isinstance(audit, list) else []
+            blob = zlib.compress(
+                json.dumps(records, separators=(",", ":"), ensure_ascii=False)
+                .encode("utf-8"),
+                9,
+            )
+            batch.append({
+                "report_id": report_id,
+                "codec": CODEC_JSON_ZLIB,
+                "record_count": len(records),
+                "payload": blob,
+            })
+        connection.execute(_audits.insert(), batch)
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        batch_op.drop_column("audit_log")
+    _set_sqlite_fk(connection, True)
+
+
+def _apply_delta(prev: Any, cell: dict) -> Any:
+    if "f" in cell:
+        return cell["f"]
+    result = dict(prev)
+    for key in cell.get("x", ()):
+        result.pop(key, None)
+    result.update(cell["d"])
+    return result
+
+
+def _decode(codec: str, blob: bytes) -> list:
+    doc = json.loads(zlib.decompress(blob).decode("utf-8"))
+    if codec == CODEC_JSON_ZLIB:
+        return doc if isinstance(doc, list) else []
+    if codec != CODEC_COLUMNAR_ZLIB:
+        return []
+    columns = ("ts", "action", "params", "result")
+    records = []
+    prev: Any = None
+    for i in range(int(doc["n"])):
+        record: dict = {}
+        for bit, name in enumerate(columns):
+            if not doc["present"][i] & (1 << bit):
+                continue
+            if name == "result":
+                prev = _apply_delta(prev, doc["result"][i])
+                record["result"] = prev
+            else:
+                record[name] = doc[name][i]
+        if doc["extra"][i]:
+            record.update(doc["extra"][i])
+        records.append(record)
+    return records
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    _set_sqlite_fk(connection, False)
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("audit_log", sa.JSON(), nullable=False, server_default="[]"),
+        )
+    rows = connection.execute(
+        sa.select(_audits.c.report_id, _audits.c.codec, _audits.c.payload)
+    ).all()
+    for report_id, codec, payload in rows:
+        try:
+            records = _decode(codec, payload)
+        except (ValueError, KeyError, IndexError, TypeError, zlib.error):
+            records = []
+        connection.execute(
+            _reports.update()
+            .where(_reports.c.id == report_id)
+            .values(audit_log=records)
+        )
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        batch_op.alter_column(
+            "audit_log", existing_type=sa.JSON(), server_default=None,
+        )
+    op.drop_table("match_report_audits")
+    _set_sqlite_fk(connection, True)
@@ -0,0 +1,163 @@
+"""denormalized summary columns and listing indexes on match_reports
+
+The match history page, its total count and the calendar used to filter
+by ``final_state -> config -> mode`` with a JSON extraction on every row,
+and to resolve both team names from the full ``customization`` blob of
+every row they returned. On an account with years of matches that turned
+each page into a scan that deserialized two JSON documents per report.
+
+This revision adds the summary as plain columns — ``mode``,
+``team_1_name`` / ``team_2_name``, ``team_1_sets`` / ``team_2_sets`` and
+``current_set`` — plus two indexes for the account-wide listing
+(``user_id, ended_at``) and its mode filter (``user_id, mode, ended_at``).
+Existing rows are backfilled in id-ordered batches.
+
+The backfill resolves names and values the way
+``app.api.match_archive._summary_fields`` does at archive time. A
+migration must not import app code, so the logic is duplicated below and
+``tests/test_db_migrations.py`` checks that both sides agree.
+
+Revision ID: 0009_match_report_summary_columns
+Revises: 0008_match_report_audit_blobs
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_match_report_summary_columns"
+down_revision: str | None = "0008_match_report_audit_blobs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BATCH = 500
+_NAME_MAX = 120
+_MODE_MAX = 32
+
+_COLUMNS: tuple[tuple[str, sa.types.TypeEngine], ...] = (
+    ("mode", sa.String(length=_MODE_MAX)),
+    ("team_1_name", sa.String(length=_NAME_MAX)),
+    ("team_2_name", sa.String(length=_NAME_MAX)),
+    ("team_1_sets", sa.Integer()),
+    ("team_2_sets", sa.Integer()),
+    ("current_set", sa.Integer()),
+)
+_INDEXES: tuple[tuple[str, list[str]], ...] = (
+    ("ix_match_reports_user_ended", ["user_id", "ended_at"]),
+    ("ix_match_reports_user_mode_ended", ["user_id", "mode", "ended_at"]),
+)
+
+_reports = sa.table(
+    "match_reports",
+    sa.column("id", sa.Integer()),
+    sa.column("final_state", sa.JSON()),
+    sa.column("customization", sa.JSON()),
+    *(sa.column(name, type_) for name, type_ in _COLUMNS),
+)
+
+
+def _json(value: Any) -> dict:
+    if isinstance(value, str):
+        # Some drivers hand back the raw JSON text.
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _team_name(customization: dict, team: int) -> str | None:
+    """Mirrors ``app.match_report.render._team_name`` (``None`` when unnamed)."""
+    for key in (
+        f"Team {team} Name",
+        f"Team {team} Text Name",
+        f"team_{team}_name",
+        f"name{team}",
+    ):
+        value = customization.get(key)
+        if isinstance(value, str) and value.strip():
+            name = value.strip()
+            return None if name == f"Team {team}" else name[:_NAME_MAX]
+    return None
+
+
+def _as_int(value: Any) -> int | None:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _summary_fields(final_state: Any, customization: Any) -> dict[str, Any]:
+    fs = _json(final_state)
+    cust = _json(customization)
+    t1 = fs.get("team_1") or {}
+    t2 = fs.get("team_2") or {}
+    config = fs.get("config") or {}
+    mode = config.get("mode") if isinstance(config, dict) else None
+    return {
+        "mode": mode[:_MODE_MAX] if isinstance(mode, str) else None,
+        "team_1_name": _team_name(cust, 1),
+        "team_2_name": _team_name(cust, 2),
+        "team_1_sets": _as_int(t1.get("sets")) if isinstance(t1, dict) else None,
+        "team_2_sets": _as_int(t2.get("sets")) if isinstance(t2, dict) else None,
+        "current_set": _as_int(fs.get("current_set")),
+    }
+
+
+def _set_sqlite_fk(connection: sa.engine.Connection, enabled: bool) -> None:
+    # A batch rebuild of ``match_reports`` drops the original table, which
+    # with FK actions on would cascade-delete every ``match_report_audits``
+    # row. Same guard as 0007 / 0008.
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"PRAGMA foreign_keys={'ON' if enabled else 'OFF'}",
+        )
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    _set_sqlite_fk(connection, False)
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        for name, type_ in _COLUMNS:
+            batch_op.add_column(sa.Column(name, type_, nullable=True))
+        for index_name, columns in _INDEXES:
+            batch_op.create_index(index_name, columns, unique=False)
+    _set_sqlite_fk(connection, True)
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(
+                _reports.c.id, _reports.c.final_state, _reports.c.customization,
+            )
+            .where(_reports.c.id > last_id)
+            .order_by(_reports.c.id)
+            .limit(_BATCH)
+        ).all()
+        if not rows:
+            break
+        for report_id, final_state, customization in rows:
+            connection.execute(
+                _reports.update()
+                .where(_reports.c.id == report_id)
+                .values(**_summary_fields(final_state, customization))
+            )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    _set_sqlite_fk(connection, False)
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        for index_name, _columns in reversed(_INDEXES):
+            batch_op.drop_index(index_name)
+        for name, _type in reversed(_COLUMNS):
+            batch_op.drop_column(name)
+    _set_sqlite_fk(connection, True)
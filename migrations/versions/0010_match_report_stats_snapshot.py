@@ -0,0 +1,59 @@
+"""stats snapshot columns on match_reports
+
+Every report render used to re-walk the archived audit transcript to derive
+its highlights, set durations, serve split and per-set timeouts. This
+revision adds ``stats`` (JSON) and ``stats_version`` so the result is
+computed once, when the match is archived, and stored with the report.
+
+Existing rows are deliberately not backfilled here: the reducers live in
+app code, which a migration must not import, and duplicating them would
+mean pinning hundreds of lines of parity. A row with no snapshot (or one
+from an older ``STATS_SNAPSHOT_VERSION``) is recomputed from its audit on
+its next full read and written back, which is the same path a future
+reducer change takes.
+
+Revision ID: 0010_match_report_stats_snapshot
+Revises: 0009_match_report_summary_columns
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_match_report_stats_snapshot"
+down_revision: str | None = "0009_match_report_summary_columns"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _set_sqlite_fk(connection: sa.engine.Connection, enabled: bool) -> None:
+    # A batch rebuild of ``match_reports`` drops the original table, which
+    # with FK actions on would cascade-delete every ``match_report_audits``
+    # row. Same guard as 0007 - 0009.
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"PRAGMA foreign_keys={'ON' if enabled else 'OFF'}",
+        )
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    _set_sqlite_fk(connection, False)
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("stats", sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column("stats_version", sa.Integer(), nullable=True))
+    _set_sqlite_fk(connection, True)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    _set_sqlite_fk(connection, False)
+    with op.batch_alter_table("match_reports", schema=None) as batch_op:
+        batch_op.drop_column("stats_version")
+        batch_op.drop_column("stats")
+    _set_sqlite_fk(connection, True)
@@ -1,6 +1,12 @@
 let previousState = null;
 let socket = null;
 let heartbeatInterval = null;
+// Patch protocol (app/overlay/broadcast.py): the server sends one snapshot
+// and then ops against the previous revision. ``streamState`` is the state
+// those ops apply to; processStateUpdate keeps its own clones, so it is
+// safe to patch in place.
+let streamState = null;
+let streamRev = 0;
 
 // Restrict <img src> values coming from remote state to http(s) so a
 // malicious logo_url (javascript:, data:, vbscript:, …) cannot turn into XSS.
@@ -44,12 +50,80 @@ function stopHeartbeat() {
   }
 }
 
+function decodePointer(path) {
+  return path
+    .split("/")
+    .slice(1)
+    .map((token) => token.replace(/~1/g, "/").replace(/~0/g, "~"));
+}
+
+// Apply add/remove/replace ops in place. Throws on a path the state does
+// not have, which the caller treats as a missed revision.
+function applyPatchOps(state, ops) {
+  let root = state;
+  for (const op of ops) {
+    const keys = decodePointer(op.path);
+    if (keys.length === 0) {
+      root = op.value;
+      continue;
+    }
+    let node = root;
+    for (const key of keys.slice(0, -1)) {
+      node = node[key];
+      if (node === null || typeof node !== "object") {
+        throw new Error(`Patch path not found: ${op.path}`);
+      }
+    }
+    const last = keys[keys.length - 1];
+    if (op.op === "remove") {
+      delete node[last];
+    } else {
+      node[last] = op.value;
+    }
+  }
+  return root;
+}
+
+function requestResync() {
+  streamState = null;
+  if (socket && socket.readyState === WebSocket.OPEN) {
+    socket.send("resync");
+  }
+}
+
+function handleStreamMessage(message) {
+  if (message.type === "snapshot") {
+    streamState = message.state;
+    streamRev = message.rev;
+    processStateUpdate(streamState);
+  } else if (message.type === "patch") {
+    if (streamState === null || message.base !== streamRev) {
+      requestResync();
+      return;
+    }
+    try {
+      streamState = applyPatchOps(streamState, message.ops);
+    } catch (e) {
+      console.warn("Overlay patch did not apply, resyncing:", e);
+      requestResync();
+      return;
+    }
+    streamRev = message.rev;
+    processStateUpdate(streamState);
+  } else {
+    // Full-state frame from a server without the patch protocol.
+    processStateUpdate(message);
+  }
+}
+
 function connectWebSocket() {
   console.log(`Connecting to WebSocket: ${wsUrl}`);
   socket = new WebSocket(wsUrl);
 
   socket.onopen = () => {
     console.log("WebSocket connected");
+    streamState = null;
+    streamRev = 0;
     startHeartbeat();
   };
 
@@ -57,8 +131,7 @@ function connectWebSocket() {
     // Ignore "pong" responses from our heartbeat ping
     if (event.data === "pong") return;
     try {
-      const state = JSON.parse(event.data);
-      processStateUpdate(state);
+      handleStreamMessage(JSON.parse(event.data));
     } catch (e) {
       console.error("Error parsing WebSocket message:", e);
     }
@@ -0,0 +1,597 @@
+"""Reproducible benchmarks for the scoring hot path and its fan-out.
+
+The test suite is behavioural on purpose (``tests/test_db_scaling.py``
+counts queries, never milliseconds), so a release note saying "scoring is
+faster" had nothing to be checked against. This runner drives the real
+ASGI app in-process — lifespan, middleware, SQLite migrations and all —
+against a throwaway data directory and database, and reports throughput
+and p50/p99 latency for four scenarios:
+
+``courts``
+    N courts scoring concurrently through ``POST /game/add-point``, with
+    an ``/game/undo`` every fifth action.
+``fanout``
+    The same actions with M control-board sockets on ``WSHub`` and M OBS
+    sources (patch protocol) on ``ObsBroadcastHub`` per court; latency is
+    from the request until the last subscriber has the new frame (the OBS
+    figure includes the hub's 50 ms debounce).
+``live_stats``
+    A court with a long audit log: the append (which folds the live-stats
+    accumulator), a full live-stats rebuild, and a cold audit read.
+``reports``
+    A large archive: the paged match listing, the full match snapshot and
+    the HTML report render (with the render cache disabled).
+
+Results are written as JSON (``--out``). Keep one run as the baseline and
+compare later runs against it with ``--baseline``: a scenario whose p99
+grew, or whose throughput shrank, by more than ``--tolerance`` is reported
+and the exit status is 1. Baselines are hardware-specific — compare runs
+from the same machine with the same parameters.
+
+Usage:
+    python scripts/benchmark.py --out baseline.json
+    python scripts/benchmark.py --baseline baseline.json
+    python scripts/benchmark.py --scenario courts --courts 40 --actions 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+SCHEMA_VERSION = 1
+SCENARIOS = ("courts", "fanout", "live_stats", "reports")
+DEFAULT_TOLERANCE = 0.25
+
+_USERNAME = "bench"
+_PASSWORD = "bench-password-123"
+_BASE_URL = "http://testserver"
+_DELIVERY_TIMEOUT = 5.0
+
+
+# ---------------------------------------------------------------------------
+# Statistics and baselines (pure; covered by tests/test_benchmark_script.py)
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of *values* (``q`` in 0-100); 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[float], wall_seconds: float) -> dict[str, float]:
+    """Latency summary in milliseconds plus operations per second."""
+    count = len(samples)
+    return {
+        "count": count,
+        "throughput_per_s": round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / count * 1000, 3) if count else 0.0,
+        "max_ms": round(max(samples) * 1000, 3) if count else 0.0,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Describe every result that regressed against *baseline*.
+
+    A result regresses when its p99 exceeds the baseline's by more than
+    *tolerance* (a fraction), or its throughput falls short by more than
+    that. Results missing from either side are not compared.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        if base["p99_ms"] > 0 and result["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {result['p99_ms']:.2f}ms vs baseline {base['p99_ms']:.2f}ms"
+            )
+        if (
+            base["throughput_per_s"] > 0
+            and result["throughput_per_s"] < base["throughput_per_s"] * (1 - tolerance)
+        ):
+            regressions.append(
+                f"{name}: {result['throughput_per_s']:.1f}/s vs baseline "
+                f"{base['throughput_per_s']:.1f}/s"
+            )
+    return regressions
+
+
+class Recorder:
+    """Latency samples and the wall time of the phase each was taken in."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {}
+        self.walls: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+
+    @contextlib.contextmanager
+    def phase(self, *names: str) -> Iterator[None]:
+        """Time a phase; its wall time is the throughput base for *names*."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            for name in names:
+                self.walls[name] = self.walls.get(name, 0.0) + elapsed
+
+    def results(self) -> dict[str, dict[str, float]]:
+        return {
+            name: summarize(samples, self.walls.get(name, sum(samples)))
+            for name, samples in sorted(self.samples.items())
+        }
+
+
+# ---------------------------------------------------------------------------
+# Environment
+# ---------------------------------------------------------------------------
+
+
+def _prepare_environment(root: Path) -> None:
+    """Point the app at *root* before anything under ``app`` is imported."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{root / 'app.db'}"
+    # Every report request must render, not hit the cache.
+    os.environ["MATCH_REPORT_CACHE_ENTRIES"] = "0"
+    os.environ.pop("WEBHOOKS_URL", None)
+    os.environ.pop("SENTRY_DSN", None)
+
+
+def _isolate_data(root: Path) -> None:
+    """Redirect every per-module data directory into *root*.
+
+    Mirrors the isolation fixtures in ``tests/conftest.py``: the shared
+    ``data_dir`` is anchored at the repository, and a benchmark must never
+    write courts, audit logs or archives into a real ``data/``.
+    """
+    from app import security_bootstrap
+    from app.api import action_log, archive_queue, match_archive, session_persistence
+    from app.overlay import overlay_state_store
+
+    for module, sub in (
+        (action_log, "audit"),
+        (archive_queue, "archive_queue"),
+        (match_archive, "archive"),
+        (session_persistence, "sessions"),
+        (security_bootstrap, "security"),
+    ):
+        path = root / sub
+        path.mkdir(parents=True, exist_ok=True)
+        module._data_dir = lambda p=str(path): p  # type: ignore[attr-defined]
+    overlays = root / "overlays"
+    overlays.mkdir(parents=True, exist_ok=True)
+    overlay_state_store._data_dir = str(overlays)
+
+
+def _create_user() -> None:
+    from app.auth import service
+    from app.db import session_scope
+
+    with session_scope() as db:
+        service.create_user(db, username=_USERNAME, password=_PASSWORD)
+
+
+class _FakeSocket:
+    """Subscriber stand-in: records when frames of interest arrive."""
+
+    def __init__(self, prefix: str | None) -> None:
+        self._prefix = prefix
+        self.received = asyncio.Event()
+        self.arrived_at = 0.0
+
+    async def accept(self, subprotocol: str | None = None) -> None:
+        return None
+
+    async def send_text(self, text: str) -> None:
+        if self._prefix is None or text.startswith(self._prefix):
+            self.arrived_at = time.perf_counter()
+            self.received.set()
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        return None
+
+
+class _Bench:
+    """One running app, its HTTP client and the scenario parameters."""
+
+    def __init__(self, args: argparse.Namespace, client: Any, recorder: Recorder) -> None:
+        self.args = args
+        self.client = client
+        self.recorder = recorder
+        self.user_id = 0
+        self.rng = random.Random(args.seed)
+
+    async def post(self, path: str, **kwargs: Any) -> Any:
+        response = await self.client.post(path, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"POST {path} -> {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    async def get(self, path: str) -> Any:
+        response = await self.client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} -> {response.status_code}: {response.text[:200]}")
+        return response
+
+    def skey(self, oid: str) -> str:
+        from app.overlay_key import make_skey
+
+        return make_skey(self.user_id, oid)
+
+    async def init_court(self, oid: str, **rules: int) -> None:
+        await self.post("/api/v1/session/init", json={"oid": oid, **rules})
+
+    async def timed_action(self, name: str, path: str, **kwargs: Any) -> float:
+        started = time.perf_counter()
+        await self.post(path, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.recorder.add(name, elapsed)
+        return started
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+
+def _action_for(index: int, rng: random.Random) -> tuple[str, str, dict[str, Any]]:
+    if index % 5 == 4:
+        return "undo", "/api/v1/game/undo?oid={oid}", {}
+    return "add_point", "/api/v1/game/add-point?oid={oid}", {"json": {"team": rng.choice((1, 2))}}
+
+
+async def _play(bench: _Bench, prefix: str, oid: str, actions: int) -> None:
+    # Points limits high enough that no court finishes mid-run.
+    await bench.init_court(oid, points_limit=999, points_limit_last_set=999, sets_limit=5)
+    for i in range(actions):
+        kind, path, kwargs = _action_for(i, bench.rng)
+        await bench.timed_action(f"{prefix}.{kind}", path.format(oid=oid), **kwargs)
+
+
+async def scenario_courts(bench: _Bench) -> None:
+    args = bench.args
+    with bench.recorder.phase("courts.add_point", "courts.undo"):
+        await asyncio.gather(*(
+            _play(bench, "courts", f"court-{n:02d}", args.actions)
+            for n in range(args.courts)
+        ))
+
+
+async def _subscribe(bench: _Bench, oid: str) -> tuple[list[_FakeSocket], list[_FakeSocket]]:
+    from app.api.ws_hub import WSHub
+    from app.overlay import obs_broadcast_hub, overlay_state_store
+    from app.overlay.broadcast import PATCH_PROTOCOL
+
+    skey = bench.skey(oid)
+    boards = [_FakeSocket('{"type":"state_update"') for _ in range(bench.args.subscribers)]
+    for ws in boards:
+        await WSHub.connect(ws, skey)  # type: ignore[arg-type]
+    sources = [_FakeSocket(None) for _ in range(bench.args.subscribers)]
+    for ws in sources:
+        obs_broadcast_hub.add_client(skey, ws, protocol=PATCH_PROTOCOL)  # type: ignore[arg-type]
+        obs_broadcast_hub.snapshot_message(skey, ws, overlay_state_store.get_state(skey))  # type: ignore[arg-type]
+    return boards, sources
+
+
+async def _await_delivery(sockets: list[_FakeSocket]) -> float | None:
+    """Latest arrival time once every socket has a frame; None on timeout."""
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(ws.received.wait() for ws in sockets)),
+            timeout=_DELIVERY_TIMEOUT,
+        )
+    except TimeoutError:
+        return None
+    return max(ws.arrived_at for ws in sockets)
+
+
+async def _fanout_court(bench: _Bench, oid: str) -> None:
+    await bench.init_court(oid, points_limit=999, points_limit_last_set=999, sets_limit=5)
+    boards, sources = await _subscribe(bench, oid)
+    for i in range(bench.args.fanout_actions):
+        for ws in (*boards, *sources):
+            ws.received.clear()
+        kind, path, kwargs = _action_for(i, bench.rng)
+        if kind == "undo":
+            # An undo can leave the overlay unchanged for OBS; keep the
+            # fan-out figures to forward points.
+            kind, path, kwargs = "add_point", "/api/v1/game/add-point?oid={oid}", {"json": {"team": 1}}
+        started = await bench.timed_action("fanout.action", path.format(oid=oid), **kwargs)
+        for name, sockets in (("fanout.ws_delivery", boards), ("fanout.obs_delivery", sources)):
+            if not sockets:
+                continue
+            arrived = await _await_delivery(sockets)
+            if arrived is None:
+                raise RuntimeError(f"{name}: subscribers of {oid} got no frame")
+            bench.recorder.add(name, arrived - started)
+
+
+async def scenario_fanout(bench: _Bench) -> None:
+    args = bench.args
+    with bench.recorder.phase("fanout.action", "fanout.ws_delivery", "fanout.obs_delivery"):
+        await asyncio.gather(*(
+            _fanout_court(bench, f"fanout-{n:02d}") for n in range(args.courts)
+        ))
+
+
+def _audit_result(team_1: int, team_2: int) -> dict[str, Any]:
+    return {
+        "current_set": 1,
+        "score_set": 1,
+        "match_finished": False,
+        "team_1": {"sets": 0, "score": team_1, "timeouts": 0},
+        "team_2": {"sets": 0, "score": team_2, "timeouts": 0},
+        "serve": "A",
+    }
+
+
+def _measure_live_stats(bench: _Bench, skey: str) -> None:
+    from app.api import action_log, live_stats
+
+    rec = bench.recorder
+    scores = [0, 0]
+    for _ in range(bench.args.audit_records):
+        team = bench.rng.choice((1, 2))
+        scores[team - 1] += 1
+        action_log.append(skey, "add_point", {"team": team, "undo": False}, _audit_result(*scores))
+    live_stats.compute_live_stats(skey)
+
+    with rec.phase("live_stats.append"):
+        for _ in range(bench.args.repeats):
+            team = bench.rng.choice((1, 2))
+            scores[team - 1] += 1
+            started = time.perf_counter()
+            action_log.append(skey, "add_point", {"team": team, "undo": False}, _audit_result(*scores))
+            live_stats.compute_live_stats(skey)
+            rec.add("live_stats.append", time.perf_counter() - started)
+    with rec.phase("live_stats.rebuild"):
+        for _ in range(bench.args.repeats):
+            live_stats.evict_cache(skey)
+            started = time.perf_counter()
+            live_stats.compute_live_stats(skey)
+            rec.add("live_stats.rebuild", time.perf_counter() - started)
+    with rec.phase("live_stats.cold_read"):
+        for _ in range(bench.args.repeats):
+            action_log.evict_cache(skey)
+            started = time.perf_counter()
+            action_log.read_all(skey)
+            rec.add("live_stats.cold_read", time.perf_counter() - started)
+
+
+async def scenario_live_stats(bench: _Bench) -> None:
+    from starlette.concurrency import run_in_threadpool
+
+    await run_in_threadpool(_measure_live_stats, bench, bench.skey("stats-court"))
+
+
+async def _finish_match(bench: _Bench, oid: str) -> None:
+    """Play one best-of-three to 25 through the API so it gets archived."""
+    await bench.init_court(oid, points_limit=25, points_limit_last_set=15, sets_limit=3)
+    for i in range(200):
+        response = await bench.post(
+            f"/api/v1/game/add-point?oid={oid}",
+            json={"team": 1 if i % 3 else 2},
+        )
+        if response["state"]["match_finished"]:
+            return
+    raise RuntimeError("the seeded match never finished")
+
+
+def _seed_archive(bench: _Bench, skey: str, count: int) -> list[str]:
+    """Clone the court's one real match *count* - 1 times, an hour apart."""
+    from app.api import archive_queue, match_archive
+
+    archive_queue.settle()
+    [original] = match_archive.list_matches(oid=skey, limit=1)
+    match = match_archive.load_match(original["match_id"])
+    if match is None:
+        raise RuntimeError("the seeded match was not archived")
+    ids = [original["match_id"]]
+    config = match["config"]
+    for i in range(1, count):
+        ended_at = float(match["ended_at"]) - 3600 * i
+        match_id = match_archive.new_match_id(skey, ended_at)
+        archived = match_archive.archive_match(
+            skey,
+            match["final_state"],
+            match["customization"],
+            started_at=ended_at - (match["duration_s"] or 3600),
+            winning_team=match["winning_team"],
+            points_limit=config["points_limit"],
+            points_limit_last_set=config["points_limit_last_set"],
+            sets_limit=config["sets_limit"],
+            match_id=match_id,
+            ended_at=ended_at,
+        )
+        if archived is None:
+            raise RuntimeError("archiving a seeded match failed")
+        ids.append(archived)
+    return ids
+
+
+async def scenario_reports(bench: _Bench) -> None:
+    from starlette.concurrency import run_in_threadpool
+
+    args = bench.args
+    oid = "archive-court"
+    await _finish_match(bench, oid)
+    ids = await run_in_threadpool(_seed_archive, bench, bench.skey(oid), args.archive_matches)
+    rec = bench.recorder
+    pages = max(1, len(ids) // 20)
+
+    async def timed_get(name: str, path: str) -> None:
+        started = time.perf_counter()
+        await bench.get(path)
+        rec.add(name, time.perf_counter() - started)
+
+    # One unrecorded pass so the first sample does not pay for cold caches.
+    await bench.get("/api/v1/matches?limit=20")
+    await bench.get(f"/match/{ids[0]}/report")
+    with rec.phase("reports.list"):
+        for i in range(args.repeats):
+            await timed_get("reports.list", f"/api/v1/matches?limit=20&offset={(i % pages) * 20}")
+    picks = [ids[bench.rng.randrange(len(ids))] for _ in range(args.repeats)]
+    with rec.phase("reports.snapshot"):
+        for match_id in picks:
+            await timed_get("reports.snapshot", f"/api/v1/matches/{match_id}")
+    with rec.phase("reports.render"):
+        for match_id in picks:
+            await timed_get("reports.render", f"/match/{match_id}/report")
+
+
+_SCENARIO_FUNCS = {
+    "courts": scenario_courts,
+    "fanout": scenario_fanout,
+    "live_stats": scenario_live_stats,
+    "reports": scenario_reports,
+}
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+async def _run(args: argparse.Namespace, root: Path) -> Recorder:
+    import httpx
+
+    from app.bootstrap import create_app
+
+    _isolate_data(root)
+    app = create_app()
+    recorder = Recorder()
+    async with app.router.lifespan_context(app):
+        await asyncio.to_thread(_create_user)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url=_BASE_URL) as client:
+            bench = _Bench(args, client, recorder)
+            login = await bench.post(
+                "/api/v1/auth/login",
+                json={"username": _USERNAME, "password": _PASSWORD},
+            )
+            bench.user_id = int(login["user"]["id"])
+            for name in args.scenario:
+                print(f"running {name} ...", file=sys.stderr)
+                await _SCENARIO_FUNCS[name](bench)
+    return recorder
+
+
+def _params(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "scenarios": list(args.scenario),
+        "courts": args.courts,
+        "actions": args.actions,
+        "fanout_actions": args.fanout_actions,
+        "subscribers": args.subscribers,
+        "audit_records": args.audit_records,
+        "archive_matches": args.archive_matches,
+        "repeats": args.repeats,
+        "seed": args.seed,
+    }
+
+
+def _print_table(results: dict[str, dict[str, float]]) -> None:
+    print(f"{'result':<24}{'count':>8}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, r in results.items():
+        print(
+            f"{name:<24}{int(r['count']):>8}{r['throughput_per_s']:>10.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}"
+        )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS,
+        help="Scenario to run; repeat for several (default: all)",
+    )
+    parser.add_argument("--courts", type=int, default=8, help="Concurrent courts (default: 8)")
+    parser.add_argument("--actions", type=int, default=200, help="Actions per court in 'courts' (default: 200)")
+    parser.add_argument("--fanout-actions", type=int, default=50, help="Actions per court in 'fanout' (default: 50)")
+    parser.add_argument("--subscribers", type=int, default=5, help="WS and OBS subscribers per court (default: 5)")
+    parser.add_argument("--audit-records", type=int, default=5000, help="Audit log length for 'live_stats' (default: 5000)")
+    parser.add_argument("--archive-matches", type=int, default=200, help="Archived matches for 'reports' (default: 200)")
+    parser.add_argument("--repeats", type=int, default=50, help="Samples per 'live_stats'/'reports' measure (default: 50)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--out", type=Path, help="Write the results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results JSON")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help=f"Allowed p99/throughput regression as a fraction (default: {DEFAULT_TOLERANCE})",
+    )
+    args = parser.parse_args(argv)
+    args.scenario = args.scenario or list(SCENARIOS)
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    logging.basicConfig(level=logging.WARNING)
+    # Migrations, templates and static files resolve from the repo root.
+    os.chdir(ROOT)
+    with tempfile.TemporaryDirectory(prefix="voc-bench-") as tmp:
+        root = Path(tmp)
+        _prepare_environment(root)
+        recorder = asyncio.run(_run(args, root))
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": _params(args),
+        "results": recorder.results(),
+    }
+    _print_table(report["results"])
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"Wrote results to {args.out}", file=sys.stderr)
+    if baseline is None:
+        return 0
+    if baseline.get("params") != report["params"]:
+        print("warning: baseline was run with different parameters", file=sys.stderr)
+    regressions = compare(report, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
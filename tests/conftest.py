@@ -121,6 +121,25 @@ def isolate_match_archive(tmp_path_factory, monkeypatch):
     monkeypatch.setattr(match_archive, "_data_dir", lambda: str(seed_dir))
 
 
+@pytest.fixture(autouse=True)
+def isolate_archive_queue(tmp_path_factory, monkeypatch):
+    """Journal queued match archives to a per-test dir, with no worker.
+
+    Without a worker, a finished match is archived when a read settles the
+    queue, on the test's own thread — a background writer would share the
+    suite's single in-memory connection with the test. Queue tests start
+    the worker explicitly.
+    """
+    from app.api import archive_queue
+
+    seed_dir = tmp_path_factory.mktemp("archive_queue")
+    monkeypatch.setattr(archive_queue, "_data_dir", lambda: str(seed_dir))
+    monkeypatch.setattr(archive_queue, "_autostart", False)
+    archive_queue.shutdown()
+    yield
+    archive_queue.shutdown()
+
+
 @pytest.fixture(autouse=True)
 def isolate_security_bootstrap(tmp_path_factory, monkeypatch):
     """Redirect the security bootstrap's data dir to a per-test temp dir.
@@ -175,6 +194,7 @@ def db_session(monkeypatch):
     from sqlalchemy import create_engine
     from sqlalchemy.pool import StaticPool
 
+    from app.auth import resolution_cache
     from app.db import Base, configure_engine, get_sessionmaker
     from app.db import migrate as db_migrate
 
@@ -186,6 +206,9 @@ def db_session(monkeypatch):
     )
     configure_engine(engine=engine)
     Base.metadata.create_all(engine)
+    # Row ids restart with every database, so a credential cached by an
+    # earlier test must not outlive it.
+    resolution_cache.clear()
     monkeypatch.setattr(db_migrate, "run_migrations", lambda: None)
 
     session = get_sessionmaker()()
@@ -202,13 +225,13 @@ def isolate_webhook_dispatcher():
     """Reset the process-wide webhook dispatcher around every test.
 
     ``app.api.webhooks.webhook_dispatcher`` is a module-level singleton
-    that caches its target list on first use and lazily owns a background
-    ``ThreadPoolExecutor``. Without a reset between tests, a case that sets
+    that caches its target list on first use and lazily starts background
+    delivery workers. Without a reset between tests, a case that sets
     ``WEBHOOKS_URL`` leaves those targets cached on the singleton, so a
     later test that merely drives a game action — which fans out through
     ``game_audit_hooks`` to the dispatcher — fires real webhook HTTP to the
     stale URL on a background thread. Those deliveries retry with backoff
-    and land, seconds later, on whichever ``requests.post`` mock or
+    and land, seconds later, on whichever ``Session.post`` mock or
     assertion happens to be active, making the suite order- and
     timing-dependent.
 
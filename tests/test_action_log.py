@@ -4,7 +4,8 @@ import os
 
 import pytest
 
-from app.api import action_log
+from app.api import _audit_index, action_log
+from app.api._audit_record import CompactRecord
 from app.api.game_service import GameService
 from app.api.session_manager import SessionManager
 
@@ -404,6 +405,223 @@ class TestParsedRecordCache:
         assert len(action_log.read_all("cache-6")) == 1
 
 
+_RESULT = {
+    "current_set": 2,
+    "score_set": 2,
+    "match_finished": False,
+    "team_1": {"sets": 1, "score": 17, "timeouts": 1},
+    "team_2": {"sets": 0, "score": 15, "timeouts": 2},
+    "serve": "A",
+}
+
+
+class TestCompactRecord:
+    """The cache holds ``CompactRecord`` objects; readers still get dicts."""
+
+    @pytest.mark.parametrize("record", [
+        {"ts": 1.5, "action": "add_point", "params": {"team": 1}, "result": _RESULT},
+        {"ts": 2.0, "action": "add_point", "params": {}, "result": {"x": [1, 2]}},
+        {"ts": 3.0, "action": "_pop", "ref_ts": 1.5},
+        {"action": "legacy", "params": None, "note": {"nested": True}},
+        # Falls back to JSON: out of int16 range, and a bool where a score goes.
+        {"ts": 4.0, "action": "add_point", "params": {"team": 2},
+         "result": {**_RESULT, "team_1": {"sets": 0, "score": 70000, "timeouts": 0}}},
+        {"ts": 5.0, "action": "add_point", "params": {"team": 2},
+         "result": {**_RESULT, "team_2": {"sets": 0, "score": True, "timeouts": 0}}},
+    ])
+    def test_round_trips_to_an_equal_dict(self, record):
+        compact = CompactRecord(record)
+        rebuilt = compact.to_dict()
+        assert rebuilt == record
+        assert json.dumps(rebuilt, sort_keys=True) == json.dumps(record, sort_keys=True)
+        for key, value in record.items():
+            assert compact.get(key) == value
+        assert compact.get("missing", "default") == "default"
+
+    def test_game_result_is_packed(self):
+        compact = CompactRecord(
+            {"ts": 1.0, "action": "add_point", "params": {}, "result": _RESULT},
+        )
+        assert compact._result is not None and compact._result.startswith(b"\x00")
+        assert compact.result == _RESULT
+
+    def test_cache_holds_compact_records_and_reads_return_dicts(self):
+        action_log.append("compact-1", "add_point", {"team": 1}, _RESULT)
+        first = action_log.read_all("compact-1")
+        [cached] = action_log._raw_cache["compact-1"][1]
+        assert isinstance(cached, CompactRecord)
+        assert first[0]["result"] == _RESULT
+
+        # Every read builds fresh dicts, so a caller mutating one cannot
+        # change what the next reader sees.
+        first[0]["params"]["team"] = 2
+        first[0]["result"]["team_1"]["score"] = 0
+        again = action_log.read_all("compact-1")
+        assert again[0]["params"] == {"team": 1}
+        assert again[0]["result"] == _RESULT
+
+    def test_warm_undo_paths_return_dicts(self):
+        action_log.append("compact-2", "add_point", {"team": 1}, _RESULT)
+        action_log.append("compact-2", "add_point", {"team": 2}, _RESULT)
+        action_log.read_all("compact-2")  # warm the cache
+        peeked = action_log.peek_last_forward("compact-2", team=1)
+        assert isinstance(peeked, dict) and peeked["params"] == {"team": 1}
+        assert action_log.count_undoable_forwards("compact-2") == 2
+        popped = action_log.pop_last_forward("compact-2", team=1)
+        assert popped == peeked
+        assert [r["params"]["team"] for r in action_log.read_all("compact-2")] == [2]
+        assert action_log.count_undoable_forwards("compact-2") == 1
+
+
+# ---------------------------------------------------------------------------
+# Segment sidecar index
+# ---------------------------------------------------------------------------
+
+
+class TestSegmentIndex:
+    """Cold-cache tail reads must come from the ``.idx`` sidecars.
+
+    After a restart (or a session eviction) the parsed-record cache is
+    empty. ``read_recent``, ``peek_last_forward``, ``pop_last_forward`` and
+    ``count_undoable_forwards`` must answer from the segment indexes
+    without re-parsing every rotated file, and always agree with a full
+    parse of the JSONL.
+    """
+
+    @pytest.fixture
+    def count_file_reads(self, monkeypatch):
+        calls = []
+        original = action_log._read_one_file_locked
+
+        def counting(path, oid):
+            calls.append(path)
+            return original(path, oid)
+
+        monkeypatch.setattr(action_log, "_read_one_file_locked", counting)
+        return calls
+
+    def _seed(self, oid: str, n: int) -> None:
+        for i in range(n):
+            action_log.append(oid, "add_point", {"team": 1 + i % 2, "i": i}, {"x": i})
+
+    def _go_cold(self, oid: str) -> None:
+        action_log._raw_cache.pop(oid, None)
+
+    def test_tombstone_actions_stay_in_sync(self):
+        assert _audit_index.POP_ACTION == action_log._POP_TOMBSTONE_ACTION
+        assert _audit_index.RESTORE_ACTION == action_log._RESTORE_TOMBSTONE_ACTION
+        assert action_log.UNDOABLE_ACTIONS.issubset(_audit_index.ACTION_CODES)
+
+    def test_cold_read_recent_does_not_parse_log(self, monkeypatch, count_file_reads):
+        monkeypatch.setattr(action_log, "AUDIT_LOG_MAX_BYTES", 300)
+        monkeypatch.setattr(action_log, "AUDIT_LOG_MAX_FILES", 10)
+        self._seed("idx-1", 30)
+        self._go_cold("idx-1")
+        recent = action_log.read_recent("idx-1", limit=3)
+        assert [r["params"]["i"] for r in recent] == [27, 28, 29]
+        assert count_file_reads == []
+        assert "idx-1" not in action_log._raw_cache
+
+    def test_cold_peek_pop_and_count_match_warm(self, count_file_reads):
+        self._seed("idx-2", 10)
+        action_log.append("idx-2", "add_point", {"team": 2, "undo": True}, {})
+        action_log.append("idx-2", "change_serve", {"team": 1}, {})
+        warm_peek = action_log.peek_last_forward("idx-2", action_log.UNDOABLE_ACTIONS, team=2)
+        warm_count = action_log.count_undoable_forwards("idx-2")
+
+        self._go_cold("idx-2")
+        count_file_reads.clear()
+        assert action_log.peek_last_forward(
+            "idx-2", action_log.UNDOABLE_ACTIONS, team=2,
+        ) == warm_peek
+        assert action_log.count_undoable_forwards("idx-2") == warm_count == 10
+        # Unfiltered peek sees the non-undoable forward the index only knows
+        # as "other action"; it has to parse that one line to confirm.
+        assert action_log.peek_last_forward("idx-2")["action"] == "change_serve"
+        assert action_log.peek_last_forward("idx-2", {"change_serve"})["action"] == "change_serve"
+        popped = action_log.pop_last_forward("idx-2", action_log.UNDOABLE_ACTIONS, team=2)
+        assert popped == warm_peek
+        assert count_file_reads == []
+
+        visible = action_log.read_all("idx-2")
+        assert popped not in visible
+        assert action_log.count_undoable_forwards("idx-2") == 9
+
+    def test_cold_reads_honour_restores(self):
+        self._seed("idx-3", 3)
+        popped = action_log.pop_last_forward("idx-3")
+        action_log.restore_popped("idx-3", popped["ts"])
+        self._go_cold("idx-3")
+        assert action_log.read_recent("idx-3", limit=1) == [popped]
+        assert action_log.count_undoable_forwards("idx-3") == 3
+
+    def test_missing_index_is_rebuilt(self):
+        self._seed("idx-4", 5)
+        path = action_log._path("idx-4")
+        os.remove(_audit_index.index_path(path))
+        self._go_cold("idx-4")
+        assert [r["params"]["i"] for r in action_log.read_recent("idx-4", 2)] == [3, 4]
+        assert os.path.getsize(_audit_index.index_path(path)) == 5 * _audit_index.ENTRY_SIZE
+
+    def test_stale_index_is_rebuilt(self):
+        """An index that no longer matches its segment (e.g. a rotation
+        interrupted between the log rename and the sidecar rename) must be
+        detected and rebuilt rather than trusted."""
+        self._seed("idx-5", 6)
+        path = action_log._path("idx-5")
+        with open(_audit_index.index_path(path), "r+b") as f:
+            f.truncate(2 * _audit_index.ENTRY_SIZE + 3)
+        stale = _audit_index.entry_for({"ts": 1.0}, 0, 10)
+        with open(_audit_index.index_path(path), "ab") as f:
+            f.write(_audit_index._ENTRY.pack(*stale))
+        self._go_cold("idx-5")
+        assert [r["params"]["i"] for r in action_log.read_recent("idx-5", 6)] == list(range(6))
+
+    def test_index_tail_catches_up_after_lost_entry(self, monkeypatch):
+        """A crash between the log write and the index write leaves the
+        index one entry short; the next cold read indexes the tail."""
+        self._seed("idx-6", 3)
+        with monkeypatch.context() as m:
+            m.setattr(_audit_index, "append_entry", lambda *a: None)
+            action_log.append("idx-6", "add_point", {"team": 1, "i": 3}, {})
+        self._go_cold("idx-6")
+        assert action_log.read_recent("idx-6", 1)[0]["params"]["i"] == 3
+        path = action_log._path("idx-6")
+        assert os.path.getsize(_audit_index.index_path(path)) == 4 * _audit_index.ENTRY_SIZE
+
+    def test_torn_tail_does_not_swallow_next_record(self):
+        self._seed("idx-7", 2)
+        path = action_log._path("idx-7")
+        with open(path, "ab") as f:
+            f.write(b'{"ts": 9')
+        action_log.append("idx-7", "add_point", {"team": 1, "i": 2}, {})
+        cold_full = action_log.read_all("idx-7")
+        self._go_cold("idx-7")
+        assert [r["params"]["i"] for r in cold_full] == [0, 1, 2]
+        assert action_log.read_recent("idx-7", 10) == cold_full
+
+    def test_rotation_moves_index_with_segment(self, monkeypatch):
+        monkeypatch.setattr(action_log, "AUDIT_LOG_MAX_BYTES", 200)
+        monkeypatch.setattr(action_log, "AUDIT_LOG_MAX_FILES", 3)
+        self._seed("idx-8", 40)
+        path = action_log._path("idx-8")
+        for segment in action_log._iter_log_paths_oldest_first(path):
+            assert os.path.exists(_audit_index.index_path(segment))
+        assert not os.path.exists(_audit_index.index_path(action_log._rotated_path(path, 3)))
+        expected = action_log.read_all("idx-8")
+        self._go_cold("idx-8")
+        assert action_log.read_recent("idx-8", 100) == expected
+
+    def test_clear_and_delete_remove_indexes(self):
+        self._seed("idx-9", 2)
+        path = action_log._path("idx-9")
+        action_log.clear("idx-9")
+        assert not os.path.exists(_audit_index.index_path(path))
+        self._seed("idx-9", 2)
+        action_log.delete("idx-9")
+        assert not os.path.exists(_audit_index.index_path(path))
+
+
 # ---------------------------------------------------------------------------
 # Cursor pagination (M13)
 # ---------------------------------------------------------------------------
@@ -178,3 +178,34 @@ def test_webhook_replay_reports_counts(db_session):
     assert body["skipped_unknown_url"] == 1
     assert body["remaining_in_dl"] == 1
     webhook_dead_letter.clear()
+
+
+def test_webhook_replay_pages_through_filtered_records(db_session, monkeypatch, tmp_path):
+    from app.api import webhook_dead_letter
+
+    monkeypatch.setattr(webhook_dead_letter, "_data_dir", lambda: str(tmp_path))
+    for event in ("set_end", "timeout", "set_end"):
+        webhook_dead_letter.append(
+            {"url": "https://no-such-target.invalid/hook", "event": event, "body": ""},
+        )
+    admin = _admin(db_session)
+
+    first = admin.post(
+        "/api/v1/admin/webhooks/replay", params={"event": "set_end", "max_records": 1},
+    ).json()
+    second = admin.post(
+        "/api/v1/admin/webhooks/replay",
+        params={"event": "set_end", "after": first["next_after"]},
+    ).json()
+    third = admin.post(
+        "/api/v1/admin/webhooks/replay",
+        params={"event": "set_end", "after": second["next_after"]},
+    ).json()
+
+    assert (first["considered"], first["next_after"]) == (1, 1)
+    assert (second["considered"], second["next_after"]) == (1, 3)
+    assert (third["considered"], third["next_after"]) == (0, 3)
+    # Unknown-URL records are not attempted: they stay in place, unchanged.
+    assert third["remaining_in_dl"] == 3
+    assert [r["seq"] for r in webhook_dead_letter.read_all()] == [1, 2, 3]
+    assert [r.get("attempts") for r in webhook_dead_letter.read_all()] == [None] * 3
@@ -71,6 +71,83 @@ class TestSessionManager:
         SessionManager.get_or_create('oid1', points_limit=21)
         assert session.points_limit == 21
 
+    def test_cold_creation_does_not_block_other_oids(
+        self, mock_conf, mock_backend, monkeypatch,
+    ):
+        from app.api import session_manager
+
+        hot = SessionManager.get_or_create('hot', mock_conf, mock_backend)
+        reading = threading.Event()
+        release = threading.Event()
+        real_load = session_manager.load_session_meta
+
+        def slow_load(oid):
+            if oid == 'cold':
+                reading.set()
+                release.wait(timeout=5)
+            return real_load(oid)
+
+        monkeypatch.setattr(session_manager, 'load_session_meta', slow_load)
+        creator = threading.Thread(
+            target=SessionManager.get_or_create,
+            args=('cold', mock_conf, mock_backend),
+        )
+        creator.start()
+        try:
+            assert reading.wait(timeout=2)
+            # The cold OID's disk read is in flight: neither a lookup of a
+            # live session nor another OID's construction waits for it.
+            assert SessionManager.get('hot') is hot
+            other = SessionManager.get_or_create('other', mock_conf, mock_backend)
+            assert other.oid == 'other'
+            assert SessionManager.get('cold') is None
+        finally:
+            release.set()
+            creator.join(timeout=5)
+        assert SessionManager.get('cold') is not None
+        assert SessionManager._creating == {}
+
+    def test_racing_creators_build_one_session(self, mock_conf, mock_backend, monkeypatch):
+        from app.api import session_manager
+
+        built = []
+        gate = threading.Barrier(4)
+        real_session = session_manager.GameSession
+
+        def counting_session(*args, **kwargs):
+            built.append(args[0])
+            return real_session(*args, **kwargs)
+
+        monkeypatch.setattr(session_manager, 'GameSession', counting_session)
+        results = []
+
+        def create():
+            gate.wait(timeout=5)
+            results.append(SessionManager.get_or_create(
+                'shared', mock_conf, mock_backend,
+            ))
+
+        threads = [threading.Thread(target=create) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert built == ['shared']
+        assert len(results) == 4 and all(r is results[0] for r in results)
+
+    def test_cleanup_evicts_only_idle_sessions(self, mock_conf, mock_backend):
+        from app.api import session_manager
+
+        idle = SessionManager.get_or_create('idle', mock_conf, mock_backend)
+        busy = SessionManager.get_or_create('busy', mock_conf, mock_backend)
+        idle.last_accessed -= session_manager.SESSION_TTL_SECONDS + 1
+        busy.touch()
+
+        assert SessionManager.cleanup_expired() == 1
+        assert SessionManager.peek('idle') is None
+        assert SessionManager.peek('busy') is busy
+
 
 # ---------------------------------------------------------------------------
 # GameService tests
@@ -5,6 +5,7 @@ actions, session-not-found errors, and WSHub broadcast across multiple
 clients. Backend HTTP dependencies are patched so no network traffic occurs.
 """
 import asyncio
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -616,6 +617,116 @@ class TestWSHubResilience:
         WSHub.clear()
 
 
+class TestWSHubPipeline:
+    """Per-OID coalescing and the bounded per-client outbox."""
+
+    def test_off_loop_burst_coalesces_to_latest_state(self):
+        """A rally of taps published from a worker thread collapses into one
+        loop callback: superseded snapshots are dropped, audit deltas keep
+        their order, and the last state frame is the newest."""
+        import asyncio as _asyncio
+        from unittest.mock import AsyncMock
+
+        from app.api.ws_hub import WSHub
+
+        WSHub.clear()
+        client = AsyncMock()
+        WSHub._connections["oid-burst"] = {client}
+
+        def burst():
+            for n in range(1, 6):
+                WSHub.broadcast_audit_sync("oid-burst", "append", n, {"n": n})
+                WSHub.broadcast_payload_json_sync(
+                    "oid-burst", json.dumps({"current_set": n}),
+                )
+
+        async def scenario():
+            WSHub.capture_event_loop()
+            await _asyncio.to_thread(burst)
+            for _ in range(50):
+                await _asyncio.sleep(0)
+
+        try:
+            _asyncio.run(scenario())
+        finally:
+            WSHub._loop = None
+            WSHub.clear()
+
+        frames = [json.loads(c.args[0]) for c in client.send_text.await_args_list]
+        states = [f for f in frames if f["type"] == "state_update"]
+        audits = [f["data"]["version"] for f in frames if f["type"] == "audit_append"]
+        assert audits == [1, 2, 3, 4, 5]
+        assert [s["data"]["current_set"] for s in states] == [5]
+        assert frames[-1]["type"] == "state_update"
+
+    def test_slow_client_only_gets_the_newest_snapshot(self):
+        """While a send is in flight, queued snapshots are replaced rather
+        than stacked, so a lagging tablet catches up in one frame."""
+        import asyncio as _asyncio
+        from unittest.mock import AsyncMock
+
+        from app.api.ws_hub import WSHub
+
+        WSHub.clear()
+        release = _asyncio.Event()
+        sent: list[dict] = []
+
+        async def _gated_send(text):
+            sent.append(json.loads(text))
+            await release.wait()
+
+        slow = AsyncMock()
+        slow.send_text.side_effect = _gated_send
+        fast = AsyncMock()
+        WSHub._connections["oid-slow"] = {slow, fast}
+
+        async def scenario():
+            release.clear()
+            first = _asyncio.create_task(WSHub.broadcast("oid-slow", {"n": 0}))
+            await _asyncio.sleep(0)
+            await _asyncio.sleep(0)
+            for n in range(1, 4):
+                WSHub._fan_out("oid-slow", ("state_update", json.dumps(
+                    {"type": "state_update", "data": {"n": n}},
+                )))
+            await _asyncio.sleep(0)
+            release.set()
+            await first
+            for _ in range(10):
+                await _asyncio.sleep(0)
+
+        try:
+            _asyncio.run(scenario())
+        finally:
+            WSHub.clear()
+
+        assert [f["data"]["n"] for f in sent] == [0, 3]
+        assert json.loads(fast.send_text.await_args.args[0])["data"]["n"] == 3
+
+    def test_outbox_overflow_sheds_oldest_delta_first(self, monkeypatch):
+        from collections import deque
+
+        from app.api import ws_hub
+
+        monkeypatch.setattr(ws_hub.WSHub, "_CLIENT_QUEUE_MAX", 4)
+        queue: deque = deque()
+        ws_hub._push_frame(queue, ("state_update", "s1"), 4)
+        for n in range(5):
+            ws_hub._push_frame(queue, (None, f"a{n}"), 4)
+        ws_hub._push_frame(queue, ("state_update", "s2"), 4)
+
+        assert list(queue) == [
+            (None, "a2"), (None, "a3"), (None, "a4"), ("state_update", "s2"),
+        ]
+
+    def test_publish_without_subscribers_schedules_nothing(self):
+        from app.api.ws_hub import WSHub
+
+        WSHub.clear()
+        WSHub.broadcast_payload_json_sync("oid-none", "{}")
+        assert WSHub._pending == {}
+
+
 # ---------------------------------------------------------------------------
 # WSHub cap + heartbeat (M14 — Fase 4)
 # ---------------------------------------------------------------------------
@@ -338,7 +338,8 @@ def _read_page_version_outside_lock(oid: str, limit: int) -> tuple:
             )
     except Exception:
         return [], None, None
-    return records[-limit:] if limit > 0 else [], None, log_version
+    page = [r.to_dict() for r in records[-limit:]] if limit > 0 else []
+    return page, None, log_version
 
 
 def _read_page_empty_fast_path_outside_lock(oid: str, limit: int) -> tuple:
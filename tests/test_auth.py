@@ -338,6 +338,129 @@ def test_deactivated_user_is_logged_out_on_next_request(client, db_session):
     assert client.get("/api/v1/auth/me").status_code == 401
 
 
+def test_cached_session_skips_the_session_lookup(db_session):
+    from sqlalchemy import update
+
+    from app.auth import sessions
+    from app.db.models.user import AuthSession
+    from tests.conftest import make_user
+
+    user = make_user(db_session, "cachu")
+    raw = sessions.create_session(db_session, user)
+    db_session.commit()
+    assert sessions.resolve_session(db_session, raw) is user
+
+    # Rewrite the row behind the cache's back: the cached resolution still
+    # answers, proving the auth_sessions lookup was skipped...
+    db_session.execute(update(AuthSession).values(token_hash="x" * 64))
+    db_session.commit()
+    assert sessions.resolve_session_user_id(db_session, raw) == user.id
+    # ...while the explicit revocation paths drop it at once.
+    sessions.revoke_session(db_session, raw)
+    assert sessions.resolve_session(db_session, raw) is None
+
+
+def test_resolution_cache_invalidation_on_revoke_and_deactivate(db_session):
+    from app.auth import service, sessions
+    from tests.conftest import make_user
+
+    user = make_user(db_session, "invu")
+    keep = sessions.create_session(db_session, user)
+    other = sessions.create_session(db_session, user)
+    db_session.commit()
+    assert sessions.resolve_session_user_id(db_session, keep) == user.id
+    assert sessions.resolve_session_user_id(db_session, other) == user.id
+
+    sessions.revoke_all_for_user(
+        db_session, user.id, except_token_hash=sessions.hash_token(keep),
+    )
+    assert sessions.resolve_session_user_id(db_session, other) is None
+    assert sessions.resolve_session_user_id(db_session, keep) == user.id
+
+    service.set_active(db_session, user, False)
+    db_session.commit()
+    assert sessions.resolve_session_user_id(db_session, keep) is None
+
+
+def test_resolution_cache_rejects_results_overtaken_by_a_revocation(monkeypatch):
+    from app.auth import resolution_cache
+
+    monkeypatch.setattr(resolution_cache, "AUTH_CACHE_TTL_SECONDS", 60.0)
+    cache: resolution_cache._ResolutionCache[str] = resolution_cache._ResolutionCache("control")
+    generation = cache.generation()
+    # A revocation lands while the lookup that read the old row is in flight.
+    cache.discard(user_id=7)
+    cache.put("k", 7, "7:liga", generation)
+    assert cache.get("k") is None
+
+    cache.put("k", 7, "7:liga", cache.generation())
+    assert cache.get("k") == (7, "7:liga")
+    monkeypatch.setattr(resolution_cache, "AUTH_CACHE_TTL_SECONDS", 0.0)
+    assert cache.get("k") is None  # disabled
+
+
+def test_password_checks_run_on_the_hashing_pool(db_session):
+    import threading
+
+    from app import password_hash
+    from app.auth import passwords
+
+    seen = []
+    real = password_hash.verify_password
+
+    def spy(provided, stored):
+        seen.append(threading.current_thread().name)
+        return real(provided, stored)
+
+    stored = password_hash.hash_password("password123", n=2)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(password_hash, "verify_password", spy)
+        assert passwords.verify_password("password123", stored) is True
+        assert passwords.verify_password("wrong", stored) is False
+    assert all(name.startswith("password-hash") for name in seen), seen
+
+
+def test_login_fails_fast_with_503_when_the_hashing_queue_is_full(
+    client, db_session, monkeypatch,
+):
+    import threading
+
+    from app import password_hash
+    from app.auth import passwords
+    from tests.conftest import make_user
+
+    make_user(db_session, "burst", password="password123")
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_QUEUE_LIMIT", 0)
+    started, release = threading.Event(), threading.Event()
+    real = password_hash.verify_password
+
+    def slow(provided, stored):
+        started.set()
+        release.wait(5)
+        return real(provided, stored)
+
+    monkeypatch.setattr(password_hash, "verify_password", slow)
+    body = {"username": "burst", "password": "password123"}
+    first = {}
+    waiter = threading.Thread(
+        target=lambda: first.update(resp=client.post("/api/v1/auth/login", json=body)),
+    )
+    waiter.start()
+    try:
+        assert started.wait(5)
+        # The only slot is taken: the next login is refused at once instead
+        # of parking another request thread behind it.
+        busy = client.post("/api/v1/auth/login", json=body)
+        assert busy.status_code == 503
+        assert busy.headers["retry-after"] == "1"
+    finally:
+        release.set()
+        waiter.join(5)
+    assert first["resp"].status_code == 200
+    assert client.post("/api/v1/auth/login", json=body).status_code == 200
+
+
 def test_session_cookie_is_httponly_and_samesite_lax(client, db_session):
     resp = _claim_admin(client, db_session)
     set_cookie = resp.headers.get("set-cookie", "")
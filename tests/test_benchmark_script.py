@@ -0,0 +1,91 @@
+"""Tests for scripts/benchmark.py: percentiles, summaries and baseline diffs.
+
+The scenarios themselves time a live app and are not run here; these cover
+the arithmetic a release decision rests on.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "benchmark.py"
+_spec = importlib.util.spec_from_file_location("voc_benchmark", _SCRIPT)
+assert _spec is not None and _spec.loader is not None
+benchmark = importlib.util.module_from_spec(_spec)
+sys.modules["voc_benchmark"] = benchmark
+_spec.loader.exec_module(benchmark)
+
+
+def _result(p99_ms: float, throughput: float) -> dict:
+    return {
+        "count": 100,
+        "throughput_per_s": throughput,
+        "p50_ms": p99_ms / 2,
+        "p99_ms": p99_ms,
+        "mean_ms": p99_ms / 2,
+        "max_ms": p99_ms,
+    }
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert benchmark.percentile(values, 50) == 50.0
+        assert benchmark.percentile(values, 99) == 99.0
+        assert benchmark.percentile(values, 100) == 100.0
+
+    def test_order_independent_and_small_samples(self):
+        assert benchmark.percentile([3.0, 1.0, 2.0], 50) == 2.0
+        assert benchmark.percentile([5.0], 99) == 5.0
+        assert benchmark.percentile([], 99) == 0.0
+
+
+def test_summarize_reports_milliseconds_and_throughput():
+    summary = benchmark.summarize([0.001, 0.002, 0.003, 0.004], wall_seconds=2.0)
+    assert summary["count"] == 4
+    assert summary["throughput_per_s"] == 2.0
+    assert summary["p50_ms"] == pytest.approx(2.0)
+    assert summary["p99_ms"] == pytest.approx(4.0)
+    assert summary["max_ms"] == pytest.approx(4.0)
+
+
+def test_recorder_uses_the_phase_wall_time():
+    recorder = benchmark.Recorder()
+    with recorder.phase("a"):
+        recorder.add("a", 0.01)
+        recorder.add("a", 0.02)
+    results = recorder.results()
+    assert results["a"]["count"] == 2
+    assert recorder.walls["a"] > 0
+    assert results["a"]["throughput_per_s"] == pytest.approx(
+        2 / recorder.walls["a"], rel=0.01,
+    )
+
+
+class TestCompare:
+    def test_within_tolerance_is_clean(self):
+        baseline = {"results": {"courts.add_point": _result(10.0, 100.0)}}
+        current = {"results": {"courts.add_point": _result(12.0, 90.0)}}
+        assert benchmark.compare(current, baseline, tolerance=0.25) == []
+
+    def test_flags_p99_growth_and_throughput_loss(self):
+        baseline = {"results": {"courts.add_point": _result(10.0, 100.0)}}
+        current = {"results": {"courts.add_point": _result(13.0, 70.0)}}
+        regressions = benchmark.compare(current, baseline, tolerance=0.25)
+        assert len(regressions) == 2
+        assert all(r.startswith("courts.add_point: ") for r in regressions)
+
+    def test_results_missing_on_either_side_are_skipped(self):
+        baseline = {"results": {"old.metric": _result(1.0, 1.0)}}
+        current = {"results": {"new.metric": _result(100.0, 0.1)}}
+        assert benchmark.compare(current, baseline) == []
+
+
+def test_parse_args_defaults_to_every_scenario():
+    args = benchmark._parse_args([])
+    assert args.scenario == list(benchmark.SCENARIOS)
+    args = benchmark._parse_args(["--scenario", "courts", "--courts", "40"])
+    assert args.scenario == ["courts"]
+    assert args.courts == 40
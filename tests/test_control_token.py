@@ -108,6 +108,23 @@ def test_regenerate_revokes_old_link(db_session):
     assert operator.get(f"/api/v1/state?c={new}").status_code == 200
 
 
+def test_cached_token_is_dropped_on_regenerate_and_delete(db_session):
+    """A control token resolved moments ago (and so cached) stops working as
+    soon as it is rotated or its overlay is deleted."""
+    owner = TestClient(create_app())
+    login_client(owner, db_session, username="owner")
+    old = _control_token(owner, "ctl-cache")
+    skey = make_skey(owner.test_user_id, "ctl-cache")
+    assert overlays_service.resolve_control_token(db_session, old) == skey
+
+    new = owner.post("/api/v1/overlays/ctl-cache/regenerate-control-token").json()["control_token"]
+    assert overlays_service.resolve_control_token(db_session, old) is None
+    assert overlays_service.resolve_control_token(db_session, new) == skey
+
+    assert owner.delete("/api/v1/overlays/ctl-cache").status_code == 200
+    assert overlays_service.resolve_control_token(db_session, new) is None
+
+
 def test_token_separates_same_oid_across_users(db_session):
     alice = TestClient(create_app())
     login_client(alice, db_session, username="alice")
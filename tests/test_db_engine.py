@@ -0,0 +1,86 @@
+"""SQLite connection profile: pragmas, the read-only pool and maintenance."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import constants
+from app.db import Base, configure_engine, get_engine, maintenance, read_session_scope, session_scope
+from app.db import engine as db_engine
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Point the app at a fresh SQLite file; the conftest engine is rebound next test."""
+
+    def configure():
+        engine = configure_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        Base.metadata.create_all(engine)
+        return engine
+
+    yield configure
+    maintenance.stop()
+    get_engine().dispose()
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_performance_profile_tunes_writer_connections(file_db):
+    file_db()
+    with get_engine().connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "busy_timeout") == constants.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(conn, "foreign_keys") == 1
+        assert _pragma(conn, "cache_size") == -constants.SQLITE_CACHE_KIB
+        assert _pragma(conn, "query_only") == 0
+
+
+def test_reads_use_a_query_only_pool(file_db):
+    file_db()
+    with session_scope() as db:
+        db.execute(text("CREATE TABLE t (x INTEGER)"))
+        db.execute(text("INSERT INTO t VALUES (1)"))
+    with read_session_scope() as db:
+        assert db.get_bind() is not get_engine()
+        assert db.execute(text("SELECT x FROM t")).scalar() == 1
+        assert _pragma(db, "query_only") == 1
+        with pytest.raises(OperationalError):
+            db.execute(text("INSERT INTO t VALUES (2)"))
+
+
+def test_compat_profile_keeps_the_rollback_journal(file_db, monkeypatch):
+    monkeypatch.setattr(constants, "SQLITE_PROFILE", "compat")
+    file_db()
+    with get_engine().connect() as conn:
+        assert _pragma(conn, "journal_mode") == "delete"
+        assert _pragma(conn, "foreign_keys") == 1
+    with read_session_scope() as db:
+        assert db.get_bind() is get_engine()
+
+
+def test_caller_built_engine_is_not_tuned(db_session):
+    # The suite's in-memory StaticPool engine: reads share it.
+    with read_session_scope() as db:
+        assert db.get_bind() is get_engine()
+    assert not db_engine.is_sqlite_file(get_engine())
+
+
+def test_maintenance_truncates_the_wal_on_stop(file_db, tmp_path, monkeypatch):
+    file_db()
+    monkeypatch.setattr(constants, "SQLITE_MAINTENANCE_SECONDS", 3600.0)
+    maintenance.start()
+    with session_scope() as db:
+        db.execute(text("CREATE TABLE t (x INTEGER)"))
+        db.execute(text("INSERT INTO t VALUES (1)"))
+    wal = tmp_path / "app.db-wal"
+    assert wal.exists() and os.path.getsize(wal) > 0
+    assert maintenance.run_once() is True
+    maintenance.stop()
+    assert os.path.getsize(wal) == 0
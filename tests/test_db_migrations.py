@@ -349,6 +349,88 @@ def test_0007_users_rebuild_keeps_rows_that_reference_users(tmp_path, monkeypatc
     assert namespace and len(namespace) == 32
 
 
+def test_audit_codec_names_match_the_app(tmp_path):
+    """0008 writes a codec tag the app must be able to decode.
+
+    Same two-literals situation as the 0004 group name: the migration cannot
+    import ``app.api._audit_codec``, so pin the duplicated names here.
+    """
+    import importlib.util
+
+    from app.api import _audit_codec
+
+    path = REPO_ROOT / "migrations" / "versions" / "0008_match_report_audit_blobs.py"
+    spec = importlib.util.spec_from_file_location("migration_0008", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.CODEC_JSON_ZLIB == _audit_codec.CODEC_JSON_ZLIB
+    assert module.CODEC_COLUMNAR_ZLIB == _audit_codec.CODEC_COLUMNAR_ZLIB
+
+
+def test_0008_moves_audit_logs_into_blobs_and_back(tmp_path, monkeypatch):
+    """Upgrade moves ``audit_log`` into ``match_report_audits``; downgrade restores it."""
+    import json
+
+    from app.api import _audit_codec
+
+    db_file = tmp_path / "audit.db"
+    url = f"sqlite:///{db_file}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    cfg = _alembic_config(url)
+    command.upgrade(cfg, "0007_user_storage_namespace")
+
+    audit = [
+        {"ts": 1.0, "action": "add_point", "params": {"team": 1},
+         "result": {"team_home": {"points": 1}}},
+        {"ts": 2.0, "action": "undo", "params": {}, "result": {}},
+    ]
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, password_hash, role, is_active, "
+            "must_change_password, storage_namespace) "
+            "VALUES (1, 'alice', 'x', 'user', 1, 0, 'ns1')"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO match_reports "
+                "(id, match_id, user_id, oid, final_state, customization, audit_log) "
+                "VALUES (1, 'match_abc_1', 1, 'oid-a', '{}', '{}', :audit)"
+            ),
+            {"audit": json.dumps(audit)},
+        )
+
+    command.upgrade(cfg, "head")
+
+    with engine.begin() as conn:
+        codec, count, payload = conn.execute(text(
+            "SELECT codec, record_count, payload FROM match_report_audits "
+            "WHERE report_id = 1"
+        )).one()
+    assert codec == _audit_codec.CODEC_JSON_ZLIB
+    assert count == 2
+    assert _audit_codec.decode(codec, payload) == audit
+
+    # Re-encode with the app's own codec so the downgrade exercises it too.
+    codec, blob = _audit_codec.encode(audit)
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE match_report_audits SET codec = :c, payload = :p"),
+            {"c": codec, "p": blob},
+        )
+
+    command.downgrade(cfg, "0007_user_storage_namespace")
+
+    with engine.begin() as conn:
+        restored = conn.execute(
+            text("SELECT audit_log FROM match_reports WHERE id = 1")
+        ).scalar()
+        tables = set(inspect(conn).get_table_names())
+    engine.dispose()
+    assert json.loads(restored) == audit
+    assert "match_report_audits" not in tables
+
+
 def test_two_users_can_share_an_oid_but_one_user_cannot(db_session):
     """``UniqueConstraint(user_id, oid)`` — same oid across users is allowed."""
     from app.db.models import User, UserOverlay
@@ -482,3 +564,127 @@ def test_0005_is_rerunnable_after_a_full_upgrade(tmp_path, monkeypatch):
 
     assert {ix["name"] for ix in inspect(engine).get_indexes("teams")} == before
     engine.dispose()
+
+
+def _load_migration(filename: str):
+    import importlib.util
+
+    path = REPO_ROOT / "migrations" / "versions" / filename
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("final_state, customization", [
+    ({}, {}),
+    ({"team_1": {"sets": 3}, "team_2": {"sets": 1}, "current_set": 4,
+      "config": {"mode": "beach"}},
+     {"Team 1 Name": "  Lions ", "Team 2 Text Name": "Tigers"}),
+    ({"team_1": {"sets": True}, "config": {"mode": 7}},
+     {"team_1_name": "Team 1", "name2": "x" * 200}),
+    ({"team_2": None, "current_set": "2"}, {"Team 1 Name": "   ", "name1": "Bears"}),
+])
+def test_0009_backfill_matches_the_archive_summary(final_state, customization):
+    """The 0009 backfill and ``archive_match`` must derive identical columns.
+
+    Two implementations again (the migration cannot import the app), so a
+    change to the name fallback on one side must fail here.
+    """
+    from app.api import match_archive
+
+    module = _load_migration("0009_match_report_summary_columns.py")
+    assert module._summary_fields(final_state, customization) == (
+        match_archive._summary_fields(final_state, customization)
+    )
+
+
+def test_0009_backfills_summary_columns_for_existing_reports(tmp_path, monkeypatch):
+    db_file = tmp_path / "summary.db"
+    url = f"sqlite:///{db_file}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    cfg = _alembic_config(url)
+    command.upgrade(cfg, "0008_match_report_audit_blobs")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, password_hash, role, is_active, "
+            "must_change_password, storage_namespace) "
+            "VALUES (1, 'alice', 'x', 'user', 1, 0, 'ns1')"
+        ))
+        conn.execute(text(
+            "INSERT INTO match_reports "
+            "(id, match_id, user_id, oid, final_state, customization) VALUES "
+            "(1, 'm1', 1, 'oid-a', "
+            "'{\"team_1\": {\"sets\": 3}, \"team_2\": {\"sets\": 2}, "
+            "\"current_set\": 5, \"config\": {\"mode\": \"indoor\"}}', "
+            "'{\"Team 1 Text Name\": \"Lions\"}')"
+        ))
+        conn.execute(text(
+            "INSERT INTO match_report_audits (report_id, codec, record_count, payload) "
+            "VALUES (1, 'json-zlib-v0', 0, x'789c8b8e0500011500b9')"
+        ))
+
+    command.upgrade(cfg, "head")
+
+    with engine.begin() as conn:
+        row = conn.execute(text(
+            "SELECT mode, team_1_name, team_2_name, team_1_sets, team_2_sets, "
+            "current_set FROM match_reports WHERE id = 1"
+        )).one()
+        audits = conn.execute(text("SELECT COUNT(*) FROM match_report_audits")).scalar()
+        index_names = {ix["name"] for ix in inspect(conn).get_indexes("match_reports")}
+    assert tuple(row) == ("indoor", "Lions", None, 3, 2, 5)
+    assert audits == 1
+    assert {"ix_match_reports_user_ended", "ix_match_reports_user_mode_ended"} <= index_names
+
+    command.downgrade(cfg, "0008_match_report_audit_blobs")
+    with engine.begin() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("match_reports")}
+        audits = conn.execute(text("SELECT COUNT(*) FROM match_report_audits")).scalar()
+    engine.dispose()
+    assert "mode" not in columns
+    # The downgrade's table rebuild must not cascade into the audit rows.
+    assert audits == 1
+
+
+def test_0010_stats_columns_round_trip_without_touching_audits(tmp_path, monkeypatch):
+    db_file = tmp_path / "stats.db"
+    url = f"sqlite:///{db_file}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    cfg = _alembic_config(url)
+    command.upgrade(cfg, "0009_match_report_summary_columns")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, password_hash, role, is_active, "
+            "must_change_password, storage_namespace) "
+            "VALUES (1, 'alice', 'x', 'user', 1, 0, 'ns1')"
+        ))
+        conn.execute(text(
+            "INSERT INTO match_reports "
+            "(id, match_id, user_id, oid, final_state, customization) "
+            "VALUES (1, 'm1', 1, 'oid-a', '{}', '{}')"
+        ))
+        conn.execute(text(
+            "INSERT INTO match_report_audits (report_id, codec, record_count, payload) "
+            "VALUES (1, 'json-zlib-v0', 0, x'789c8b8e0500011500b9')"
+        ))
+
+    command.upgrade(cfg, "0010_match_report_stats_snapshot")
+    with engine.begin() as conn:
+        # Not backfilled: the first full read recomputes the snapshot.
+        row = conn.execute(text(
+            "SELECT stats, stats_version FROM match_reports WHERE id = 1"
+        )).one()
+    assert tuple(row) == (None, None)
+
+    command.downgrade(cfg, "0009_match_report_summary_columns")
+    with engine.begin() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("match_reports")}
+        audits = conn.execute(text("SELECT COUNT(*) FROM match_report_audits")).scalar()
+    engine.dispose()
+    assert "stats" not in columns and "stats_version" not in columns
+    assert audits == 1
@@ -88,6 +88,9 @@ def test_group_listings_do_not_scale_queries_with_group_count(
     """
     client = _admin(db_session) if as_admin else _user(db_session)
     user_id = client.test_user_id
+    # Resolve the cookie once so both measured requests find it in the
+    # credential cache alike.
+    assert client.get("/api/v1/auth/me").status_code == 200
 
     _seed_groups(db_session, user_id, shared=1, private=1)
     with count_selects(db_session) as small:
@@ -100,6 +100,99 @@ def test_process_applies_exif_orientation():
     assert (processed.width, processed.height) == (60, 100)
 
 
+def _counting_transcode(monkeypatch):
+    """Run transcodes inline and count how many actually encode."""
+    monkeypatch.setattr(icons_service, "ICONS_TRANSCODE_WORKERS", 0)
+    monkeypatch.setattr(icons_service, "_cache", type(icons_service._cache)())
+    monkeypatch.setattr(icons_service, "_cache_bytes", 0)
+    calls = []
+    original = icons_service.transcode
+
+    def counting(raw, **settings):
+        calls.append(settings)
+        return original(raw, **settings)
+
+    monkeypatch.setattr(icons_service, "transcode", counting)
+    return calls
+
+
+def test_identical_source_bytes_skip_the_encode(monkeypatch):
+    calls = _counting_transcode(monkeypatch)
+    first = icons_service.process_icon_upload(png_bytes(64, 64))
+    again = icons_service.process_icon_upload(png_bytes(64, 64))
+    assert again == first and len(calls) == 1
+
+    # Different encoder settings are a different cache entry.
+    monkeypatch.setattr(icons_service, "ICONS_MAX_DIM", 32)
+    assert icons_service.process_icon_upload(png_bytes(64, 64)).width == 32
+    assert len(calls) == 2
+
+
+def test_transcode_cache_is_byte_bounded(monkeypatch):
+    calls = _counting_transcode(monkeypatch)
+    size = len(icons_service.process_icon_upload(png_bytes(color=(1, 0, 0, 255))).content)
+    monkeypatch.setattr(icons_service, "ICONS_TRANSCODE_CACHE_BYTES", size * 2)
+    icons_service.process_icon_upload(png_bytes(color=(2, 0, 0, 255)))
+    icons_service.process_icon_upload(png_bytes(color=(3, 0, 0, 255)))
+
+    assert icons_service._cache_bytes <= size * 2
+    icons_service.process_icon_upload(png_bytes(color=(1, 0, 0, 255)))
+    assert len(calls) == 4  # the oldest entry was evicted
+
+
+def test_transcode_runs_in_the_worker_pool_and_keeps_errors():
+    processed = icons_service.process_icon_upload(png_bytes(48, 40, color=(9, 9, 9, 255)))
+    assert (processed.width, processed.height) == (48, 40)
+    assert icons_service._pool is not None
+    with pytest.raises(icons_service.IconError, match="not a recognizable image"):
+        icons_service.process_icon_upload(b"still not an image")
+
+
+def test_batch_import_downloads_a_shared_logo_once(db_session, user, monkeypatch):
+    calls = _counting_transcode(monkeypatch)
+    db_session.add_all([
+        Team(name=f"Club {n}", icon_url="https://cdn.example.com/league.png",
+             owner_user_id=user.id)
+        for n in range(3)
+    ])
+    db_session.commit()
+    fetched = []
+
+    def fake_fetch(url, **kw):
+        fetched.append(url)
+        return png_bytes()
+
+    monkeypatch.setattr(icons_service, "fetch_guarded", fake_fetch)
+    teams = list(db_session.query(Team).order_by(Team.id))
+    results = icons_service.import_icons_from_teams(db_session, teams, user_id=user.id)
+
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert fetched == ["https://cdn.example.com/league.png"]
+    assert len(calls) == 1
+
+
+def test_batch_import_encodes_each_logo_once_without_the_cache(db_session, user, monkeypatch):
+    """The write step stores the prepared icon instead of re-encoding it, so
+    a large import that evicts the transcode cache costs no extra encodes."""
+    calls = _counting_transcode(monkeypatch)
+    monkeypatch.setattr(icons_service, "ICONS_TRANSCODE_CACHE_BYTES", 0)
+    db_session.add_all([
+        Team(name=f"Club {n}", icon_url=f"https://cdn.example.com/{n}.png",
+             owner_user_id=user.id)
+        for n in range(3)
+    ])
+    db_session.commit()
+    monkeypatch.setattr(
+        icons_service, "fetch_guarded",
+        lambda url, **kw: png_bytes(color=(int(url[-5]), 0, 0, 255)),
+    )
+    teams = list(db_session.query(Team).order_by(Team.id))
+    results = icons_service.import_icons_from_teams(db_session, teams, user_id=user.id)
+
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert len(calls) == 3
+
+
 # ---- create / quota / names --------------------------------------------------
 
 
@@ -194,7 +287,7 @@ def test_batch_import_isolates_unexpected_commit_errors(db_session, user, monkey
     teams = list(db_session.query(Team).order_by(Team.id))
 
     monkeypatch.setattr(icons_service, "fetch_guarded", lambda url, **kw: png_bytes())
-    original_create = icons_service.create_icon
+    original_create = icons_service._create_processed_icon
     calls = {"n": 0}
 
     def flaky_create(*args, **kwargs):
@@ -203,7 +296,7 @@ def test_batch_import_isolates_unexpected_commit_errors(db_session, user, monkey
             raise RuntimeError("simulated transient failure")
         return original_create(*args, **kwargs)
 
-    monkeypatch.setattr(icons_service, "create_icon", flaky_create)
+    monkeypatch.setattr(icons_service, "_create_processed_icon", flaky_create)
     results = icons_service.import_icons_from_teams(db_session, teams, user_id=user.id)
 
     assert [r["status"] for r in results] == ["error", "ok"]
@@ -10,7 +10,7 @@ Drives the full chain the unit suite only covers in isolation:
 Uses the ``test_overlay`` custom overlay seeded by the autouse
 ``isolate_overlay_store`` fixture, so the whole flow stays in-process —
 no overlays.uno HTTP. Webhook network I/O is captured by patching
-``requests.post``; the SSRF guard passes the example host through because
+``requests.Session.post``; the SSRF guard passes the example host through because
 DNS failures are deliberately non-blocking (see ``_is_target_safe``).
 """
 
@@ -66,9 +66,7 @@ def client(db_session):
 
 def _drain(dispatcher):
     """Wait for queued webhook deliveries before asserting on them."""
-    if dispatcher._executor is not None:
-        dispatcher._executor.shutdown(wait=True)
-        dispatcher._executor = None
+    dispatcher.drain()
 
 
 def _win_set(client, team: int, points: int = POINTS):
@@ -78,7 +76,7 @@ def _win_set(client, team: int, points: int = POINTS):
 
 
 def test_full_match_lifecycle(client, dispatcher):
-    with patch("app.api.webhooks.requests.post") as post:
+    with patch("app.api.webhooks.requests.Session.post") as post:
         post.return_value.status_code = 200
 
         # --- session bootstrap -------------------------------------------
@@ -175,7 +173,7 @@ def test_full_match_lifecycle(client, dispatcher):
 
 def test_undo_does_not_fire_webhooks(client, dispatcher):
     """Undoing a point must not emit set_end/match_end events."""
-    with patch("app.api.webhooks.requests.post") as post:
+    with patch("app.api.webhooks.requests.Session.post") as post:
         post.return_value.status_code = 200
 
         client.post("/api/v1/session/init", json={"oid": OID})
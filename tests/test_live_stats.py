@@ -429,3 +429,134 @@ class TestLastPoint:
         lp = compute_live_stats(oid)["last_point"]
         assert lp["team"] == 1
         assert lp["point_type"] is None
+
+
+class TestIncrementalAccumulator:
+    """Appends fold into the per-OID accumulator instead of re-reading.
+
+    The rebuild path and the fold-per-append path must agree on every
+    field, and the Highlights fields must keep reconciling with the
+    post-match ``_compute_stats`` the printed report uses.
+    """
+
+    @pytest.fixture
+    def count_rebuilds(self, monkeypatch):
+        from app.api import live_stats
+
+        calls = []
+        original = live_stats._compute_live_stats
+
+        def counting(oid, *, history_limit=30):
+            calls.append(oid)
+            return original(oid, history_limit=history_limit)
+
+        monkeypatch.setattr(live_stats, "_compute_live_stats", counting)
+        return calls
+
+    def test_appends_do_not_rebuild(self, count_rebuilds):
+        oid = "inc-append"
+        _add_point(oid, 1, (1, 0))
+        compute_live_stats(oid)
+        assert count_rebuilds == [oid]
+        for i in range(2, 12):
+            _add_point(oid, 1 + i % 2, (i, i - 1))
+            stats = compute_live_stats(oid)
+        assert count_rebuilds == [oid]
+        assert stats["total_points"] == 11
+
+    def test_undo_forces_rebuild(self, count_rebuilds):
+        oid = "inc-undo"
+        _add_point(oid, 1, (1, 0))
+        _add_point(oid, 1, (2, 0))
+        assert compute_live_stats(oid)["total_points"] == 2
+        action_log.pop_last_forward(oid)
+        assert compute_live_stats(oid)["total_points"] == 1
+        assert count_rebuilds == [oid, oid]
+
+    def test_version_gap_drops_accumulator(self):
+        from app.api import live_stats
+
+        oid = "inc-gap"
+        _add_point(oid, 1, (1, 0))
+        compute_live_stats(oid)
+        # A notification that skips a version means one was missed or
+        # delivered out of order; folding it would corrupt the totals.
+        acc = live_stats._ACCUMULATORS[oid]
+        live_stats._on_audit_mutation(
+            oid, action_log.EVENT_APPEND, acc.version + 2, {"action": "add_point"},
+        )
+        assert oid not in live_stats._ACCUMULATORS
+
+    def test_payloads_are_not_mutated_by_later_folds(self):
+        oid = "inc-frozen"
+        _add_point(oid, 1, (1, 0))
+        first = compute_live_stats(oid)
+        snapshot = repr(first)
+        _add_point(oid, 1, (2, 0), set_num=1)
+        action_log.append(oid, "add_timeout", {"team": 2}, {"current_set": 1, "serve": "B"})
+        compute_live_stats(oid)
+        assert repr(first) == snapshot
+
+    def test_history_beyond_retained_window(self):
+        from app.api import live_stats
+
+        oid = "inc-long-history"
+        n = live_stats._HISTORY_RETAINED + 10
+        for i in range(1, n + 1):
+            _add_point(oid, 1, (i, 0))
+        assert len(compute_live_stats(oid, history_limit=n)["points_history"]) == n
+        assert len(compute_live_stats(oid, history_limit=5)["points_history"]) == 5
+
+    def test_incremental_matches_rebuild_and_report_on_random_logs(self):
+        import random
+
+        from app.api import live_stats
+        from app.match_report.stats import _compute_stats
+
+        rng = random.Random(20260501)
+        for trial in range(25):
+            oid = f"inc-rand-{trial}"
+            scores = {1: [0, 0], 2: [0, 0]}
+            set_num = 1
+            compute_live_stats(oid)  # install the accumulator up front
+            for _ in range(rng.randint(1, 80)):
+                roll = rng.random()
+                team = rng.choice((1, 2))
+                if roll < 0.7:
+                    scores[set_num] = scores.get(set_num, [0, 0])
+                    scores[set_num][team - 1] += 1
+                    action, params = "add_point", {
+                        "team": team, "undo": False,
+                        "point_type": rng.choice((None, "ace", "opp_error")),
+                        "error_type": rng.choice((None, "net_fault")),
+                    }
+                elif roll < 0.78:
+                    action, params = "add_timeout", {"team": team, "undo": False}
+                elif roll < 0.84:
+                    action, params = "set_score", {"team": team, "set": set_num, "value": 3}
+                elif roll < 0.9:
+                    action, params = "add_point", {"team": team, "undo": True}
+                elif roll < 0.95:
+                    action, params = "change_serve", {"team": team}
+                else:
+                    set_num += 1
+                    action, params = "add_set", {"team": team, "undo": False}
+                pair = scores.get(set_num, [0, 0])
+                action_log.append(oid, action, params, {
+                    "current_set": set_num,
+                    "team_1": {"score": pair[0]},
+                    "team_2": {"score": pair[1]},
+                    "serve": rng.choice(("A", "B", "None")),
+                })
+                incremental = compute_live_stats(oid, history_limit=200)
+            live_stats.evict_cache(oid)
+            rebuilt = compute_live_stats(oid, history_limit=200)
+            assert incremental == rebuilt
+
+            report = _compute_stats(action_log.read_all(oid))
+            for key in (
+                "longest_streak", "set_win_comeback", "partial_comeback",
+                "longest_rally", "total_points", "set_durations",
+                "point_types", "error_types", "point_types_by_set",
+            ):
+                assert incremental[key] == report[key], key
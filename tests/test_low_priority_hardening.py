@@ -182,12 +182,10 @@ def test_webhook_delivery_blocks_private_ip(monkeypatch):
     )
     monkeypatch.delenv("WEBHOOKS_ALLOW_PRIVATE_IPS", raising=False)
     d = WebhookDispatcher()
-    with patch("app.api.webhooks.requests.post") as post:
+    with patch("app.api.webhooks.requests.Session.post") as post:
         post.return_value.status_code = 200
         d.dispatch("set_end", "oid", {})
-        if d._executor is not None:
-            d._executor.shutdown(wait=True)
-            d._executor = None
+        d.drain()
         post.assert_not_called()
 
 
@@ -198,12 +196,10 @@ def test_webhook_delivery_allows_private_ip_when_opted_in(monkeypatch):
     )
     monkeypatch.setenv("WEBHOOKS_ALLOW_PRIVATE_IPS", "true")
     d = WebhookDispatcher()
-    with patch("app.api.webhooks.requests.post") as post:
+    with patch("app.api.webhooks.requests.Session.post") as post:
         post.return_value.status_code = 200
         d.dispatch("set_end", "oid", {})
-        if d._executor is not None:
-            d._executor.shutdown(wait=True)
-            d._executor = None
+        d.drain()
         post.assert_called_once()
 
 
@@ -213,11 +209,9 @@ def test_webhook_blocked_emits_warning(monkeypatch, caplog):
     )
     monkeypatch.delenv("WEBHOOKS_ALLOW_PRIVATE_IPS", raising=False)
     d = WebhookDispatcher()
-    with caplog.at_level(logging.WARNING, logger="app.api.webhooks"), patch("app.api.webhooks.requests.post"):
+    with caplog.at_level(logging.WARNING, logger="app.api.webhooks"), patch("app.api.webhooks.requests.Session.post"):
         d.dispatch("set_end", "oid", {})
-        if d._executor is not None:
-            d._executor.shutdown(wait=True)
-            d._executor = None
+        d.drain()
     assert any(
         "blocked by SSRF guard" in r.getMessage()
         for r in caplog.records
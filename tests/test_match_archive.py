@@ -1,10 +1,13 @@
 """Tests for app/api/match_archive.py (DB-backed) and the archive trigger."""
+import json
+import os
 import time
+import zlib
 
 import pytest
 from sqlalchemy import event
 
-from app.api import action_log, match_archive
+from app.api import _audit_codec, action_log, match_archive
 from app.api.game_service import GameService
 from app.api.session_manager import SessionManager
 from app.overlay_key import make_skey
@@ -134,14 +137,121 @@ class TestMatchArchive:
 
         event.listen(engine, "before_cursor_execute", capture)
         try:
-            rows = match_archive.list_matches(oid=skey, limit=20)
+            rows = match_archive.list_matches(oid=skey, limit=20, mode="indoor")
         finally:
             event.remove(engine, "before_cursor_execute", capture)
 
         assert len(rows) == 1
+        assert rows[0]["team_1_name"] == "Home" and rows[0]["mode"] == "indoor"
         assert len(statements) == 1
-        selected = statements[0].lower().split(" from ", 1)[0]
-        assert "audit_log" not in selected
+        sql = statements[0].lower()
+        assert "match_report_audits" not in sql
+        # Summary columns only: no JSON blob in the projection, no JSON
+        # extraction in the filter.
+        assert "final_state" not in sql and "customization" not in sql
+        assert "json_extract" not in sql
+
+    def test_audit_is_stored_as_a_compressed_side_row(self, db_session):
+        from app.db.models import MatchReport, MatchReportAudit
+
+        _uid, skey = _user_skey(db_session, "oid-audit-blob")
+        for i in range(40):
+            action_log.append(
+                skey, "add_point", {"team": 1 + i % 2},
+                {"team_home": {"points": i, "sets": 0}, "serve": i % 2},
+            )
+        match_id = match_archive.archive_match(oid=skey, final_state={}, winning_team=1)
+        original = action_log.read_all(skey)
+
+        report = db_session.query(MatchReport).filter_by(match_id=match_id).one()
+        row = db_session.get(MatchReportAudit, report.id)
+        assert row.codec == _audit_codec.CODEC_COLUMNAR_ZLIB
+        assert row.record_count == 40
+        assert len(row.payload) < len(json.dumps(original))
+        assert match_archive.load_match(match_id)["audit_log"] == original
+
+        # A corrupt blob costs the transcript, not the report.
+        row.payload = b"not zlib"
+        db_session.commit()
+        loaded = match_archive.load_match(match_id)
+        assert loaded is not None and loaded["audit_log"] == []
+
+        # So does one that decompresses but whose columns are too short.
+        doc = json.loads(zlib.decompress(_audit_codec.encode(original)[1]))
+        doc["ts"] = doc["ts"][:5]
+        row.payload = zlib.compress(json.dumps(doc).encode("utf-8"))
+        db_session.commit()
+        loaded = match_archive.load_match(match_id)
+        assert loaded is not None and loaded["audit_log"] == []
+
+    @pytest.mark.parametrize("corrupt", [
+        {"present": [1]},
+        {"action": []},
+        {"present": ["x", "y"]},
+        {"result": [{"d": 1}, {"d": 2}]},
+        {"extra": [None]},
+    ])
+    def test_audit_codec_rejects_short_or_malformed_columns(self, corrupt):
+        records = [
+            {"ts": 1.0, "action": "a", "params": {}, "result": {"x": 1}},
+            {"ts": 2.0, "action": "b", "params": {}, "result": {"x": 2}},
+        ]
+        codec, blob = _audit_codec.encode(records)
+        doc = {**json.loads(zlib.decompress(blob)), **corrupt}
+        with pytest.raises(ValueError, match="corrupt audit blob"):
+            _audit_codec.decode(codec, zlib.compress(json.dumps(doc).encode("utf-8")))
+
+    def test_stats_snapshot_is_stored_and_recomputed_when_stale(self, db_session):
+        from app.db.models import MatchReport
+        from app.match_report.stats import STATS_SNAPSHOT_VERSION, compute_stats_snapshot
+
+        _uid, skey = _user_skey(db_session, "oid-stats")
+        for i in range(1, 4):
+            action_log.append(
+                skey, "add_point", {"team": 1},
+                {"current_set": 1, "team_1": {"score": i}, "team_2": {"score": 0}},
+            )
+        match_id = match_archive.archive_match(oid=skey, final_state={})
+        expected = compute_stats_snapshot(action_log.read_all(skey))
+
+        report = db_session.query(MatchReport).filter_by(match_id=match_id).one()
+        assert report.stats_version == STATS_SNAPSHOT_VERSION
+        loaded = match_archive.load_match(match_id)["stats"]
+        # The JSON round trip must hand back the reducers' int keys.
+        assert loaded == expected
+        assert loaded["stats"]["longest_streak"]["n"] == 3
+        assert loaded["stats"]["total_points_by_team"][1] == 3
+
+        report.stats, report.stats_version = {"stale": True}, STATS_SNAPSHOT_VERSION - 1
+        db_session.commit()
+        assert match_archive.load_match(match_id)["stats"] == expected
+        db_session.refresh(report)
+        assert report.stats_version == STATS_SNAPSHOT_VERSION
+        assert "stale" not in report.stats
+
+        # A snapshot from newer code is recomputed for this read only, never
+        # downgraded in place.
+        newer = {"from": "the future"}
+        report.stats, report.stats_version = newer, STATS_SNAPSHOT_VERSION + 1
+        db_session.commit()
+        assert match_archive.load_match(match_id)["stats"] == expected
+        db_session.refresh(report)
+        assert report.stats_version == STATS_SNAPSHOT_VERSION + 1
+        assert report.stats == newer
+
+    def test_audit_codec_round_trips_irregular_records(self):
+        records = [
+            {"ts": 1.0, "action": "a", "params": {}, "result": {"x": 1, "y": 2}},
+            {"ts": 2.0, "action": "b", "result": {"x": 1}},
+            {"ts": 3.0, "action": "c", "params": None, "result": [1, 2]},
+            {"ts": 4.0, "action": "d", "note": "extra"},
+            {"ts": 5.0, "result": {"z": None}},
+        ]
+        codec, blob = _audit_codec.encode(records)
+        assert _audit_codec.decode(codec, blob) == records
+        assert _audit_codec.decode(*_audit_codec.encode([])) == []
+        with pytest.raises(ValueError):
+            _audit_codec.decode("nope-v9", blob)
 
     def test_summary_filters_sort_and_count_run_in_database(self, db_session):
         _uid, skey = _user_skey(db_session, "oid-filtered")
@@ -555,3 +665,173 @@ class TestArchiveTrigger:
         GameService.add_set(session, team=1)
         assert session.match_finished_at is not None
         assert session.match_finished_at > first_finished
+
+
+# ---------------------------------------------------------------------------
+# Background archive queue
+# ---------------------------------------------------------------------------
+
+class TestArchiveQueue:
+    def _finish(self, session):
+        for _ in range(3):
+            GameService.add_set(session, team=1)
+
+    def _journal(self):
+        from app.api import archive_queue
+
+        return sorted(os.listdir(archive_queue._data_dir()))
+
+    def test_match_end_journals_and_reserves_the_id(
+            self, mock_conf, api_backend, db_session):
+        from app.api import archive_queue
+
+        _uid, skey = _user_skey(db_session, "queue-1")
+        session = SessionManager.get_or_create(skey, mock_conf, api_backend)
+        self._finish(session)
+
+        match_id = session.last_match_id
+        assert match_id is not None
+        assert self._journal() == [f"{match_id}.json"]
+        assert archive_queue.archive_queue.pending_count() == 1
+
+        # Any read settles the queue first and finds the reserved id.
+        assert match_archive.load_match(match_id)["winning_team"] == 1
+        assert archive_queue.archive_queue.pending_count() == 0
+        assert self._journal() == []
+
+    def test_report_excludes_audit_written_after_match_end(
+            self, mock_conf, api_backend, db_session):
+        _uid, skey = _user_skey(db_session, "queue-2")
+        session = SessionManager.get_or_create(skey, mock_conf, api_backend)
+        self._finish(session)
+        action_log.append(skey, "add_point", {"team": 2}, {"score": 1})
+
+        payload = match_archive.load_match(session.last_match_id)
+        assert [r["action"] for r in payload["audit_log"]] == ["add_set"] * 3
+
+    def test_undo_after_match_end_keeps_the_winning_record(
+            self, mock_conf, api_backend, db_session):
+        """The undo's tombstone postdates the match, so it must not apply."""
+        _uid, skey = _user_skey(db_session, "queue-2b")
+        session = SessionManager.get_or_create(skey, mock_conf, api_backend)
+        self._finish(session)
+        match_id = session.last_match_id
+        GameService.add_set(session, team=1, undo=True)
+
+        payload = match_archive.load_match(match_id)
+        assert payload["winning_team"] == 1
+        assert [
+            (r["action"], r["params"].get("undo", False))
+            for r in payload["audit_log"]
+        ] == [("add_set", False)] * 3
+
+    def test_reset_archives_before_clearing_the_log(
+            self, mock_conf, api_backend, db_session):
+        from app.api import archive_queue
+
+        _uid, skey = _user_skey(db_session, "queue-3")
+        session = SessionManager.get_or_create(skey, mock_conf, api_backend)
+        self._finish(session)
+        match_id = session.last_match_id
+        GameService.reset(session)
+
+        assert archive_queue.archive_queue.pending_count() == 0
+        assert len(match_archive.load_match(match_id)["audit_log"]) == 3
+
+    def test_recover_replays_journal_once(self, db_session):
+        from app.api import archive_queue
+
+        _uid, skey = _user_skey(db_session, "queue-4")
+        ended_at = time.time()
+        match_id = match_archive.new_match_id(skey, ended_at)
+        job = archive_queue.ArchiveJob(
+            match_id=match_id, oid=skey, ended_at=ended_at,
+            final_state={"team_1": {"sets": 3}}, customization={},
+            winning_team=1,
+        )
+        # A crash after the insert committed but before the journal entry
+        # was removed: the replay must not archive the match twice.
+        archive_queue.enqueue(job)
+        archive_queue.archive_queue.shutdown()
+        assert match_archive.archive_match(
+            skey, job.final_state, match_id=match_id, ended_at=ended_at,
+        ) == match_id
+
+        assert archive_queue.recover() == 1
+        assert archive_queue.archive_queue.run_pending() == 1
+        assert self._journal() == []
+        assert [m["match_id"] for m in match_archive.list_matches(oid=skey)] == [match_id]
+
+    def test_failed_attempts_stay_journaled(self, db_session, monkeypatch):
+        from app.api import archive_queue
+
+        _uid, skey = _user_skey(db_session, "queue-5")
+        monkeypatch.setattr(archive_queue, "MATCH_ARCHIVE_RETRY_ATTEMPTS", 0)
+        monkeypatch.setattr(match_archive, "archive_match", lambda *a, **k: None)
+        ended_at = time.time()
+        match_id = match_archive.new_match_id(skey, ended_at)
+        archive_queue.enqueue(archive_queue.ArchiveJob(
+            match_id=match_id, oid=skey, ended_at=ended_at,
+            final_state={}, customization={},
+        ))
+        archive_queue.settle()
+        assert archive_queue.archive_queue.pending_count() == 1
+        assert self._journal() == [f"{match_id}.json"]
+
+    def test_delete_for_oid_drops_pending_jobs(self, db_session):
+        from app.api import archive_queue
+
+        _uid, skey = _user_skey(db_session, "queue-6")
+        ended_at = time.time()
+        archive_queue.enqueue(archive_queue.ArchiveJob(
+            match_id=match_archive.new_match_id(skey, ended_at), oid=skey,
+            ended_at=ended_at, final_state={}, customization={},
+        ))
+        assert match_archive.delete_for_oid(skey) == 0
+        assert archive_queue.archive_queue.pending_count() == 0
+        assert self._journal() == []
+        assert match_archive.list_matches(oid=skey) == []
+
+    def test_reads_settle_only_their_own_scope(self, db_session):
+        """One user's history must not archive another user's backlog."""
+        from app.api import archive_queue
+
+        uid_a, skey_a = _user_skey(db_session, "queue-8", username="scope-a")
+        uid_b, skey_b = _user_skey(db_session, "queue-8", username="scope-b")
+        ended_at = time.time()
+        for skey in (skey_a, skey_b):
+            archive_queue.enqueue(archive_queue.ArchiveJob(
+                match_id=match_archive.new_match_id(skey, ended_at), oid=skey,
+                ended_at=ended_at, final_state={}, customization={},
+            ))
+
+        assert match_archive.count_matches(user_id=uid_a) == 1
+        assert len(match_archive.list_matches(user_id=uid_a)) == 1
+        assert len(match_archive.list_match_times(oid=skey_a)) == 1
+        assert match_archive.latest_match_id(skey_a) is not None
+        # User B's job is still waiting for the worker.
+        assert archive_queue.archive_queue.pending_count() == 1
+        assert match_archive.delete_matches_for_user(
+            uid_a, [match_archive.new_match_id(skey_a, 1.0)],
+        ) == 0
+        assert archive_queue.archive_queue.pending_count() == 1
+
+        assert match_archive.count_matches(user_id=uid_b) == 1
+        assert archive_queue.archive_queue.pending_count() == 0
+
+    def test_worker_archives_in_the_background(self, db_session, monkeypatch):
+        from app.api import archive_queue
+
+        _uid, skey = _user_skey(db_session, "queue-7")
+        monkeypatch.setattr(archive_queue, "_autostart", True)
+        ended_at = time.time()
+        archive_queue.enqueue(archive_queue.ArchiveJob(
+            match_id=match_archive.new_match_id(skey, ended_at), oid=skey,
+            ended_at=ended_at, final_state={}, customization={},
+        ))
+        deadline = time.monotonic() + 5
+        while archive_queue.archive_queue.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        archive_queue.archive_queue.shutdown()
+        assert self._journal() == []
+        assert len(match_archive.list_matches(oid=skey)) == 1
@@ -2689,3 +2689,89 @@ class TestMatchReportDarkMode:
         # Legend swatches are var-driven now.
         assert '<span class="swatch swatch-t1"></span>' in body
         assert '<span class="swatch swatch-t2"></span>' in body
+
+
+class TestMatchReportCache:
+    """Rendered bodies are cached per (match, locale, kind) and revalidated."""
+
+    @pytest.fixture(autouse=True)
+    def _count_renders(self, monkeypatch):
+        from app.match_report import cache as report_cache
+        from app.match_report import routes
+
+        report_cache.clear()
+        self.renders = []
+        real = routes._render_report_html
+
+        def counting(match_id, payload, locale):
+            self.renders.append(locale)
+            return real(match_id, payload, locale)
+
+        monkeypatch.setattr(routes, "_render_report_html", counting)
+        yield
+        report_cache.clear()
+
+    def test_repeat_reads_reuse_the_render_and_honour_etags(self, client, archived_match):
+        url = f"/match/{archived_match}/report"
+        first = client.get(url)
+        second = client.get(url)
+        assert first.text == second.text
+        assert self.renders == ["en"]
+        assert client.get(url + "?lang=es").status_code == 200
+        assert self.renders == ["en", "es"]
+
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+        revalidated = client.get(url, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+
+        csv = client.get(url + ".csv")
+        assert client.get(
+            url + ".csv", headers={"If-None-Match": csv.headers["etag"]},
+        ).status_code == 304
+
+    def test_cached_page_carries_each_readers_signed_csv_link(
+        self, client, archived_match,
+    ):
+        url = f"/match/{archived_match}/report"
+        plain = client.get(url)
+        signed = client.get(url + "?exp=123&sig=abc")
+
+        assert self.renders == ["en"]
+        assert f'href="/match/{archived_match}/report.csv"' in plain.text
+        assert (
+            f'href="/match/{archived_match}/report.csv?exp=123&amp;sig=abc"'
+            in signed.text
+        )
+        assert "\x00" not in signed.text
+        assert plain.headers["etag"] != signed.headers["etag"]
+
+    def test_deleted_match_is_not_served_from_the_cache(self, client, archived_match):
+        url = f"/match/{archived_match}/report"
+        assert client.get(url).status_code == 200
+        assert match_archive.delete_match(archived_match)
+
+        assert client.get(url).status_code == 404
+        assert client.get(url + ".csv").status_code == 404
+
+    def test_evicted_renders_spill_to_disk_and_come_back(
+        self, client, archived_match, rich_match, tmp_path, monkeypatch,
+    ):
+        from app.match_report import cache as report_cache
+
+        monkeypatch.setattr(report_cache, "MATCH_REPORT_CACHE_ENTRIES", 1)
+        monkeypatch.setattr(report_cache, "MATCH_REPORT_CACHE_DISK_ENTRIES", 5)
+        monkeypatch.setattr(report_cache, "cache_dir", lambda: str(tmp_path))
+
+        first = client.get(f"/match/{archived_match}/report").text
+        client.get(f"/match/{rich_match}/report")  # evicts the first
+        assert len(self.renders) == 2
+
+        assert client.get(f"/match/{archived_match}/report").text == first
+        assert len(self.renders) == 2
+
+        spilled = report_cache._match_dir(rich_match)
+        assert os.listdir(spilled)
+        match_archive.delete_match(rich_match)
+        assert not os.path.exists(spilled)
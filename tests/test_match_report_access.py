@@ -15,7 +15,6 @@ import pytest
 from fastapi import HTTPException, Request
 
 from app.match_report.access import _public_mode_enabled, check_read_access, cookie_user_owns
-from app.overlay_key import make_skey
 
 
 def make_request(cookie: str | None = None) -> MagicMock:
@@ -85,56 +84,43 @@ class TestCookieUserOwns:
 
         with (
             patch("app.auth.sessions.resolve_session", return_value=mock_user),
-            patch("app.api.match_archive.load_match", return_value=None),
+            patch("app.api.match_archive.owner_user_id", return_value=None),
         ):
             assert cookie_user_owns(make_request("valid-session"), "match_missing") is False
 
-    # Archived payload carries no skey at all.
-    def test_payload_without_oid_returns_false(self):
+    # Happy path: the cookie's user is the report's owner.
+    def test_owner_match_returns_true(self):
         mock_user = MagicMock()
         mock_user.id = 42
 
         with (
             patch("app.auth.sessions.resolve_session", return_value=mock_user),
-            patch("app.api.match_archive.load_match", return_value={"final_state": {}}),
+            patch("app.api.match_archive.owner_user_id", return_value=42) as owner,
         ):
-            assert cookie_user_owns(make_request("valid-session"), "match_no_oid") is False
+            assert cookie_user_owns(make_request("owner-session"), "match_owned") is True
+            owner.assert_called_once_with("match_owned")
 
-    # Archived payload carries a skey that does not parse.
-    def test_payload_with_invalid_skey_returns_false(self):
+    # The owner check must not load (and decode) the whole report.
+    def test_does_not_load_the_report(self):
         mock_user = MagicMock()
         mock_user.id = 42
 
         with (
             patch("app.auth.sessions.resolve_session", return_value=mock_user),
-            patch("app.api.match_archive.load_match", return_value={"oid": "not-a-valid-skey"}),
-        ):
-            assert cookie_user_owns(make_request("valid-session"), "match_bad_skey") is False
-
-    # Happy path: the cookie's user is the skey's owner.
-    def test_owner_match_returns_true(self):
-        user_id = 42
-        skey = make_skey(user_id, "test-oid")
-
-        mock_user = MagicMock()
-        mock_user.id = user_id
-
-        with (
-            patch("app.auth.sessions.resolve_session", return_value=mock_user),
-            patch("app.api.match_archive.load_match", return_value={"oid": skey}),
+            patch("app.api.match_archive.owner_user_id", return_value=42),
+            patch("app.api.match_archive.load_match") as load_match,
         ):
             assert cookie_user_owns(make_request("owner-session"), "match_owned") is True
+            load_match.assert_not_called()
 
     # A signed-in user who is not the owner must not read someone else's report.
     def test_non_owner_returns_false(self):
-        skey = make_skey(42, "test-oid")  # owner is 42
-
         mock_user = MagicMock()
         mock_user.id = 99  # intruder — not 42
 
         with (
             patch("app.auth.sessions.resolve_session", return_value=mock_user),
-            patch("app.api.match_archive.load_match", return_value={"oid": skey}),
+            patch("app.api.match_archive.owner_user_id", return_value=42),
         ):
             assert cookie_user_owns(make_request("intruder-session"), "match_not_mine") is False
 
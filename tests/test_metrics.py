@@ -41,6 +41,13 @@ class TestMetricsEndpoint:
         assert "voc_overlay_executor_queue_depth" in body
         assert "voc_overlay_executor_wait_seconds" in body
         assert "voc_overlay_executor_run_seconds" in body
+        assert "voc_match_report_cache_total" in body
+        assert "voc_auth_cache_total" in body
+        assert "voc_password_hash_queue_depth" in body
+        assert "voc_password_hash_run_seconds" in body
+        assert "voc_match_archive_queue_depth" in body
+        assert "voc_match_archive_run_seconds" in body
+        assert "voc_stage_duration_seconds" in body
         assert "voc_webhook_dead_letter_size" in body
         assert "voc_rate_limit_blocks_total" in body
         assert "voc_rate_limit_blocked_buckets" in body
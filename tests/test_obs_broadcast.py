@@ -6,10 +6,16 @@ unbounded fan-out, and a failing state getter must not kill the task map.
 """
 
 import asyncio
+import json
 
 import pytest
 
-from app.overlay.broadcast import ObsBroadcastHub, ObsHubFull
+from app.overlay.broadcast import (
+    PATCH_PROTOCOL,
+    ObsBroadcastHub,
+    ObsHubFull,
+    json_diff,
+)
 
 
 class FakeWS:
@@ -92,3 +98,90 @@ async def test_superseded_broadcast_only_sends_once():
 
     assert ws.sent == ['{"n": 2}']
     assert "ov1" not in hub._broadcast_tasks
+
+
+# ---------------------------------------------------------------------------
+# Opt-in patch protocol
+# ---------------------------------------------------------------------------
+
+
+def test_json_diff_emits_minimal_ops():
+    old = {"team_1": {"score": 3, "name": "A"}, "gone": 1, "sets": [1, 2]}
+    new = {"team_1": {"score": 4, "name": "A"}, "sets": [1, 2, 3], "a/b": True}
+
+    assert json_diff(old, new) == [
+        {"op": "replace", "path": "/team_1/score", "value": 4},
+        {"op": "remove", "path": "/gone"},
+        {"op": "replace", "path": "/sets", "value": [1, 2, 3]},
+        {"op": "add", "path": "/a~1b", "value": True},
+    ]
+    assert json_diff(new, new) == []
+    # ``1 == True`` in Python, but the client would render them differently.
+    assert json_diff({"x": 1}, {"x": True}) == [
+        {"op": "replace", "path": "/x", "value": True},
+    ]
+
+
+async def test_patch_client_gets_snapshot_then_diffs():
+    hub = ObsBroadcastHub()
+    ws = FakeWS()
+    hub.add_client("ov1", ws, protocol=PATCH_PROTOCOL)
+
+    snapshot = json.loads(hub.snapshot_message("ov1", ws, {"score": 1, "name": "A"}))
+    assert snapshot == {"type": "snapshot", "rev": 1, "state": {"score": 1, "name": "A"}}
+
+    await hub.broadcast_now("ov1", {"score": 2, "name": "A"})
+    await hub.broadcast_now("ov1", {"score": 2, "name": "A"})  # no change → no frame
+
+    assert [json.loads(m) for m in ws.sent] == [
+        {
+            "type": "patch", "rev": 2, "base": 1,
+            "ops": [{"op": "replace", "path": "/score", "value": 2}],
+        },
+    ]
+
+
+async def test_legacy_and_patch_clients_share_one_hub():
+    hub = ObsBroadcastHub()
+    legacy, patched = FakeWS(), FakeWS()
+    hub.add_client("ov1", legacy)
+    hub.add_client("ov1", patched, protocol=PATCH_PROTOCOL)
+    hub.snapshot_message("ov1", patched, {"score": 1})
+
+    await hub.broadcast_now("ov1", {"score": 2})
+
+    assert legacy.sent == ['{"score": 2}']
+    assert json.loads(patched.sent[0])["type"] == "patch"
+
+
+async def test_client_behind_the_baseline_gets_a_snapshot(monkeypatch):
+    """A patch client that missed a revision (here: its send timed out while
+    a second, faster client kept up) is caught up with a snapshot rather
+    than a patch against state it never saw."""
+    hub = ObsBroadcastHub()
+    current, behind = FakeWS(), FakeWS()
+    hub.add_client("ov1", current, protocol=PATCH_PROTOCOL)
+    hub.add_client("ov1", behind, protocol=PATCH_PROTOCOL)
+    hub.snapshot_message("ov1", current, {"score": 1})
+    hub.snapshot_message("ov1", behind, {"score": 1})
+    await hub.broadcast_now("ov1", {"score": 2})
+    hub._revisions[behind] = 1  # simulate the lost rev-2 frame
+
+    await hub.broadcast_now("ov1", {"score": 3})
+
+    assert json.loads(current.sent[-1])["base"] == 2
+    assert json.loads(behind.sent[-1]) == {
+        "type": "snapshot", "rev": 3, "state": {"score": 3},
+    }
+
+
+async def test_baseline_dropped_when_last_patch_client_leaves():
+    hub = ObsBroadcastHub()
+    ws = FakeWS()
+    hub.add_client("ov1", ws, protocol=PATCH_PROTOCOL)
+    hub.snapshot_message("ov1", ws, {"score": 1})
+
+    hub.remove_client("ov1", ws)
+
+    assert hub._baselines == {}
+    assert hub._revisions == {}
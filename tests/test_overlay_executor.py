@@ -221,6 +221,65 @@ def test_run_after_pending_is_a_keyed_cleanup_barrier() -> None:
     assert events == ["push", "delete"]
 
 
+def _blocked_executor(
+    key: str,
+) -> tuple[OverlayTaskExecutor, threading.Event]:
+    """One-worker executor whose only worker is held by a task on *key*."""
+    executor = OverlayTaskExecutor(max_workers=1, max_queue=8)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        started.set()
+        assert release.wait(timeout=2)
+
+    executor.submit(key, hold)
+    assert started.wait(timeout=2)
+    return executor, release
+
+
+def test_submit_latest_replaces_a_queued_push_and_settles_both() -> None:
+    executor, release = _blocked_executor("1:court")
+    ran: list[int] = []
+
+    older = executor.submit_latest("1:court", "model", ran.append, 1)
+    newer = executor.submit_latest("1:court", "model", ran.append, 2)
+    release.set()
+
+    assert newer.result(timeout=2) is None
+    assert older.result(timeout=2) is None
+    executor.shutdown()
+    assert ran == [2]
+
+
+def test_plain_work_is_a_barrier_for_coalescing_and_priority() -> None:
+    executor, release = _blocked_executor("1:court")
+    ran: list[str] = []
+
+    executor.submit_latest("1:court", "customization", ran.append, "custom-1")
+    executor.submit("1:court", ran.append, "barrier")
+    executor.submit_latest("1:court", "customization", ran.append, "custom-2")
+    executor.submit_latest("1:court", "model", ran.append, "model", priority=True)
+    release.set()
+    executor.shutdown()
+
+    # Nothing merges or overtakes across the plain task; after it the score
+    # push jumps the queued customization re-render.
+    assert ran == ["custom-1", "barrier", "model", "custom-2"]
+
+
+def test_priority_push_key_is_dispatched_before_ordinary_keys() -> None:
+    executor, release = _blocked_executor("1:other")
+    ran: list[str] = []
+
+    executor.submit("1:idle", ran.append, "ordinary")
+    executor.submit_latest("1:score", "model", ran.append, "score", priority=True)
+    release.set()
+    executor.shutdown()
+
+    assert ran == ["score", "ordinary"]
+
+
 def test_shutdown_backend_ignores_late_state_writes() -> None:
     from app.overlay import overlay_state_store
     from app.state import State
@@ -14,6 +14,8 @@ Pins:
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import urllib.parse
 
 import pytest
@@ -584,6 +586,89 @@ def test_websocket_scope_is_passed_through(monkeypatch):
     assert seen == ["websocket"]
 
 
+def test_sliding_window_counter_weights_the_previous_window():
+    """Buckets hold two counts, not timestamps; the previous window's count
+    fades out linearly as the sliding window moves past it."""
+    counts = auth_rate_limit._EMPTY
+    for t in (10.0, 20.0, 30.0, 40.0):
+        counts = auth_rate_limit._with_failure(counts, t, 60.0, 100, 60.0)
+    assert counts == (0.0, 0, 4, 0.0)
+    # A quarter into the next window, three quarters of it still overlap.
+    assert auth_rate_limit._estimate(
+        auth_rate_limit._advance(counts, 75.0, 60.0), 75.0, 60.0,
+    ) == 3
+    # Two windows later nothing is left.
+    assert auth_rate_limit._advance(counts, 130.0, 60.0)[1:3] == (0, 0)
+
+
+def test_sqlite_store_shares_buckets_across_workers(monkeypatch, tmp_path):
+    """Two store instances on one file behave like two uvicorn workers: the
+    failures add up and a block set by one is enforced by the other."""
+    path = str(tmp_path / "limits.sqlite3")
+    worker_a = auth_rate_limit._SQLiteStore(path)
+    worker_b = auth_rate_limit._SQLiteStore(path)
+    try:
+        key = ("api", "203.0.113.9")
+        opts = {"window": 60.0, "max_failures": 4, "block": 30.0}
+        for store in (worker_a, worker_b, worker_a):
+            store.record_failure(key, **opts)
+        assert not worker_b.is_blocked(key)
+        worker_b.record_failure(key, **opts)
+        assert worker_a.is_blocked(key)
+        assert worker_a.blocked_counts() == {"api": 1}
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_middleware_uses_the_configured_sqlite_store(monkeypatch, tmp_path):
+    monkeypatch.setenv("AUTH_RATE_LIMIT_STORE", "sqlite")
+    monkeypatch.setenv("AUTH_RATE_LIMIT_STORE_PATH", str(tmp_path / "limits.sqlite3"))
+    monkeypatch.setenv("AUTH_RATE_LIMIT_MAX_FAILURES", "2")
+    auth_rate_limit._reset_for_tests()
+
+    client = _limiter_app({"/api/v1/thing": 401})
+    assert client.get("/api/v1/thing").status_code == 401
+    assert client.get("/api/v1/thing").status_code == 401
+    assert client.get("/api/v1/thing").status_code == 429
+    assert isinstance(auth_rate_limit._store(), auth_rate_limit._SQLiteStore)
+    assert auth_rate_limit.blocked_bucket_counts() == {"api": 1, "capability": 0}
+
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "memory"])
+def test_sqlite_store_calls_run_off_the_event_loop(monkeypatch, tmp_path, kind):
+    """SQLite lookups and commits block, so they go to the threadpool; the
+    in-memory store is a dict lookup and stays on the loop thread."""
+    monkeypatch.setenv("AUTH_RATE_LIMIT_STORE", kind)
+    monkeypatch.setenv("AUTH_RATE_LIMIT_STORE_PATH", str(tmp_path / "limits.sqlite3"))
+    auth_rate_limit._reset_for_tests()
+    store = auth_rate_limit._store()
+    threads: list[int] = []
+
+    def spy(method):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return method(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(store, "is_blocked", spy(store.is_blocked))
+    monkeypatch.setattr(store, "record_failure", spy(store.record_failure))
+
+    async def exercise() -> int:
+        key = ("api", "198.51.100.7")
+        await auth_rate_limit._record_outcome(key, 401, frozenset({401}))
+        await auth_rate_limit._is_blocked(key)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(exercise())
+    assert len(threads) == 2
+    if kind == "sqlite":
+        assert loop_thread not in threads
+    else:
+        assert threads == [loop_thread, loop_thread]
+    auth_rate_limit._reset_for_tests()
+
 # ---------------------------------------------------------------------------
 # Logo URL allow-list
 # ---------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+"""Tests for app/spans.py: stage histograms and the sampled action breakdown."""
+
+import contextvars
+import logging
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import spans
+from app.bootstrap import create_app
+from app.logging_context import ContextFilter
+from app.metrics import REGISTRY
+from app.state import State
+from tests.conftest import load_fixture, login_client
+
+_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+def _count(stage: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "voc_stage_duration_seconds_count", {"stage": stage},
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def sample_all(monkeypatch):
+    monkeypatch.setattr(spans, "SPAN_LOG_SAMPLE_RATE", 1.0)
+
+
+def _breakdown_lines(caplog) -> list[str]:
+    return [
+        r.getMessage() for r in caplog.records
+        if r.name == "app.spans" and r.getMessage().startswith("game action")
+    ]
+
+
+class TestSpan:
+    def test_records_stage_histogram(self):
+        before = _count(spans.STAGE_GET_STATE)
+        with spans.span(spans.STAGE_GET_STATE):
+            pass
+        assert _count(spans.STAGE_GET_STATE) == before + 1
+
+    def test_records_even_when_the_block_raises(self):
+        before = _count(spans.STAGE_PERSIST_META)
+        with pytest.raises(RuntimeError), spans.span(spans.STAGE_PERSIST_META):
+            raise RuntimeError("boom")
+        assert _count(spans.STAGE_PERSIST_META) == before + 1
+
+    def test_timed_decorator_preserves_the_function(self):
+        @spans.timed(spans.STAGE_LIVE_STATS)
+        def add(a: int, b: int) -> int:
+            """Adds."""
+            return a + b
+
+        before = _count(spans.STAGE_LIVE_STATS)
+        assert add(2, 3) == 5
+        assert add.__doc__ == "Adds."
+        assert _count(spans.STAGE_LIVE_STATS) == before + 1
+
+
+class TestRequestBreakdown:
+    def test_not_sampled_logs_nothing(self, caplog, monkeypatch):
+        monkeypatch.setattr(spans, "SPAN_LOG_SAMPLE_RATE", 0.0)
+        before = _count(spans.STAGE_ACTION)
+        with (
+            caplog.at_level(logging.INFO, logger="app.spans"),
+            spans.request_breakdown("add_point"),
+            spans.span(spans.STAGE_AUDIT_APPEND),
+        ):
+            pass
+        assert _breakdown_lines(caplog) == []
+        # The action histogram is recorded whether or not it was sampled.
+        assert _count(spans.STAGE_ACTION) == before + 1
+
+    def test_sampled_collects_spans_from_a_worker_thread(self, caplog, sample_all):
+        def work() -> None:
+            for _ in range(2):
+                with spans.span(spans.STAGE_GET_STATE):
+                    pass
+            with spans.span(spans.STAGE_WS_BROADCAST):
+                pass
+
+        with (
+            caplog.at_level(logging.INFO, logger="app.spans"),
+            spans.request_breakdown("add_point"),
+        ):
+            # Same hand-off as ``run_in_threadpool``: a copied context.
+            ctx = contextvars.copy_context()
+            worker = threading.Thread(target=ctx.run, args=(work,))
+            worker.start()
+            worker.join()
+
+        [line] = _breakdown_lines(caplog)
+        assert line.startswith("game action add_point took ")
+        assert "get_state=" in line and " x2" in line
+        assert "ws_broadcast=" in line
+        # The breakdown does not leak past the action.
+        assert spans._breakdown_var.get() is None
+
+
+@pytest.mark.usefixtures("clean_sessions")
+class TestGameRouteBreakdown:
+    @pytest.fixture
+    def client(self, db_session):
+        fake = MagicMock()
+        fake.validate_and_store_model_for_oid.return_value = State.OIDStatus.VALID
+        fake.fetch_output_token.return_value = None
+        fake.get_current_model.return_value = load_fixture("base_model")
+        fake.get_current_customization.return_value = load_fixture("base_customization")
+        fake.is_visible.return_value = True
+        fake.is_custom_overlay.return_value = False
+        with (
+            patch("app.api.routes.session.Backend", return_value=fake),
+            TestClient(create_app()) as c,
+        ):
+            login_client(c, db_session)
+            yield c
+
+    def test_add_point_logs_stages_with_the_trace_id(self, client, caplog, sample_all):
+        client.post("/api/v1/session/init", json={"oid": "abc"})
+        caplog.handler.addFilter(ContextFilter())
+        with caplog.at_level(logging.INFO, logger="app.spans"):
+            r = client.post(
+                "/api/v1/game/add-point?oid=abc",
+                json={"team": 1},
+                headers={"traceparent": f"00-{_TRACE_ID}-00f067aa0ba902b7-01"},
+            )
+        assert r.status_code == 200
+        [record] = [
+            rec for rec in caplog.records
+            if rec.name == "app.spans" and rec.getMessage().startswith("game action")
+        ]
+        message = record.getMessage()
+        assert message.startswith("game action add_point took ")
+        for stage in (
+            spans.STAGE_AUDIT_APPEND,
+            spans.STAGE_GET_STATE,
+            spans.STAGE_LIVE_STATS,
+            spans.STAGE_PERSIST_META,
+            spans.STAGE_WS_BROADCAST,
+        ):
+            assert f"{stage}=" in message
+        assert record.trace_id == _TRACE_ID
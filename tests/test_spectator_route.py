@@ -115,3 +115,69 @@ def test_spectator_template_not_in_style_picker(tmp_path):
     assert "_spectator" not in styles
     renderable = store.get_renderable_styles()
     assert "_spectator" not in renderable
+
+
+# ---------------------------------------------------------------------------
+# Page caching and versioned assets
+# ---------------------------------------------------------------------------
+
+
+def test_overlay_page_links_content_versioned_assets(client):
+    from app.overlay.assets import static_assets
+
+    cli, _, token, _ = client
+    res = cli.get(f"/follow/{token}")
+    digest = static_assets.version("js/spectator.js")
+    assert digest
+    assert f"/static/js/spectator.js?v={digest}" in res.text
+
+
+def test_overlay_page_revalidates_with_etag(client):
+    cli, store, token, skey = client
+    first = cli.get(f"/overlay/{token}")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    assert token in first.text
+
+    again = cli.get(f"/overlay/{token}", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # A customization change that alters the page changes the validator.
+    store.set_raw_config(skey, customization={"locale": "es"})
+    changed = cli.get(f"/overlay/{token}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_compiled_page_is_shared_across_overlays(client, db_session):
+    from app import overlays_service
+
+    cli, store, token, _ = client
+    user = make_user(db_session, "other")
+    other = overlays_service.create_overlay(db_session, user.id, "otherovl")
+    db_session.commit()
+    store.create_overlay(overlays_service.skey_for(other))
+
+    mine = cli.get(f"/overlay/{token}").text
+    theirs = cli.get(f"/overlay/{other.public_token}").text
+    assert other.public_token in theirs and token not in theirs
+    assert theirs.replace(other.public_token, token) == mine
+
+
+def test_static_files_immutable_only_for_current_digest(tmp_path):
+    from app.overlay.assets import StaticAssets
+    from app.static_files import IMMUTABLE_CACHE_CONTROL, VersionedStaticFiles
+
+    (tmp_path / "app.js").write_text("console.log(1)")
+    assets = StaticAssets(tmp_path)
+    app = FastAPI()
+    app.mount("/static", VersionedStaticFiles(directory=str(tmp_path), assets=assets))
+    cli = TestClient(app)
+
+    url = assets.url("app.js")
+    assert url.startswith("/static/app.js?v=")
+    assert cli.get(url).headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert cli.get("/static/app.js?v=stale").headers["cache-control"] == "no-cache"
+    assert cli.get("/static/app.js").headers["cache-control"] == "no-cache"
@@ -0,0 +1,103 @@
+"""Copy-on-write state snapshots returned by ``OverlayStateStore.get_state``."""
+
+import copy
+import json
+import pickle
+import threading
+
+import pytest
+
+# Keep the established import order used by the state-store test modules.
+from app.api import action_log  # noqa: F401
+from app.overlay.state_store import FrozenDict, FrozenList, OverlayStateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = OverlayStateStore(
+        data_dir=str(tmp_path / "data"),
+        templates_dir=str(tmp_path / "tpl"),
+    )
+    assert s.create_overlay("snap") is True
+    return s
+
+
+def test_snapshot_is_read_only_and_deepcopy_thaws_it(store):
+    state = store.get_state("snap")
+
+    assert isinstance(state, FrozenDict)
+    with pytest.raises(TypeError):
+        state["team_home"]["points"] = 99
+    with pytest.raises(TypeError):
+        state.setdefault("extra", {})
+
+    editable = copy.deepcopy(state)
+    assert type(editable) is dict
+    assert type(editable["team_home"]) is dict
+    editable["team_home"]["points"] = 99
+    assert store.get_state("snap")["team_home"]["points"] == 0
+
+
+def test_mutation_publishes_a_new_snapshot_sharing_unchanged_subtrees(store):
+    before = store.get_state("snap")
+    rev_before = store.get_state_revision("snap")
+
+    store.update_state_sync("snap", {"team_home": {"points": 3}})
+    after = store.get_state("snap")
+
+    assert before["team_home"]["points"] == 0
+    assert after["team_home"]["points"] == 3
+    assert after["team_away"] is before["team_away"]
+    assert after["match_info"] is before["match_info"]
+    assert after["team_home"] is not before["team_home"]
+    assert store.get_state_revision("snap") == rev_before + 1
+
+
+def test_no_op_mutation_keeps_the_revision_and_snapshot(store):
+    store.set_visibility("snap", True)
+    state = store.get_state("snap")
+    revision = store.get_state_revision("snap")
+
+    store.set_visibility("snap", True)
+
+    assert store.get_state("snap") is state
+    assert store.get_state_revision("snap") == revision
+
+
+def test_snapshot_serializes_like_plain_state(store):
+    store.update_state_sync("snap", {"overlay_control": {"stats": {"points_history": [1, 2]}}})
+    state = store.get_state("snap")
+    history = state["overlay_control"]["stats"]["points_history"]
+
+    assert isinstance(history, FrozenList)
+    assert history == [1, 2]
+    assert json.loads(json.dumps(state)) == copy.deepcopy(state)
+    assert type(pickle.loads(pickle.dumps(state))) is dict
+    # The persisted file carries the same data plus the id stamp.
+    assert store.load_persisted_state("snap")["overlay_control"]["stats"][
+        "points_history"
+    ] == [1, 2]
+
+
+def test_get_state_does_not_wait_on_the_store_lock(store):
+    store.get_state("snap")  # load the context
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with store._lock:
+            holding.set()
+            release.wait(timeout=5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    try:
+        assert holding.wait(timeout=2)
+        result: list = []
+        reader = threading.Thread(target=lambda: result.append(store.get_state("snap")))
+        reader.start()
+        reader.join(timeout=1)
+        assert result, "get_state blocked behind self._lock"
+    finally:
+        release.set()
+        holder.join(timeout=5)
@@ -0,0 +1,131 @@
+"""Write-behind persistence mode of ``OverlayStateStore``."""
+
+import threading
+import time
+
+import pytest
+
+# Keep the established import order used by the state-store test modules.
+from app.api import action_log  # noqa: F401
+from app.overlay.state_store import OverlayStateStore
+
+
+def _store(tmp_path, window):
+    return OverlayStateStore(
+        data_dir=str(tmp_path / "data"),
+        templates_dir=str(tmp_path / "tpl"),
+        write_behind_seconds=window,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    # A window far longer than any test: only explicit flushes write.
+    s = _store(tmp_path, 3600)
+    yield s
+    s.close()
+
+
+def _count_writes(store, monkeypatch):
+    writes: list[dict] = []
+    real = store._write_state_durable
+
+    def counting(path, state):
+        writes.append(state)
+        real(path, state)
+
+    monkeypatch.setattr(store, "_write_state_durable", counting)
+    return writes
+
+
+def test_mutations_are_visible_immediately_but_written_once(store, monkeypatch):
+    oid = "wb-coalesce"
+    assert store.create_overlay(oid) is True
+    writes = _count_writes(store, monkeypatch)
+
+    for points in range(1, 6):
+        store.update_state_sync(oid, {"team_home": {"points": points}})
+    store.set_visibility(oid, False)
+
+    assert store.get_state(oid)["team_home"]["points"] == 5
+    assert store.load_persisted_state(oid)["team_home"]["points"] == 0
+    assert writes == []
+
+    store.flush()
+
+    assert len(writes) == 1
+    persisted = store.load_persisted_state(oid)
+    assert persisted["team_home"]["points"] == 5
+    assert persisted["overlay_control"]["show_main_scoreboard"] is False
+    assert persisted["_meta"]["overlay_id"] == oid
+
+
+def test_background_writer_persists_after_the_window(tmp_path):
+    store = _store(tmp_path, 0.05)
+    oid = "wb-background"
+    try:
+        assert store.create_overlay(oid) is True
+        store.update_state_sync(oid, {"team_away": {"points": 7}})
+
+        deadline = time.monotonic() + 3
+        while time.monotonic() < deadline:
+            if store.load_persisted_state(oid)["team_away"]["points"] == 7:
+                break
+            time.sleep(0.02)
+        assert store.load_persisted_state(oid)["team_away"]["points"] == 7
+        assert store._dirty == {}
+    finally:
+        store.close()
+
+
+def test_delete_discards_the_pending_write(store):
+    oid = "wb-delete"
+    assert store.create_overlay(oid) is True
+    store.update_state_sync(oid, {"team_home": {"points": 3}})
+
+    assert store.delete_overlay(oid) is True
+    store.flush()
+
+    assert not store.overlay_exists(oid)
+
+
+def test_copy_reads_the_source_pending_changes(store):
+    assert store.create_overlay("wb-src") is True
+    store.update_state_sync("wb-src", {"team_home": {"points": 9}})
+
+    assert store.copy_overlay("wb-src", "wb-dst") is True
+
+    assert store.load_persisted_state("wb-dst")["team_home"]["points"] == 9
+
+
+def test_close_flushes_and_a_later_mutation_restarts_the_writer(store):
+    oid = "wb-close"
+    assert store.create_overlay(oid) is True
+    store.update_state_sync(oid, {"team_home": {"points": 2}})
+    first_writer = store._writer
+
+    store.close()
+
+    assert store.load_persisted_state(oid)["team_home"]["points"] == 2
+    assert store._writer is None
+    first_writer.join(timeout=2)
+    assert not first_writer.is_alive()
+
+    store.update_state_sync(oid, {"team_home": {"points": 4}})
+    assert isinstance(store._writer, threading.Thread)
+    assert store._writer.is_alive()
+    store.close()
+    assert store.load_persisted_state(oid)["team_home"]["points"] == 4
+
+
+def test_synchronous_mode_is_the_default(tmp_path):
+    store = OverlayStateStore(
+        data_dir=str(tmp_path / "data"),
+        templates_dir=str(tmp_path / "tpl"),
+    )
+    assert store.create_overlay("wb-off") is True
+
+    store.update_state_sync("wb-off", {"team_home": {"points": 1}})
+
+    assert store.load_persisted_state("wb-off")["team_home"]["points"] == 1
+    assert store._writer is None
@@ -0,0 +1,77 @@
+"""Startup warm-up (``app/api/warmup.py``) and its readiness signal."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.api import action_log, warmup
+from app.overlay import overlay_state_store
+
+
+@pytest.fixture(autouse=True)
+def reset_warmup():
+    # Age the conftest-seeded overlay out of the way of the ranking.
+    os.utime(overlay_state_store.get_state_file_path("test_overlay"), (1, 1))
+    yield
+    warmup._set_result({"state": "disabled"})
+
+
+def _seed(oid, mtime):
+    overlay_state_store.create_overlay(oid)
+    os.utime(overlay_state_store.get_state_file_path(oid), (mtime, mtime))
+
+
+def test_recent_overlay_ids_ranks_by_last_write():
+    _seed("court_old", 1_000)
+    _seed("court_new", 3_000)
+    _seed("court_mid", 2_000)
+
+    assert overlay_state_store.recent_overlay_ids(2) == ["court_new", "court_mid"]
+    assert overlay_state_store.recent_overlay_ids(0) == []
+
+
+@pytest.mark.asyncio
+async def test_run_warmup_loads_caches_then_reports_ready():
+    _seed("court_a", 2_000)
+    _seed("court_b", 1_000)
+    action_log.append("court_a", "add_point", {"team": 1}, {"score": 1})
+    action_log._raw_cache.clear()
+    overlay_state_store._overlays.clear()
+
+    warmed = await warmup.run_warmup(limit=2, workers=2, timeout=5)
+
+    assert warmed == 2
+    assert {"court_a", "court_b"} <= set(overlay_state_store._overlays)
+    assert "court_a" in action_log._raw_cache
+    ready, detail = warmup.readiness()
+    assert ready and detail["state"] == "done" and detail["overlays"] == 2
+
+
+@pytest.mark.asyncio
+async def test_not_ready_while_running_and_timeout_still_releases(monkeypatch):
+    _seed("court_slow", 1_000)
+    release = threading.Event()
+    monkeypatch.setattr(warmup, "warm_overlay", lambda oid: release.wait(timeout=5))
+
+    task = asyncio.create_task(warmup.run_warmup(limit=1, workers=1, timeout=0.2))
+    await asyncio.sleep(0.05)
+    assert warmup.readiness() == (False, {"state": "running"})
+
+    assert await task == 0
+    release.set()
+    ready, detail = warmup.readiness()
+    assert ready and detail["state"] == "timed_out"
+
+
+def test_readiness_probe_is_503_while_warming(app_client):
+    warmup.mark_pending()
+    res = app_client.get("/health/ready")
+    assert res.status_code == 503
+    assert res.json()["reasons"]["warmup_complete"] == "warming_up"
+
+    warmup._set_result({"state": "done", "overlays": 0, "seconds": 0.0})
+    res = app_client.get("/health/ready")
+    assert res.status_code == 200
+    assert res.json()["checks"]["warmup_complete"] is True
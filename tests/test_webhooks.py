@@ -1,6 +1,8 @@
 """Tests for app/api/webhooks.py and the GameService firing path."""
 import json
+import os
 import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -125,7 +127,7 @@ class TestDispatch:
     def test_unknown_event_is_ignored(self, monkeypatch):
         monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
         d = WebhookDispatcher()
-        with patch("app.api.webhooks.requests.post") as post:
+        with patch("app.api.webhooks.requests.Session.post") as post:
             assert d.dispatch("not_an_event", "oid", {}) == 0
             post.assert_not_called()
 
@@ -138,15 +140,13 @@ class TestDispatch:
         # accidental private IPs, which is unrelated to this test.
         monkeypatch.setenv("WEBHOOKS_ALLOW_PRIVATE_IPS", "true")
         d = WebhookDispatcher()
-        with patch("app.api.webhooks.requests.post") as post:
+        with patch("app.api.webhooks.requests.Session.post") as post:
             post.return_value.status_code = 200
             queued = d.dispatch("set_end", "match-1", {"foo": 1})
             # Drain the executor so the worker thread has run before
             # we assert on the mock — pre-PR the assertion was racy
             # and only worked because ``_deliver`` finished quickly.
-            if d._executor is not None:
-                d._executor.shutdown(wait=True)
-                d._executor = None
+            d.drain()
             assert queued == 1
             post.assert_called_once()
             kwargs = post.call_args.kwargs
@@ -178,12 +178,10 @@ class TestDispatch:
         state_token = tracestate_var.set("vendor=value")
         try:
             dispatcher = WebhookDispatcher()
-            with patch("app.api.webhooks.requests.post") as post:
+            with patch("app.api.webhooks.requests.Session.post") as post:
                 post.return_value.status_code = 200
                 dispatcher.dispatch("set_end", "match-1", {})
-                if dispatcher._executor is not None:
-                    dispatcher._executor.shutdown(wait=True)
-                    dispatcher._executor = None
+                dispatcher.drain()
         finally:
             traceparent_var.reset(parent_token)
             tracestate_var.reset(state_token)
@@ -200,12 +198,10 @@ class TestDispatch:
         # guard so the original assertion still holds.
         monkeypatch.setenv("WEBHOOKS_ALLOW_PRIVATE_IPS", "true")
         d = WebhookDispatcher()
-        with patch("app.api.webhooks.requests.post") as post:
+        with patch("app.api.webhooks.requests.Session.post") as post:
             post.return_value.status_code = 200
             queued = d.dispatch("timeout", "oid", {})
-            if d._executor is not None:
-                d._executor.shutdown(wait=True)
-                d._executor = None
+            d.drain()
             assert queued == 1
             assert post.call_args.args[0] == "https://only-timeout.example.com"
 
@@ -215,7 +211,7 @@ class TestDispatch:
         import requests
         monkeypatch.setenv("WEBHOOKS_URL", "https://broken.example.com")
         # Sandbox DNS doesn't resolve example.com; the SSRF guard
-        # would block this target before requests.post is reached
+        # would block this target before Session.post is reached
         # and the test would assert on a different log record. The
         # opt-out lets us still exercise the network-failure path.
         monkeypatch.setenv("WEBHOOKS_ALLOW_PRIVATE_IPS", "true")
@@ -233,14 +229,12 @@ class TestDispatch:
         webhook_logger.addHandler(handler)
         webhook_logger.setLevel(stdlogging.WARNING)
         try:
-            with patch("app.api.webhooks.requests.post",
+            with patch("app.api.webhooks.requests.Session.post",
                        side_effect=requests.ConnectionError("nope")):
                 d.dispatch("set_end", "oid", {})
                 # Drain the executor so the worker thread's log
                 # record lands before we inspect ``records``.
-                if d._executor is not None:
-                    d._executor.shutdown(wait=True)
-                    d._executor = None
+                d.drain()
         finally:
             webhook_logger.removeHandler(handler)
             webhook_logger.setLevel(prior_level)
@@ -264,7 +258,7 @@ class TestDispatch:
 def fast_retries(monkeypatch, tmp_path):
     """Shrink retry timing and isolate the dead-letter file to *tmp_path*.
 
-    The retry loop calls ``time.sleep`` between attempts; with the
+    Retries wait out an exponential backoff between attempts; with the
     production defaults (1 / 2 / 4 s) a single failing test would
     take seven seconds. ``WEBHOOK_RETRY_BASE_SECONDS=0`` skips that
     entirely so the tests stay snappy.
@@ -285,16 +279,14 @@ def fast_retries(monkeypatch, tmp_path):
 
 
 def _drain(dispatcher):
-    if dispatcher._executor is not None:
-        dispatcher._executor.shutdown(wait=True)
-        dispatcher._executor = None
+    dispatcher.drain()
 
 
 class TestWebhookRetries:
     def test_first_attempt_success_is_not_retried(self, monkeypatch, fast_retries):
         monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
         d = WebhookDispatcher()
-        with patch("app.api.webhooks.requests.post") as post:
+        with patch("app.api.webhooks.requests.Session.post") as post:
             post.return_value.status_code = 200
             d.dispatch("set_end", "oid", {})
             _drain(d)
@@ -310,7 +302,7 @@ class TestWebhookRetries:
             MagicMock(status_code=503),
             MagicMock(status_code=200),
         ]
-        with patch("app.api.webhooks.requests.post", side_effect=responses) as post:
+        with patch("app.api.webhooks.requests.Session.post", side_effect=responses) as post:
             d.dispatch("set_end", "oid", {})
             _drain(d)
             assert post.call_count == 3
@@ -325,7 +317,7 @@ class TestWebhookRetries:
         monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
         d = WebhookDispatcher()
         with patch(
-            "app.api.webhooks.requests.post",
+            "app.api.webhooks.requests.Session.post",
             return_value=MagicMock(status_code=503),
         ) as post:
             d.dispatch("set_end", "oid-X", {"k": "v"})
@@ -351,7 +343,7 @@ class TestWebhookRetries:
         monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
         d = WebhookDispatcher()
         with patch(
-            "app.api.webhooks.requests.post",
+            "app.api.webhooks.requests.Session.post",
             return_value=MagicMock(status_code=403),
         ) as post:
             d.dispatch("set_end", "oid", {})
@@ -368,7 +360,7 @@ class TestWebhookRetries:
         monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
         d = WebhookDispatcher()
         with patch(
-            "app.api.webhooks.requests.post",
+            "app.api.webhooks.requests.Session.post",
             side_effect=requests.ConnectTimeout("nope"),
         ) as post:
             d.dispatch("set_end", "oid", {})
@@ -433,6 +425,115 @@ class TestDeadLetterCap:
         assert webhook_dead_letter_size._value.get() == 0
 
 
+class TestDeadLetterIndex:
+    """Ring-buffer layout, sidecar index and paged reads of the DL store."""
+
+    @pytest.fixture
+    def dl(self, monkeypatch, tmp_path):
+        from app.api import webhook_dead_letter
+
+        monkeypatch.setattr(
+            webhook_dead_letter, "WEBHOOK_DEAD_LETTER_MAX_RECORDS", 3,
+        )
+        monkeypatch.setattr(
+            webhook_dead_letter, "_data_dir", lambda: str(tmp_path),
+        )
+        monkeypatch.setattr(webhook_dead_letter, "_indexes", {})
+        return webhook_dead_letter
+
+    def test_append_at_cap_advances_the_head_instead_of_rewriting(
+        self, dl, monkeypatch,
+    ):
+        for i in range(3):
+            dl.append({"url": "u", "event": "e", "oid": f"o{i}"})
+        inode = os.stat(dl._path()).st_ino
+        monkeypatch.setattr(
+            dl, "_rewrite_locked",
+            MagicMock(side_effect=AssertionError("rewrote the DL")),
+        )
+
+        dl.append({"url": "u", "event": "e", "oid": "o3"})
+
+        assert os.stat(dl._path()).st_ino == inode
+        assert [r["oid"] for r in dl.read_all()] == ["o1", "o2", "o3"]
+        assert [r["seq"] for r in dl.read_all()] == [2, 3, 4]
+        index = json.loads(Path(dl._path() + ".idx").read_text())
+        assert index["count"] == 3
+        assert index["head"] > 0
+
+    def test_dead_prefix_is_compacted_once_it_outweighs_live_records(
+        self, dl, monkeypatch,
+    ):
+        monkeypatch.setattr(dl, "_COMPACT_MIN_BYTES", 1)
+        for i in range(7):
+            dl.append({"url": "u", "event": "e", "oid": f"o{i}"})
+
+        index = json.loads(Path(dl._path() + ".idx").read_text())
+        assert index["head"] < index["size"] - index["head"]
+        assert os.path.getsize(dl._path()) == index["size"]
+        assert [r["oid"] for r in dl.read_all()] == ["o4", "o5", "o6"]
+
+    def test_lost_sidecar_and_torn_tail_are_repaired(self, dl):
+        for i in range(2):
+            dl.append({"url": "u", "event": "e", "oid": f"o{i}"})
+        # A crash after a line write but before the sidecar update, followed
+        # by a torn half-line.
+        with open(dl._path(), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"seq": 3, "oid": "o2"}) + "\n")
+            f.write('{"seq": 4, "oid": "to')
+        dl._indexes.clear()
+
+        assert dl.count() == 3
+        dl.append({"url": "u", "event": "e", "oid": "o4"})
+        assert [r["oid"] for r in dl.read_all()] == ["o1", "o2", "o4"]
+        assert dl.read_all()[-1]["seq"] == 4
+
+        os.remove(dl._path() + ".idx")
+        dl._indexes.clear()
+        assert dl.count() == 3
+
+    def test_legacy_file_without_seq_is_renumbered(self, dl):
+        with open(dl._path(), "w", encoding="utf-8") as f:
+            for i in range(2):
+                f.write(json.dumps({"url": "u", "oid": f"old{i}"}) + "\n")
+
+        dl.append({"url": "u", "oid": "new"})
+
+        assert [(r["oid"], r["seq"]) for r in dl.read_all()] == [
+            ("old0", 1), ("old1", 2), ("new", 3),
+        ]
+
+    def test_read_page_filters_and_pages_by_seq(self, dl, monkeypatch):
+        monkeypatch.setattr(dl, "WEBHOOK_DEAD_LETTER_MAX_RECORDS", 100)
+        for i in range(6):
+            dl.append({
+                "url": f"https://t{i % 2}.example.com",
+                "event": "set_end" if i % 3 == 0 else "timeout",
+                "oid": f"o{i}",
+            })
+
+        first = dl.read_page(url="https://t0.example.com", limit=2)
+        assert [r["oid"] for r in first] == ["o0", "o2"]
+        rest = dl.read_page(url="https://t0.example.com", after=first[-1]["seq"])
+        assert [r["oid"] for r in rest] == ["o4"]
+        assert [r["oid"] for r in dl.read_page(event="set_end")] == ["o0", "o3"]
+        assert [r["oid"] for r in dl.read_page(oid="o5")] == ["o5"]
+
+    def test_settle_keeps_records_appended_during_the_replay(self, dl):
+        for i in range(2):
+            dl.append({"url": "u", "event": "e", "oid": f"o{i}"})
+        replayed = dl.read_page()
+        dl.append({"url": "u", "event": "e", "oid": "late"})
+
+        failing = dict(replayed[1], attempts=9)
+        remaining = dl.settle([replayed[0]["seq"]], [failing])
+
+        assert remaining == 2
+        records = dl.read_all()
+        assert [r["oid"] for r in records] == ["o1", "late"]
+        assert records[0]["attempts"] == 9
+
+
 class TestReplayRecords:
     def test_replay_redelivers_on_success(self, monkeypatch, fast_retries):
         monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
@@ -448,7 +549,7 @@ class TestReplayRecords:
             "attempts": 3,
         }
         with patch(
-            "app.api.webhooks.requests.post",
+            "app.api.webhooks.requests.Session.post",
             return_value=MagicMock(status_code=200),
         ) as post:
             succeeded, still_failing, skipped = d.replay_records([record])
@@ -467,7 +568,7 @@ class TestReplayRecords:
             "url": "https://stale.example.com/old-target",
             "event": "set_end", "oid": "oid", "body": "{}",
         }
-        with patch("app.api.webhooks.requests.post") as post:
+        with patch("app.api.webhooks.requests.Session.post") as post:
             succeeded, still_failing, skipped = d.replay_records([record])
         assert succeeded == 0
         assert skipped == 1
@@ -484,7 +585,7 @@ class TestReplayRecords:
             "attempts": 3,
         }
         with patch(
-            "app.api.webhooks.requests.post",
+            "app.api.webhooks.requests.Session.post",
             return_value=MagicMock(status_code=503),
         ):
             succeeded, still_failing, skipped = d.replay_records([record])
@@ -496,6 +597,182 @@ class TestReplayRecords:
         assert still_failing[0]["last_error"] == "HTTP 503"
 
 
+# ---------------------------------------------------------------------------
+# Delivery engine: per-target lanes, batching, bounded queues
+# ---------------------------------------------------------------------------
+
+
+def _two_targets(monkeypatch, **extra):
+    monkeypatch.setenv("WEBHOOKS_JSON", json.dumps([
+        {"url": "https://slow.example.com", **extra},
+        {"url": "https://fast.example.com", **extra},
+    ]))
+
+
+class TestDeliveryEngine:
+    def test_slow_target_does_not_delay_other_targets(
+        self, monkeypatch, fast_retries,
+    ):
+        import threading
+
+        _two_targets(monkeypatch)
+        d = WebhookDispatcher()
+        release = threading.Event()
+        fast_done = threading.Event()
+
+        def post(url, **kwargs):
+            if url == "https://slow.example.com":
+                release.wait(timeout=5)
+            else:
+                fast_done.set()
+            return MagicMock(status_code=200)
+
+        with patch("app.api.webhooks.requests.Session.post", side_effect=post):
+            d.dispatch("set_end", "oid", {})
+            try:
+                assert fast_done.wait(timeout=2)
+            finally:
+                release.set()
+            assert d.drain(timeout=5)
+
+    def test_events_reach_each_target_in_dispatch_order(
+        self, monkeypatch, fast_retries,
+    ):
+        monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
+        d = WebhookDispatcher()
+        # A 503 on the first event must hold the later ones back until the
+        # retry succeeds, instead of letting them overtake it.
+        responses = iter([503, 200, 200, 200])
+        seen: list[int] = []
+
+        def post(url, data, **kwargs):
+            seen.append(json.loads(data)["n"])
+            return MagicMock(status_code=next(responses))
+
+        with patch("app.api.webhooks.requests.Session.post", side_effect=post):
+            for n in range(3):
+                d.dispatch("timeout", "oid", {"n": n})
+            assert d.drain(timeout=5)
+        assert seen == [0, 0, 1, 2]
+
+    def test_backoff_does_not_hold_a_worker(self, monkeypatch, fast_retries):
+        import threading
+
+        from app.api import webhooks as module
+
+        monkeypatch.setattr(module, "_MAX_WORKERS", 1)
+        monkeypatch.setattr(module, "WEBHOOK_RETRY_BASE_SECONDS", 0.5)
+        monkeypatch.setattr(module, "WEBHOOK_RETRY_MAX_SECONDS", 0.5)
+        _two_targets(monkeypatch)
+        d = WebhookDispatcher()
+        fast_done = threading.Event()
+
+        def post(url, **kwargs):
+            if url == "https://slow.example.com":
+                return MagicMock(status_code=503)
+            fast_done.set()
+            return MagicMock(status_code=200)
+
+        with patch("app.api.webhooks.requests.Session.post", side_effect=post):
+            started = time.monotonic()
+            d.dispatch("set_end", "oid", {})
+            # The single worker parks the failing target for 0.5 s and
+            # serves the other one meanwhile.
+            assert fast_done.wait(timeout=2)
+            assert time.monotonic() - started < 0.4
+            assert d.drain(timeout=5)
+
+    def test_backlog_is_posted_as_one_signed_batch(
+        self, monkeypatch, fast_retries,
+    ):
+        import hashlib
+        import hmac
+        import threading
+
+        monkeypatch.setenv("WEBHOOKS_JSON", json.dumps([
+            {"url": "https://hooks.example.com/x", "secret": "s",
+             "batch_max": 10},
+        ]))
+        d = WebhookDispatcher()
+        gate = threading.Event()
+        calls: list[dict] = []
+
+        def post(url, data, headers, **kwargs):
+            gate.wait(timeout=5)
+            calls.append({"data": data, "headers": headers})
+            return MagicMock(status_code=200)
+
+        with patch("app.api.webhooks.requests.Session.post", side_effect=post):
+            for n in range(4):
+                d.dispatch("timeout", "oid", {"n": n})
+            gate.set()
+            assert d.drain(timeout=5)
+
+        # The first event may already be in flight alone; everything that
+        # queued up behind it goes out together.
+        events = [json.loads(c["data"]) for c in calls]
+        assert len(calls) <= 2
+        batch = events[-1]
+        assert isinstance(batch, list)
+        assert calls[-1]["headers"]["X-Webhook-Batch"] == str(len(batch))
+        flat = [e for item in events for e in (item if isinstance(item, list) else [item])]
+        assert [e["n"] for e in flat] == [0, 1, 2, 3]
+        expected = "sha256=" + hmac.new(
+            b"s", calls[-1]["data"], hashlib.sha256,
+        ).hexdigest()
+        assert calls[-1]["headers"]["X-Webhook-Signature"] == expected
+
+    def test_full_queue_dead_letters_the_oldest_waiting_delivery(
+        self, monkeypatch, fast_retries,
+    ):
+        import threading
+
+        from app.api import webhook_dead_letter
+
+        monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
+        monkeypatch.setattr(WebhookDispatcher, "_QUEUE_MAX", 3)
+        d = WebhookDispatcher()
+        in_flight = threading.Event()
+        release = threading.Event()
+        sent: list[int] = []
+
+        def post(url, data, **kwargs):
+            in_flight.set()
+            release.wait(timeout=5)
+            sent.append(json.loads(data)["n"])
+            return MagicMock(status_code=200)
+
+        with patch("app.api.webhooks.requests.Session.post", side_effect=post):
+            d.dispatch("timeout", "oid", {"n": 0})
+            assert in_flight.wait(timeout=2)
+            for n in range(1, 4):
+                d.dispatch("timeout", "oid", {"n": n})
+            release.set()
+            assert d.drain(timeout=5)
+
+        # n=0 was in flight and n=1 was the oldest waiting one.
+        assert sent == [0, 2, 3]
+        records = webhook_dead_letter.read_all()
+        assert [json.loads(r["body"])["n"] for r in records] == [1]
+        assert records[0]["last_error"] == "queue overflow"
+
+    def test_target_connection_is_reused(self, monkeypatch, fast_retries):
+        monkeypatch.setenv("WEBHOOKS_URL", "https://hooks.example.com/x")
+        d = WebhookDispatcher()
+        sessions: list[object] = []
+
+        def post(self, url, **kwargs):
+            sessions.append(self)
+            return MagicMock(status_code=200)
+
+        with patch("app.api.webhooks.requests.Session.post", new=post):
+            for n in range(3):
+                d.dispatch("timeout", "oid", {"n": n})
+                assert d.drain(timeout=5)
+        assert len(sessions) == 3
+        assert len({id(s) for s in sessions}) == 1
+
+
 # ---------------------------------------------------------------------------
 # GameService firing path
 # ---------------------------------------------------------------------------